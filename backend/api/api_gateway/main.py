@@ -1,16 +1,27 @@
-from typing import Any
+import os
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Optional
 
+import httpx
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Request, status
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
-from api.api_gateway.middleware.auth_middleware import auth_middleware
+from api.api_gateway.middleware.auth_middleware import AuthMiddleware, token_cache
 from api.api_gateway.middleware.circuit_breaker import (
+    CircuitBreakerMiddleware,
     circuit_breaker,
-    circuit_breaker_middleware,
+)
+from api.api_gateway.utils.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    etag_matches,
 )
 from api.api_gateway.utils.service_registry import service_registry
+from api.api_gateway.utils.single_flight import SingleFlight
 
 # Load environment variables
 load_dotenv()
@@ -21,12 +32,37 @@ EXCLUDED_HEADERS = {
     "proxy-authorization", "te", "trailers", "transfer-encoding", "upgrade",
     "content-length",
 }
+# Upstream Content-Length stays valid when the raw body is streamed through
+RESPONSE_EXCLUDED_HEADERS = EXCLUDED_HEADERS - {"content-length"}
+# Pipe bodies chunk by chunk instead of buffering them in the gateway
+STREAMING_PROXY = os.getenv("GATEWAY_STREAMING_PROXY", "true").lower() == "true"
+# Opt-in cache of GET responses for routes with a cache_ttl in the registry
+response_cache = ResponseCache()
+# Coalesces concurrent identical GETs of cacheable or "coalesce" routes
+single_flight = SingleFlight()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Open pooled service clients on startup and close them on shutdown.
+
+    Args:
+        app (FastAPI): FastAPI app
+    """
+    await circuit_breaker.client_pool.startup(service_registry.services.keys())
+    try:
+        yield
+    finally:
+        await circuit_breaker.client_pool.shutdown()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="TaskHub API Gateway",
     description="API Gateway for TaskHub platform",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -36,65 +72,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Add custom middlewares
-app.middleware("http")(auth_middleware)
-app.middleware("http")(circuit_breaker_middleware)
-
-
-@app.api_route(
-    "/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
+# Add custom middlewares (pure ASGI, the last added runs first)
+app.add_middleware(AuthMiddleware)
+app.add_middleware(
+    CircuitBreakerMiddleware, exclude_paths=("/health", "/services", "/metrics")
 )
-async def gateway(request: Request, path: str) -> Any:
-    """
-    Gateway for all requests.
-
-    Args:
-        request (Request): FastAPI request
-        path (str): Request path
-
-    Returns:
-        Response: Response from service
-    """
-    # Get full path
-    full_path = f"/{path}"
-
-    try:
-        # Get service for path
-        service = service_registry.get_service_for_path(full_path, request.method)
-
-        # Build target URL
-        target_url = f"{service['url']}{full_path}"
-
-        # Forward request to service
-        return await forward_request(request, target_url, service["name"])
-    except ValueError as e:
-        return JSONResponse(
-            status_code=status.HTTP_404_NOT_FOUND, content={"detail": str(e)}
-        )
-    except HTTPException as e:
-        return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"detail": str(e)},
-        )
 
 
 async def forward_request(
-    request: Request, target_url: str, service_name: str
-) -> JSONResponse:
+    request: Request,
+    target_url: str,
+    service_name: str,
+    route: Optional[str] = None,
+    cache_ttl: Optional[float] = None,
+    coalesce: bool = False,
+    max_body_size: int = MAX_REQUEST_BODY_SIZE,
+) -> Response:
     """
     Forward request to service.
 
+    In streaming mode the request and response bodies are piped chunk by chunk
+    as raw bytes; otherwise the upstream body is buffered and returned as is.
+    GETs of cacheable routes are always buffered and answered from the
+    response cache while fresh; successful writes invalidate the cached
+    responses under the same top-level path. Concurrent identical GETs of
+    cacheable or coalesced routes share one buffered upstream call.
+
     Args:
         request (Request): FastAPI request
         target_url (str): Target URL
         service_name (str): Service name
+        route (str, optional): Matched route template
+        cache_ttl (float, optional): Seconds GET responses of the route may be cached
+        coalesce (bool, optional): Whether concurrent identical GETs share one call
+        max_body_size (int, optional): Largest request body accepted, in bytes
 
     Returns:
-        JSONResponse: Response from service
+        Response: Response from service
     """
     # Filter headers
     temp_headers = {}
@@ -105,36 +122,239 @@ async def forward_request(
     if hasattr(request.state, "user_id"):
         temp_headers["X-User-ID"] = str(request.state.user_id)
 
-    # Prepare arguments for circuit_breaker.call_service
-    request_body = await request.body()
-
-    if len(request_body) > MAX_REQUEST_BODY_SIZE:
-        return JSONResponse(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            content={"detail": f"Request body exceeds maximum allowed size of {MAX_REQUEST_BODY_SIZE} bytes."}
+    # Answer from the response cache without contacting the service
+    cache_key = None
+    cache_control = request.headers.get("cache-control", "")
+    if (
+        response_cache.enabled
+        and cache_ttl
+        and request.method.upper() == "GET"
+        and hasattr(request.state, "user_id")
+        and "no-store" not in cache_control
+    ):
+        cache_key = response_cache.make_key(
+            str(request.state.user_id), request.url.path, request.url.query
         )
+        if "no-cache" not in cache_control:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return _cached_response(request, cached)
+
+    # Let concurrent identical GETs of the same user share one upstream call
+    flight_key = None
+    if (
+        single_flight.enabled
+        and (coalesce or cache_key is not None)
+        and request.method.upper() == "GET"
+        and hasattr(request.state, "user_id")
+    ):
+        flight_key = (str(request.state.user_id), request.url.path, request.url.query)
+
+    # Shared and cached responses must be read in full
+    stream = STREAMING_PROXY and cache_key is None and flight_key is None
+
+    # Reject oversized bodies early when the client announces their size
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > max_body_size:
+            return _request_too_large_response(max_body_size)
 
-    service_kwargs = {
+    # Prepare arguments for circuit_breaker.call_service
+    service_kwargs: Dict[str, Any] = {
         "headers": temp_headers,
-        "params": dict(request.query_params)
+        "params": request.query_params.multi_items(),
     }
 
     if request.method.upper() not in ("GET", "HEAD", "DELETE"):
-        service_kwargs["content"] = request_body
+        if STREAMING_PROXY:
+            # Keep the announced length so the body is not re-chunked upstream
+            if content_length:
+                temp_headers["Content-Length"] = content_length
+            service_kwargs["content"] = _stream_request_body(request, max_body_size)
+        else:
+            request_body = await request.body()
+            if len(request_body) > max_body_size:
+                return _request_too_large_response(max_body_size)
+            service_kwargs["content"] = request_body
 
     # Forward request to service using circuit breaker
-    response = await circuit_breaker.call_service(  # type: ignore
+    call = partial(
+        circuit_breaker.call_service,
         service_name=service_name,
         url=target_url,
         method=request.method,
-        **service_kwargs
+        stream=stream,
+        route=route,
+        **service_kwargs,
     )
+    try:
+        if flight_key is not None:
+            response = await single_flight.do(flight_key, call)
+        else:
+            response = await call()
+    except RequestBodyTooLargeError:
+        return _request_too_large_response(max_body_size)
+
+    if response_cache.enabled and request.method.upper() not in (
+        "GET",
+        "HEAD",
+        "OPTIONS",
+    ):
+        if response.status_code < 400:
+            response_cache.invalidate_prefix(_cache_prefix(request.url.path))
+
+    if cache_key is not None and _is_cacheable(response):
+        entry = response_cache.set(
+            cache_key,
+            response.content,
+            response.status_code,
+            _filter_response_headers(response, keep_encoding=False),
+            cache_ttl,  # type: ignore
+        )
+        if entry is not None:
+            return _cached_response(request, entry)
+
+    if stream:
+        # Pipe the raw (still encoded) upstream body to the client
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers=_filter_response_headers(response, keep_encoding=True),
+            background=BackgroundTask(response.aclose),
+        )
 
     # Return response
-    return JSONResponse(
+    return Response(
+        content=response.content,
         status_code=response.status_code,
-        content=response.json() if response.content else None,
-        headers=dict(response.headers),
+        headers=_filter_response_headers(response, keep_encoding=False),
+    )
+
+
+class RequestBodyTooLargeError(Exception):
+    """Raised when a streamed request body exceeds its route's maximum size"""
+
+
+async def _stream_request_body(
+    request: Request, max_body_size: int = MAX_REQUEST_BODY_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Stream the request body, enforcing the maximum size as it arrives.
+
+    Args:
+        request (Request): FastAPI request
+        max_body_size (int, optional): Largest request body accepted, in bytes
+
+    Yields:
+        bytes: Body chunk
+
+    Raises:
+        RequestBodyTooLargeError: If the body exceeds the maximum size
+    """
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_body_size:
+            raise RequestBodyTooLargeError()
+        yield chunk
+
+
+def _filter_response_headers(
+    response: httpx.Response, keep_encoding: bool
+) -> Dict[str, str]:
+    """
+    Filter hop-by-hop headers out of a service response.
+
+    Args:
+        response (httpx.Response): Service response
+        keep_encoding (bool): Whether the body is forwarded still encoded, in
+            which case Content-Encoding and Content-Length remain valid
+
+    Returns:
+        Dict[str, str]: Headers to send to the client
+    """
+    excluded = RESPONSE_EXCLUDED_HEADERS
+    if not keep_encoding:
+        excluded = excluded | {"content-encoding", "content-length"}
+
+    return {
+        name: value
+        for name, value in response.headers.items()
+        if name.lower() not in excluded
+    }
+
+
+def _cache_prefix(path: str) -> str:
+    """
+    Get the path prefix whose cached responses a write to path invalidates.
+
+    Args:
+        path (str): Request path
+
+    Returns:
+        str: Top-level path (e.g. "/projects" for "/projects/1/tasks")
+    """
+    return "/" + path.strip("/").split("/", 1)[0]
+
+
+def _is_cacheable(response: httpx.Response) -> bool:
+    """
+    Check if a service response may be stored in the response cache.
+
+    Args:
+        response (httpx.Response): Buffered service response
+
+    Returns:
+        bool: True if the response may be cached
+    """
+    cache_control = response.headers.get("cache-control", "")
+
+    return (
+        response.status_code == status.HTTP_200_OK
+        and "set-cookie" not in response.headers
+        and "no-store" not in cache_control
+    )
+
+
+def _cached_response(request: Request, cached: CachedResponse) -> Response:
+    """
+    Build the response for a cached entry, honouring If-None-Match.
+
+    Args:
+        request (Request): FastAPI request
+        cached (CachedResponse): Cached response
+
+    Returns:
+        Response: 304 if the client's copy is current, the cached response otherwise
+    """
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        response_cache.not_modified += 1
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": cached.etag}
+        )
+
+    return Response(
+        content=cached.body, status_code=cached.status_code, headers=cached.headers
+    )
+
+
+def _request_too_large_response(
+    max_body_size: int = MAX_REQUEST_BODY_SIZE,
+) -> JSONResponse:
+    """
+    Build the response for oversized request bodies.
+
+    Args:
+        max_body_size (int, optional): Largest request body accepted, in bytes
+
+    Returns:
+        JSONResponse: 413 response
+    """
+    return JSONResponse(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        content={
+            "detail": f"Request body exceeds maximum allowed size of {max_body_size} bytes."
+        },
     )
 
 
@@ -159,8 +379,82 @@ async def get_services() -> Any:
         List[Dict[str, Any]]: List of services
 
     """
-    return service_registry.get_all_services()
+    services = service_registry.get_all_services()
+
+    # Attach connection pool utilisation for each service
+    for service in services:
+        service["pool"] = circuit_breaker.client_pool.get_stats(service["name"])
+
+    return services
+
+
+@app.get("/metrics", tags=["Services"])
+async def get_metrics() -> Any:
+    """
+    Get gateway metrics.
+
+    Returns:
+        Dict[str, Any]: Gateway metrics
+    """
+    return {
+        "auth_token_cache": token_cache.get_stats(),
+        "circuit_breakers": circuit_breaker.get_stats(),
+        "response_cache": response_cache.get_stats(),
+        "single_flight": single_flight.get_stats(),
+    }
+
+
+# The catch-all route must be registered last so it does not shadow the
+# gateway's own endpoints above
+@app.api_route(
+    "/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
+)
+async def gateway(request: Request, path: str) -> Any:
+    """
+    Gateway for all requests.
+
+    Args:
+        request (Request): FastAPI request
+        path (str): Request path
+
+    Returns:
+        Response: Response from service
+    """
+    # Get full path
+    full_path = f"/{path}"
+
+    try:
+        # Get service for path, already resolved by the circuit breaker middleware
+        service = getattr(request.state, "service", None)
+        if service is None:
+            service = service_registry.get_service_for_path(full_path, request.method)
+
+        # Build target URL
+        target_url = f"{service['url']}{full_path}"
+
+        # Forward request to service
+        return await forward_request(
+            request,
+            target_url,
+            service["name"],
+            service["route"],
+            service["cache_ttl"],
+            service["coalesce"],
+            service["max_body_size"] or MAX_REQUEST_BODY_SIZE,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND, content={"detail": str(e)}
+        )
+    except HTTPException as e:
+        return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+    except Exception as e:
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"detail": str(e)},
+        )
+
 
 # Export para tests de integración
-# (No existen get_db ni get_current_user aquí, pero exporto auth_middleware por consistencia)
-auth_middleware = auth_middleware
+# (No existen get_db ni get_current_user aquí, pero exporto AuthMiddleware por consistencia)
+AuthMiddleware = AuthMiddleware
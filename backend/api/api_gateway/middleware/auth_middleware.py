@@ -1,10 +1,13 @@
 import os
-from typing import Awaitable, Callable, Optional
+from typing import Optional
 
 from dotenv import load_dotenv
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from jose import ExpiredSignatureError, JWTError, jwt
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.api_gateway.utils.token_cache import TokenCache, TokenDenylist
 
 # Load environment variables
 load_dotenv()
@@ -14,52 +17,103 @@ SUPABASE_AUDIENCE = os.getenv("SUPABASE_AUDIENCE", "authenticated")
 # Optional: Add SUPABASE_ISSUER if you want to validate the 'iss' claim, e.g.:
 # SUPABASE_ISSUER = os.getenv("SUPABASE_ISSUER")
 
+# Verified tokens, so repeated requests skip the signature check
+token_cache = TokenCache()
+# Logged-out tokens, rejected before the cache or signature are checked.
+# Held in process memory: with several gateway workers a logout only revokes
+# the token on the worker that served it, the others accept it until expiry.
+token_denylist = TokenDenylist()
 
-async def auth_middleware(
-    request: Request, call_next: Callable[[Request], Awaitable[JSONResponse]]
-) -> JSONResponse:
-    if request.method == "OPTIONS":
-        return await call_next(request)
-    """
-    Middleware for authentication.
-
-    Args:
-        request (Request): FastAPI request
-        call_next (Callable[[Request], Awaitable[JSONResponse]]): Next middleware or route handler
 
-    Returns:
-        JSONResponse: Response
+class AuthMiddleware:
     """
-    # Skip authentication for certain paths
-    if _should_skip_auth(request.url.path):
-        return await call_next(request)
-
-    # Get token from request
-    token = _get_token_from_request(request)
+    Pure ASGI middleware for authentication.
 
-    # Check if token exists
-    if not token:
-        return JSONResponse(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            content={"detail": "Not authenticated"},
-        )
+    Unlike ``app.middleware("http")`` middlewares it does not wrap the request
+    in a separate task and response stream; it only inspects the scope and
+    either answers directly or calls the next app with the same receive/send.
+    """
 
-    # Validate token
-    try:
-        user_id = await _validate_token(token)
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Initialize AuthMiddleware.
+
+        Args:
+            app (ASGIApp): Next ASGI app
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Authenticate an HTTP request and forward it.
+
+        Args:
+            scope (Scope): ASGI scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
+        """
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
+        # Skip authentication for certain paths
+        if _should_skip_auth(request.url.path):
+            await self.app(scope, receive, send)
+            return
+
+        # Get token from request
+        token = _get_token_from_request(request)
+
+        # Check if token exists
+        if not token:
+            response = JSONResponse(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                content={"detail": "Not authenticated"},
+            )
+            await response(scope, receive, send)
+            return
+
+        # Validate token
+        try:
+            user_id = await _validate_token(token)
+        except HTTPException as e:
+            response = JSONResponse(
+                status_code=e.status_code, content={"detail": e.detail}
+            )
+            await response(scope, receive, send)
+            return
+        except Exception as e:
+            response = JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"detail": str(e)},
+            )
+            await response(scope, receive, send)
+            return
 
         # Add user ID to request state
         request.state.user_id = user_id
 
-        # Continue with request
-        return await call_next(request)
-    except HTTPException as e:
-        return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"detail": str(e)},
-        )
+        if request.url.path.rstrip("/") != "/auth/logout":
+            # Continue with request
+            await self.app(scope, receive, send)
+            return
+
+        response_status = 0
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_with_status)
+
+        # Stop trusting the token once the user has been logged out upstream
+        if 200 <= response_status < 400:
+            token_denylist.add(token, _get_token_expiry(token))
+            token_cache.invalidate(token)
 
 
 def _should_skip_auth(path: str) -> bool:
@@ -105,7 +159,36 @@ def _get_token_from_request(request: Request) -> Optional[str]:
     return None
 
 
+def _get_token_expiry(token: str) -> Optional[float]:
+    """
+    Get the expiry of an already verified token.
+
+    Args:
+        token (str): JWT
+
+    Returns:
+        Optional[float]: exp claim as a UNIX timestamp, None if missing
+    """
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return None
+
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
 async def _validate_token(token: str) -> str:
+    if token_denylist.is_denied(token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Token has been revoked.',
+        )
+
+    # Tokens verified recently are served from the cache until they expire
+    cached_user_id = token_cache.get(token)
+    if cached_user_id:
+        return cached_user_id
+
     if not SUPABASE_JWT_SECRET:
         print('ERROR: SUPABASE_JWT_SECRET is not configured in the environment.')
         raise HTTPException(
@@ -128,7 +211,9 @@ async def _validate_token(token: str) -> str:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail='Invalid token: User ID (sub) not found in token.',
             )
-        
+
+        token_cache.set(token, user_id, payload.get('exp'))
+
         return user_id
 
     except ExpiredSignatureError:
@@ -1,11 +1,37 @@
 import asyncio
-from datetime import datetime, timedelta, timezone
+import os
+import time
+from bisect import bisect_left
+from collections import deque
 from enum import Enum
-from typing import Any, Awaitable, Callable, Dict
+from typing import Any, Deque, Dict, Iterable, List, Optional
 
 import httpx
-from fastapi import HTTPException, Request, status
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
 from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.api_gateway.utils.http_client_pool import HTTPClientPool
+from api.api_gateway.utils.service_registry import service_registry
+
+# Load environment variables
+load_dotenv()
+
+# Circuit breaker configuration
+GATEWAY_CB_WINDOW_SECONDS = int(os.getenv("GATEWAY_CB_WINDOW_SECONDS", "30"))
+GATEWAY_CB_MINIMUM_CALLS = int(os.getenv("GATEWAY_CB_MINIMUM_CALLS", "20"))
+GATEWAY_CB_FAILURE_RATE = float(os.getenv("GATEWAY_CB_FAILURE_RATE", "0.5"))
+GATEWAY_CB_SLOW_CALL_RATE = float(os.getenv("GATEWAY_CB_SLOW_CALL_RATE", "0.8"))
+GATEWAY_CB_SLOW_CALL_DURATION = float(
+    os.getenv("GATEWAY_CB_SLOW_CALL_DURATION", "2.0")
+)
+GATEWAY_CB_RECOVERY_TIMEOUT = float(os.getenv("GATEWAY_CB_RECOVERY_TIMEOUT", "30"))
+GATEWAY_CB_HALF_OPEN_MAX_CALLS = int(os.getenv("GATEWAY_CB_HALF_OPEN_MAX_CALLS", "3"))
+GATEWAY_CB_PER_ROUTE = os.getenv("GATEWAY_CB_PER_ROUTE", "false").lower() == "true"
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
 
 
 class CircuitState(str, Enum):
@@ -16,121 +42,326 @@ class CircuitState(str, Enum):
     HALF_OPEN = "half_open"  # Testing if service is back online
 
 
+class Circuit:
+    """
+    State of one circuit: a service, or a single route of a service.
+
+    Outcomes are counted in one bucket per second over a rolling window.
+    Every update is a plain synchronous attribute change with no await in
+    between, so it is atomic with respect to other asyncio tasks and needs
+    no lock.
+    """
+
+    def __init__(self, name: str, window_seconds: int):
+        """
+        Initialize Circuit.
+
+        Args:
+            name (str): Circuit name
+            window_seconds (int): Length of the rolling window in seconds
+        """
+        self.name = name
+        self.window_seconds = window_seconds
+        self.state = CircuitState.CLOSED
+        self.opened_at: Optional[float] = None
+        self.half_open_in_flight = 0
+        self.half_open_successes = 0
+        # [second, calls, failures, slow calls] per second of the window
+        self.buckets: Deque[List[int]] = deque()
+        self.rejected = 0
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+
+    def _trim(self, now: float) -> None:
+        """
+        Drop buckets that left the rolling window.
+
+        Args:
+            now (float): Current monotonic time
+        """
+        oldest = int(now) - self.window_seconds
+        while self.buckets and self.buckets[0][0] <= oldest:
+            self.buckets.popleft()
+
+    def record(self, duration: float, failed: bool, slow: bool, now: float) -> None:
+        """
+        Record the outcome of a call.
+
+        Args:
+            duration (float): Call duration in seconds
+            failed (bool): Whether the call failed
+            slow (bool): Whether the call was slow
+            now (float): Current monotonic time
+        """
+        second = int(now)
+        if not self.buckets or self.buckets[-1][0] != second:
+            self.buckets.append([second, 0, 0, 0])
+            self._trim(now)
+
+        bucket = self.buckets[-1]
+        bucket[1] += 1
+        bucket[2] += int(failed)
+        bucket[3] += int(slow)
+
+        self.latency_counts[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        self.latency_sum += duration
+        self.latency_count += 1
+
+    def window(self, now: float) -> Dict[str, Any]:
+        """
+        Aggregate the rolling window.
+
+        Args:
+            now (float): Current monotonic time
+
+        Returns:
+            Dict[str, Any]: Calls, failure rate and slow call rate
+        """
+        self._trim(now)
+        calls = sum(bucket[1] for bucket in self.buckets)
+        failures = sum(bucket[2] for bucket in self.buckets)
+        slow = sum(bucket[3] for bucket in self.buckets)
+
+        return {
+            "calls": calls,
+            "failure_rate": failures / calls if calls else 0.0,
+            "slow_call_rate": slow / calls if calls else 0.0,
+        }
+
+    def reset(self) -> None:
+        """Close the circuit and forget the window"""
+        self.state = CircuitState.CLOSED
+        self.opened_at = None
+        self.half_open_in_flight = 0
+        self.half_open_successes = 0
+        self.buckets.clear()
+
+
 class CircuitBreaker:
-    """Circuit breaker for protecting services"""
+    """Rolling-window circuit breaker for protecting services"""
 
     def __init__(
         self,
-        failure_threshold: int = 5,
-        recovery_timeout: int = 30,
+        window_seconds: int = GATEWAY_CB_WINDOW_SECONDS,
+        minimum_calls: int = GATEWAY_CB_MINIMUM_CALLS,
+        failure_rate_threshold: float = GATEWAY_CB_FAILURE_RATE,
+        slow_call_rate_threshold: float = GATEWAY_CB_SLOW_CALL_RATE,
+        slow_call_duration: float = GATEWAY_CB_SLOW_CALL_DURATION,
+        recovery_timeout: float = GATEWAY_CB_RECOVERY_TIMEOUT,
+        half_open_max_calls: int = GATEWAY_CB_HALF_OPEN_MAX_CALLS,
+        per_route: bool = GATEWAY_CB_PER_ROUTE,
         timeout: float = 10.0,
+        client_pool: Optional[HTTPClientPool] = None,
     ):
         """
         Initialize CircuitBreaker.
 
         Args:
-            failure_threshold (int, optional): Number of failures before opening circuit. Defaults to 5.
-            recovery_timeout (int, optional): Seconds to wait before trying again. Defaults to 30.
-            timeout (float, optional): Request timeout in seconds. Defaults to 10.0.
+            window_seconds (int, optional): Length of the rolling window in seconds.
+            minimum_calls (int, optional): Calls needed in the window before rates are evaluated.
+            failure_rate_threshold (float, optional): Failure rate (0-1) that opens the circuit.
+            slow_call_rate_threshold (float, optional): Slow call rate (0-1) that opens the circuit.
+            slow_call_duration (float, optional): Seconds after which a call counts as slow.
+            recovery_timeout (float, optional): Seconds to wait before probing an open circuit.
+            half_open_max_calls (int, optional): Concurrent probes allowed while half-open;
+                this many successful probes close the circuit.
+            per_route (bool, optional): Track a circuit per route instead of per service.
+            timeout (float, optional): Default request timeout in seconds. Defaults to 10.0.
+            client_pool (HTTPClientPool, optional): Pooled clients used to call the services.
         """
-        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.minimum_calls = minimum_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration = slow_call_duration
         self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.per_route = per_route
         self.timeout = timeout
-        self.state = CircuitState.CLOSED
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.services = {}  # Service name -> CircuitBreaker state
+        self.client_pool = client_pool or HTTPClientPool(timeout=timeout)
+        self.circuits: Dict[str, Circuit] = {}
 
-    def get_service_circuit(self, service_name: str) -> Dict[str, Any]:
+    def get_circuit(self, service_name: str, route: Optional[str] = None) -> Circuit:
         """
-        Get or create circuit for a service.
+        Get or create the circuit for a service or route.
 
         Args:
             service_name (str): Service name
+            route (str, optional): Route template, used when tracking per route
 
         Returns:
-            Dict[str, Any]: Service circuit
+            Circuit: Circuit
         """
-        if service_name not in self.services:
-            self.services[service_name] = {
-                "state": CircuitState.CLOSED,
-                "failure_count": 0,
-                "last_failure_time": None,
-            }
+        name = f"{service_name} {route}" if self.per_route and route else service_name
+        circuit = self.circuits.get(name)
+
+        if circuit is None:
+            circuit = Circuit(name, self.window_seconds)
+            self.circuits[name] = circuit
 
-        return self.services[service_name]
+        return circuit
 
-    def record_success(self, service_name: str) -> None:
+    def is_circuit_open(self, service_name: str, route: Optional[str] = None) -> bool:
         """
-        Record a successful request.
+        Check if requests to a service are currently rejected.
+
+        Unlike acquire() this does not take a half-open probe slot.
 
         Args:
             service_name (str): Service name
+            route (str, optional): Route template
+
+        Returns:
+            bool: True if circuit is open, False otherwise
         """
-        circuit = self.get_service_circuit(service_name)
+        circuit = self.get_circuit(service_name, route)
 
-        # Reset circuit if it was half-open
-        if circuit["state"] == CircuitState.HALF_OPEN:
-            circuit["state"] = CircuitState.CLOSED
-            circuit["failure_count"] = 0
-            circuit["last_failure_time"] = None
+        if circuit.state == CircuitState.OPEN:
+            return not self._recovery_elapsed(circuit, time.monotonic())
 
-    def record_failure(self, service_name: str) -> None:
+        if circuit.state == CircuitState.HALF_OPEN:
+            return circuit.half_open_in_flight >= self.half_open_max_calls
+
+        return False
+
+    def acquire(self, circuit: Circuit) -> bool:
         """
-        Record a failed request.
+        Ask permission to call through a circuit.
 
         Args:
-            service_name (str): Service name
+            circuit (Circuit): Circuit
+
+        Returns:
+            bool: True if the call may proceed, False if it must be rejected
+        """
+        if circuit.state == CircuitState.OPEN:
+            if not self._recovery_elapsed(circuit, time.monotonic()):
+                circuit.rejected += 1
+                return False
+
+            # Let a limited number of probes test if service is back online
+            circuit.state = CircuitState.HALF_OPEN
+            circuit.half_open_in_flight = 0
+            circuit.half_open_successes = 0
+
+        if circuit.state == CircuitState.HALF_OPEN:
+            if circuit.half_open_in_flight >= self.half_open_max_calls:
+                circuit.rejected += 1
+                return False
+            circuit.half_open_in_flight += 1
+
+        return True
+
+    def record_result(self, circuit: Circuit, duration: float, failed: bool) -> None:
         """
-        circuit = self.get_service_circuit(service_name)
+        Record the outcome of a call and update the circuit state.
 
-        # Increment failure count
-        circuit["failure_count"] += 1
-        circuit["last_failure_time"] = datetime.now(timezone.utc)
+        Args:
+            circuit (Circuit): Circuit
+            duration (float): Call duration in seconds
+            failed (bool): Whether the call failed
+        """
+        now = time.monotonic()
+        slow = duration >= self.slow_call_duration
+        circuit.record(duration, failed, slow, now)
+
+        if circuit.state == CircuitState.HALF_OPEN:
+            circuit.half_open_in_flight = max(circuit.half_open_in_flight - 1, 0)
+            if failed or slow:
+                self._open(circuit, now)
+                return
+
+            circuit.half_open_successes += 1
+            if circuit.half_open_successes >= self.half_open_max_calls:
+                circuit.reset()
+            return
+
+        if circuit.state == CircuitState.CLOSED:
+            window = circuit.window(now)
+            if window["calls"] >= self.minimum_calls and (
+                window["failure_rate"] >= self.failure_rate_threshold
+                or window["slow_call_rate"] >= self.slow_call_rate_threshold
+            ):
+                self._open(circuit, now)
+
+    def record_success(
+        self, service_name: str, route: Optional[str] = None, duration: float = 0.0
+    ) -> None:
+        """
+        Record a successful request.
 
-        # Open circuit if threshold is reached
-        if (
-            circuit["state"] == CircuitState.CLOSED
-            and circuit["failure_count"] >= self.failure_threshold
-        ):
-            circuit["state"] = CircuitState.OPEN
+        Args:
+            service_name (str): Service name
+            route (str, optional): Route template
+            duration (float, optional): Call duration in seconds
+        """
+        self.record_result(self.get_circuit(service_name, route), duration, False)
 
-    def is_circuit_open(self, service_name: str) -> bool:
+    def record_failure(
+        self, service_name: str, route: Optional[str] = None, duration: float = 0.0
+    ) -> None:
         """
-        Check if circuit is open for a service.
+        Record a failed request.
 
         Args:
             service_name (str): Service name
+            route (str, optional): Route template
+            duration (float, optional): Call duration in seconds
+        """
+        self.record_result(self.get_circuit(service_name, route), duration, True)
 
-        Returns:
-            bool: True if circuit is open, False otherwise
+    def _open(self, circuit: Circuit, now: float) -> None:
         """
-        circuit = self.get_service_circuit(service_name)
+        Open a circuit.
 
-        # Check if circuit is open
-        if circuit["state"] == CircuitState.OPEN:
-            # Check if recovery timeout has passed
-            if circuit["last_failure_time"] and datetime.now(timezone.utc) - circuit[
-                "last_failure_time"
-            ] > timedelta(seconds=self.recovery_timeout):
-                # Set circuit to half-open to test if service is back online
-                circuit["state"] = CircuitState.HALF_OPEN
-                return False
+        Args:
+            circuit (Circuit): Circuit
+            now (float): Current monotonic time
+        """
+        circuit.state = CircuitState.OPEN
+        circuit.opened_at = now
+        circuit.half_open_in_flight = 0
+        circuit.half_open_successes = 0
 
-            return True
+    def _recovery_elapsed(self, circuit: Circuit, now: float) -> bool:
+        """
+        Check if an open circuit may be probed again.
 
-        return False
+        Args:
+            circuit (Circuit): Circuit
+            now (float): Current monotonic time
+
+        Returns:
+            bool: True if the recovery timeout has passed
+        """
+        return (
+            circuit.opened_at is None
+            or now - circuit.opened_at >= self.recovery_timeout
+        )
 
     async def call_service(
-        self, service_name: str, url: str, method: str, **kwargs
+        self,
+        service_name: str,
+        url: str,
+        method: str,
+        stream: bool = False,
+        route: Optional[str] = None,
+        **kwargs,
     ) -> httpx.Response:
         """
         Call a service with circuit breaker protection.
 
+        Transport errors, timeouts and 5xx responses count as failures; calls
+        slower than slow_call_duration count as slow.
+
         Args:
             service_name (str): Service name
             url (str): Request URL
             method (str): HTTP method
+            stream (bool, optional): Return the response before its body is read.
+                The caller must close it. Defaults to False.
+            route (str, optional): Route template, used when tracking per route
             **kwargs: Additional arguments for httpx
 
         Returns:
@@ -139,71 +370,134 @@ class CircuitBreaker:
         Raises:
             HTTPException: If circuit is open or request fails
         """
+        circuit = self.get_circuit(service_name, route)
+
         # Check if circuit is open
-        if self.is_circuit_open(service_name):
+        if not self.acquire(circuit):
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=f"Service {service_name} is unavailable",
             )
 
+        start = time.monotonic()
         try:
-            # Make request
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await getattr(client, method.lower())(url, **kwargs)
-
-                # Record success
-                self.record_success(service_name)
-
-                return response
+            # Make request over the service's keep-alive connection pool
+            response = await self.client_pool.request(
+                service_name, method.upper(), url, stream=stream, **kwargs
+            )
         except (httpx.RequestError, asyncio.TimeoutError) as e:
             # Record failure
-            self.record_failure(service_name)
+            self.record_result(circuit, time.monotonic() - start, True)
 
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=f"Service {service_name} is unavailable: {str(e)}",
             )
+        except BaseException:
+            # Not the service's fault (e.g. client body too large), release the probe slot
+            if circuit.state == CircuitState.HALF_OPEN:
+                circuit.half_open_in_flight = max(circuit.half_open_in_flight - 1, 0)
+            raise
+
+        # Record result
+        self.record_result(
+            circuit, time.monotonic() - start, response.status_code >= 500
+        )
+
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get state, rolling window and latency histogram of every circuit.
+
+        Returns:
+            Dict[str, Any]: Circuit name -> statistics
+        """
+        now = time.monotonic()
+        stats = {}
+
+        for name, circuit in self.circuits.items():
+            window = circuit.window(now)
+            cumulative = 0
+            histogram = {}
+            for bound, count in zip(
+                [str(b) for b in LATENCY_BUCKETS] + ["+Inf"], circuit.latency_counts
+            ):
+                cumulative += count
+                histogram[bound] = cumulative
+
+            stats[name] = {
+                "state": circuit.state.value,
+                "window_seconds": circuit.window_seconds,
+                "calls": window["calls"],
+                "failure_rate": round(window["failure_rate"], 4),
+                "slow_call_rate": round(window["slow_call_rate"], 4),
+                "rejected": circuit.rejected,
+                "half_open_in_flight": circuit.half_open_in_flight,
+                "latency_seconds": {
+                    "buckets": histogram,
+                    "count": circuit.latency_count,
+                    "sum": round(circuit.latency_sum, 6),
+                },
+            }
+
+        return stats
 
 
 # Create global circuit breaker
 circuit_breaker = CircuitBreaker()
 
 
-async def circuit_breaker_middleware(
-    request: Request, call_next: Callable[[Request], Awaitable[JSONResponse]]
-) -> JSONResponse:
-    """
-    Middleware for circuit breaker.
+class CircuitBreakerMiddleware:
+    """Pure ASGI middleware rejecting requests for services with an open circuit"""
 
-    Args:
-        request (Request): FastAPI request
-        call_next (Callable): Next middleware or route handler
+    def __init__(self, app: ASGIApp, exclude_paths: Iterable[str] = ()) -> None:
+        """
+        Initialize CircuitBreakerMiddleware.
 
-    Returns:
-        JSONResponse: Response
-    """
-    # Extract service name from path
-    path_parts = request.url.path.strip("/").split("/")
-    service_name = path_parts[0] if path_parts else "unknown"
-
-    # Check if circuit is open
-    if circuit_breaker.is_circuit_open(service_name):
-        return JSONResponse(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content={"detail": f"Service {service_name} is unavailable"},
-        )
+        Args:
+            app (ASGIApp): Next ASGI app
+            exclude_paths (Iterable[str], optional): Paths answered by the gateway
+                itself, which never reach a service
+        """
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
 
-    try:
-        # Continue with request
-        response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Check the circuit of the target service and forward the request.
 
-        # Record success
-        circuit_breaker.record_success(service_name)
+        The resolved service is stored in the request state so the gateway
+        route does not have to look it up again. Outcomes are recorded by
+        CircuitBreaker.call_service, where the upstream call is made.
 
-        return response
-    except Exception as e:
-        # Record failure
-        circuit_breaker.record_failure(service_name)
+        Args:
+            scope (Scope): ASGI scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
+        """
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        # Resolve the target service the same way the gateway route does
+        try:
+            service = service_registry.get_service_for_path(
+                scope["path"], scope["method"]
+            )
+        except ValueError:
+            await self.app(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["service"] = service
+
+        # Check if circuit is open
+        if circuit_breaker.is_circuit_open(service["name"], service["route"]):
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": f"Service {service['name']} is unavailable"},
+            )
+            await response(scope, receive, send)
+            return
 
-        # Re-raise exception
-        raise e
+        await self.app(scope, receive, send)
@@ -0,0 +1,276 @@
+import logging
+import os
+from typing import Any, Dict, Iterable, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Connection pool configuration
+GATEWAY_MAX_CONNECTIONS = int(os.getenv("GATEWAY_MAX_CONNECTIONS", "100"))
+GATEWAY_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("GATEWAY_MAX_KEEPALIVE_CONNECTIONS", "20")
+)
+GATEWAY_KEEPALIVE_EXPIRY = float(os.getenv("GATEWAY_KEEPALIVE_EXPIRY", "30.0"))
+GATEWAY_HTTP2 = os.getenv("GATEWAY_HTTP2", "false").lower() == "true"
+GATEWAY_TIMEOUT = float(os.getenv("GATEWAY_TIMEOUT", "10.0"))
+GATEWAY_CONNECT_TIMEOUT = float(os.getenv("GATEWAY_CONNECT_TIMEOUT", "5.0"))
+
+logger = logging.getLogger(__name__)
+
+
+def _env_key(service_name: str) -> str:
+    """
+    Build the environment variable suffix for a service.
+
+    Args:
+        service_name (str): Service name (e.g. "external-tools")
+
+    Returns:
+        str: Upper-case suffix (e.g. "EXTERNAL_TOOLS")
+    """
+    return service_name.upper().replace("-", "_")
+
+
+def _http2_available() -> bool:
+    """
+    Check if the optional HTTP/2 dependency (h2) is installed.
+
+    Returns:
+        bool: True if HTTP/2 can be enabled, False otherwise
+    """
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+
+    return True
+
+
+class HTTPClientPool:
+    """Pool of long-lived keep-alive HTTP clients, one per backend service"""
+
+    def __init__(
+        self,
+        max_connections: int = GATEWAY_MAX_CONNECTIONS,
+        max_keepalive_connections: int = GATEWAY_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = GATEWAY_KEEPALIVE_EXPIRY,
+        http2: bool = GATEWAY_HTTP2,
+        timeout: float = GATEWAY_TIMEOUT,
+        connect_timeout: float = GATEWAY_CONNECT_TIMEOUT,
+    ):
+        """
+        Initialize HTTPClientPool.
+
+        Every setting can be overridden per service through an environment
+        variable suffixed with the service name, e.g. GATEWAY_TIMEOUT_PROJECTS
+        or GATEWAY_HTTP2_EXTERNAL_TOOLS.
+
+        Args:
+            max_connections (int, optional): Maximum connections per service.
+            max_keepalive_connections (int, optional): Maximum idle keep-alive connections per service.
+            keepalive_expiry (float, optional): Seconds an idle connection is kept open.
+            http2 (bool, optional): Whether to negotiate HTTP/2 with the services.
+            timeout (float, optional): Request timeout in seconds.
+            connect_timeout (float, optional): Connect timeout in seconds.
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+        self.configs: Dict[str, Dict[str, Any]] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.requests_total: Dict[str, int] = {}
+
+    def get_service_config(self, service_name: str) -> Dict[str, Any]:
+        """
+        Get pool configuration for a service.
+
+        Args:
+            service_name (str): Service name
+
+        Returns:
+            Dict[str, Any]: Pool limits, HTTP/2 toggle and timeouts
+        """
+        suffix = _env_key(service_name)
+        http2 = os.getenv(f"GATEWAY_HTTP2_{suffix}")
+
+        config = {
+            "max_connections": int(
+                os.getenv(f"GATEWAY_MAX_CONNECTIONS_{suffix}", self.max_connections)
+            ),
+            "max_keepalive_connections": int(
+                os.getenv(
+                    f"GATEWAY_MAX_KEEPALIVE_CONNECTIONS_{suffix}",
+                    self.max_keepalive_connections,
+                )
+            ),
+            "keepalive_expiry": float(
+                os.getenv(f"GATEWAY_KEEPALIVE_EXPIRY_{suffix}", self.keepalive_expiry)
+            ),
+            "http2": self.http2 if http2 is None else http2.lower() == "true",
+            "timeout": float(os.getenv(f"GATEWAY_TIMEOUT_{suffix}", self.timeout)),
+            "connect_timeout": float(
+                os.getenv(f"GATEWAY_CONNECT_TIMEOUT_{suffix}", self.connect_timeout)
+            ),
+        }
+
+        if config["http2"] and not _http2_available():
+            logger.warning(
+                "HTTP/2 requested for service %s but the 'h2' package is not "
+                "installed, falling back to HTTP/1.1",
+                service_name,
+            )
+            config["http2"] = False
+
+        return config
+
+    def _create_client(self, service_name: str) -> httpx.AsyncClient:
+        """
+        Create a pooled client for a service.
+
+        Args:
+            service_name (str): Service name
+
+        Returns:
+            httpx.AsyncClient: Client
+        """
+        config = self.get_service_config(service_name)
+        self.configs[service_name] = config
+
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive_connections"],
+                keepalive_expiry=config["keepalive_expiry"],
+            ),
+            timeout=httpx.Timeout(
+                config["timeout"], connect=config["connect_timeout"]
+            ),
+            http2=config["http2"],
+        )
+
+    async def startup(self, service_names: Iterable[str]) -> None:
+        """
+        Create clients for the given services.
+
+        Args:
+            service_names (Iterable[str]): Service names
+        """
+        for service_name in service_names:
+            self.get_client(service_name)
+
+    async def shutdown(self) -> None:
+        """Close all clients and their connections"""
+        clients = list(self.clients.values())
+        self.clients = {}
+
+        for client in clients:
+            await client.aclose()
+
+    def get_client(self, service_name: str) -> httpx.AsyncClient:
+        """
+        Get the client for a service, creating it if needed.
+
+        Args:
+            service_name (str): Service name
+
+        Returns:
+            httpx.AsyncClient: Client
+        """
+        client = self.clients.get(service_name)
+
+        if client is None or client.is_closed:
+            client = self._create_client(service_name)
+            self.clients[service_name] = client
+
+        return client
+
+    async def request(
+        self,
+        service_name: str,
+        method: str,
+        url: str,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request through the service's pooled client.
+
+        Args:
+            service_name (str): Service name
+            method (str): HTTP method
+            url (str): Request URL
+            stream (bool, optional): Return as soon as the response headers are
+                received, leaving the body unread. The caller must close the
+                response. Defaults to False.
+            **kwargs: Additional arguments for httpx
+
+        Returns:
+            httpx.Response: Response
+        """
+        client = self.get_client(service_name)
+
+        self.in_flight[service_name] = self.in_flight.get(service_name, 0) + 1
+        self.requests_total[service_name] = self.requests_total.get(service_name, 0) + 1
+        try:
+            if stream:
+                return await client.send(
+                    client.build_request(method, url, **kwargs), stream=True
+                )
+
+            return await client.request(method, url, **kwargs)
+        finally:
+            self.in_flight[service_name] -= 1
+
+    def get_stats(self, service_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get pool utilisation for a service.
+
+        Args:
+            service_name (str): Service name
+
+        Returns:
+            Optional[Dict[str, Any]]: Pool statistics, None if no client exists
+        """
+        client = self.clients.get(service_name)
+
+        if client is None:
+            return None
+
+        config = self.configs[service_name]
+        connections = getattr(
+            getattr(client._transport, "_pool", None), "connections", []
+        )
+        idle = sum(1 for connection in connections if connection.is_idle())
+
+        return {
+            "max_connections": config["max_connections"],
+            "max_keepalive_connections": config["max_keepalive_connections"],
+            "http2": config["http2"],
+            "timeout": config["timeout"],
+            "connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+            "in_flight": self.in_flight.get(service_name, 0),
+            "requests_total": self.requests_total.get(service_name, 0),
+            "utilisation": round(
+                (len(connections) - idle) / config["max_connections"], 4
+            )
+            if config["max_connections"]
+            else 0.0,
+        }
+
+    def get_all_stats(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get pool utilisation for all services.
+
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: Service name -> pool statistics
+        """
+        return {name: self.get_stats(name) for name in self.clients}
@@ -0,0 +1,243 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+GATEWAY_RESPONSE_CACHE_ENABLED = (
+    os.getenv("GATEWAY_RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+)
+GATEWAY_RESPONSE_CACHE_SIZE = int(os.getenv("GATEWAY_RESPONSE_CACHE_SIZE", "1000"))
+GATEWAY_RESPONSE_CACHE_MAX_BODY = int(
+    os.getenv("GATEWAY_RESPONSE_CACHE_MAX_BODY", str(256 * 1024))
+)
+
+# (user ID, path, query string)
+CacheKey = Tuple[str, str, str]
+
+
+class CachedResponse:
+    """Buffered service response kept by the gateway"""
+
+    __slots__ = ("body", "status_code", "headers", "etag", "expires_at")
+
+    def __init__(
+        self,
+        body: bytes,
+        status_code: int,
+        headers: Dict[str, str],
+        etag: str,
+        expires_at: float,
+    ) -> None:
+        """
+        Initialize CachedResponse.
+
+        Args:
+            body (bytes): Response body
+            status_code (int): Status code
+            headers (Dict[str, str]): Response headers, ETag included
+            etag (str): Strong ETag of the body
+            expires_at (float): Monotonic time at which the entry expires
+        """
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Build a strong ETag from a response body.
+
+    Args:
+        body (bytes): Response body
+
+    Returns:
+        str: Quoted ETag
+    """
+    return f'"{hashlib.sha256(body).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Args:
+        if_none_match (str, optional): If-None-Match request header
+        etag (str): Current ETag
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+
+    return False
+
+
+class ResponseCache:
+    """Bounded LRU/TTL cache of GET responses, keyed by user, path and query"""
+
+    def __init__(
+        self,
+        enabled: bool = GATEWAY_RESPONSE_CACHE_ENABLED,
+        max_size: int = GATEWAY_RESPONSE_CACHE_SIZE,
+        max_body_size: int = GATEWAY_RESPONSE_CACHE_MAX_BODY,
+    ):
+        """
+        Initialize ResponseCache.
+
+        Args:
+            enabled (bool, optional): Whether responses are cached at all.
+            max_size (int, optional): Maximum number of cached responses.
+            max_body_size (int, optional): Largest body in bytes worth caching.
+        """
+        self.enabled = enabled
+        self.max_size = max_size
+        self.max_body_size = max_body_size
+        self.entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(user_id: str, path: str, query: str) -> CacheKey:
+        """
+        Build a cache key.
+
+        Args:
+            user_id (str): User ID
+            path (str): Request path
+            query (str): Raw query string
+
+        Returns:
+            CacheKey: Cache key
+        """
+        return (user_id, path, query)
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """
+        Get a fresh cached response.
+
+        Args:
+            key (CacheKey): Cache key
+
+        Returns:
+            Optional[CachedResponse]: Cached response, None if missing or expired
+        """
+        entry = self.entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            del self.entries[key]
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(
+        self,
+        key: CacheKey,
+        body: bytes,
+        status_code: int,
+        headers: Dict[str, str],
+        ttl: float,
+    ) -> Optional[CachedResponse]:
+        """
+        Cache a response.
+
+        Args:
+            key (CacheKey): Cache key
+            body (bytes): Response body
+            status_code (int): Status code
+            headers (Dict[str, str]): Response headers
+            ttl (float): Seconds the response stays fresh
+
+        Returns:
+            Optional[CachedResponse]: Cached response, None if it was too large
+        """
+        if self.max_size <= 0 or ttl <= 0 or len(body) > self.max_body_size:
+            return None
+
+        etag = make_etag(body)
+        entry = CachedResponse(
+            body=body,
+            status_code=status_code,
+            headers={**headers, "etag": etag},
+            etag=etag,
+            expires_at=time.monotonic() + ttl,
+        )
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+        return entry
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Remove the cached responses of every user under a path prefix.
+
+        Args:
+            prefix (str): Path prefix (e.g. "/projects")
+
+        Returns:
+            int: Number of removed responses
+        """
+        prefix = prefix.rstrip("/")
+        stale = [
+            key
+            for key in self.entries
+            if key[1] == prefix or key[1].startswith(f"{prefix}/")
+        ]
+
+        for key in stale:
+            del self.entries[key]
+
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove all responses from the cache"""
+        self.entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: Size, hit and miss counters
+        """
+        lookups = self.hits + self.misses
+
+        return {
+            "enabled": self.enabled,
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -1,5 +1,5 @@
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 import requests
@@ -18,6 +18,24 @@ EXTERNAL_TOOLS_SERVICE_URL = os.getenv(
     "EXTERNAL_TOOLS_SERVICE_URL", "http://localhost:8005"
 )
 
+# Largest task import body (bytes); the service reads it in constant memory
+TASK_IMPORT_MAX_BODY_SIZE = int(
+    os.getenv("GATEWAY_TASK_IMPORT_MAX_BODY_SIZE", str(100 * 1024 * 1024))
+)
+
+
+class RouteNode:
+    """Node of the compiled route trie, one per path segment"""
+
+    __slots__ = ("children", "param_child", "handlers")
+
+    def __init__(self) -> None:
+        """Initialize RouteNode"""
+        self.children: Dict[str, "RouteNode"] = {}
+        self.param_child: Optional["RouteNode"] = None
+        # HTTP method -> (service name, route definition, parameter names)
+        self.handlers: Dict[str, Tuple[str, Dict[str, Any], List[str]]] = {}
+
 
 class ServiceRegistry:
     """Registry for microservices"""
@@ -40,10 +58,12 @@ class ServiceRegistry:
             "projects": {
                 "url": PROJECT_SERVICE_URL,
                 "routes": [
-                    {"path": "/projects", "methods": ["GET", "POST"]},
+                    {"path": "/projects", "methods": ["GET", "POST"], "cache_ttl": 10},
                     {
                         "path": "/projects/{project_id}",
                         "methods": ["GET", "PUT", "DELETE"],
+                        "cache_ttl": 10,
+                        "coalesce": True,
                     },
                     {
                         "path": "/projects/{project_id}/members",
@@ -56,6 +76,20 @@ class ServiceRegistry:
                     {
                         "path": "/projects/{project_id}/tasks",
                         "methods": ["GET", "POST"],
+                        "cache_ttl": 10,
+                    },
+                    {
+                        "path": "/projects/{project_id}/tasks/bulk",
+                        "methods": ["POST"],
+                    },
+                    {
+                        "path": "/projects/{project_id}/tasks/export",
+                        "methods": ["GET"],
+                    },
+                    {
+                        "path": "/projects/{project_id}/tasks/import",
+                        "methods": ["POST"],
+                        "max_body_size": TASK_IMPORT_MAX_BODY_SIZE,
                     },
                     {
                         "path": "/projects/{project_id}/tasks/{task_id}",
@@ -65,7 +99,11 @@ class ServiceRegistry:
                         "path": "/projects/{project_id}/tasks/{task_id}/comments",
                         "methods": ["GET", "POST"],
                     },
-                    {"path": "/projects/{project_id}/activities", "methods": ["GET"]},
+                    {
+                        "path": "/projects/{project_id}/activities",
+                        "methods": ["GET"],
+                        "coalesce": True,
+                    },
                     {
                         "path": "/projects/{project_id}/tasks/{task_id}/assign",
                         "methods": ["POST"],
@@ -119,7 +157,16 @@ class ServiceRegistry:
                 "routes": [
                     {"path": "/notifications", "methods": ["GET", "POST"]},
                     {"path": "/notifications/batch", "methods": ["POST"]},
-                    {"path": "/notifications/unread", "methods": ["GET"]},
+                    {
+                        "path": "/notifications/unread",
+                        "methods": ["GET"],
+                        "cache_ttl": 5,
+                    },
+                    {
+                        "path": "/notifications/unread/count",
+                        "methods": ["GET"],
+                        "cache_ttl": 5,
+                    },
                     {
                         "path": "/notifications/{notification_id}/read",
                         "methods": ["PUT"],
@@ -157,6 +204,42 @@ class ServiceRegistry:
                 ],
             },
         }
+        self.compile_routes()
+
+    def compile_routes(self) -> None:
+        """
+        Compile the route templates of all services into a segment trie.
+
+        A route's optional "cache_ttl" (seconds) lets the gateway cache its GET
+        responses, "coalesce" lets concurrent identical GETs share one
+        upstream call, and "max_body_size" (bytes) raises the request body
+        limit of uploads.
+
+        Literal segments are stored as dictionary children and parameters such
+        as {project_id} as a single wildcard child, so a lookup costs one step
+        per path segment regardless of how many routes are registered. Must be
+        called again after the services are modified.
+        """
+        root = RouteNode()
+
+        for name, service in self.services.items():
+            for route in service["routes"]:
+                node = root
+                param_names: List[str] = []
+                for segment in self._split_path(route["path"]):
+                    if segment.startswith("{") and segment.endswith("}"):
+                        if node.param_child is None:
+                            node.param_child = RouteNode()
+                        node = node.param_child
+                        param_names.append(segment[1:-1])
+                    else:
+                        node = node.children.setdefault(segment, RouteNode())
+
+                # The first service registering a route keeps it
+                for method in route["methods"]:
+                    node.handlers.setdefault(method, (name, route, param_names))
+
+        self._route_trie = root
 
     def get_service_url(self, service_name: str) -> str:
         """
@@ -187,60 +270,109 @@ class ServiceRegistry:
             method (str): HTTP method
 
         Returns:
-            Dict[str, Any]: Service information
+            Dict[str, Any]: Service name and URL, the matched route template, the
+            extracted path parameters, and the route's cache TTL, coalesce flag
+            and request body limit
 
         Raises:
             ValueError: If service not found for path and method
         """
         # Extract service name from path
-        path_parts = path.strip("/").split("/")
+        path_parts = self._split_path(path)
         service_name = path_parts[0] if path_parts else ""
 
         # Special case for auth service
         if service_name == "auth":
-            return {"name": "auth", "url": self.get_service_url("auth")}
+            return {
+                "name": "auth",
+                "url": self.get_service_url("auth"),
+                "route": None,
+                "path_params": {},
+                "cache_ttl": None,
+                "coalesce": False,
+                "max_body_size": None,
+            }
 
-        # Check all services for matching route
-        for name, service in self.services.items():
-            for route in service["routes"]:
-                if (
-                    self._match_route(path, route["path"])
-                    and method in route["methods"]
-                ):
-                    return {"name": name, "url": service["url"]}
+        # Walk the compiled route trie
+        match = self._match_segments(self._route_trie, path_parts, 0, method, [])
+        if match:
+            (name, route, param_names), param_values = match
+            return {
+                "name": name,
+                "url": self.services[name]["url"],
+                "route": route["path"],
+                "path_params": dict(zip(param_names, param_values)),
+                "cache_ttl": route.get("cache_ttl"),
+                "coalesce": route.get("coalesce", False),
+                "max_body_size": route.get("max_body_size"),
+            }
 
         raise ValueError(f"No service found for path {path} and method {method}")
 
-    def _match_route(self, path: str, route_path: str) -> bool:
+    def _match_segments(
+        self,
+        node: RouteNode,
+        segments: List[str],
+        index: int,
+        method: str,
+        param_values: List[str],
+    ) -> Optional[Tuple[Tuple[str, Dict[str, Any], List[str]], List[str]]]:
         """
-        Check if a path matches a route path.
+        Match path segments against the route trie.
+
+        Literal segments take precedence over parameters; the parameter branch
+        is only tried when the literal branch has no route for the method.
 
         Args:
-            path (str): Request path
-            route_path (str): Route path
+            node (RouteNode): Current trie node
+            segments (List[str]): Path segments
+            index (int): Index of the segment to match
+            method (str): HTTP method
+            param_values (List[str]): Parameter values extracted so far
 
         Returns:
-            bool: True if path matches route path, False otherwise
+            Optional[Tuple[Tuple[str, Dict[str, Any], List[str]], List[str]]]: Matched
+            handler and parameter values, None if no route matches
         """
-        # Split paths into parts
-        path_parts = path.strip("/").split("/")
-        route_parts = route_path.strip("/").split("/")
+        if index == len(segments):
+            handler = node.handlers.get(method)
+            return (handler, param_values) if handler else None
 
-        # Check if number of parts match
-        if len(path_parts) != len(route_parts):
-            return False
+        segment = segments[index]
+
+        child = node.children.get(segment)
+        if child is not None:
+            match = self._match_segments(
+                child, segments, index + 1, method, param_values
+            )
+            if match:
+                return match
 
-        # Check if parts match
-        for i, route_part in enumerate(route_parts):
-            # If route part is a parameter (e.g., {project_id}), it matches any value
-            if route_part.startswith("{") and route_part.endswith("}"):
-                continue
+        if node.param_child is not None:
+            match = self._match_segments(
+                node.param_child,
+                segments,
+                index + 1,
+                method,
+                param_values + [segment],
+            )
+            if match:
+                return match
 
-            # Otherwise, parts must match exactly
-            if route_part != path_parts[i]:
-                return False
+        return None
 
-        return True
+    @staticmethod
+    def _split_path(path: str) -> List[str]:
+        """
+        Split a path into segments.
+
+        Args:
+            path (str): Path
+
+        Returns:
+            List[str]: Path segments
+        """
+        return path.strip("/").split("/")
 
     def get_all_services(self) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,116 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+GATEWAY_SINGLE_FLIGHT_ENABLED = (
+    os.getenv("GATEWAY_SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+)
+GATEWAY_SINGLE_FLIGHT_MAX_WAITERS = int(
+    os.getenv("GATEWAY_SINGLE_FLIGHT_MAX_WAITERS", "100")
+)
+
+T = TypeVar("T")
+
+
+class Flight:
+    """One in-flight call and the number of callers sharing it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[Any]") -> None:
+        """
+        Initialize Flight.
+
+        Args:
+            task (asyncio.Future[Any]): Task running the call
+        """
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one in-flight call"""
+
+    def __init__(
+        self,
+        enabled: bool = GATEWAY_SINGLE_FLIGHT_ENABLED,
+        max_waiters: int = GATEWAY_SINGLE_FLIGHT_MAX_WAITERS,
+    ):
+        """
+        Initialize SingleFlight.
+
+        Args:
+            enabled (bool, optional): Whether calls are coalesced at all.
+            max_waiters (int, optional): Callers that may join one call; further
+                callers make their own call.
+        """
+        self.enabled = enabled
+        self.max_waiters = max_waiters
+        self.flights: Dict[Hashable, Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.overflows = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn, or join the call already in flight for the same key.
+
+        The call runs in its own task, so a caller that is cancelled (e.g. a
+        client disconnecting) does not cancel it for the others.
+
+        Args:
+            key (Hashable): Call key
+            fn (Callable[[], Awaitable[T]]): Call to make
+
+        Returns:
+            T: Result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        flight = self.flights.get(key)
+
+        if flight is not None:
+            if flight.waiters >= self.max_waiters:
+                self.overflows += 1
+                return await fn()
+
+            flight.waiters += 1
+            self.coalesced += 1
+            return await asyncio.shield(flight.task)
+
+        task = asyncio.ensure_future(fn())
+        flight = Flight(task)
+        self.flights[key] = flight
+        self.leaders += 1
+
+        def _done(task: "asyncio.Future[Any]") -> None:
+            if self.flights.get(key) is flight:
+                del self.flights[key]
+            # Mark the exception retrieved in case every caller was cancelled
+            if not task.cancelled():
+                task.exception()
+
+        task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dict[str, Any]: In-flight calls and leader, coalesced and overflow counters
+        """
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self.flights),
+            "max_waiters": self.max_waiters,
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "overflows": self.overflows,
+        }
@@ -0,0 +1,200 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+GATEWAY_TOKEN_CACHE_SIZE = int(os.getenv("GATEWAY_TOKEN_CACHE_SIZE", "10000"))
+GATEWAY_TOKEN_CACHE_TTL = float(os.getenv("GATEWAY_TOKEN_CACHE_TTL", "300"))
+# Seconds a logged-out token without an exp claim stays denied
+GATEWAY_TOKEN_DENYLIST_TTL = float(os.getenv("GATEWAY_TOKEN_DENYLIST_TTL", "86400"))
+
+
+class TokenCache:
+    """Bounded LRU/TTL cache of verified JWTs"""
+
+    def __init__(
+        self,
+        max_size: int = GATEWAY_TOKEN_CACHE_SIZE,
+        ttl: float = GATEWAY_TOKEN_CACHE_TTL,
+    ):
+        """
+        Initialize TokenCache.
+
+        Args:
+            max_size (int, optional): Maximum number of cached tokens.
+            ttl (float, optional): Seconds a verified token is trusted before it
+                is verified again, capped by the token's own expiry.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        # Token hash -> (user ID, token exp, entry expiry)
+        self.entries: "OrderedDict[str, Tuple[str, Optional[float], float]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        """
+        Hash a token so raw credentials are never kept in memory.
+
+        Args:
+            token (str): JWT
+
+        Returns:
+            str: Cache key
+        """
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[str]:
+        """
+        Get the verified user ID for a token.
+
+        Args:
+            token (str): JWT
+
+        Returns:
+            Optional[str]: User ID (sub), None if the token is not cached or expired
+        """
+        key = self._key(token)
+        entry = self.entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        user_id, _, expires_at = entry
+        if expires_at <= time.time():
+            del self.entries[key]
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return user_id
+
+    def set(self, token: str, user_id: str, exp: Optional[float] = None) -> None:
+        """
+        Cache a verified token.
+
+        Args:
+            token (str): JWT
+            user_id (str): Verified user ID (sub)
+            exp (float, optional): Token expiry as a UNIX timestamp
+        """
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+
+        key = self._key(token)
+        self.entries[key] = (user_id, exp, expires_at)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, token: str) -> None:
+        """
+        Remove a token from the cache.
+
+        Args:
+            token (str): JWT
+        """
+        if self.entries.pop(self._key(token), None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Remove all tokens from the cache"""
+        self.entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: Size, hit and miss counters
+        """
+        lookups = self.hits + self.misses
+
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class TokenDenylist:
+    """Hashes of logged-out JWTs, denied until the tokens expire"""
+
+    def __init__(self, default_ttl: float = GATEWAY_TOKEN_DENYLIST_TTL):
+        """
+        Initialize TokenDenylist.
+
+        Args:
+            default_ttl (float, optional): Seconds a token without an expiry
+                is denied.
+        """
+        self.default_ttl = default_ttl
+        # Token hash -> denied until
+        self.entries: Dict[str, float] = {}
+
+    def add(self, token: str, exp: Optional[float] = None) -> None:
+        """
+        Deny a token until it expires.
+
+        Args:
+            token (str): JWT
+            exp (float, optional): Token expiry as a UNIX timestamp
+        """
+        now = time.time()
+        # Tokens that expired meanwhile are rejected anyway
+        for key in [key for key, until in self.entries.items() if until <= now]:
+            del self.entries[key]
+
+        self.entries[TokenCache._key(token)] = (
+            exp if exp is not None else now + self.default_ttl
+        )
+
+    def is_denied(self, token: str) -> bool:
+        """
+        Check whether a token was logged out.
+
+        Args:
+            token (str): JWT
+
+        Returns:
+            bool: True if the token is denied and not yet expired
+        """
+        key = TokenCache._key(token)
+        until = self.entries.get(key)
+
+        if until is None:
+            return False
+
+        if until <= time.time():
+            del self.entries[key]
+            return False
+
+        return True
+
+    def clear(self) -> None:
+        """Remove all tokens from the denylist"""
+        self.entries.clear()
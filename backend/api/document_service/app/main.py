@@ -15,7 +15,7 @@ from fastapi import (
 )
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.document_service.app.schemas.document import (
     DocumentCreateDTO,
@@ -27,9 +27,14 @@ from api.document_service.app.schemas.document import (
     DocumentUploadResponseDTO,
     DocumentVersionDTO,
 )
-from api.document_service.app.services.document_service import DocumentService
+from api.document_service.app.services.document_service import AsyncDocumentService
 from api.shared.exceptions.auth_exceptions import InvalidTokenException
-from api.shared.utils.db import get_db
+from api.shared.utils.db import (
+    get_async_db,
+    get_async_pool_stats,
+    get_db,
+    get_pool_stats,
+)
 from api.shared.utils.jwt import decode_token
 from api.shared.middleware.auth_middleware import auth_middleware
 from api.external_tools_service.app.services.document_tools import process_document_with_libreoffice
@@ -67,7 +72,7 @@ async def get_current_user(x_user_id: Optional[str] = Header(None, alias="X-User
 @app.post("/documents", response_model=DocumentResponseDTO, tags=["Documents"])
 async def create_document(
     document_data: DocumentCreateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -75,14 +80,14 @@ async def create_document(
 
     Args:
         document_data (DocumentCreateDTO): Document data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentResponseDTO: Created document
     """
-    document_service = DocumentService(db)
-    return document_service.create_document(document_data, user_id)
+    document_service = AsyncDocumentService(db)
+    return await document_service.create_document(document_data, user_id)
 
 
 @app.get(
@@ -90,7 +95,7 @@ async def create_document(
 )
 async def get_document(
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -98,14 +103,14 @@ async def get_document(
 
     Args:
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentResponseDTO: Document
     """
-    document_service = DocumentService(db)
-    return document_service.get_document(document_id, user_id)
+    document_service = AsyncDocumentService(db)
+    return await document_service.get_document(document_id, user_id)
 
 
 @app.put(
@@ -114,7 +119,7 @@ async def get_document(
 async def update_document(
     document_data: DocumentUpdateDTO,
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -123,20 +128,20 @@ async def update_document(
     Args:
         document_data (DocumentUpdateDTO): Document data
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentResponseDTO: Updated document
     """
-    document_service = DocumentService(db)
-    return document_service.update_document(document_id, document_data, user_id)
+    document_service = AsyncDocumentService(db)
+    return await document_service.update_document(document_id, document_data, user_id)
 
 
 @app.delete("/documents/{document_id}", tags=["Documents"])
 async def delete_document(
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -144,14 +149,14 @@ async def delete_document(
 
     Args:
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Delete response
     """
-    document_service = DocumentService(db)
-    return document_service.delete_document(document_id, user_id)
+    document_service = AsyncDocumentService(db)
+    return await document_service.delete_document(document_id, user_id)
 
 
 @app.get(
@@ -162,7 +167,7 @@ async def delete_document(
 async def get_project_documents(
     project_id: str = Path(..., description="Project ID"),
     parent_id: Optional[str] = Query(None, description="Parent document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -171,14 +176,14 @@ async def get_project_documents(
     Args:
         project_id (str): Project ID
         parent_id (Optional[str], optional): Parent document ID. Defaults to None.
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[DocumentResponseDTO]: List of documents
     """
-    document_service = DocumentService(db)
-    return document_service.get_project_documents(project_id, user_id, parent_id)
+    document_service = AsyncDocumentService(db)
+    return await document_service.get_project_documents(project_id, user_id, parent_id)
 
 
 @app.post(
@@ -186,7 +191,7 @@ async def get_project_documents(
 )
 async def upload_document(
     document_data: DocumentCreateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -194,14 +199,14 @@ async def upload_document(
 
     Args:
         document_data (DocumentCreateDTO): Document data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentUploadResponseDTO: Upload response
     """
-    document_service = DocumentService(db)
-    return document_service.upload_document(document_data, user_id)
+    document_service = AsyncDocumentService(db)
+    return await document_service.upload_document(document_data, user_id)
 
 
 # Document version endpoints
@@ -214,7 +219,7 @@ async def create_document_version(
     content_type: str = Form(..., description="Content type"),
     changes: str = Form(..., description="Changes description"),
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -224,14 +229,14 @@ async def create_document_version(
         content_type (str): Content type
         changes (str): Changes description
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentVersionDTO: Created document version
     """
-    document_service = DocumentService(db)
-    return document_service.create_document_version(
+    document_service = AsyncDocumentService(db)
+    return await document_service.create_document_version(
         document_id, content_type, changes, user_id
     )
 
@@ -243,7 +248,7 @@ async def create_document_version(
 )
 async def get_document_versions(
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -251,14 +256,14 @@ async def get_document_versions(
 
     Args:
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[DocumentVersionDTO]: List of document versions
     """
-    document_service = DocumentService(db)
-    return document_service.get_document_versions(document_id, user_id)
+    document_service = AsyncDocumentService(db)
+    return await document_service.get_document_versions(document_id, user_id)
 
 
 @app.get(
@@ -269,7 +274,7 @@ async def get_document_versions(
 async def get_document_version(
     document_id: str = Path(..., description="Document ID"),
     version: int = Path(..., description="Version number"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -278,14 +283,14 @@ async def get_document_version(
     Args:
         document_id (str): Document ID
         version (int): Version number
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentVersionDTO: Document version
     """
-    document_service = DocumentService(db)
-    return document_service.get_document_version(document_id, version, user_id)
+    document_service = AsyncDocumentService(db)
+    return await document_service.get_document_version(document_id, version, user_id)
 
 
 # Document permission endpoints
@@ -297,7 +302,7 @@ async def get_document_version(
 async def add_document_permission(
     permission_data: DocumentPermissionCreateDTO,
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -306,14 +311,14 @@ async def add_document_permission(
     Args:
         permission_data (DocumentPermissionCreateDTO): Permission data
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentPermissionDTO: Added document permission
     """
-    document_service = DocumentService(db)
-    return document_service.add_document_permission(
+    document_service = AsyncDocumentService(db)
+    return await document_service.add_document_permission(
         document_id, permission_data, user_id
     )
 
@@ -327,7 +332,7 @@ async def update_document_permission(
     permission_data: DocumentPermissionUpdateDTO,
     document_id: str = Path(..., description="Document ID"),
     permission_id: str = Path(..., description="Permission ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -337,14 +342,14 @@ async def update_document_permission(
         permission_data (DocumentPermissionUpdateDTO): Permission data
         document_id (str): Document ID
         permission_id (str): Permission ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentPermissionDTO: Updated document permission
     """
-    document_service = DocumentService(db)
-    return document_service.update_document_permission(
+    document_service = AsyncDocumentService(db)
+    return await document_service.update_document_permission(
         document_id, permission_id, permission_data, user_id
     )
 
@@ -356,7 +361,7 @@ async def update_document_permission(
 async def delete_document_permission(
     document_id: str = Path(..., description="Document ID"),
     permission_id: str = Path(..., description="Permission ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -365,14 +370,14 @@ async def delete_document_permission(
     Args:
         document_id (str): Document ID
         permission_id (str): Permission ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Delete response
     """
-    document_service = DocumentService(db)
-    return document_service.delete_document_permission(
+    document_service = AsyncDocumentService(db)
+    return await document_service.delete_document_permission(
         document_id, permission_id, user_id
     )
 
@@ -384,7 +389,7 @@ async def delete_document_permission(
 )
 async def get_document_permissions(
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -392,14 +397,14 @@ async def get_document_permissions(
 
     Args:
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[DocumentPermissionDTO]: List of document permissions
     """
-    document_service = DocumentService(db)
-    return document_service.get_document_permissions(document_id, user_id)
+    document_service = AsyncDocumentService(db)
+    return await document_service.get_document_permissions(document_id, user_id)
 
 
 @app.post("/documents/convert", tags=["Documents"])
@@ -434,6 +439,18 @@ async def health_check() -> Any:
     """
     return {"status": "healthy"}
 
+
+@app.get("/metrics", tags=["Health"])
+async def get_metrics() -> Any:
+    """
+    Get service metrics.
+
+    Returns:
+        Dict[str, Any]: Database pool utilisation and checkout wait times, for
+        the sync and async engines
+    """
+    return {"db_pool": get_pool_stats(), "async_db_pool": get_async_pool_stats()}
+
 # Export para tests de integración
 get_db = get_db
 get_current_user = get_current_user
@@ -29,6 +29,7 @@ from api.shared.exceptions.project_exceptions import (
 )
 from api.shared.models.document import Document, DocumentPermission, DocumentVersion
 from api.shared.models.project import Project, ProjectMember
+from api.shared.utils.async_service import AsyncService
 from api.shared.utils.supabase import SupabaseManager
 
 
@@ -1023,3 +1024,14 @@ class DocumentService:
             created_at=document_permission.created_at,
             updated_at=document_permission.updated_at,
         )
+
+
+class AsyncDocumentService(AsyncService):
+    """
+    Async variant of DocumentService.
+
+    The Supabase storage calls of delete_document, upload_document and
+    create_document_version still run on the event loop (see AsyncService).
+    """
+
+    service_class = DocumentService
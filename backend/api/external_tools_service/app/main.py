@@ -17,7 +17,7 @@ from api.external_tools_service.app.services.external_tools_service import (
     ExternalToolsService,
 )
 from api.shared.exceptions.auth_exceptions import InvalidTokenException
-from api.shared.utils.db import get_db
+from api.shared.utils.db import get_db, get_pool_stats
 from api.shared.utils.jwt import decode_token
 from api.shared.middleware.auth_middleware import auth_middleware
 from api.external_tools_service.app.services.analytics_tools import get_metabase_card_data
@@ -288,6 +288,17 @@ async def health_check() -> Any:
     return {"status": "healthy"}
 
 
+@app.get("/metrics", tags=["Health"])
+async def get_metrics() -> Any:
+    """
+    Get service metrics.
+
+    Returns:
+        Dict[str, Any]: Database pool utilisation and checkout wait times
+    """
+    return {"db_pool": get_pool_stats()}
+
+
 @app.get("/analytics/card/{card_id}", tags=["Analytics"])
 async def analytics_card(card_id: int, session_token: str, metabase_url: str, supabase_bucket: str = None, supabase_path: str = None):
     """
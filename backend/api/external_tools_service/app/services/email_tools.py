@@ -1,4 +1,6 @@
 import os
+from typing import Any, Dict, List
+
 import sib_api_v3_sdk
 from sib_api_v3_sdk.rest import ApiException
 
@@ -25,4 +27,42 @@ def send_email_brevo(to: str, subject: str, body: str) -> bool:
         return True
     except ApiException as e:
         print(f"Brevo error: {e}")
-        return False 
\ No newline at end of file
+        return False 
+
+
+def send_email_brevo_batch(html_template: str, versions: List[Dict[str, Any]]) -> bool:
+    """
+    Envía un lote de emails en una sola llamada a la API de Brevo.
+
+    Cada versión tiene "to", "subject" y los "params" con los que Brevo
+    rellena html_template para ese destinatario.
+    """
+    if not versions:
+        return True
+    api_key = os.getenv("BREVO_API_KEY")
+    from_addr = os.getenv("BREVO_FROM", "noreply@example.com")
+    if not api_key:
+        print("Falta la variable BREVO_API_KEY")
+        return False
+    configuration = sib_api_v3_sdk.Configuration()
+    configuration.api_key["api-key"] = api_key
+    api_instance = sib_api_v3_sdk.TransactionalEmailsApi(sib_api_v3_sdk.ApiClient(configuration))
+    send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
+        sender={"email": from_addr},
+        subject=versions[0]["subject"],
+        html_content=html_template,
+        message_versions=[
+            sib_api_v3_sdk.SendSmtpEmailMessageVersions(
+                to=[{"email": version["to"]}],
+                subject=version["subject"],
+                params=version["params"],
+            )
+            for version in versions
+        ],
+    )
+    try:
+        api_instance.send_transac_email(send_smtp_email)
+        return True
+    except ApiException as e:
+        print(f"Brevo error: {e}")
+        return False
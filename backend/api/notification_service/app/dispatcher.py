@@ -0,0 +1,321 @@
+"""
+Dispatcher for scheduled notifications.
+
+Notifications created with a scheduled_at are stored without being sent.
+This process polls for the due ones through the pending scheduled index,
+claims them in batches of NOTIFICATION_DISPATCH_BATCH_SIZE and hands them to
+the delivery worker through NotificationService. Claims use
+SELECT ... FOR UPDATE SKIP LOCKED, so several replicas can run side by side.
+
+A full batch is followed by the next one straight away; otherwise the
+dispatcher waits NOTIFICATION_DISPATCH_INTERVAL seconds. Every
+NOTIFICATION_DIGEST_INTERVAL seconds it also sends the email digests that are
+due, NOTIFICATION_DIGEST_BATCH_SIZE users per Brevo request. Dispatch lag,
+batch size and digest metrics are served as JSON on
+http://0.0.0.0:NOTIFICATION_DISPATCHER_METRICS_PORT/metrics.
+
+Usage (from the backend directory):
+
+    python -m api.notification_service.app.dispatcher
+"""
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from api.notification_service.app.schemas.notification import (
+    NotificationResponseDTO,
+)
+from api.notification_service.app.services.digest_service import DigestService
+from api.notification_service.app.services.notification_service import (
+    NotificationService,
+)
+from api.shared.utils.db import SessionLocal
+from api.shared.utils.metrics_server import start_metrics_server
+
+# Load environment variables
+load_dotenv()
+
+# Dispatch configuration
+DISPATCH_BATCH_SIZE = int(os.getenv("NOTIFICATION_DISPATCH_BATCH_SIZE", "500"))
+DISPATCH_INTERVAL = float(os.getenv("NOTIFICATION_DISPATCH_INTERVAL", "1"))
+METRICS_PORT = int(os.getenv("NOTIFICATION_DISPATCHER_METRICS_PORT", "8014"))
+DIGEST_BATCH_SIZE = int(os.getenv("NOTIFICATION_DIGEST_BATCH_SIZE", "500"))
+DIGEST_INTERVAL = float(os.getenv("NOTIFICATION_DIGEST_INTERVAL", "300"))
+
+# Upper bounds of the batch size and dispatch lag (seconds) histogram buckets
+BATCH_SIZE_BUCKETS = (1, 10, 50, 100, 250, 500, 1000)
+LAG_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _histogram(buckets: Any, counts: List[int]) -> Dict[str, int]:
+    """
+    Label histogram counts with their bucket upper bounds.
+
+    Args:
+        buckets (Any): Bucket upper bounds
+        counts (List[int]): Count per bucket, with one more for +Inf
+
+    Returns:
+        Dict[str, int]: Count by upper bound
+    """
+    return dict(zip([str(b) for b in buckets] + ["+Inf"], counts))
+
+
+class DispatchMetrics:
+    """Batch sizes and dispatch lag of the scheduled notification dispatcher"""
+
+    def __init__(self) -> None:
+        """Initialize DispatchMetrics."""
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.empty_polls = 0
+        self.failures = 0
+        self.dispatched = 0
+        self.batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self.lag_counts = [0] * (len(LAG_BUCKETS) + 1)
+        self.lag_sum = 0.0
+        self.lag_max = 0.0
+        self.last_lag = 0.0
+        self.last_dispatch_at: Optional[datetime] = None
+        self.digest_batches = 0
+        self.digest_emails = 0
+        self.digest_notifications = 0
+        self.digest_failures = 0
+
+    def record_batch(self, lags: List[float]) -> None:
+        """
+        Record a dispatched batch.
+
+        Args:
+            lags (List[float]): Seconds between each notification's
+                scheduled_at and its dispatch
+        """
+        with self._lock:
+            if not lags:
+                self.empty_polls += 1
+                return
+
+            self.batches += 1
+            self.dispatched += len(lags)
+            self.batch_size_counts[bisect_left(BATCH_SIZE_BUCKETS, len(lags))] += 1
+
+            for lag in lags:
+                self.lag_counts[bisect_left(LAG_BUCKETS, lag)] += 1
+                self.lag_sum += lag
+
+            self.last_lag = max(lags)
+            self.lag_max = max(self.lag_max, self.last_lag)
+            self.last_dispatch_at = datetime.now(timezone.utc)
+
+    def record_failure(self) -> None:
+        """Record a batch that could not be dispatched"""
+        with self._lock:
+            self.failures += 1
+
+    def record_digests(self, emails: int, notifications: int) -> None:
+        """
+        Record a batch of sent digests.
+
+        Args:
+            emails (int): Digest emails sent
+            notifications (int): Notifications the emails cover
+        """
+        with self._lock:
+            self.digest_batches += 1
+            self.digest_emails += emails
+            self.digest_notifications += notifications
+
+    def record_digest_failure(self) -> None:
+        """Record a digest batch that could not be sent"""
+        with self._lock:
+            self.digest_failures += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current metrics.
+
+        Returns:
+            Dict[str, Any]: Batch counts and sizes, dispatch lag histogram and
+            digest counts
+        """
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "empty_polls": self.empty_polls,
+                "failures": self.failures,
+                "dispatched": self.dispatched,
+                "batch_size": {
+                    "buckets": _histogram(BATCH_SIZE_BUCKETS, self.batch_size_counts),
+                    "mean": (
+                        self.dispatched / self.batches if self.batches else 0.0
+                    ),
+                },
+                "lag_seconds": {
+                    "buckets": _histogram(LAG_BUCKETS, self.lag_counts),
+                    "mean": (
+                        self.lag_sum / self.dispatched if self.dispatched else 0.0
+                    ),
+                    "max": self.lag_max,
+                    "last": self.last_lag,
+                },
+                "last_dispatch_at": (
+                    self.last_dispatch_at.isoformat()
+                    if self.last_dispatch_at is not None
+                    else None
+                ),
+                "digests": {
+                    "batches": self.digest_batches,
+                    "emails": self.digest_emails,
+                    "notifications": self.digest_notifications,
+                    "failures": self.digest_failures,
+                },
+            }
+
+
+def dispatch_lag(notification: NotificationResponseDTO) -> float:
+    """
+    Get how late a notification was dispatched.
+
+    Args:
+        notification (NotificationResponseDTO): Dispatched notification
+
+    Returns:
+        float: Seconds between scheduled_at and sent_at
+    """
+    scheduled_at = notification.scheduled_at
+    sent_at = notification.sent_at
+
+    if scheduled_at is None or sent_at is None:
+        return 0.0
+
+    # Naive timestamps read back from the database are UTC
+    if scheduled_at.tzinfo is None:
+        scheduled_at = scheduled_at.replace(tzinfo=timezone.utc)
+    if sent_at.tzinfo is None:
+        sent_at = sent_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (sent_at - scheduled_at).total_seconds())
+
+
+class ScheduledNotificationDispatcher:
+    """Poll for due scheduled notifications and dispatch them in batches"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = DISPATCH_BATCH_SIZE,
+        metrics: Optional[DispatchMetrics] = None,
+        digest_batch_size: int = DIGEST_BATCH_SIZE,
+    ):
+        """
+        Initialize ScheduledNotificationDispatcher.
+
+        Args:
+            session_factory (Callable[[], Session], optional): Session factory
+            batch_size (int, optional): Largest number of rows claimed at once
+            metrics (DispatchMetrics, optional): Metrics to record into
+            digest_batch_size (int, optional): Largest number of digests sent
+                in one request
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.metrics = metrics or DispatchMetrics()
+        self.digest_batch_size = digest_batch_size
+
+    def dispatch_once(self) -> int:
+        """
+        Claim and dispatch one batch of due notifications.
+
+        Returns:
+            int: Number of notifications dispatched
+        """
+        with self.session_factory() as db:
+            try:
+                dispatched = NotificationService(
+                    db
+                ).dispatch_scheduled_notifications(self.batch_size)
+            except Exception as e:
+                logger.error(f"Error dispatching scheduled notifications: {e}")
+                self.metrics.record_failure()
+                return 0
+
+        self.metrics.record_batch([dispatch_lag(n) for n in dispatched])
+        return len(dispatched)
+
+    def send_digests(self) -> int:
+        """
+        Send all due email digests, one batch of users at a time.
+
+        Returns:
+            int: Number of digest emails sent
+        """
+        emails = 0
+
+        while True:
+            with self.session_factory() as db:
+                try:
+                    batch = DigestService(db).send_due_digests(self.digest_batch_size)
+                except Exception as e:
+                    logger.error(f"Error sending notification digests: {e}")
+                    self.metrics.record_digest_failure()
+                    return emails
+
+            if not batch.notifications:
+                return emails
+
+            self.metrics.record_digests(batch.emails, batch.notifications)
+            emails += batch.emails
+
+    def run_forever(
+        self,
+        interval: float = DISPATCH_INTERVAL,
+        digest_interval: float = DIGEST_INTERVAL,
+    ) -> None:
+        """
+        Dispatch due notifications and digests until interrupted.
+
+        Args:
+            interval (float, optional): Seconds to wait after a partial batch
+            digest_interval (float, optional): Seconds between digest runs
+        """
+        logger.info(
+            f"Dispatching scheduled notifications, {self.batch_size} at a time"
+        )
+        next_digest_at = time.monotonic()
+
+        while True:
+            if time.monotonic() >= next_digest_at:
+                self.send_digests()
+                next_digest_at = time.monotonic() + digest_interval
+
+            # A full batch means more may be due already
+            if self.dispatch_once() < self.batch_size:
+                time.sleep(interval)
+
+
+def main() -> None:
+    """Run the dispatcher with its metrics server."""
+    dispatcher = ScheduledNotificationDispatcher()
+    start_metrics_server(
+        dispatcher.metrics.snapshot, METRICS_PORT, name="dispatcher-metrics"
+    )
+
+    try:
+        dispatcher.run_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopping scheduled notification dispatcher")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,19 @@
 from typing import Any, List, Optional
 
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, Path, Query, Security, HTTPException, Header
+from fastapi import (
+    Depends,
+    FastAPI,
+    Path,
+    Query,
+    Response,
+    Security,
+    HTTPException,
+    Header,
+)
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.notification_service.app.schemas.notification import (
     NotificationBatchCreateDTO,
@@ -12,12 +21,18 @@ from api.notification_service.app.schemas.notification import (
     NotificationPreferencesDTO,
     NotificationPreferencesUpdateDTO,
     NotificationResponseDTO,
+    NotificationUnreadCountDTO,
 )
 from api.notification_service.app.services.notification_service import (
-    NotificationService,
+    AsyncNotificationService,
 )
 from api.shared.exceptions.auth_exceptions import InvalidTokenException
-from api.shared.utils.db import get_db
+from api.shared.utils.db import (
+    get_async_db,
+    get_async_pool_stats,
+    get_db,
+    get_pool_stats,
+)
 from api.shared.utils.jwt import decode_token
 from api.shared.middleware.auth_middleware import auth_middleware
 
@@ -56,7 +71,7 @@ async def get_current_user(x_user_id: Optional[str] = Header(None, alias="X-User
 )
 async def create_notification(
     notification_data: NotificationCreateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -64,7 +79,7 @@ async def create_notification(
 
     Args:
         notification_data (NotificationCreateDTO): Notification data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
@@ -76,8 +91,8 @@ async def create_notification(
         # For simplicity, we'll allow it here
         pass
 
-    notification_service = NotificationService(db)
-    return notification_service.create_notification(notification_data)
+    notification_service = AsyncNotificationService(db)
+    return await notification_service.create_notification(notification_data)
 
 
 @app.post(
@@ -87,7 +102,7 @@ async def create_notification(
 )
 async def create_batch_notifications(
     notification_data: NotificationBatchCreateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -95,7 +110,7 @@ async def create_batch_notifications(
 
     Args:
         notification_data (NotificationBatchCreateDTO): Notification data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
@@ -104,8 +119,8 @@ async def create_batch_notifications(
     # In a real application, you would check if the user has admin permissions
     # For simplicity, we'll allow it here
 
-    notification_service = NotificationService(db)
-    return notification_service.create_batch_notifications(notification_data)
+    notification_service = AsyncNotificationService(db)
+    return await notification_service.create_batch_notifications(notification_data)
 
 
 @app.get(
@@ -114,25 +129,39 @@ async def create_batch_notifications(
     tags=["Notifications"],
 )
 async def get_user_notifications(
-    limit: int = Query(100, description="Limit"),
-    offset: int = Query(0, description="Offset"),
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(100, ge=1, le=500, description="Limit"),
+    offset: int = Query(0, ge=0, description="Offset, ignored with a cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page"),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
-    Get notifications for current user.
+    Get notifications for current user, newest first.
+
+    The cursor of the next page is returned in the X-Next-Cursor header, which
+    is absent on the last page.
 
     Args:
+        response (Response): Response
         limit (int): Limit
-        offset (int): Offset
-        db (Session): Database session
+        offset (int): Offset, ignored with a cursor
+        cursor (str, optional): Cursor of the next page
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[NotificationResponseDTO]: List of notifications
     """
-    notification_service = NotificationService(db)
-    return notification_service.get_user_notifications(user_id, limit, offset)
+    notification_service = AsyncNotificationService(db)
+    page = await notification_service.get_user_notifications(
+        user_id, limit, offset, cursor
+    )
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+
+    return page.items
 
 
 @app.get(
@@ -141,25 +170,61 @@ async def get_user_notifications(
     tags=["Notifications"],
 )
 async def get_unread_notifications(
-    limit: int = Query(100, description="Limit"),
-    offset: int = Query(0, description="Offset"),
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(100, ge=1, le=500, description="Limit"),
+    offset: int = Query(0, ge=0, description="Offset, ignored with a cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page"),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
-    Get unread notifications for current user.
+    Get unread notifications for current user, newest first.
+
+    The cursor of the next page is returned in the X-Next-Cursor header, which
+    is absent on the last page.
 
     Args:
+        response (Response): Response
         limit (int): Limit
-        offset (int): Offset
-        db (Session): Database session
+        offset (int): Offset, ignored with a cursor
+        cursor (str, optional): Cursor of the next page
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[NotificationResponseDTO]: List of unread notifications
     """
-    notification_service = NotificationService(db)
-    return notification_service.get_unread_notifications(user_id, limit, offset)
+    notification_service = AsyncNotificationService(db)
+    page = await notification_service.get_unread_notifications(
+        user_id, limit, offset, cursor
+    )
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+
+    return page.items
+
+
+@app.get(
+    "/notifications/unread/count",
+    response_model=NotificationUnreadCountDTO,
+    tags=["Notifications"],
+)
+async def get_unread_count(
+    db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)
+):
+    """
+    Get the number of unread notifications of current user.
+
+    Args:
+        db (AsyncSession): Async database session
+        user_id (str): User ID
+
+    Returns:
+        NotificationUnreadCountDTO: Unread notification count
+    """
+    notification_service = AsyncNotificationService(db)
+    return await notification_service.get_unread_count(user_id)
 
 
 @app.put(
@@ -169,7 +234,7 @@ async def get_unread_notifications(
 )
 async def mark_notification_as_read(
     notification_id: str = Path(..., description="Notification ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -177,38 +242,40 @@ async def mark_notification_as_read(
 
     Args:
         notification_id (str): Notification ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         NotificationResponseDTO: Updated notification
     """
-    notification_service = NotificationService(db)
-    return notification_service.mark_notification_as_read(notification_id, user_id)
+    notification_service = AsyncNotificationService(db)
+    return await notification_service.mark_notification_as_read(
+        notification_id, user_id
+    )
 
 
 @app.put("/notifications/read-all", tags=["Notifications"])
 async def mark_all_notifications_as_read(
-    db: Session = Depends(get_db), user_id: str = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)
 ):
     """
     Mark all notifications as read for current user.
 
     Args:
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Success response
     """
-    notification_service = NotificationService(db)
-    return notification_service.mark_all_notifications_as_read(user_id)
+    notification_service = AsyncNotificationService(db)
+    return await notification_service.mark_all_notifications_as_read(user_id)
 
 
 @app.delete("/notifications/{notification_id}", tags=["Notifications"])
 async def delete_notification(
     notification_id: str = Path(..., description="Notification ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -216,14 +283,14 @@ async def delete_notification(
 
     Args:
         notification_id (str): Notification ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Success response
     """
-    notification_service = NotificationService(db)
-    return notification_service.delete_notification(notification_id, user_id)
+    notification_service = AsyncNotificationService(db)
+    return await notification_service.delete_notification(notification_id, user_id)
 
 
 # Notification preferences endpoints
@@ -233,20 +300,20 @@ async def delete_notification(
     tags=["Notification Preferences"],
 )
 async def get_notification_preferences(
-    db: Session = Depends(get_db), user_id: str = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)
 ):
     """
     Get notification preferences for current user.
 
     Args:
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         NotificationPreferencesDTO: Notification preferences
     """
-    notification_service = NotificationService(db)
-    return notification_service.get_notification_preferences(user_id)
+    notification_service = AsyncNotificationService(db)
+    return await notification_service.get_notification_preferences(user_id)
 
 
 @app.put(
@@ -256,7 +323,7 @@ async def get_notification_preferences(
 )
 async def update_notification_preferences(
     preferences_data: NotificationPreferencesUpdateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -264,14 +331,14 @@ async def update_notification_preferences(
 
     Args:
         preferences_data (NotificationPreferencesUpdateDTO): Preferences data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         NotificationPreferencesDTO: Updated notification preferences
     """
-    notification_service = NotificationService(db)
-    return notification_service.update_notification_preferences(
+    notification_service = AsyncNotificationService(db)
+    return await notification_service.update_notification_preferences(
         user_id, preferences_data
     )
 
@@ -286,6 +353,18 @@ async def health_check() -> Any:
     """
     return {"status": "healthy"}
 
+
+@app.get("/metrics", tags=["Health"])
+async def get_metrics() -> Any:
+    """
+    Get service metrics.
+
+    Returns:
+        Dict[str, Any]: Database pool utilisation and checkout wait times, for
+        the sync and async engines
+    """
+    return {"db_pool": get_pool_stats(), "async_db_pool": get_async_pool_stats()}
+
 # Export para tests de integración
 get_db = get_db
 get_current_user = get_current_user
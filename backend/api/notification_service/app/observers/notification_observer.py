@@ -11,35 +11,61 @@ from api.external_tools_service.app.services.sms_tools import send_sms_twilio
 class NotificationObserver(ABC):
     """Abstract observer for notifications"""
 
-    @abstractmethod
+    # Channel the observer delivers notifications on
+    channel: NotificationChannel
+
     def notify(self, notification: Notification) -> None:
         """
         Notify observer about a notification.
 
+        Delivery errors are logged, not raised.
+
         Args:
             notification (Notification): Notification to send
         """
+        if self.channel not in notification.channels:
+            return
+        try:
+            if not self.deliver(notification):
+                print(f"Error sending {self.channel.value} notification: not accepted")
+        except Exception as e:
+            print(f"Error sending {self.channel.value} notification: {e}")
+
+    @abstractmethod
+    def deliver(self, notification: Notification) -> bool:
+        """
+        Send a notification on the observer's channel.
+
+        Args:
+            notification (Notification): Notification to send
+
+        Returns:
+            bool: Whether the provider accepted the notification
+
+        Raises:
+            Exception: If the provider could not be reached
+        """
 
 
 class EmailNotificationObserver(NotificationObserver):
     """Observer for email notifications"""
     
-    def notify(self, notification: Notification) -> None:
+    channel = NotificationChannel.EMAIL
+
+    def deliver(self, notification: Notification) -> bool:
         """
         Send notification via email (Brevo).
 
         Args:
             notification (Notification): Notification to send
+
+        Returns:
+            bool: Whether Brevo accepted the email
         """
-        if NotificationChannel.EMAIL not in notification.channels:
-            return
-        try:
-            to = self._get_user_email(notification.user_id)
-            subject = notification.title
-            body = self._create_email_body(notification)
-            send_email_brevo(to, subject, body)
-        except Exception as e:
-            print(f"Error sending email notification: {e}")
+        to = self._get_user_email(notification.user_id)
+        subject = notification.title
+        body = self._create_email_body(notification)
+        return send_email_brevo(to, subject, body)
 
     def _get_user_email(self, user_id: str) -> str:
         """
@@ -102,41 +128,41 @@ class EmailNotificationObserver(NotificationObserver):
 class PushNotificationObserver(NotificationObserver):
     """Observer for push notifications"""
     
-    def notify(self, notification: Notification) -> None:
+    channel = NotificationChannel.PUSH
+
+    def deliver(self, notification: Notification) -> bool:
         """
         Send notification via push.
 
         Args:
             notification (Notification): Notification to send
+
+        Returns:
+            bool: Whether Gotify accepted the message
         """
-        if NotificationChannel.PUSH not in notification.channels:
-            return
-        try:
-            message = notification.message
-            title = notification.title
-            send_gotify_notification(message, title)
-        except Exception as e:
-            print(f"Error sending push notification: {e}")
+        message = notification.message
+        title = notification.title
+        return send_gotify_notification(message, title)
 
 
 
 class SMSNotificationObserver(NotificationObserver):
     """Observer for SMS notifications"""
     
-    def notify(self, notification: Notification) -> None:
+    channel = NotificationChannel.SMS
+
+    def deliver(self, notification: Notification) -> bool:
         """
         Send notification via SMS.
 
         Args:
             notification (Notification): Notification to send
+
+        Returns:
+            bool: Whether Twilio accepted the message
         """
-        if NotificationChannel.SMS not in notification.channels:
-            return
-        try:
-            phone_number = self._get_user_phone_number(notification.user_id)
-            send_sms_twilio(phone_number, notification.message)
-        except Exception as e:
-            print(f"Error sending SMS notification: {e}")
+        phone_number = self._get_user_phone_number(notification.user_id)
+        return send_sms_twilio(phone_number, notification.message)
 
     def _get_user_phone_number(self, user_id: str) -> str:
         """
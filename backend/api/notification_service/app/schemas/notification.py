@@ -71,6 +71,19 @@ class NotificationResponseDTO(BaseModel):
     sent_at: Optional[datetime] = None
 
 
+class NotificationPageDTO(BaseModel):
+    """DTO for a page of notifications"""
+
+    items: List[NotificationResponseDTO]
+    next_cursor: Optional[str] = None
+
+
+class NotificationUnreadCountDTO(BaseModel):
+    """DTO for the unread notification count"""
+
+    unread_count: int
+
+
 class NotificationUpdateDTO(BaseModel):
     """DTO for updating a notification"""
 
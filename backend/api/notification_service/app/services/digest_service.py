@@ -0,0 +1,297 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import and_, exists, func, or_, select
+from sqlalchemy.orm import Session
+
+from api.external_tools_service.app.services.email_tools import send_email_brevo_batch
+from api.shared.models.notification import Notification, NotificationPreference
+from api.shared.models.user import User
+
+# Load environment variables
+load_dotenv()
+
+# Most recent notifications listed in a digest; the rest are only counted
+DIGEST_MAX_ITEMS = int(os.getenv("NOTIFICATION_DIGEST_MAX_ITEMS", "20"))
+
+# Digest window by NotificationPreference.digest_frequency
+DIGEST_WINDOWS = {"daily": timedelta(days=1), "weekly": timedelta(days=7)}
+DEFAULT_DIGEST_FREQUENCY = "daily"
+
+# Brevo template, filled in from each recipient's params
+DIGEST_EMAIL_TEMPLATE = """
+<html>
+<body style="font-family: Arial, sans-serif;">
+    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+        <h2>You have {{ params.count }} new notifications</h2>
+        <ul>
+        {% for item in params.items %}
+            <li style="margin-bottom: 12px;">
+                <strong>{{ item.title }}</strong><br>
+                {{ item.message }}
+                {% if item.action_url %}
+                    <br><a href="{{ item.action_url }}">View Details</a>
+                {% endif %}
+            </li>
+        {% endfor %}
+        </ul>
+        {% if params.more %}
+            <p>And {{ params.more }} more in TaskHub.</p>
+        {% endif %}
+        <p style="font-size: 12px;">
+            This is an automated {{ params.frequency }} digest from TaskHub.
+            Please do not reply to this email.
+        </p>
+    </div>
+</body>
+</html>
+"""
+
+
+class DigestBatch(NamedTuple):
+    """Digests sent in one batch"""
+
+    emails: int
+    notifications: int
+
+
+class DigestService:
+    """
+    Service sending email digests.
+
+    Notifications for users with digest_enabled are stored with their email
+    held back (digest_pending). Once a user's daily or weekly window has
+    passed, all their pending notifications are folded into one email, and
+    the emails of a whole batch of users go out in one Brevo request.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize DigestService.
+
+        Args:
+            db (Session): Database session
+        """
+        self.db = db
+
+    def send_due_digests(
+        self, limit: int, now: Optional[datetime] = None
+    ) -> DigestBatch:
+        """
+        Send the digests of up to limit users whose window has passed.
+
+        Users are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so
+        concurrent senders handle disjoint users. Users who turned digests
+        off get one last digest of what was held back for them.
+
+        Args:
+            limit (int): Largest number of users to send digests to
+            now (datetime, optional): Current time
+
+        Returns:
+            DigestBatch: Number of emails sent and notifications they cover
+        """
+        now = now or datetime.now(timezone.utc)
+
+        # Claim users with pending notifications whose window has passed
+        preferences = (
+            self.db.query(NotificationPreference)
+            .filter(
+                self._has_pending(now),
+                or_(NotificationPreference.digest_enabled == False, self._is_due(now)),
+            )
+            .order_by(NotificationPreference.user_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        if not preferences:
+            self.db.rollback()
+            return DigestBatch(0, 0)
+
+        user_ids = [p.user_id for p in preferences]
+        counts = dict(
+            self.db.query(Notification.user_id, func.count(Notification.id))
+            .filter(Notification.user_id.in_(user_ids), self._pending(now))
+            .group_by(Notification.user_id)
+            .all()
+        )
+        items = self._recent_items(user_ids, now)
+        emails = dict(
+            self.db.query(User.id, User.email).filter(User.id.in_(user_ids)).all()
+        )
+
+        # Render one email per user
+        versions: List[Dict[str, Any]] = []
+
+        for preference in preferences:
+            count = counts.get(preference.user_id, 0)
+            email = emails.get(preference.user_id)
+
+            if not count or not email:
+                continue
+
+            frequency = self._frequency(preference)
+            versions.append(
+                {
+                    "to": email,
+                    "subject": (
+                        f"Your {frequency} TaskHub digest: {count} notifications"
+                    ),
+                    "params": {
+                        "count": count,
+                        "items": items.get(preference.user_id, []),
+                        "more": max(0, count - DIGEST_MAX_ITEMS),
+                        "frequency": frequency,
+                    },
+                }
+            )
+
+        # Send all emails in one request; on failure they are retried later
+        if not send_email_brevo_batch(DIGEST_EMAIL_TEMPLATE, versions):
+            self.db.rollback()
+            return DigestBatch(0, 0)
+
+        self.db.query(Notification).filter(
+            Notification.user_id.in_(user_ids), self._pending(now)
+        ).update({Notification.digest_pending: False}, synchronize_session=False)
+
+        for preference in preferences:
+            preference.last_digest_at = now
+
+        self.db.commit()
+
+        return DigestBatch(
+            len(versions), sum(v["params"]["count"] for v in versions)
+        )
+
+    def _recent_items(
+        self, user_ids: List[str], now: datetime
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the most recent pending notifications of every user.
+
+        Args:
+            user_ids (List[str]): User IDs
+            now (datetime): Current time
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Up to DIGEST_MAX_ITEMS digest
+            items per user ID, newest first
+        """
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=Notification.user_id,
+                order_by=Notification.created_at.desc(),
+            )
+            .label("rank")
+        )
+        ranked = (
+            select(
+                Notification.user_id,
+                Notification.title,
+                Notification.message,
+                Notification.action_url,
+                rank,
+            )
+            .where(Notification.user_id.in_(user_ids), self._pending(now))
+            .subquery()
+        )
+        rows = self.db.execute(
+            select(ranked)
+            .where(ranked.c.rank <= DIGEST_MAX_ITEMS)
+            .order_by(ranked.c.user_id, ranked.c.rank)
+        )
+
+        items: Dict[str, List[Dict[str, Any]]] = {}
+
+        for row in rows:
+            items.setdefault(row.user_id, []).append(
+                {
+                    "title": row.title,
+                    "message": row.message,
+                    "action_url": row.action_url,
+                }
+            )
+
+        return items
+
+    def _pending(self, now: datetime) -> Any:
+        """
+        Condition matching notifications held back for a digest.
+
+        Scheduled notifications are left out until they are due.
+
+        Args:
+            now (datetime): Current time
+
+        Returns:
+            Any: SQL condition on Notification
+        """
+        return and_(
+            Notification.digest_pending == True,
+            or_(Notification.scheduled_at.is_(None), Notification.scheduled_at <= now),
+        )
+
+    def _has_pending(self, now: datetime) -> Any:
+        """
+        Condition matching preferences of users with pending notifications.
+
+        Args:
+            now (datetime): Current time
+
+        Returns:
+            Any: SQL condition on NotificationPreference
+        """
+        return exists().where(
+            Notification.user_id == NotificationPreference.user_id,
+            self._pending(now),
+        )
+
+    def _is_due(self, now: datetime) -> Any:
+        """
+        Condition matching preferences whose digest window has passed.
+
+        Args:
+            now (datetime): Current time
+
+        Returns:
+            Any: SQL condition on NotificationPreference
+        """
+        frequency = func.coalesce(
+            NotificationPreference.digest_frequency, DEFAULT_DIGEST_FREQUENCY
+        )
+        windows = [
+            and_(
+                frequency == name,
+                NotificationPreference.last_digest_at <= now - window,
+            )
+            for name, window in DIGEST_WINDOWS.items()
+        ]
+        # Unknown frequencies get the default window
+        windows.append(
+            and_(
+                frequency.notin_(list(DIGEST_WINDOWS)),
+                NotificationPreference.last_digest_at
+                <= now - DIGEST_WINDOWS[DEFAULT_DIGEST_FREQUENCY],
+            )
+        )
+        return or_(NotificationPreference.last_digest_at.is_(None), *windows)
+
+    def _frequency(self, preference: NotificationPreference) -> str:
+        """
+        Get a user's digest frequency.
+
+        Args:
+            preference (NotificationPreference): User's preferences
+
+        Returns:
+            str: "daily" or "weekly"
+        """
+        if preference.digest_frequency in DIGEST_WINDOWS:
+            return preference.digest_frequency
+        return DEFAULT_DIGEST_FREQUENCY
@@ -1,24 +1,54 @@
+from collections import Counter, defaultdict
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query, Session
 
-from api.notification_service.app.observers.notification_observer import (
-    EmailNotificationObserver,
-    NotificationObserver,
-    PushNotificationObserver,
-    SMSNotificationObserver,
-)
 from api.notification_service.app.schemas.notification import (
     NotificationBatchCreateDTO,
     NotificationChannel,
     NotificationCreateDTO,
+    NotificationPageDTO,
     NotificationPreferencesDTO,
     NotificationPreferencesUpdateDTO,
     NotificationResponseDTO,
+    NotificationUnreadCountDTO,
+)
+from api.notification_service.app.services.preference_rules import (
+    PreferenceRules,
+    preference_cache,
+)
+from api.shared.exceptions.base_exceptions import (
+    BadRequestException,
+    ServiceUnavailableException,
 )
-from api.shared.models.notification import Notification, NotificationPreference
-from api.shared.utils.rabbitmq import RabbitMQManager
+from api.shared.models.notification import (
+    Notification,
+    NotificationCounter,
+    NotificationPreference,
+)
+from api.shared.utils.async_service import AsyncService
+from api.shared.utils.pagination import decode_cursor, encode_cursor
+from api.shared.utils.rabbitmq import RabbitMQManager, async_publisher
+
+# Largest number of user IDs bound into one IN (...) clause
+IN_CLAUSE_CHUNK_SIZE = 1000
+
+
+def _chunks(values: Sequence[str]) -> Iterator[Sequence[str]]:
+    """
+    Split values into slices that fit in one IN clause.
+
+    Args:
+        values (Sequence[str]): Values
+
+    Returns:
+        Iterator[Sequence[str]]: Slices of at most IN_CLAUSE_CHUNK_SIZE values
+    """
+    for start in range(0, len(values), IN_CLAUSE_CHUNK_SIZE):
+        yield values[start : start + IN_CLAUSE_CHUNK_SIZE]
 
 
 class NotificationService:
@@ -33,13 +63,9 @@ class NotificationService:
         """
         self.db = db
         self.rabbitmq_manager = RabbitMQManager()
-
-        # Initialize observers
-        self.observers: List[NotificationObserver] = [
-            EmailNotificationObserver(),
-            PushNotificationObserver(),
-            SMSNotificationObserver(),
-        ]
+        self.preference_cache = preference_cache
+        # Set to collect sent notifications instead of publishing them
+        self.outbox: Optional[List[Tuple[str, Dict[str, Any]]]] = None
 
     def create_notification(
         self, notification_data: NotificationCreateDTO
@@ -54,46 +80,13 @@ class NotificationService:
             NotificationResponseDTO: Created notification
         """
         # Check user notification preferences
-        preferences = self._get_or_create_preferences(notification_data.user_id)
+        rules = self._get_preference_rules(notification_data.user_id)
 
         # Filter channels based on user preferences
-        channels: List[NotificationChannel] = []
-        for channel in notification_data.channels:
-            if channel == NotificationChannel.EMAIL and preferences.email_enabled:
-                channels.append(channel)
-            elif channel == NotificationChannel.PUSH and preferences.push_enabled:
-                channels.append(channel)
-            elif channel == NotificationChannel.SMS and preferences.sms_enabled:
-                channels.append(channel)
-            elif channel == NotificationChannel.IN_APP and preferences.in_app_enabled:
-                channels.append(channel)
-
-        # Check if notification should be sent based on type preferences
-        if preferences.preferences_by_type:
-            type_preferences = preferences.preferences_by_type.get(
-                notification_data.type.value, {}
-            )
-            filtered_channels: List[NotificationChannel] = []
-            for channel in channels:
-                if type_preferences.get(channel, True):
-                    filtered_channels.append(channel)
-            channels = filtered_channels
-
-        # Check if notification should be sent during quiet hours
-        if preferences.quiet_hours_enabled and channels:
-            current_time = datetime.now(timezone.utc).strftime("%H:%M")
-            if preferences.quiet_hours_start and preferences.quiet_hours_end:
-                if (
-                    preferences.quiet_hours_start
-                    <= current_time
-                    <= preferences.quiet_hours_end
-                ):
-                    # Only allow in-app notifications during quiet hours
-                    channels = [
-                        channel
-                        for channel in channels
-                        if channel == NotificationChannel.IN_APP
-                    ]
+        channels = rules.filter_channels(
+            notification_data.channels, notification_data.type
+        )
+        channels, digest_pending = self._hold_for_digest(channels, rules)
 
         # Create notification
         notification = Notification(
@@ -108,14 +101,19 @@ class NotificationService:
             action_url=notification_data.action_url,
             meta_data=(notification_data.meta_data or {}),
             scheduled_at=notification_data.scheduled_at,
+            sent_at=(
+                None if notification_data.scheduled_at else datetime.now(timezone.utc)
+            ),
+            digest_pending=digest_pending,
         )
 
         # Add notification to database
         self.db.add(notification)
+        self._adjust_unread_count(notification_data.user_id, 1)
         self.db.commit()
         self.db.refresh(notification)
 
-        # Send notification to observers if not scheduled
+        # Hand notification over to the delivery worker if not scheduled
         if not notification_data.scheduled_at:
             self._send_notification(notification)
 
@@ -128,89 +126,240 @@ class NotificationService:
         """
         Create multiple notifications at once.
 
+        Preferences are loaded with one query per chunk of users, the
+        notifications are inserted together and committed once, and they are
+        published to the delivery worker in a single confirmed pass.
+
         Args:
             notification_data (NotificationBatchCreateDTO): Notification data
 
         Returns:
             List[NotificationResponseDTO]: List of created notifications
         """
-        notifications: List[NotificationResponseDTO] = []
-
-        for user_id in notification_data.user_ids:
-            # Create notification data for user
-            user_notification_data = NotificationCreateDTO(
-                user_id=user_id,
-                type=notification_data.type,
-                title=notification_data.title,
-                message=notification_data.message,
-                priority=notification_data.priority,
-                channels=list(notification_data.channels),
-                related_entity_type=notification_data.related_entity_type,
-                related_entity_id=notification_data.related_entity_id,
-                action_url=notification_data.action_url,
-                meta_data=(notification_data.meta_data or {}),
-                scheduled_at=notification_data.scheduled_at,
+        user_ids = notification_data.user_ids
+
+        if not user_ids:
+            return []
+
+        # Check user notification preferences
+        rules_by_user = self._get_preference_rules_batch(user_ids)
+
+        # Scheduled notifications are sent later, the others right after commit
+        now = datetime.now(timezone.utc)
+        sent_at = None if notification_data.scheduled_at else now
+
+        # Create notifications
+        notifications: List[Notification] = []
+
+        for user_id in user_ids:
+            rules = rules_by_user[user_id]
+            channels, digest_pending = self._hold_for_digest(
+                rules.filter_channels(
+                    notification_data.channels, notification_data.type, now
+                ),
+                rules,
+            )
+            notifications.append(
+                Notification(
+                    user_id=user_id,
+                    type=notification_data.type,
+                    title=notification_data.title,
+                    message=notification_data.message,
+                    priority=notification_data.priority,
+                    channels=channels,
+                    related_entity_type=notification_data.related_entity_type,
+                    related_entity_id=notification_data.related_entity_id,
+                    action_url=notification_data.action_url,
+                    meta_data=(notification_data.meta_data or {}),
+                    scheduled_at=notification_data.scheduled_at,
+                    sent_at=sent_at,
+                    digest_pending=digest_pending,
+                )
             )
 
-            # Create notification
-            notification_response = self.create_notification(user_notification_data)
-            notifications.append(notification_response)
+        # Add notifications to database
+        self.db.add_all(notifications)
+        self._adjust_unread_counts(Counter(user_ids))
+        self.db.flush()
+
+        # Convert before commit, which may expire the notifications
+        responses = [self._notification_to_dto(n) for n in notifications]
+        routing_key = f"notification.{notification_data.type.value}"
+        messages = (
+            []
+            if sent_at is None
+            else [(routing_key, self._notification_to_dict(n)) for n in notifications]
+        )
+
+        self.db.commit()
 
-        return notifications
+        # Hand notifications over to the delivery worker if not scheduled
+        if messages:
+            self._publish_notifications(messages)
 
-    def get_user_notifications(
-        self, user_id: str, limit: int = 100, offset: int = 0
+        return responses
+
+    def dispatch_scheduled_notifications(
+        self, limit: int
     ) -> List[NotificationResponseDTO]:
         """
-        Get notifications for a user.
+        Hand the due scheduled notifications over to the delivery worker.
+
+        Due rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so
+        concurrent dispatchers claim disjoint batches. They are marked sent
+        and published in one confirmed batch, and the claim is committed only
+        once RabbitMQ has confirmed every message; otherwise it is rolled back
+        and the rows are claimed again later.
 
         Args:
-            user_id (str): User ID
-            limit (int, optional): Limit. Defaults to 100.
-            offset (int, optional): Offset. Defaults to 0.
+            limit (int): Largest number of notifications to dispatch
 
         Returns:
-            List[NotificationResponseDTO]: List of notifications
+            List[NotificationResponseDTO]: Dispatched notifications
+
+        Raises:
+            ServiceUnavailableException: If RabbitMQ did not confirm the batch
         """
-        # Get notifications
-        notifications_db = (
+        now = datetime.now(timezone.utc)
+
+        # Claim due notifications, oldest first
+        notifications = (
             self.db.query(Notification)
-            .filter(Notification.user_id == user_id)
-            .order_by(Notification.created_at.desc())
-            .offset(offset)
+            .filter(
+                Notification.sent_at.is_(None),
+                Notification.scheduled_at.isnot(None),
+                Notification.scheduled_at <= now,
+            )
+            .order_by(Notification.scheduled_at)
             .limit(limit)
+            .with_for_update(skip_locked=True)
             .all()
         )
 
-        # Return notifications
-        return [self._notification_to_dto(n) for n in notifications_db]
+        if not notifications:
+            self.db.rollback()
+            return []
+
+        for notification in notifications:
+            notification.sent_at = now
+
+        self.db.flush()
+
+        responses = [self._notification_to_dto(n) for n in notifications]
+        messages = [
+            (f"notification.{n.type}", self._notification_to_dict(n))
+            for n in notifications
+        ]
+
+        # Publish notifications, keeping the rows locked until confirmed
+        try:
+            self.rabbitmq_manager.declare_exchange("notifications", "topic")
+            confirmed = self.rabbitmq_manager.publish_batch(
+                exchange_name="notifications", messages=messages
+            )
+        except Exception as e:
+            self.db.rollback()
+            raise ServiceUnavailableException(
+                f"Could not publish scheduled notifications: {e}",
+                "NOTIFICATION_DISPATCH_FAILED",
+            )
+
+        if confirmed < len(messages):
+            self.db.rollback()
+            raise ServiceUnavailableException(
+                f"RabbitMQ confirmed {confirmed} of {len(messages)} notifications",
+                "NOTIFICATION_DISPATCH_FAILED",
+            )
+
+        self.db.commit()
+
+        return responses
+
+    def get_user_notifications(
+        self,
+        user_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> NotificationPageDTO:
+        """
+        Get notifications for a user, newest first.
+
+        Args:
+            user_id (str): User ID
+            limit (int, optional): Limit. Defaults to 100.
+            offset (int, optional): Offset, ignored with a cursor. Defaults to 0.
+            cursor (str, optional): Cursor of the previous page
+
+        Returns:
+            NotificationPageDTO: Notifications and the cursor of the next page
+
+        Raises:
+            BadRequestException: If the cursor is invalid
+        """
+        query = self.db.query(Notification).filter(Notification.user_id == user_id)
+
+        # Return page
+        return self._notification_page(query, limit, offset, cursor)
 
     def get_unread_notifications(
-        self, user_id: str, limit: int = 100, offset: int = 0
-    ) -> List[NotificationResponseDTO]:
+        self,
+        user_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> NotificationPageDTO:
         """
-        Get unread notifications for a user.
+        Get unread notifications for a user, newest first.
 
         Args:
             user_id (str): User ID
             limit (int, optional): Limit. Defaults to 100.
-            offset (int, optional): Offset. Defaults to 0.
+            offset (int, optional): Offset, ignored with a cursor. Defaults to 0.
+            cursor (str, optional): Cursor of the previous page
 
         Returns:
-            List[NotificationResponseDTO]: List of unread notifications
+            NotificationPageDTO: Unread notifications and the cursor of the next
+            page
+
+        Raises:
+            BadRequestException: If the cursor is invalid
         """
-        # Get notifications
-        notifications_db = (
-            self.db.query(Notification)
-            .filter(Notification.user_id == user_id, Notification.is_read == False)
-            .order_by(Notification.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+        query = self.db.query(Notification).filter(
+            Notification.user_id == user_id, Notification.is_read == False
         )
 
-        # Return notifications
-        return [self._notification_to_dto(n) for n in notifications_db]
+        # Return page
+        return self._notification_page(query, limit, offset, cursor)
+
+    def get_unread_count(self, user_id: str) -> NotificationUnreadCountDTO:
+        """
+        Get the number of unread notifications of a user.
+
+        The count is read from the user's counter row rather than counted.
+
+        Args:
+            user_id (str): User ID
+
+        Returns:
+            NotificationUnreadCountDTO: Unread notification count
+        """
+        counter = (
+            self.db.query(NotificationCounter)
+            .filter(NotificationCounter.user_id == user_id)
+            .first()
+        )
+
+        # Create the counter on first use
+        if not counter:
+            counter = self._create_counter(user_id)
+            self.db.commit()
+
+            # Created concurrently by another request
+            if counter is None:
+                return self.get_unread_count(user_id)
+
+        return NotificationUnreadCountDTO(unread_count=counter.unread_count)
 
     def mark_notification_as_read(
         self, notification_id: str, user_id: str
@@ -240,9 +389,13 @@ class NotificationService:
             raise Exception("Notification not found or user does not have permission")
 
         # Update notification
+        was_unread = not notification_db.is_read
         notification_db.is_read = True
         notification_db.read_at = datetime.now(timezone.utc)
 
+        if was_unread:
+            self._adjust_unread_count(user_id, -1)
+
         # Update notification in database
         self.db.commit()
         self.db.refresh(notification_db)
@@ -261,9 +414,14 @@ class NotificationService:
             Dict[str, Any]: Success response
         """
         # Update notifications
-        self.db.query(Notification).filter(
-            Notification.user_id == user_id, Notification.is_read == False
-        ).update({"is_read": True, "read_at": datetime.now(timezone.utc)})
+        updated = (
+            self.db.query(Notification)
+            .filter(Notification.user_id == user_id, Notification.is_read == False)
+            .update({"is_read": True, "read_at": datetime.now(timezone.utc)})
+        )
+
+        if updated:
+            self._adjust_unread_count(user_id, -updated)
 
         # Commit changes
         self.db.commit()
@@ -298,6 +456,10 @@ class NotificationService:
 
         # Delete notification
         self.db.delete(notification_db)
+
+        if not notification_db.is_read:
+            self._adjust_unread_count(user_id, -1)
+
         self.db.commit()
 
         # Return success response
@@ -387,6 +549,7 @@ class NotificationService:
         # Update preferences in database
         self.db.commit()
         self.db.refresh(preferences)
+        self.preference_cache.invalidate(user_id)
 
         # Return preferences
         return NotificationPreferencesDTO(
@@ -403,6 +566,300 @@ class NotificationService:
             preferences_by_type=(preferences.preferences_by_type or {}),
         )
 
+    def _notification_page(
+        self, query: Query, limit: int, offset: int, cursor: Optional[str]
+    ) -> NotificationPageDTO:
+        """
+        Get a page of notifications, newest first.
+
+        With a cursor, the page starts after the notification it points to
+        instead of skipping offset rows, so deep pages cost the same as the
+        first one.
+
+        Args:
+            query (Query): Filtered notification query
+            limit (int): Limit
+            offset (int): Offset, ignored with a cursor
+            cursor (str, optional): Cursor of the previous page
+
+        Returns:
+            NotificationPageDTO: Notifications and the cursor of the next page
+
+        Raises:
+            BadRequestException: If the cursor is invalid
+        """
+        query = query.order_by(Notification.created_at.desc(), Notification.id.desc())
+
+        if cursor is not None:
+            try:
+                created_at, notification_id = decode_cursor(cursor)  # type: ignore
+                created_at = datetime.fromisoformat(created_at)
+            except (TypeError, ValueError):
+                raise BadRequestException(
+                    "Invalid notification cursor", "INVALID_NOTIFICATION_CURSOR"
+                )
+
+            query = query.filter(
+                tuple_(Notification.created_at, Notification.id)
+                < tuple_(created_at, notification_id)
+            )
+        elif offset:
+            query = query.offset(offset)
+
+        # Get one notification more than the page to know whether another follows
+        notifications_db = query.limit(limit + 1).all()
+        next_cursor = None
+
+        if len(notifications_db) > limit:
+            notifications_db = notifications_db[:limit]
+            last = notifications_db[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        # Return notifications
+        return NotificationPageDTO(
+            items=[self._notification_to_dto(n) for n in notifications_db],
+            next_cursor=next_cursor,
+        )
+
+    def _adjust_unread_count(self, user_id: str, delta: int) -> None:
+        """
+        Add delta to a user's unread count in the current transaction.
+
+        Called after the change is made on the session, as a missing counter
+        is created from the flushed rows, which already include it.
+
+        Args:
+            user_id (str): User ID
+            delta (int): Change of the unread count
+        """
+        if self._increment_unread_count(user_id, delta):
+            return
+
+        # A new counter counts the pending change along with the existing rows,
+        # but one created concurrently by another transaction has not seen it
+        if self._create_counter(user_id) is None:
+            self._increment_unread_count(user_id, delta)
+
+    def _increment_unread_count(self, user_id: str, delta: int) -> bool:
+        """
+        Add delta to a user's unread counter in place.
+
+        The update is done in SQL, so concurrent changes add up instead of
+        overwriting each other.
+
+        Args:
+            user_id (str): User ID
+            delta (int): Change of the unread count
+
+        Returns:
+            bool: False if the user has no counter yet
+        """
+        updated = (
+            self.db.query(NotificationCounter)
+            .filter(NotificationCounter.user_id == user_id)
+            .update(
+                {
+                    NotificationCounter.unread_count: (
+                        NotificationCounter.unread_count + delta
+                    )
+                },
+                synchronize_session=False,
+            )
+        )
+        return bool(updated)
+
+    def _adjust_unread_counts(self, deltas: Dict[str, int]) -> None:
+        """
+        Add per-user deltas to unread counts in the current transaction.
+
+        Existing counters are updated with one UPDATE per distinct delta and
+        chunk of users; missing ones are created together.
+
+        Args:
+            deltas (Dict[str, int]): Change of the unread count by user ID
+        """
+        user_ids = list(deltas)
+        existing = set()
+
+        for chunk in _chunks(user_ids):
+            existing.update(
+                user_id
+                for (user_id,) in self.db.query(NotificationCounter.user_id).filter(
+                    NotificationCounter.user_id.in_(chunk)
+                )
+            )
+
+        users_by_delta: Dict[int, List[str]] = defaultdict(list)
+
+        for user_id in existing:
+            users_by_delta[deltas[user_id]].append(user_id)
+
+        for delta, delta_user_ids in users_by_delta.items():
+            for chunk in _chunks(delta_user_ids):
+                self.db.query(NotificationCounter).filter(
+                    NotificationCounter.user_id.in_(chunk)
+                ).update(
+                    {
+                        NotificationCounter.unread_count: (
+                            NotificationCounter.unread_count + delta
+                        )
+                    },
+                    synchronize_session=False,
+                )
+
+        missing = [user_id for user_id in user_ids if user_id not in existing]
+
+        # Some counters were created concurrently; fall back to one user at a time
+        if missing and not self._create_counters(missing):
+            for user_id in missing:
+                self._adjust_unread_count(user_id, deltas[user_id])
+
+    def _create_counter(self, user_id: str) -> Optional[NotificationCounter]:
+        """
+        Create a user's unread counter from the current notification rows.
+
+        Args:
+            user_id (str): User ID
+
+        Returns:
+            Optional[NotificationCounter]: Counter, None if another transaction
+            created it first
+        """
+        self.db.flush()
+        unread_count = (
+            self.db.query(func.count(Notification.id))
+            .filter(Notification.user_id == user_id, Notification.is_read == False)
+            .scalar()
+        )
+        counter = NotificationCounter(user_id=user_id, unread_count=unread_count)
+
+        try:
+            with self.db.begin_nested():
+                self.db.add(counter)
+        except IntegrityError:
+            return None
+
+        return counter
+
+    def _create_counters(self, user_ids: List[str]) -> bool:
+        """
+        Create the unread counters of several users from the current rows.
+
+        Args:
+            user_ids (List[str]): IDs of users without a counter
+
+        Returns:
+            bool: False if another transaction created one of them first, in
+            which case none is created
+        """
+        self.db.flush()
+        unread_counts: Dict[str, int] = {}
+
+        for chunk in _chunks(user_ids):
+            unread_counts.update(
+                self.db.query(Notification.user_id, func.count(Notification.id))
+                .filter(
+                    Notification.user_id.in_(chunk), Notification.is_read == False
+                )
+                .group_by(Notification.user_id)
+                .all()
+            )
+
+        counters = [
+            NotificationCounter(
+                user_id=user_id, unread_count=unread_counts.get(user_id, 0)
+            )
+            for user_id in user_ids
+        ]
+
+        try:
+            with self.db.begin_nested():
+                self.db.add_all(counters)
+        except IntegrityError:
+            return False
+
+        return True
+
+    def _hold_for_digest(
+        self, channels: List[NotificationChannel], rules: PreferenceRules
+    ) -> Tuple[List[NotificationChannel], bool]:
+        """
+        Hold a notification's email back for the user's digest, if enabled.
+
+        Args:
+            channels (List[NotificationChannel]): Channels to send on
+            rules (PreferenceRules): User's compiled preferences
+
+        Returns:
+            Tuple[List[NotificationChannel], bool]: Channels to send on right
+            away, and whether the notification goes into the digest
+        """
+        if not rules.digest_enabled or NotificationChannel.EMAIL not in channels:
+            return channels, False
+
+        # The first held email starts the user's digest window
+        if not rules.digest_started:
+            self.db.query(NotificationPreference).filter(
+                NotificationPreference.user_id == rules.user_id,
+                NotificationPreference.last_digest_at.is_(None),
+            ).update(
+                {NotificationPreference.last_digest_at: datetime.now(timezone.utc)},
+                synchronize_session=False,
+            )
+            rules.digest_started = True
+
+        return [c for c in channels if c != NotificationChannel.EMAIL], True
+
+    def _get_preference_rules(self, user_id: str) -> PreferenceRules:
+        """
+        Get a user's compiled notification preferences.
+
+        Args:
+            user_id (str): User ID
+
+        Returns:
+            PreferenceRules: Compiled preferences, from the cache if present
+        """
+        rules = self.preference_cache.get(user_id)
+
+        if rules is None:
+            rules = PreferenceRules.compile(self._get_or_create_preferences(user_id))
+            self.preference_cache.set(rules)
+
+        return rules
+
+    def _get_preference_rules_batch(
+        self, user_ids: List[str]
+    ) -> Dict[str, PreferenceRules]:
+        """
+        Get the compiled notification preferences of several users.
+
+        Args:
+            user_ids (List[str]): User IDs
+
+        Returns:
+            Dict[str, PreferenceRules]: Compiled preferences by user ID
+        """
+        rules_by_user: Dict[str, PreferenceRules] = {}
+        missing: List[str] = []
+
+        for user_id in dict.fromkeys(user_ids):
+            rules = self.preference_cache.get(user_id)
+            if rules is None:
+                missing.append(user_id)
+            else:
+                rules_by_user[user_id] = rules
+
+        if missing:
+            for user_id, preferences in self._get_or_create_preferences_batch(
+                missing
+            ).items():
+                rules = PreferenceRules.compile(preferences)
+                self.preference_cache.set(rules)
+                rules_by_user[user_id] = rules
+
+        return rules_by_user
+
     def _get_or_create_preferences(self, user_id: str) -> NotificationPreference:
         """
         Get or create notification preferences for a user.
@@ -422,15 +879,7 @@ class NotificationService:
 
         # Create preferences if not exists
         if not preferences:
-            preferences = NotificationPreference(
-                user_id=user_id,
-                email_enabled=True,
-                push_enabled=True,
-                sms_enabled=False,
-                in_app_enabled=True,
-                digest_enabled=False,
-                quiet_hours_enabled=False,
-            )
+            preferences = self._default_preferences(user_id)
 
             # Add preferences to database
             self.db.add(preferences)
@@ -439,38 +888,121 @@ class NotificationService:
 
         return preferences
 
+    def _get_or_create_preferences_batch(
+        self, user_ids: List[str]
+    ) -> Dict[str, NotificationPreference]:
+        """
+        Get or create notification preferences for several users.
+
+        Args:
+            user_ids (List[str]): User IDs
+
+        Returns:
+            Dict[str, NotificationPreference]: Notification preferences by user ID
+        """
+        unique_user_ids = list(dict.fromkeys(user_ids))
+        preferences_by_user: Dict[str, NotificationPreference] = {}
+
+        # Get preferences
+        for chunk in _chunks(unique_user_ids):
+            for preferences in self.db.query(NotificationPreference).filter(
+                NotificationPreference.user_id.in_(chunk)
+            ):
+                preferences_by_user[preferences.user_id] = preferences
+
+        # Create preferences if not exists
+        missing = [
+            self._default_preferences(user_id)
+            for user_id in unique_user_ids
+            if user_id not in preferences_by_user
+        ]
+
+        if missing:
+            try:
+                with self.db.begin_nested():
+                    self.db.add_all(missing)
+            except IntegrityError:
+                # Some were created concurrently; fall back to one user at a time
+                for preferences in missing:
+                    preferences_by_user[preferences.user_id] = (
+                        self._get_or_create_preferences(preferences.user_id)
+                    )
+            else:
+                preferences_by_user.update((p.user_id, p) for p in missing)
+
+        return preferences_by_user
+
+    def _default_preferences(self, user_id: str) -> NotificationPreference:
+        """
+        Build the default notification preferences of a user.
+
+        Args:
+            user_id (str): User ID
+
+        Returns:
+            NotificationPreference: Unsaved notification preferences
+        """
+        return NotificationPreference(
+            user_id=user_id,
+            email_enabled=True,
+            push_enabled=True,
+            sms_enabled=False,
+            in_app_enabled=True,
+            digest_enabled=False,
+            quiet_hours_enabled=False,
+        )
+
     def _send_notification(self, notification: Notification) -> None:
         """
-        Send notification to observers.
+        Hand a notification over to the delivery worker.
+
+        The notification is published to RabbitMQ, from where the delivery
+        worker sends it on its email, push and SMS channels, so the request
+        does not wait for the providers.
 
         Args:
             notification (Notification): Notification to send
         """
-        # Update sent_at
-        notification.sent_at = datetime.now(timezone.utc)
-        self.db.commit()
+        # The notification is committed, so a failure here must not fail the request
+        try:
+            message = self._notification_to_dict(notification)
+        except Exception as e:
+            # Log error
+            print(f"Error publishing notification to RabbitMQ: {e}")
+            return
 
-        # Notify observers
-        for observer in self.observers:
-            observer.notify(notification)
+        self._publish_notifications([(f"notification.{notification.type}", message)])
 
-        # Publish notification to RabbitMQ
-        try:
-            # Ensure connection
-            self.rabbitmq_manager.ensure_connection()
+    def _publish_notifications(
+        self, messages: List[Tuple[str, Dict[str, Any]]]
+    ) -> None:
+        """
+        Publish notifications to RabbitMQ in one confirmed batch.
+
+        Args:
+            messages (List[Tuple[str, Dict[str, Any]]]): Routing key and message
+            of each notification
+        """
+        if self.outbox is not None:
+            self.outbox.extend(messages)
+            return
 
+        try:
             # Declare exchange
             self.rabbitmq_manager.declare_exchange("notifications", "topic")
 
-            # Publish notification
-            self.rabbitmq_manager.publish(
-                exchange_name="notifications",
-                routing_key=f"notification.{notification.type}",
-                message=self._notification_to_dict(notification),
+            # Publish notifications
+            confirmed = self.rabbitmq_manager.publish_batch(
+                exchange_name="notifications", messages=messages
             )
+
+            if confirmed < len(messages):
+                print(
+                    f"RabbitMQ confirmed {confirmed} of {len(messages)} notifications"
+                )
         except Exception as e:
             # Log error
-            print(f"Error publishing notification to RabbitMQ: {e}")
+            print(f"Error publishing notifications to RabbitMQ: {e}")
 
     def _notification_to_dto(
         self, notification: Notification
@@ -543,3 +1075,84 @@ class NotificationService:
                 notification.sent_at.isoformat() if notification.sent_at is not None else None  # type: ignore
             ),
         }
+
+
+class AsyncNotificationService(AsyncService):
+    """
+    Async variant of NotificationService.
+
+    Created notifications are published with the async publisher after the
+    session work is done, so the event loop never waits on the broker.
+    """
+
+    service_class = NotificationService
+
+    async def create_notification(
+        self, notification_data: NotificationCreateDTO
+    ) -> NotificationResponseDTO:
+        """
+        Create a new notification.
+
+        Args:
+            notification_data (NotificationCreateDTO): Notification data
+
+        Returns:
+            NotificationResponseDTO: Created notification
+        """
+        return await self._run_and_publish("create_notification", notification_data)
+
+    async def create_batch_notifications(
+        self, notification_data: NotificationBatchCreateDTO
+    ) -> List[NotificationResponseDTO]:
+        """
+        Create multiple notifications at once.
+
+        Args:
+            notification_data (NotificationBatchCreateDTO): Notification data
+
+        Returns:
+            List[NotificationResponseDTO]: List of created notifications
+        """
+        return await self._run_and_publish(
+            "create_batch_notifications", notification_data
+        )
+
+    async def _run_and_publish(self, method_name: str, *args: Any) -> Any:
+        """
+        Run a method of the synchronous service and publish what it sent.
+
+        Args:
+            method_name (str): Method name
+            *args: Positional arguments for the method
+
+        Returns:
+            Any: Method result
+        """
+        outbox: List[Tuple[str, Dict[str, Any]]] = []
+
+        def _call(session: Session) -> Any:
+            service = self.service_class(session)
+            service.outbox = outbox
+            return getattr(service, method_name)(*args)
+
+        result = await self.db.run_sync(_call)
+
+        # The notifications are committed, so a failure here must not fail the
+        # request
+        if outbox:
+            try:
+                await async_publisher.declare_exchange("notifications", "topic")
+                confirmed = await async_publisher.publish_batch(
+                    "notifications", outbox
+                )
+
+                if confirmed < len(outbox):
+                    print(
+                        f"RabbitMQ confirmed {confirmed} of {len(outbox)} "
+                        "notifications"
+                    )
+            except Exception as e:
+                # Log error
+                print(f"Error publishing notifications to RabbitMQ: {e}")
+
+        return result
@@ -0,0 +1,305 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from api.notification_service.app.schemas.notification import (
+    NotificationChannel,
+    NotificationType,
+)
+from api.shared.models.notification import NotificationPreference
+
+# Load environment variables
+load_dotenv()
+
+NOTIFICATION_PREFERENCE_CACHE_SIZE = int(
+    os.getenv("NOTIFICATION_PREFERENCE_CACHE_SIZE", "10000")
+)
+NOTIFICATION_PREFERENCE_CACHE_TTL = float(
+    os.getenv("NOTIFICATION_PREFERENCE_CACHE_TTL", "60")
+)
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_time_of_day(value: Optional[str]) -> Optional[int]:
+    """
+    Parse an "HH:MM" time of day.
+
+    Args:
+        value (Optional[str]): Time of day
+
+    Returns:
+        Optional[int]: Minutes since midnight, None if missing or malformed
+    """
+    if not value:
+        return None
+
+    try:
+        hours, minutes = value.split(":")[:2]
+        minute_of_day = int(hours) * 60 + int(minutes)
+    except ValueError:
+        return None
+
+    if not 0 <= minute_of_day < MINUTES_PER_DAY:
+        return None
+
+    return minute_of_day
+
+
+class PreferenceRules:
+    """A user's notification preferences, compiled for fast evaluation"""
+
+    __slots__ = (
+        "user_id",
+        "channels",
+        "channels_by_type",
+        "quiet_hours",
+        "digest_enabled",
+        "digest_started",
+    )
+
+    def __init__(
+        self,
+        user_id: str,
+        channels: FrozenSet[NotificationChannel],
+        channels_by_type: Dict[str, FrozenSet[NotificationChannel]],
+        quiet_hours: Optional[Tuple[int, int]],
+        digest_enabled: bool,
+        digest_started: bool,
+    ) -> None:
+        """
+        Initialize PreferenceRules.
+
+        Args:
+            user_id (str): User ID
+            channels (FrozenSet[NotificationChannel]): Enabled channels
+            channels_by_type (Dict[str, FrozenSet[NotificationChannel]]):
+                Enabled channels of the notification types with overrides
+            quiet_hours (Optional[Tuple[int, int]]): Start and end of the quiet
+                hours in minutes since midnight UTC, None if disabled
+            digest_enabled (bool): Whether emails are held for a digest
+            digest_started (bool): Whether the user's digest window has started
+        """
+        self.user_id = user_id
+        self.channels = channels
+        self.channels_by_type = channels_by_type
+        self.quiet_hours = quiet_hours
+        self.digest_enabled = digest_enabled
+        self.digest_started = digest_started
+
+    @classmethod
+    def compile(cls, preferences: NotificationPreference) -> "PreferenceRules":
+        """
+        Compile a user's notification preferences.
+
+        Args:
+            preferences (NotificationPreference): User's preferences
+
+        Returns:
+            PreferenceRules: Compiled rules
+        """
+        enabled = {
+            NotificationChannel.EMAIL: preferences.email_enabled,
+            NotificationChannel.PUSH: preferences.push_enabled,
+            NotificationChannel.SMS: preferences.sms_enabled,
+            NotificationChannel.IN_APP: preferences.in_app_enabled,
+        }
+        channels = frozenset(channel for channel, on in enabled.items() if on)
+
+        # Type overrides can only turn channels off
+        channels_by_type = {
+            type_key: frozenset(
+                channel
+                for channel in channels
+                if (type_preferences or {}).get(channel.value, True)
+            )
+            for type_key, type_preferences in (
+                preferences.preferences_by_type or {}
+            ).items()
+        }
+
+        quiet_hours = None
+        if preferences.quiet_hours_enabled:
+            start = parse_time_of_day(preferences.quiet_hours_start)
+            end = parse_time_of_day(preferences.quiet_hours_end)
+            if start is not None and end is not None:
+                quiet_hours = (start, end)
+
+        return cls(
+            user_id=preferences.user_id,
+            channels=channels,
+            channels_by_type=channels_by_type,
+            quiet_hours=quiet_hours,
+            digest_enabled=bool(preferences.digest_enabled),
+            digest_started=preferences.last_digest_at is not None,
+        )
+
+    def in_quiet_hours(self, now: datetime) -> bool:
+        """
+        Check whether a time falls within the quiet hours.
+
+        Both ends are included. A window whose end is before its start, such
+        as 22:00-07:00, runs across midnight.
+
+        Args:
+            now (datetime): Time, in UTC
+
+        Returns:
+            bool: True if notifications should be quiet
+        """
+        if self.quiet_hours is None:
+            return False
+
+        start, end = self.quiet_hours
+        minute_of_day = now.hour * 60 + now.minute
+
+        if start <= end:
+            return start <= minute_of_day <= end
+        return minute_of_day >= start or minute_of_day <= end
+
+    def filter_channels(
+        self,
+        requested: List[NotificationChannel],
+        notification_type: NotificationType,
+        now: Optional[datetime] = None,
+    ) -> List[NotificationChannel]:
+        """
+        Filter the requested channels by the user's preferences.
+
+        Args:
+            requested (List[NotificationChannel]): Requested channels
+            notification_type (NotificationType): Notification type
+            now (datetime, optional): Current time
+
+        Returns:
+            List[NotificationChannel]: Channels to send the notification on
+        """
+        allowed = self.channels_by_type.get(notification_type.value, self.channels)
+        channels = [channel for channel in requested if channel in allowed]
+
+        # Only allow in-app notifications during quiet hours
+        if channels and self.in_quiet_hours(now or datetime.now(timezone.utc)):
+            channels = [c for c in channels if c == NotificationChannel.IN_APP]
+
+        return channels
+
+
+class PreferenceCache:
+    """Bounded LRU/TTL cache of compiled notification preferences"""
+
+    def __init__(
+        self,
+        max_size: int = NOTIFICATION_PREFERENCE_CACHE_SIZE,
+        ttl: float = NOTIFICATION_PREFERENCE_CACHE_TTL,
+    ):
+        """
+        Initialize PreferenceCache.
+
+        Args:
+            max_size (int, optional): Maximum number of cached users.
+            ttl (float, optional): Seconds compiled preferences are reused
+                before they are read from the database again.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        # User ID -> (rules, entry expiry)
+        self.entries: "OrderedDict[str, Tuple[PreferenceRules, float]]" = (
+            OrderedDict()
+        )
+        # Services run on several threads of the async wrapper
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[PreferenceRules]:
+        """
+        Get a user's compiled preferences.
+
+        Args:
+            user_id (str): User ID
+
+        Returns:
+            Optional[PreferenceRules]: Rules, None if not cached or expired
+        """
+        with self._lock:
+            entry = self.entries.get(user_id)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            rules, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self.entries[user_id]
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(user_id)
+            self.hits += 1
+            return rules
+
+    def set(self, rules: PreferenceRules) -> None:
+        """
+        Cache a user's compiled preferences.
+
+        Args:
+            rules (PreferenceRules): Rules
+        """
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+
+        with self._lock:
+            self.entries[rules.user_id] = (rules, time.monotonic() + self.ttl)
+            self.entries.move_to_end(rules.user_id)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: str) -> None:
+        """
+        Remove a user's compiled preferences from the cache.
+
+        Args:
+            user_id (str): User ID
+        """
+        with self._lock:
+            if self.entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Remove all users from the cache"""
+        with self._lock:
+            self.entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: Size, hit and miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Shared by all services of the process
+preference_cache = PreferenceCache()
@@ -0,0 +1,342 @@
+"""
+Delivery worker for notification observers.
+
+The notification service publishes every sent notification to the
+``notifications`` exchange and returns. This worker consumes the exchange
+and delivers the notifications on email, push and SMS, so API latency no
+longer depends on Brevo, Gotify or Twilio.
+
+Every delivery channel has its own durable queue bound to the exchange and
+a QueueConsumer with its own connection and a thread pool of
+NOTIFICATION_<CHANNEL>_CONCURRENCY threads, with the same prefetch so that
+no more messages are in flight. A failed delivery is retried through
+per-attempt delay queues, waiting NOTIFICATION_RETRY_BASE_DELAY seconds
+doubled on every attempt, up to NOTIFICATION_MAX_RETRIES times. After that, or if the message cannot be
+parsed, it is dead-lettered to the ``notifications.dead`` queue.
+
+Per-queue throughput and lag are served as JSON on
+http://0.0.0.0:NOTIFICATION_WORKER_METRICS_PORT/metrics. SIGTERM stops the
+worker once the deliveries in progress are settled.
+
+Usage (from the backend directory):
+
+    python -m api.notification_service.app.worker
+"""
+import json
+import logging
+import os
+from enum import Enum
+from typing import Any, Dict, List
+
+import pika
+from dotenv import load_dotenv
+from pika.adapters.blocking_connection import BlockingChannel
+
+from api.notification_service.app.observers.notification_observer import (
+    EmailNotificationObserver,
+    NotificationObserver,
+    PushNotificationObserver,
+    SMSNotificationObserver,
+)
+from api.notification_service.app.schemas.notification import NotificationChannel
+from api.shared.models.notification import Notification
+from api.shared.utils.metrics_server import start_metrics_server
+from api.shared.utils.rabbitmq_consumer import QueueConsumer, run_consumers
+
+# Load environment variables
+load_dotenv()
+
+# Delivery configuration
+CHANNEL_CONCURRENCY = {
+    NotificationChannel.EMAIL: int(os.getenv("NOTIFICATION_EMAIL_CONCURRENCY", "4")),
+    NotificationChannel.PUSH: int(os.getenv("NOTIFICATION_PUSH_CONCURRENCY", "8")),
+    NotificationChannel.SMS: int(os.getenv("NOTIFICATION_SMS_CONCURRENCY", "2")),
+}
+RETRY_BASE_DELAY = float(os.getenv("NOTIFICATION_RETRY_BASE_DELAY", "5"))
+MAX_RETRIES = int(os.getenv("NOTIFICATION_MAX_RETRIES", "4"))
+METRICS_PORT = int(os.getenv("NOTIFICATION_WORKER_METRICS_PORT", "8015"))
+
+EXCHANGE = "notifications"
+DEAD_LETTER_EXCHANGE = "notifications.dead-letter"
+DEAD_LETTER_QUEUE = "notifications.dead"
+ATTEMPT_HEADER = "x-delivery-attempt"
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DeliveryResult(str, Enum):
+    """Outcome of handling one message"""
+
+    DELIVERED = "delivered"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+    MALFORMED = "malformed"
+
+
+def retry_delays() -> List[float]:
+    """
+    Get the delay before every retry.
+
+    Returns:
+        List[float]: Delay in seconds before retry 1, 2, ...
+    """
+    return [RETRY_BASE_DELAY * 2**attempt for attempt in range(MAX_RETRIES)]
+
+
+def delivery_queue(channel: NotificationChannel) -> str:
+    """
+    Get the name of a delivery channel's queue.
+
+    Args:
+        channel (NotificationChannel): Delivery channel
+
+    Returns:
+        str: Queue name
+    """
+    return f"{EXCHANGE}.{channel.value}"
+
+
+def retry_queue(channel: NotificationChannel, attempt: int) -> str:
+    """
+    Get the name of the queue holding messages before a retry.
+
+    Args:
+        channel (NotificationChannel): Delivery channel
+        attempt (int): Retry number, starting at 1
+
+    Returns:
+        str: Queue name
+    """
+    return f"{delivery_queue(channel)}.retry.{attempt}"
+
+
+def declare_topology(
+    amqp_channel: BlockingChannel, channel: NotificationChannel
+) -> None:
+    """
+    Declare the exchanges and queues a delivery channel consumes from.
+
+    Messages in a retry queue expire after the retry's delay and are then
+    dead-lettered back into the delivery queue. Messages rejected by the
+    delivery queue are dead-lettered to the dead-letter queue.
+
+    Args:
+        amqp_channel (BlockingChannel): RabbitMQ channel
+        channel (NotificationChannel): Delivery channel
+    """
+    queue = delivery_queue(channel)
+
+    amqp_channel.exchange_declare(
+        exchange=EXCHANGE, exchange_type="topic", durable=True
+    )
+    amqp_channel.exchange_declare(
+        exchange=DEAD_LETTER_EXCHANGE, exchange_type="topic", durable=True
+    )
+    amqp_channel.queue_declare(queue=DEAD_LETTER_QUEUE, durable=True)
+    amqp_channel.queue_bind(
+        queue=DEAD_LETTER_QUEUE, exchange=DEAD_LETTER_EXCHANGE, routing_key="#"
+    )
+
+    amqp_channel.queue_declare(
+        queue=queue,
+        durable=True,
+        arguments={"x-dead-letter-exchange": DEAD_LETTER_EXCHANGE},
+    )
+    amqp_channel.queue_bind(
+        queue=queue, exchange=EXCHANGE, routing_key="notification.#"
+    )
+
+    for attempt, delay in enumerate(retry_delays(), start=1):
+        amqp_channel.queue_declare(
+            queue=retry_queue(channel, attempt),
+            durable=True,
+            arguments={
+                "x-message-ttl": int(delay * 1000),
+                "x-dead-letter-exchange": "",
+                "x-dead-letter-routing-key": queue,
+            },
+        )
+
+
+def notification_from_message(message: Dict[str, Any]) -> Notification:
+    """
+    Rebuild a notification from the message the notification service published.
+
+    Args:
+        message (Dict[str, Any]): Notification dictionary
+
+    Returns:
+        Notification: Transient notification, not attached to a session
+    """
+    return Notification(
+        id=message["id"],
+        user_id=message["user_id"],
+        type=message["type"],
+        title=message["title"],
+        message=message["message"],
+        priority=message.get("priority"),
+        channels=message.get("channels") or [],
+        related_entity_type=message.get("related_entity_type"),
+        related_entity_id=message.get("related_entity_id"),
+        action_url=message.get("action_url"),
+        meta_data=message.get("meta_data") or {},
+    )
+
+
+class ChannelConsumer(QueueConsumer):
+    """Deliver the notifications of one channel with bounded concurrency"""
+
+    def __init__(self, observer: NotificationObserver, concurrency: int):
+        """
+        Initialize ChannelConsumer.
+
+        Args:
+            observer (NotificationObserver): Observer delivering on the channel
+            concurrency (int): Largest number of deliveries in flight
+        """
+        super().__init__(
+            delivery_queue(observer.channel),
+            prefetch=concurrency,
+            concurrency=concurrency,
+        )
+        self.observer = observer
+        self.channel = observer.channel
+
+    def setup(self, amqp_channel: BlockingChannel) -> None:
+        """
+        Declare the exchanges and queues of the consumer's channel.
+
+        Args:
+            amqp_channel (BlockingChannel): RabbitMQ channel
+        """
+        declare_topology(amqp_channel, self.channel)
+
+    def process(
+        self, body: bytes, properties: pika.BasicProperties, redelivered: bool
+    ) -> DeliveryResult:
+        """
+        Deliver one message; retries go through the retry queues.
+
+        Args:
+            body (bytes): Message body
+            properties (pika.BasicProperties): Message properties
+            redelivered (bool): Whether the message was delivered before
+
+        Returns:
+            DeliveryResult: Outcome of the delivery
+        """
+        return self.deliver(body)
+
+    def deliver(self, body: bytes) -> DeliveryResult:
+        """
+        Deliver one message on the consumer's channel.
+
+        Args:
+            body (bytes): Message body
+
+        Returns:
+            DeliveryResult: Outcome of the delivery
+        """
+        try:
+            notification = notification_from_message(json.loads(body))
+        except (KeyError, TypeError, ValueError):
+            return DeliveryResult.MALFORMED
+
+        # Not requested on this channel, or filtered out by user preferences
+        if self.channel not in notification.channels:
+            return DeliveryResult.SKIPPED
+
+        try:
+            delivered = self.observer.deliver(notification)
+        except Exception as e:
+            logger.warning(
+                f"{self.channel.value} delivery of {notification.id} failed: {e}"
+            )
+            return DeliveryResult.FAILED
+
+        return DeliveryResult.DELIVERED if delivered else DeliveryResult.FAILED
+
+    def settle(
+        self,
+        amqp_channel: BlockingChannel,
+        delivery_tag: int,
+        properties: pika.BasicProperties,
+        body: bytes,
+        result: DeliveryResult,
+    ) -> None:
+        """
+        Acknowledge, retry or dead-letter a handled message.
+
+        Must run on the connection's thread.
+
+        Args:
+            amqp_channel (BlockingChannel): Channel the message came from
+            delivery_tag (int): Delivery tag of the message
+            properties (pika.BasicProperties): Message properties
+            body (bytes): Message body
+            result (DeliveryResult): Outcome of the delivery
+        """
+        if result in (DeliveryResult.DELIVERED, DeliveryResult.SKIPPED):
+            amqp_channel.basic_ack(delivery_tag=delivery_tag)
+            return
+
+        headers = dict(properties.headers or {})
+        attempt = int(headers.get(ATTEMPT_HEADER, 0)) + 1
+
+        if result == DeliveryResult.FAILED and attempt <= MAX_RETRIES:
+            headers[ATTEMPT_HEADER] = attempt
+            amqp_channel.basic_publish(
+                exchange="",
+                routing_key=retry_queue(self.channel, attempt),
+                body=body,
+                properties=pika.BasicProperties(
+                    delivery_mode=2,
+                    content_type=properties.content_type,
+                    headers=headers,
+                    timestamp=properties.timestamp,
+                ),
+            )
+            amqp_channel.basic_ack(delivery_tag=delivery_tag)
+            return
+
+        logger.error(
+            f"Dead-lettering {self.channel.value} message after {attempt - 1} "
+            f"retries ({result.value})"
+        )
+        amqp_channel.basic_nack(delivery_tag=delivery_tag, requeue=False)
+
+
+def create_consumers() -> List[ChannelConsumer]:
+    """
+    Create a consumer for every delivery channel.
+
+    Returns:
+        List[ChannelConsumer]: Consumers
+    """
+    observers: List[NotificationObserver] = [
+        EmailNotificationObserver(),
+        PushNotificationObserver(),
+        SMSNotificationObserver(),
+    ]
+    return [
+        ChannelConsumer(observer, CHANNEL_CONCURRENCY[observer.channel])
+        for observer in observers
+    ]
+
+
+def main() -> None:
+    """Run one consumer thread per delivery channel, with a metrics server."""
+    consumers = create_consumers()
+    start_metrics_server(
+        lambda: {c.queue: c.metrics.snapshot() for c in consumers},
+        METRICS_PORT,
+        name="worker-metrics",
+    )
+    run_consumers(consumers)
+    logger.info("Stopped notification delivery worker")
+
+
+if __name__ == "__main__":
+    main()
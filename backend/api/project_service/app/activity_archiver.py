@@ -0,0 +1,143 @@
+"""
+Archiver for cold activity logs.
+
+Activity feeds read activity_logs through indexes on (project_id,
+created_at), (entity_type, entity_id, created_at) and (user_id,
+created_at). This optional process keeps that table small by moving the
+activities older than ACTIVITY_LOG_RETENTION_DAYS to activity_logs_archive,
+ACTIVITY_ARCHIVE_BATCH_SIZE rows per transaction. On PostgreSQL the archive
+is range-partitioned by month, so old months can be detached or dropped as
+a whole.
+
+A full batch is followed by the next one straight away; otherwise the
+archiver waits ACTIVITY_ARCHIVE_INTERVAL seconds. Rows are claimed with
+SELECT ... FOR UPDATE SKIP LOCKED, so several replicas can run side by side.
+
+Usage (from the backend directory):
+
+    python -m api.project_service.app.activity_archiver
+"""
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from api.project_service.app.services.activity_service import ActivityService
+from api.shared.models.base import get_utc_now
+from api.shared.utils.db import SessionLocal
+
+# Load environment variables
+load_dotenv()
+
+# Archive configuration
+RETENTION_DAYS = int(os.getenv("ACTIVITY_LOG_RETENTION_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ACTIVITY_ARCHIVE_BATCH_SIZE", "1000"))
+ARCHIVE_INTERVAL = float(os.getenv("ACTIVITY_ARCHIVE_INTERVAL", "3600"))
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ActivityArchiver:
+    """Move activity logs older than the retention to the archive in batches"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        retention_days: int = RETENTION_DAYS,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+    ):
+        """
+        Initialize ActivityArchiver.
+
+        Args:
+            session_factory (Callable[[], Session], optional): Session factory
+            retention_days (int, optional): Days activities stay in
+                activity_logs
+            batch_size (int, optional): Largest number of rows moved at once
+        """
+        self.session_factory = session_factory
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.archived = 0
+
+    def archive_once(self, now: Optional[datetime] = None) -> int:
+        """
+        Move one batch of activities past the retention.
+
+        Args:
+            now (datetime, optional): Current time. Defaults to now.
+
+        Returns:
+            int: Number of activities moved
+        """
+        # created_at is stored as naive UTC
+        cutoff = (now or get_utc_now()).replace(tzinfo=None) - timedelta(
+            days=self.retention_days
+        )
+
+        with self.session_factory() as db:
+            try:
+                moved = ActivityService(db).archive_activities(
+                    cutoff, self.batch_size
+                )
+            except Exception as e:
+                logger.error(f"Error archiving activity logs: {e}")
+                return 0
+
+        self.archived += moved
+        return moved
+
+    def archive_all(self, now: Optional[datetime] = None) -> int:
+        """
+        Move all activities past the retention, one batch at a time.
+
+        Args:
+            now (datetime, optional): Current time. Defaults to now.
+
+        Returns:
+            int: Number of activities moved
+        """
+        moved = 0
+
+        while True:
+            batch = self.archive_once(now)
+            moved += batch
+
+            if batch < self.batch_size:
+                return moved
+
+    def run_forever(self, interval: float = ARCHIVE_INTERVAL) -> None:
+        """
+        Archive activities until interrupted.
+
+        Args:
+            interval (float, optional): Seconds to wait after a partial batch
+        """
+        logger.info(
+            f"Archiving activity logs older than {self.retention_days} days, "
+            f"{self.batch_size} at a time"
+        )
+
+        while True:
+            moved = self.archive_all()
+            if moved:
+                logger.info(f"Archived {moved} activity logs")
+            time.sleep(interval)
+
+
+def main() -> None:
+    """Run the archiver."""
+    try:
+        ActivityArchiver().run_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopping activity log archiver")
+
+
+if __name__ == "__main__":
+    main()
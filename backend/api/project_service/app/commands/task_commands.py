@@ -1,11 +1,128 @@
+import os
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
 
-from api.shared.exceptions.project_exceptions import TaskNotFoundException
-from api.shared.models.project import Task
+from api.shared.exceptions.project_exceptions import (
+    NoTaskCommandException,
+    TaskNotFoundException,
+)
+from api.shared.models.project import Task, TaskCommandHistory
+
+# Load environment variables
+load_dotenv()
+
+# Undo/redo entries kept per task; older ones are deleted
+TASK_COMMAND_HISTORY_LIMIT = int(os.getenv("TASK_COMMAND_HISTORY_LIMIT", "20"))
+
+# Task fields commands may change
+TASK_COMMAND_FIELDS = (
+    "title",
+    "description",
+    "assignee_id",
+    "due_date",
+    "priority",
+    "status",
+    "tags",
+    "meta_data",
+)
+
+
+def _encode(value: Any) -> Any:
+    """
+    Make a task field value JSON-serializable.
+
+    Args:
+        value (Any): Field value
+
+    Returns:
+        Any: Serializable value
+    """
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _decode(field: str, value: Any) -> Any:
+    """
+    Restore a task field value stored by _encode.
+
+    Args:
+        field (str): Field name
+        value (Any): Stored value
+
+    Returns:
+        Any: Field value
+    """
+    if field == "due_date" and isinstance(value, str):
+        return datetime.fromisoformat(value)
+
+    return value
+
+
+def apply_task_changes(task: Task, values: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """
+    Set task fields and return what changed.
+
+    Args:
+        task (Task): Task
+        values (Dict[str, Any]): New field values; other fields are ignored
+
+    Returns:
+        Dict[str, List[Any]]: Changed fields, as {field: [before, after]} with
+        JSON-serializable values
+    """
+    changes: Dict[str, List[Any]] = {}
+
+    for field, value in values.items():
+        if field not in TASK_COMMAND_FIELDS:
+            continue
+
+        value = _decode(field, value)
+        before = getattr(task, field)
+
+        if before != value:
+            changes[field] = [_encode(before), _encode(value)]
+            setattr(task, field, value)
+
+    if changes:
+        task.updated_at = datetime.now(timezone.utc)
+
+    return changes
+
+
+def lock_task(db: Session, task_id: str, project_id: Optional[str] = None) -> Task:
+    """
+    Get a task, locking it until the transaction ends.
+
+    Concurrent commands, undos and redos of the task are serialized on the
+    lock. Request handlers pass the project from the URL, so a task ID of
+    another project is not found.
+
+    Args:
+        db (Session): Database session
+        task_id (str): Task ID
+        project_id (str, optional): Project the task must belong to
+
+    Returns:
+        Task: Task
+
+    Raises:
+        TaskNotFoundException: If task not found in the project
+    """
+    query = db.query(Task).filter(Task.id == task_id)
+
+    if project_id is not None:
+        query = query.filter(Task.project_id == project_id)
+
+    task = query.with_for_update().first()
+
+    if not task:
+        raise TaskNotFoundException()
+
+    return task
 
 
 class Command(ABC):
@@ -21,62 +138,88 @@ class Command(ABC):
 
 
 class TaskCommand(Command):
-    """Base task command"""
+    """
+    Base task command.
+
+    Executing a command records the fields it changed, so it can be undone
+    and kept in the task's history as a small state diff. Commands do not
+    commit; CommandInvoker commits the change with its history entry.
+    """
 
-    def __init__(self, db: Session, task_id: str):
+    name = "update"
+
+    def __init__(self, db: Session, task_id: str, project_id: Optional[str] = None):
         """
         Initialize TaskCommand.
 
         Args:
             db (Session): Database session
             task_id (str): Task ID
+            project_id (str, optional): Project the task must belong to
         """
         self.db = db
         self.task_id = task_id
+        self.project_id = project_id
         self.task = self._get_task()
-        self.previous_state = self._get_task_state()
+        self.changes: Dict[str, List[Any]] = {}
 
-    def _get_task(self) -> Task:
+    @abstractmethod
+    def values(self) -> Dict[str, Any]:
         """
-        Get task.
+        Get the field values the command sets.
 
         Returns:
-            Task: Task
+            Dict[str, Any]: New field values
+        """
 
-        Raises:
-            TaskNotFoundException: If task not found
+    def execute(self) -> Task:
         """
-        task = self.db.query(Task).filter(Task.id == self.task_id).first()
+        Execute the command.
 
-        if not task:
-            raise TaskNotFoundException()
+        Returns:
+            Task: Updated task
+        """
+        self.changes = apply_task_changes(self.task, self.values())
+        return self.task
 
-        return task
+    def undo(self) -> Task:
+        """
+        Undo the command.
 
-    def _get_task_state(self) -> Dict[str, Any]:
+        Returns:
+            Task: Restored task
+        """
+        apply_task_changes(
+            self.task, {field: before for field, (before, _) in self.changes.items()}
+        )
+        self.changes = {}
+        return self.task
+
+    def _get_task(self) -> Task:
         """
-        Get task state.
+        Get task, locking it until the command is committed.
 
         Returns:
-            Dict[str, Any]: Task state
+            Task: Task
+
+        Raises:
+            TaskNotFoundException: If task not found in the command's project
         """
-        return {
-            "title": self.task.title,
-            "description": self.task.description,
-            "assignee_id": self.task.assignee_id,
-            "due_date": self.task.due_date,
-            "priority": self.task.priority,
-            "status": self.task.status,
-            "tags": (self.task.tags or {}),
-            "meta_data": (self.task.meta_data or {}),
-            "created_at": self.task.created_at.isoformat(),
-        }
+        return lock_task(self.db, self.task_id, self.project_id)
 
 
 class UpdateTaskCommand(TaskCommand):
     """Command to update a task"""
 
-    def __init__(self, db: Session, task_id: str, updates: Dict[str, Any]):
+    name = "update"
+
+    def __init__(
+        self,
+        db: Session,
+        task_id: str,
+        updates: Dict[str, Any],
+        project_id: Optional[str] = None,
+    ):
         """
         Initialize UpdateTaskCommand.
 
@@ -84,53 +227,33 @@ class UpdateTaskCommand(TaskCommand):
             db (Session): Database session
             task_id (str): Task ID
             updates (Dict[str, Any]): Task updates
+            project_id (str, optional): Project the task must belong to
         """
-        super().__init__(db, task_id)
+        super().__init__(db, task_id, project_id)
         self.updates = updates
 
-    def execute(self) -> Task:
-        """
-        Execute the command.
-
-        Returns:
-            Task: Updated task
-        """
-        # Update task
-        for key, value in self.updates.items():
-            if hasattr(self.task, key):
-                setattr(self.task, key, value)
-
-        # Update task in database
-        self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
-
-        return self.task
-
-    def undo(self) -> Task:
+    def values(self) -> Dict[str, Any]:
         """
-        Undo the command.
+        Get the field values the command sets.
 
         Returns:
-            Task: Restored task
+            Dict[str, Any]: Task updates
         """
-        # Restore task state
-        for key, value in self.previous_state.items():
-            if hasattr(self.task, key):
-                setattr(self.task, key, value)
-
-        # Update task in database
-        self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
-
-        return self.task
+        return self.updates
 
 
 class AssignTaskCommand(TaskCommand):
     """Command to assign a task"""
 
-    def __init__(self, db: Session, task_id: str, assignee_id: Optional[str]):
+    name = "assign"
+
+    def __init__(
+        self,
+        db: Session,
+        task_id: str,
+        assignee_id: Optional[str],
+        project_id: Optional[str] = None,
+    ):
         """
         Initialize AssignTaskCommand.
 
@@ -138,49 +261,33 @@ class AssignTaskCommand(TaskCommand):
             db (Session): Database session
             task_id (str): Task ID
             assignee_id (Optional[str]): Assignee ID
+            project_id (str, optional): Project the task must belong to
         """
-        super().__init__(db, task_id)
+        super().__init__(db, task_id, project_id)
         self.assignee_id = assignee_id
 
-    def execute(self) -> Task:
-        """
-        Execute the command.
-
-        Returns:
-            Task: Updated task
-        """
-        # Update task
-        self.task.assignee_id = self.assignee_id
-
-        # Update task in database
-        self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
-
-        return self.task
-
-    def undo(self) -> Task:
+    def values(self) -> Dict[str, Any]:
         """
-        Undo the command.
+        Get the field values the command sets.
 
         Returns:
-            Task: Restored task
+            Dict[str, Any]: New assignee
         """
-        # Restore task state
-        self.task.assignee_id = self.previous_state["assignee_id"]
-
-        # Update task in database
-        self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
-
-        return self.task
+        return {"assignee_id": self.assignee_id}
 
 
 class ChangeTaskStatusCommand(TaskCommand):
     """Command to change task status"""
 
-    def __init__(self, db: Session, task_id: str, status: str):
+    name = "change_status"
+
+    def __init__(
+        self,
+        db: Session,
+        task_id: str,
+        status: str,
+        project_id: Optional[str] = None,
+    ):
         """
         Initialize ChangeTaskStatusCommand.
 
@@ -188,100 +295,169 @@ class ChangeTaskStatusCommand(TaskCommand):
             db (Session): Database session
             task_id (str): Task ID
             status (str): Task status
+            project_id (str, optional): Project the task must belong to
         """
-        super().__init__(db, task_id)
+        super().__init__(db, task_id, project_id)
         self.status = status
 
-    def execute(self) -> Task:
+    def values(self) -> Dict[str, Any]:
         """
-        Execute the command.
+        Get the field values the command sets.
 
         Returns:
-            Task: Updated task
+            Dict[str, Any]: New status
         """
-        # Update task
-        self.task.status = self.status
+        return {"status": self.status}
 
-        # Update task in database
-        self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
 
-        return self.task
+class CommandInvoker:
+    """
+    Command invoker with a persistent undo/redo history per task.
 
-    def undo(self) -> Task:
-        """
-        Undo the command.
+    History entries live in task_command_history, so undo and redo work
+    from any worker and across restarts. Each task keeps its last
+    history_limit entries; executing a command discards the task's redo
+    entries. Create one invoker per request session.
+    """
 
-        Returns:
-            Task: Restored task
+    def __init__(self, db: Session, history_limit: int = TASK_COMMAND_HISTORY_LIMIT):
         """
-        # Restore task state
-        self.task.status = self.previous_state["status"]
+        Initialize CommandInvoker.
 
-        # Update task in database
-        self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
+        Args:
+            db (Session): Database session
+            history_limit (int, optional): Entries kept per task
+        """
+        self.db = db
+        self.history_limit = history_limit
 
-        return self.task
+    def execute_command(
+        self, command: TaskCommand, user_id: Optional[str] = None
+    ) -> Task:
+        """
+        Execute a command and record it in its task's history.
 
+        Args:
+            command (TaskCommand): Command to execute
+            user_id (str, optional): User executing the command
 
-class CommandInvoker:
-    """Command invoker"""
+        Returns:
+            Task: Updated task
+        """
+        task = command.execute()
+
+        if command.changes:
+            # A new command makes the undone ones unreachable
+            self._history(command.task_id).filter(
+                TaskCommandHistory.undone == True
+            ).delete(synchronize_session=False)
+
+            sequence = (
+                self.db.query(func.max(TaskCommandHistory.sequence))
+                .filter(TaskCommandHistory.task_id == command.task_id)
+                .scalar()
+                or 0
+            ) + 1
+            self.db.add(
+                TaskCommandHistory(
+                    task_id=command.task_id,
+                    sequence=sequence,
+                    user_id=user_id,
+                    command=command.name,
+                    changes=command.changes,
+                    undone=False,
+                )
+            )
+
+            # Cap the task's history
+            self._history(command.task_id).filter(
+                TaskCommandHistory.sequence <= sequence - self.history_limit
+            ).delete(synchronize_session=False)
 
-    def __init__(self):
-        """Initialize CommandInvoker"""
-        self.history: List[Command] = []
-        self.undo_history: List[Command] = []
+        self.db.commit()
+        self.db.refresh(task)
+        return task
 
-    def execute_command(self, command: Command) -> Any:
+    def undo(self, task_id: str, project_id: Optional[str] = None) -> Task:
         """
-        Execute a command.
+        Undo the last command of a task.
 
         Args:
-            command (Command): Command to execute
+            task_id (str): Task ID
+            project_id (str, optional): Project the task must belong to
 
         Returns:
-            Any: Command result
+            Task: Restored task
+
+        Raises:
+            TaskNotFoundException: If task not found in the project
+            NoTaskCommandException: If no commands to undo
         """
-        result = command.execute()
-        self.history.append(command)
-        self.undo_history = []
-        return result
+        task = lock_task(self.db, task_id, project_id)
+        entry = (
+            self._history(task_id)
+            .filter(TaskCommandHistory.undone == False)
+            .order_by(TaskCommandHistory.sequence.desc())
+            .first()
+        )
+
+        if entry is None:
+            raise NoTaskCommandException("No commands to undo")
+
+        apply_task_changes(
+            task, {field: before for field, (before, _) in entry.changes.items()}
+        )
+        entry.undone = True
+        self.db.commit()
+        self.db.refresh(task)
+        return task
 
-    def undo(self) -> Any:
+    def redo(self, task_id: str, project_id: Optional[str] = None) -> Task:
         """
-        Undo the last command.
+        Redo the last undone command of a task.
+
+        Args:
+            task_id (str): Task ID
+            project_id (str, optional): Project the task must belong to
 
         Returns:
-            Any: Command result
+            Task: Updated task
 
         Raises:
-            Exception: If no commands to undo
+            TaskNotFoundException: If task not found in the project
+            NoTaskCommandException: If no commands to redo
         """
-        if not self.history:
-            raise Exception("No commands to undo")
-
-        command = self.history.pop()
-        result = command.undo()
-        self.undo_history.append(command)
-        return result
+        task = lock_task(self.db, task_id, project_id)
+        entry = (
+            self._history(task_id)
+            .filter(TaskCommandHistory.undone == True)
+            .order_by(TaskCommandHistory.sequence.asc())
+            .first()
+        )
+
+        if entry is None:
+            raise NoTaskCommandException("No commands to redo")
+
+        apply_task_changes(
+            task, {field: after for field, (_, after) in entry.changes.items()}
+        )
+        entry.undone = False
+        self.db.commit()
+        self.db.refresh(task)
+        return task
 
-    def redo(self) -> Any:
+    def _history(self, task_id: str) -> Query:
         """
-        Redo the last undone command.
+        Query the history entries of a task.
 
-        Returns:
-            Any: Command result
+        Callers lock the task with lock_task first, which checks its project.
 
-        Raises:
-            Exception: If no commands to redo
-        """
-        if not self.undo_history:
-            raise Exception("No commands to redo")
+        Args:
+            task_id (str): Task ID
 
-        command = self.undo_history.pop()
-        result = command.execute()
-        self.history.append(command)
-        return result
+        Returns:
+            Query: History entry query
+        """
+        return self.db.query(TaskCommandHistory).filter(
+            TaskCommandHistory.task_id == task_id
+        )
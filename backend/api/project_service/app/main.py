@@ -1,16 +1,25 @@
-from typing import Any, List, Optional
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional
 
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, Path, Query, Security, Header
+from fastapi import (
+    Depends,
+    FastAPI,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    Security,
+    Header,
+)
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.project_service.app.commands.task_commands import (
-    AssignTaskCommand,
-    ChangeTaskStatusCommand,
-    CommandInvoker,
-)
 from api.shared.middleware.auth_middleware import auth_middleware
 from api.project_service.app.schemas.activity import ActivityLogResponseDTO
 from api.project_service.app.schemas.project import (
@@ -22,27 +31,66 @@ from api.project_service.app.schemas.project import (
     ProjectUpdateDTO,
 )
 from api.project_service.app.schemas.task import (
+    SortOrder,
+    TaskBulkUpdateDTO,
+    TaskBulkUpdateResponseDTO,
     TaskCommentCreateDTO,
     TaskCommentResponseDTO,
     TaskCreateDTO,
+    TaskFilterDTO,
+    TaskImportResponseDTO,
+    TaskPriority,
     TaskResponseDTO,
+    TaskSortField,
+    TaskStatus,
+    TaskTransferFormat,
     TaskUpdateDTO,
 )
-from api.project_service.app.services.activity_service import ActivityService
-from api.project_service.app.services.project_service import ProjectService
-from api.project_service.app.services.task_service import TaskService
+from api.project_service.app.services.activity_service import AsyncActivityService
+from api.project_service.app.services.activity_writer import activity_writer
+from api.project_service.app.services.project_service import (
+    AsyncProjectService,
+)
+from api.project_service.app.services.task_service import AsyncTaskService
+from api.project_service.app.services.task_transfer_service import (
+    TASK_TRANSFER_MEDIA_TYPES,
+    AsyncTaskTransferService,
+    TaskTransferService,
+)
 from api.shared.exceptions.auth_exceptions import InvalidTokenException
-from api.shared.utils.db import get_db
+from api.shared.utils.db import (
+    SessionLocal,
+    get_async_db,
+    get_async_pool_stats,
+    get_db,
+    get_pool_stats,
+)
 from api.shared.utils.jwt import decode_token
 
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Flush the queued activity logs on shutdown.
+
+    Args:
+        app (FastAPI): FastAPI app
+    """
+    try:
+        yield
+    finally:
+        activity_writer.close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="TaskHub Project Service",
     description="Project management service for TaskHub platform",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -57,10 +105,6 @@ app.add_middleware(
 # Create OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-# Create command invoker
-command_invoker = CommandInvoker()
-
-
 # A dependency to get the user ID, assuming it's always provided by the gateway for protected routes
 async def get_current_user(x_user_id: Optional[str] = Header(None, alias="X-User-ID")) -> str:
     if not x_user_id:
@@ -72,7 +116,7 @@ async def get_current_user(x_user_id: Optional[str] = Header(None, alias="X-User
 @app.post("/projects", response_model=ProjectResponseDTO, tags=["Projects"])
 async def create_project(
     project_data: ProjectCreateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -80,38 +124,38 @@ async def create_project(
 
     Args:
         project_data (ProjectCreateDTO): Project data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ProjectResponseDTO: Created project
     """
-    project_service = ProjectService(db)
-    return project_service.create_project(project_data, user_id)
+    project_service = AsyncProjectService(db)
+    return await project_service.create_project(project_data, user_id)
 
 
 @app.get("/projects", response_model=List[ProjectResponseDTO], tags=["Projects"])
 async def get_user_projects(
-    db: Session = Depends(get_db), user_id: str = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)
 ):
     """
     Get projects for current user.
 
     Args:
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[ProjectResponseDTO]: List of projects
     """
-    project_service = ProjectService(db)
-    return project_service.get_user_projects(user_id)
+    project_service = AsyncProjectService(db)
+    return await project_service.get_user_projects(user_id)
 
 
 @app.get("/projects/{project_id}", response_model=ProjectResponseDTO, tags=["Projects"])
 async def get_project(
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -119,21 +163,21 @@ async def get_project(
 
     Args:
         project_id (str): Project ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ProjectResponseDTO: Project
     """
-    project_service = ProjectService(db)
-    return project_service.get_project(project_id, user_id)
+    project_service = AsyncProjectService(db)
+    return await project_service.get_project(project_id, user_id)
 
 
 @app.put("/projects/{project_id}", response_model=ProjectResponseDTO, tags=["Projects"])
 async def update_project(
     project_data: ProjectUpdateDTO,
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -142,20 +186,20 @@ async def update_project(
     Args:
         project_data (ProjectUpdateDTO): Project data
         project_id (str): Project ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ProjectResponseDTO: Updated project
     """
-    project_service = ProjectService(db)
-    return project_service.update_project(project_id, project_data, user_id)
+    project_service = AsyncProjectService(db)
+    return await project_service.update_project(project_id, project_data, user_id)
 
 
 @app.delete("/projects/{project_id}", tags=["Projects"])
 async def delete_project(
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -163,14 +207,14 @@ async def delete_project(
 
     Args:
         project_id (str): Project ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Delete response
     """
-    project_service = ProjectService(db)
-    return project_service.delete_project(project_id, user_id)
+    project_service = AsyncProjectService(db)
+    return await project_service.delete_project(project_id, user_id)
 
 
 # Project members endpoints
@@ -182,7 +226,7 @@ async def delete_project(
 async def add_project_member(
     member_data: ProjectMemberCreateDTO,
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -191,14 +235,14 @@ async def add_project_member(
     Args:
         member_data (ProjectMemberCreateDTO): Member data
         project_id (str): Project ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ProjectMemberResponseDTO: Added project member
     """
-    project_service = ProjectService(db)
-    return project_service.add_project_member(project_id, member_data, user_id)
+    project_service = AsyncProjectService(db)
+    return await project_service.add_project_member(project_id, member_data, user_id)
 
 
 @app.get(
@@ -208,7 +252,7 @@ async def add_project_member(
 )
 async def get_project_members(
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -216,14 +260,14 @@ async def get_project_members(
 
     Args:
         project_id (str): Project ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[ProjectMemberResponseDTO]: List of project members
     """
-    project_service = ProjectService(db)
-    return project_service.get_project_members(project_id, user_id)
+    project_service = AsyncProjectService(db)
+    return await project_service.get_project_members(project_id, user_id)
 
 
 @app.put(
@@ -235,7 +279,7 @@ async def update_project_member(
     member_data: ProjectMemberUpdateDTO,
     project_id: str = Path(..., description="Project ID"),
     member_id: str = Path(..., description="Member ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -245,14 +289,14 @@ async def update_project_member(
         member_data (ProjectMemberUpdateDTO): Member data
         project_id (str): Project ID
         member_id (str): Member ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ProjectMemberResponseDTO: Updated project member
     """
-    project_service = ProjectService(db)
-    return project_service.update_project_member(
+    project_service = AsyncProjectService(db)
+    return await project_service.update_project_member(
         project_id, member_id, member_data, user_id
     )
 
@@ -261,7 +305,7 @@ async def update_project_member(
 async def remove_project_member(
     project_id: str = Path(..., description="Project ID"),
     member_id: str = Path(..., description="Member ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -270,14 +314,14 @@ async def remove_project_member(
     Args:
         project_id (str): Project ID
         member_id (str): Member ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Remove response
     """
-    project_service = ProjectService(db)
-    return project_service.remove_project_member(project_id, member_id, user_id)
+    project_service = AsyncProjectService(db)
+    return await project_service.remove_project_member(project_id, member_id, user_id)
 
 
 # Task endpoints
@@ -287,7 +331,7 @@ async def remove_project_member(
 async def create_task(
     task_data: TaskCreateDTO,
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -296,37 +340,181 @@ async def create_task(
     Args:
         task_data (TaskCreateDTO): Task data
         project_id (str): Project ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Created task
     """
-    task_service = TaskService(db)
-    return task_service.create_task(project_id, task_data, user_id)
+    task_service = AsyncTaskService(db)
+    return await task_service.create_task(project_id, task_data, user_id)
+
+
+@app.post(
+    "/projects/{project_id}/tasks/bulk",
+    response_model=TaskBulkUpdateResponseDTO,
+    tags=["Tasks"],
+)
+async def bulk_update_tasks(
+    bulk_data: TaskBulkUpdateDTO,
+    project_id: str = Path(..., description="Project ID"),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Change the status, assignee or priority of many tasks in one transaction.
+
+    Args:
+        bulk_data (TaskBulkUpdateDTO): Task updates
+        project_id (str): Project ID
+        db (AsyncSession): Async database session
+        user_id (str): User ID
+
+    Returns:
+        TaskBulkUpdateResponseDTO: Result per task
+    """
+    task_service = AsyncTaskService(db)
+    return await task_service.bulk_update_tasks(project_id, bulk_data, user_id)
+
+
+@app.get("/projects/{project_id}/tasks/export", tags=["Tasks"])
+def export_project_tasks(
+    project_id: str = Path(..., description="Project ID"),
+    format: TaskTransferFormat = Query(
+        TaskTransferFormat.NDJSON, description="Export format"
+    ),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Stream all tasks of a project as CSV or NDJSON.
+
+    The tasks are read through a server-side cursor on a session of their own,
+    which is closed once the response has been sent.
+
+    Args:
+        project_id (str): Project ID
+        format (TaskTransferFormat): Export format
+        user_id (str): User ID
+
+    Returns:
+        StreamingResponse: Exported tasks
+    """
+    db = SessionLocal()
+    try:
+        chunks = TaskTransferService(db).export_tasks(project_id, user_id, format)
+    except Exception:
+        db.close()
+        raise
+
+    return StreamingResponse(
+        chunks,
+        media_type=TASK_TRANSFER_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="tasks-{project_id}.{format.value}"'
+            )
+        },
+        background=BackgroundTask(db.close),
+    )
+
+
+@app.post(
+    "/projects/{project_id}/tasks/import",
+    response_model=TaskImportResponseDTO,
+    tags=["Tasks"],
+)
+async def import_project_tasks(
+    request: Request,
+    project_id: str = Path(..., description="Project ID"),
+    format: TaskTransferFormat = Query(
+        TaskTransferFormat.NDJSON, description="Import format"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Import tasks into a project from a CSV or NDJSON request body.
+
+    The body is read as it arrives and inserted in batches, so its size is
+    not limited by memory. Invalid rows are skipped and reported.
+
+    Args:
+        request (Request): Request, whose body holds the tasks
+        project_id (str): Project ID
+        format (TaskTransferFormat): Import format
+        db (AsyncSession): Async database session
+        user_id (str): User ID
+
+    Returns:
+        TaskImportResponseDTO: Counts, first errors and throughput
+    """
+    task_service = AsyncTaskTransferService(db)
+    return await task_service.import_tasks(
+        project_id, user_id, request.stream(), format
+    )
 
 
 @app.get(
     "/projects/{project_id}/tasks", response_model=List[TaskResponseDTO], tags=["Tasks"]
 )
 async def get_project_tasks(
+    response: Response,
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    status: Optional[List[TaskStatus]] = Query(None, description="Task status"),
+    priority: Optional[List[TaskPriority]] = Query(None, description="Task priority"),
+    assignee_id: Optional[str] = Query(None, description="Assignee ID"),
+    due_after: Optional[datetime] = Query(None, description="Earliest due date"),
+    due_before: Optional[datetime] = Query(None, description="Latest due date"),
+    tags: Optional[List[str]] = Query(None, description="Tags the task must have"),
+    sort: TaskSortField = Query(TaskSortField.CREATED_AT, description="Sort field"),
+    order: SortOrder = Query(SortOrder.ASC, description="Sort order"),
+    limit: int = Query(100, ge=1, le=500, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page"),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
-    Get tasks for a project.
+    Get a page of tasks for a project.
+
+    The cursor of the next page is returned in the X-Next-Cursor header, which
+    is absent on the last page.
 
     Args:
+        response (Response): Response
         project_id (str): Project ID
-        db (Session): Database session
+        status (List[TaskStatus], optional): Task statuses to include
+        priority (List[TaskPriority], optional): Task priorities to include
+        assignee_id (str, optional): Assignee ID
+        due_after (datetime, optional): Earliest due date, inclusive
+        due_before (datetime, optional): Latest due date, inclusive
+        tags (List[str], optional): Tags the task must all have
+        sort (TaskSortField): Sort field
+        order (SortOrder): Sort order
+        limit (int): Page size
+        cursor (str, optional): Cursor of the next page
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[TaskResponseDTO]: List of tasks
     """
-    task_service = TaskService(db)
-    return task_service.get_project_tasks(project_id, user_id)
+    filters = TaskFilterDTO(
+        status=status,
+        priority=priority,
+        assignee_id=assignee_id,
+        due_after=due_after,
+        due_before=due_before,
+        tags=tags,
+    )
+    task_service = AsyncTaskService(db)
+    page = await task_service.get_project_tasks(
+        project_id, user_id, filters, sort, order, limit, cursor
+    )
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+
+    return page.items
 
 
 @app.get(
@@ -337,7 +525,7 @@ async def get_project_tasks(
 async def get_task(
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -346,14 +534,14 @@ async def get_task(
     Args:
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Task
     """
-    task_service = TaskService(db)
-    return task_service.get_task(project_id, task_id, user_id)
+    task_service = AsyncTaskService(db)
+    return await task_service.get_task(project_id, task_id, user_id)
 
 
 @app.put(
@@ -365,7 +553,7 @@ async def update_task(
     task_data: TaskUpdateDTO,
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -375,21 +563,21 @@ async def update_task(
         task_data (TaskUpdateDTO): Task data
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Updated task
     """
-    task_service = TaskService(db)
-    return task_service.update_task(project_id, task_id, task_data, user_id)
+    task_service = AsyncTaskService(db)
+    return await task_service.update_task(project_id, task_id, task_data, user_id)
 
 
 @app.delete("/projects/{project_id}/tasks/{task_id}", tags=["Tasks"])
 async def delete_task(
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -398,14 +586,14 @@ async def delete_task(
     Args:
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Delete response
     """
-    task_service = TaskService(db)
-    return task_service.delete_task(project_id, task_id, user_id)
+    task_service = AsyncTaskService(db)
+    return await task_service.delete_task(project_id, task_id, user_id)
 
 
 # Task comments endpoints
@@ -418,7 +606,7 @@ async def add_task_comment(
     comment_data: TaskCommentCreateDTO,
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -428,14 +616,16 @@ async def add_task_comment(
         comment_data (TaskCommentCreateDTO): Comment data
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskCommentResponseDTO: Added comment
     """
-    task_service = TaskService(db)
-    return task_service.add_task_comment(project_id, task_id, comment_data, user_id)
+    task_service = AsyncTaskService(db)
+    return await task_service.add_task_comment(
+        project_id, task_id, comment_data, user_id
+    )
 
 
 @app.get(
@@ -446,7 +636,7 @@ async def add_task_comment(
 async def get_task_comments(
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -455,14 +645,14 @@ async def get_task_comments(
     Args:
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[TaskCommentResponseDTO]: List of comments
     """
-    task_service = TaskService(db)
-    return task_service.get_task_comments(project_id, task_id, user_id)
+    task_service = AsyncTaskService(db)
+    return await task_service.get_task_comments(project_id, task_id, user_id)
 
 
 # Activity endpoints
@@ -472,33 +662,47 @@ async def get_task_comments(
     tags=["Activities"],
 )
 async def get_project_activities(
+    response: Response,
     project_id: str = Path(..., description="Project ID"),
-    limit: int = Query(100, description="Limit"),
-    offset: int = Query(0, description="Offset"),
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=500, description="Limit"),
+    offset: int = Query(0, ge=0, description="Offset, ignored with a cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page"),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
-    Get activities for a project.
+    Get activities for a project, newest first.
+
+    The cursor of the next page is returned in the X-Next-Cursor header, which
+    is absent on the last page.
 
     Args:
+        response (Response): Response
         project_id (str): Project ID
         limit (int): Limit
-        offset (int): Offset
-        db (Session): Database session
+        offset (int): Offset, ignored with a cursor
+        cursor (str, optional): Cursor of the next page
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[ActivityLogResponseDTO]: List of activities
     """
     # Check if user is a project member
-    project_service = ProjectService(db)
-    project_service.get_project(
+    project_service = AsyncProjectService(db)
+    await project_service.get_project(
         project_id, user_id
     )  # This will raise an exception if user is not a project member
 
-    activity_service = ActivityService(db)
-    return activity_service.get_project_activities(project_id, limit, offset)
+    activity_service = AsyncActivityService(db)
+    page = await activity_service.get_project_activities(
+        project_id, limit, offset, cursor
+    )
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+
+    return page.items
 
 
 # Command pattern endpoints
@@ -511,7 +715,7 @@ async def assign_task(
     assignee_id: Optional[str] = Query(None, description="Assignee ID"),
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -521,51 +725,14 @@ async def assign_task(
         assignee_id (Optional[str]): Assignee ID
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Updated task
     """
-    # Check if user is a project member
-    project_service = ProjectService(db)
-    project_service.get_project(
-        project_id, user_id
-    )  # This will raise an exception if user is not a project member
-
-    # Create command
-    command = AssignTaskCommand(db, task_id, assignee_id)
-
-    # Execute command
-    task = command_invoker.execute_command(command)
-
-    # Log activity
-    activity_service = ActivityService(db)
-    activity_service.log_activity(
-        project_id=project_id,
-        user_id=user_id,
-        action="assign",
-        entity_type="task",
-        entity_id=task_id,
-        details={"assignee_id": assignee_id},
-    )
-
-    # Return task
-    return TaskResponseDTO(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        project_id=task.project_id,
-        creator_id=task.creator_id,
-        assignee_id=task.assignee_id,
-        due_date=task.due_date,
-        priority=task.priority,
-        status=task.status,
-        tags=list(task.tags) if task.tags is not None else [],
-        meta_data=(task.metadata or {}),
-        created_at=task.created_at,
-        updated_at=task.updated_at,
-    )
+    task_service = AsyncTaskService(db)
+    return await task_service.assign_task(project_id, task_id, assignee_id, user_id)
 
 
 @app.post(
@@ -574,63 +741,28 @@ async def assign_task(
     tags=["Task Commands"],
 )
 async def change_task_status(
-    status: str = Query(..., description="Task status"),
+    status: TaskStatus = Query(..., description="Task status"),
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
     Change task status.
 
     Args:
-        status (str): Task status
+        status (TaskStatus): Task status
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Updated task
     """
-    # Check if user is a project member
-    project_service = ProjectService(db)
-    project_service.get_project(
-        project_id, user_id
-    )  # This will raise an exception if user is not a project member
-
-    # Create command
-    command = ChangeTaskStatusCommand(db, task_id, status)
-
-    # Execute command
-    task = command_invoker.execute_command(command)
-
-    # Log activity
-    activity_service = ActivityService(db)
-    activity_service.log_activity(
-        project_id=project_id,
-        user_id=user_id,
-        action="change_status",
-        entity_type="task",
-        entity_id=task_id,
-        details={"status": status},
-    )
-
-    # Return task
-    return TaskResponseDTO(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        project_id=task.project_id,
-        creator_id=task.creator_id,
-        assignee_id=task.assignee_id,
-        due_date=task.due_date,
-        priority=task.priority,
-        status=task.status,
-        tags=list(task.tags) if task.tags is not None else [],
-        metadata=(task.metadata or {}),
-        created_at=task.created_at,
-        updated_at=task.updated_at,
+    task_service = AsyncTaskService(db)
+    return await task_service.change_task_status(
+        project_id, task_id, status.value, user_id
     )
 
 
@@ -642,7 +774,7 @@ async def change_task_status(
 async def undo_task_command(
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -651,51 +783,14 @@ async def undo_task_command(
     Args:
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Updated task
     """
-    # Check if user is a project member
-    project_service = ProjectService(db)
-    project_service.get_project(
-        project_id, user_id
-    )  # This will raise an exception if user is not a project member
-
-    try:
-        # Undo command
-        task = command_invoker.undo()
-
-        # Log activity
-        activity_service = ActivityService(db)
-        activity_service.log_activity(
-            project_id=project_id,
-            user_id=user_id,
-            action="undo",
-            entity_type="task",
-            entity_id=task_id,
-            details=None,
-        )
-
-        # Return task
-        return TaskResponseDTO(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            project_id=task.project_id,
-            creator_id=task.creator_id,
-            assignee_id=task.assignee_id,
-            due_date=task.due_date,
-            priority=task.priority,
-            status=task.status,
-            tags=list(task.tags) if task.tags is not None else [],
-            metadata=(task.metadata or {}),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    task_service = AsyncTaskService(db)
+    return await task_service.undo_task_command(project_id, task_id, user_id)
 
 
 @app.post(
@@ -706,7 +801,7 @@ async def undo_task_command(
 async def redo_task_command(
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -715,51 +810,14 @@ async def redo_task_command(
     Args:
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Updated task
     """
-    # Check if user is a project member
-    project_service = ProjectService(db)
-    project_service.get_project(
-        project_id, user_id
-    )  # This will raise an exception if user is not a project member
-
-    try:
-        # Redo command
-        task = command_invoker.redo()
-
-        # Log activity
-        activity_service = ActivityService(db)
-        activity_service.log_activity(
-            project_id=project_id,
-            user_id=user_id,
-            action="redo",
-            entity_type="task",
-            entity_id=task_id,
-            details=None,
-        )
-
-        # Return task
-        return TaskResponseDTO(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            project_id=task.project_id,
-            creator_id=task.creator_id,
-            assignee_id=task.assignee_id,
-            due_date=task.due_date,
-            priority=task.priority,
-            status=task.status,
-            tags=list(task.tags) if task.tags is not None else [],
-            metadata=(task.metadata or {}),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    task_service = AsyncTaskService(db)
+    return await task_service.redo_task_command(project_id, task_id, user_id)
 
 
 @app.get("/health", tags=["Health"])
@@ -772,6 +830,22 @@ async def health_check() -> Any:
     """
     return {"status": "healthy"}
 
+
+@app.get("/metrics", tags=["Health"])
+async def get_metrics() -> Any:
+    """
+    Get service metrics.
+
+    Returns:
+        Dict[str, Any]: Database pool utilisation and checkout wait times, for
+        the sync and async engines, and the activity log writer's queue
+    """
+    return {
+        "db_pool": get_pool_stats(),
+        "async_db_pool": get_async_pool_stats(),
+        "activity_log_writer": activity_writer.get_stats(),
+    }
+
 # Export para tests de integración
 get_db = get_db
 get_current_user = get_current_user
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -24,3 +24,10 @@ class ActivityLogResponseDTO(BaseModel):
     entity_id: str
     details: Optional[Dict[str, Any]] = None
     created_at: datetime
+
+
+class ActivityPageDTO(BaseModel):
+    """DTO for a page of activity logs"""
+
+    items: List[ActivityLogResponseDTO]
+    next_cursor: Optional[str] = None
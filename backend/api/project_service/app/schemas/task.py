@@ -23,6 +23,29 @@ class TaskStatus(str, Enum):
     DONE = "done"
 
 
+class TaskSortField(str, Enum):
+    """Enum for task list sort fields"""
+
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    DUE_DATE = "due_date"
+    TITLE = "title"
+
+
+class SortOrder(str, Enum):
+    """Enum for sort order"""
+
+    ASC = "asc"
+    DESC = "desc"
+
+
+class TaskTransferFormat(str, Enum):
+    """Enum for task import and export formats"""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 class TaskCreateDTO(BaseModel):
     """DTO for creating a new task"""
 
@@ -67,6 +90,76 @@ class TaskResponseDTO(BaseModel):
     updated_at: Optional[datetime] = None
 
 
+class TaskFilterDTO(BaseModel):
+    """DTO for task list filters"""
+
+    status: Optional[List[TaskStatus]] = None
+    priority: Optional[List[TaskPriority]] = None
+    assignee_id: Optional[str] = None
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+    tags: Optional[List[str]] = None
+
+
+class TaskPageDTO(BaseModel):
+    """DTO for a page of tasks"""
+
+    items: List[TaskResponseDTO]
+    next_cursor: Optional[str] = None
+
+
+
+class TaskBulkUpdateItemDTO(BaseModel):
+    """DTO for one task of a bulk update"""
+
+    task_id: str
+    status: Optional[TaskStatus] = None
+    # An explicit null unassigns the task; leaving it out keeps the assignee
+    assignee_id: Optional[str] = None
+    priority: Optional[TaskPriority] = None
+
+
+class TaskBulkUpdateDTO(BaseModel):
+    """DTO for updating many tasks of a project at once"""
+
+    updates: List[TaskBulkUpdateItemDTO] = Field(..., min_length=1, max_length=1000)
+
+
+class TaskBulkResultDTO(BaseModel):
+    """DTO for the result of one task of a bulk update"""
+
+    task_id: str
+    success: bool
+    error: Optional[str] = None
+    error_code: Optional[str] = None
+
+
+class TaskBulkUpdateResponseDTO(BaseModel):
+    """DTO for bulk update response"""
+
+    results: List[TaskBulkResultDTO]
+    updated: int
+    failed: int
+
+
+class TaskImportErrorDTO(BaseModel):
+    """DTO for a rejected row of a task import"""
+
+    line: int
+    error: str
+
+
+class TaskImportResponseDTO(BaseModel):
+    """DTO for task import response"""
+
+    imported: int
+    failed: int
+    # The first rejected rows, up to TASK_IMPORT_MAX_ERRORS
+    errors: List[TaskImportErrorDTO]
+    elapsed_seconds: float
+    rows_per_second: float
+
+
 class TaskCommentCreateDTO(BaseModel):
     """DTO for creating a task comment"""
 
@@ -1,22 +1,52 @@
-from typing import Any, Dict, List, Optional
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, text, tuple_
+from sqlalchemy.orm import Query, Session
 
-from api.project_service.app.schemas.activity import ActivityLogResponseDTO
-from api.shared.models.project import ActivityLog
+from api.project_service.app.schemas.activity import (
+    ActivityLogResponseDTO,
+    ActivityPageDTO,
+)
+from api.project_service.app.services.activity_writer import (
+    ActivityLogWriter,
+    activity_writer,
+)
+from api.shared.exceptions.project_exceptions import InvalidActivityCursorException
+from api.shared.models.base import get_utc_now
+from api.shared.models.project import ActivityLog, ActivityLogArchive
+from api.shared.utils.async_service import AsyncService
+from api.shared.utils.pagination import decode_cursor, encode_cursor
+
+# Columns copied to activity_logs_archive
+ARCHIVE_COLUMNS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "project_id",
+    "user_id",
+    "action",
+    "entity_type",
+    "entity_id",
+    "details",
+)
 
 
 class ActivityService:
     """Service for activity log operations"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, writer: Optional[ActivityLogWriter] = None):
         """
         Initialize ActivityService.
 
         Args:
             db (Session): Database session
+            writer (ActivityLogWriter, optional): Writer activities are queued
+                on. Defaults to the process's activity_writer.
         """
         self.db = db
+        self.writer = writer or activity_writer
 
     def log_activity(
         self,
@@ -26,10 +56,15 @@ class ActivityService:
         entity_type: str,
         entity_id: str,
         details: Optional[Dict[str, Any]] = None,
+        in_transaction: bool = False,
     ) -> ActivityLogResponseDTO:
         """
         Log an activity.
 
+        The row is queued on the buffered writer and inserted with the next
+        batch, so the caller's request pays no commit for it. When the writer
+        is in sync mode, it is inserted and committed on this session.
+
         Args:
             project_id (str): Project ID
             user_id (str): User ID
@@ -37,115 +72,242 @@ class ActivityService:
             entity_type (str): Entity type
             entity_id (str): Entity ID
             details (Dict[str, Any], optional): Activity details
+            in_transaction (bool, optional): Insert the row on this session
+                without committing, so it is committed along with the
+                caller's changes
 
         Returns:
             ActivityLogResponseDTO: Logged activity
         """
-        # Create activity log
-        activity_log = ActivityLog(
-            project_id=project_id,
-            user_id=user_id,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            details=details,
-        )
+        # Build the row with its generated columns, so it needs no refresh
+        now = get_utc_now()
+        row = {
+            "id": str(uuid.uuid4()),
+            "project_id": project_id,
+            "user_id": user_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "details": details,
+            "created_at": now,
+            "updated_at": now,
+        }
 
-        # Add activity log to database
-        self.db.add(activity_log)
-        self.db.commit()
-        self.db.refresh(activity_log)
+        if in_transaction:
+            self.db.execute(insert(ActivityLog), [row])
+        elif self.writer.buffered:
+            self.writer.write(row)
+        else:
+            self.db.execute(insert(ActivityLog), [row])
+            self.db.commit()
 
         # Return activity log
-        return self._activity_log_to_dto(activity_log)
+        return self._activity_log_to_dto(ActivityLog(**row))
 
     def get_project_activities(
-        self, project_id: str, limit: int = 100, offset: int = 0
-    ) -> List[ActivityLogResponseDTO]:
+        self,
+        project_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> ActivityPageDTO:
         """
-        Get activities for a project.
+        Get activities for a project, newest first.
 
         Args:
             project_id (str): Project ID
             limit (int, optional): Limit. Defaults to 100.
-            offset (int, optional): Offset. Defaults to 0.
+            offset (int, optional): Offset, ignored with a cursor. Defaults to 0.
+            cursor (str, optional): Cursor of the previous page
 
         Returns:
-            List[ActivityLogResponseDTO]: List of activities
+            ActivityPageDTO: Activities and the cursor of the next page
 
         Raises:
-            ProjectNotFoundException: If project not found
-        """
-        # Get activities
-        activities = (
-            self.db.query(ActivityLog)
-            .filter(ActivityLog.project_id == project_id)
-            .order_by(ActivityLog.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+            InvalidActivityCursorException: If the cursor is invalid
+        """
+        query = self.db.query(ActivityLog).filter(ActivityLog.project_id == project_id)
 
-        # Return activities
-        return [self._activity_log_to_dto(activity) for activity in activities]
+        # Return page
+        return self._activity_page(query, limit, offset, cursor)
 
     def get_entity_activities(
-        self, entity_type: str, entity_id: str, limit: int = 100, offset: int = 0
-    ) -> List[ActivityLogResponseDTO]:
+        self,
+        entity_type: str,
+        entity_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> ActivityPageDTO:
         """
-        Get activities for an entity.
+        Get activities for an entity, newest first.
 
         Args:
             entity_type (str): Entity type
             entity_id (str): Entity ID
             limit (int, optional): Limit. Defaults to 100.
-            offset (int, optional): Offset. Defaults to 0.
+            offset (int, optional): Offset, ignored with a cursor. Defaults to 0.
+            cursor (str, optional): Cursor of the previous page
 
         Returns:
-            List[ActivityLogResponseDTO]: List of activities
-        """
-        # Get activities
-        activities = (
-            self.db.query(ActivityLog)
-            .filter(
-                ActivityLog.entity_type == entity_type,
-                ActivityLog.entity_id == entity_id,
-            )
-            .order_by(ActivityLog.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+            ActivityPageDTO: Activities and the cursor of the next page
+
+        Raises:
+            InvalidActivityCursorException: If the cursor is invalid
+        """
+        query = self.db.query(ActivityLog).filter(
+            ActivityLog.entity_type == entity_type,
+            ActivityLog.entity_id == entity_id,
         )
 
-        # Return activities
-        return [self._activity_log_to_dto(activity) for activity in activities]
+        # Return page
+        return self._activity_page(query, limit, offset, cursor)
 
     def get_user_activities(
-        self, user_id: str, limit: int = 100, offset: int = 0
-    ) -> List[ActivityLogResponseDTO]:
+        self,
+        user_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> ActivityPageDTO:
         """
-        Get activities for a user.
+        Get activities for a user, newest first.
 
         Args:
             user_id (str): User ID
             limit (int, optional): Limit. Defaults to 100.
-            offset (int, optional): Offset. Defaults to 0.
+            offset (int, optional): Offset, ignored with a cursor. Defaults to 0.
+            cursor (str, optional): Cursor of the previous page
 
         Returns:
-            List[ActivityLogResponseDTO]: List of activities
-        """
-        # Get activities
-        activities = (
-            self.db.query(ActivityLog)
-            .filter(ActivityLog.user_id == user_id)
-            .order_by(ActivityLog.created_at.desc())
-            .offset(offset)
-            .limit(limit)
+            ActivityPageDTO: Activities and the cursor of the next page
+
+        Raises:
+            InvalidActivityCursorException: If the cursor is invalid
+        """
+        query = self.db.query(ActivityLog).filter(ActivityLog.user_id == user_id)
+
+        # Return page
+        return self._activity_page(query, limit, offset, cursor)
+
+    def archive_activities(self, before: datetime, batch_size: int = 1000) -> int:
+        """
+        Move the oldest activities created before a time to the archive.
+
+        Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+        archivers can run side by side. On PostgreSQL the monthly partitions
+        of activity_logs_archive the rows fall in are created as needed.
+
+        Args:
+            before (datetime): Activities created before this time are moved
+            batch_size (int, optional): Largest number of activities moved.
+                Defaults to 1000.
+
+        Returns:
+            int: Number of activities moved
+        """
+        rows = (
+            self.db.query(ActivityLog.id, ActivityLog.created_at)
+            .filter(ActivityLog.created_at < before)
+            .order_by(ActivityLog.created_at, ActivityLog.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
             .all()
         )
 
+        if not rows:
+            return 0
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            for month in {(row.created_at.year, row.created_at.month) for row in rows}:
+                self._ensure_archive_partition(*month)
+
+        # Copy the rows and delete them in the same transaction
+        ids = [row.id for row in rows]
+        self.db.execute(
+            insert(ActivityLogArchive).from_select(
+                ARCHIVE_COLUMNS,
+                select(*[getattr(ActivityLog, c) for c in ARCHIVE_COLUMNS]).where(
+                    ActivityLog.id.in_(ids)
+                ),
+            )
+        )
+        self.db.query(ActivityLog).filter(ActivityLog.id.in_(ids)).delete(
+            synchronize_session=False
+        )
+        self.db.commit()
+
+        return len(ids)
+
+    def _ensure_archive_partition(self, year: int, month: int) -> None:
+        """
+        Create the archive partition of a month if it does not exist.
+
+        Args:
+            year (int): Year
+            month (int): Month
+        """
+        start = date(year, month, 1)
+        end = date(year + month // 12, month % 12 + 1, 1)
+        self.db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS activity_logs_archive_{year}_{month:02d} "
+                "PARTITION OF activity_logs_archive "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+        )
+
+    def _activity_page(
+        self, query: Query, limit: int, offset: int, cursor: Optional[str]
+    ) -> ActivityPageDTO:
+        """
+        Get a page of activities, newest first.
+
+        With a cursor, the page starts after the activity it points to instead
+        of skipping offset rows, so it is read from the feed's index in the
+        same time however deep it is.
+
+        Args:
+            query (Query): Filtered activity query
+            limit (int): Limit
+            offset (int): Offset, ignored with a cursor
+            cursor (str, optional): Cursor of the previous page
+
+        Returns:
+            ActivityPageDTO: Activities and the cursor of the next page
+
+        Raises:
+            InvalidActivityCursorException: If the cursor is invalid
+        """
+        query = query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc())
+
+        if cursor is not None:
+            try:
+                created_at, activity_id = decode_cursor(cursor)  # type: ignore
+                created_at = datetime.fromisoformat(created_at)
+            except (TypeError, ValueError):
+                raise InvalidActivityCursorException()
+
+            query = query.filter(
+                tuple_(ActivityLog.created_at, ActivityLog.id)
+                < tuple_(created_at, activity_id)
+            )
+        elif offset:
+            query = query.offset(offset)
+
+        # Get one activity more than the page to know whether another follows
+        activities = query.limit(limit + 1).all()
+        next_cursor = None
+
+        if len(activities) > limit:
+            activities = activities[:limit]
+            next_cursor = encode_cursor(activities[-1].created_at, activities[-1].id)
+
         # Return activities
-        return [self._activity_log_to_dto(activity) for activity in activities]
+        return ActivityPageDTO(
+            items=[self._activity_log_to_dto(activity) for activity in activities],
+            next_cursor=next_cursor,
+        )
 
     def _activity_log_to_dto(self, activity_log: ActivityLog) -> ActivityLogResponseDTO:
         """
@@ -167,3 +329,9 @@ class ActivityService:
             details=(activity_log.details or {}),
             created_at=activity_log.created_at,
         )
+
+
+class AsyncActivityService(AsyncService):
+    """Async variant of ActivityService"""
+
+    service_class = ActivityService
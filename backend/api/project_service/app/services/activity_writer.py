@@ -0,0 +1,274 @@
+"""Buffered writer that inserts activity logs in batches from a thread"""
+import atexit
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+
+from api.shared.models.project import ActivityLog
+
+# Load environment variables
+load_dotenv()
+
+# Writer configuration
+ACTIVITY_LOG_MODE = os.getenv("ACTIVITY_LOG_MODE", "buffered").lower()
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "500"))
+ACTIVITY_LOG_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_LOG_FLUSH_INTERVAL", "0.5"))
+# Rows kept for a retry while the database is unavailable
+ACTIVITY_LOG_MAX_PENDING = int(os.getenv("ACTIVITY_LOG_MAX_PENDING", "50000"))
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogWriter:
+    """Queue activity log rows and insert them in batches from a thread"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        batch_size: int = ACTIVITY_LOG_BATCH_SIZE,
+        flush_interval: float = ACTIVITY_LOG_FLUSH_INTERVAL,
+        max_pending: int = ACTIVITY_LOG_MAX_PENDING,
+        buffered: bool = ACTIVITY_LOG_MODE != "sync",
+    ):
+        """
+        Initialize ActivityLogWriter.
+
+        Args:
+            session_factory (Callable[[], Session], optional): Creates the
+                sessions batches are inserted with. Defaults to SessionLocal.
+            batch_size (int, optional): Rows that trigger an early flush and
+                largest number of rows per INSERT
+            flush_interval (float, optional): Seconds between flushes
+            max_pending (int, optional): Largest number of queued rows kept
+                when a flush fails
+            buffered (bool, optional): Whether rows are queued; when False,
+                ActivityService writes them on the request's session
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.buffered = buffered
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.dropped = 0
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """
+        Queue an activity log row.
+
+        Args:
+            row (Dict[str, Any]): ActivityLog column values, including id and
+                created_at
+        """
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.batch_size
+
+            if self._thread is None:
+                self._start()
+
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Insert the queued rows.
+
+        Returns:
+            int: Number of rows inserted
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+
+            if not rows:
+                return 0
+
+            try:
+                self._insert(rows)
+            except Exception as e:
+                if _is_transient(e) or not isinstance(e, (IntegrityError, DataError)):
+                    self._discard(rows, e)
+                    return 0
+
+                logger.warning("Retrying %s activity logs one by one: %s", len(rows), e)
+                written = self._insert_each(rows)
+            else:
+                written = len(rows)
+
+            self.written += written
+            return written
+
+    def close(self) -> None:
+        """Stop the flush thread and insert the rows still queued"""
+        self._stopping.set()
+        self._wakeup.set()
+        thread = self._thread
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get writer statistics.
+
+        Returns:
+            Dict[str, Any]: Mode, queued, written and dropped rows
+        """
+        with self._lock:
+            pending = len(self._pending)
+
+        return {
+            "mode": "buffered" if self.buffered else "sync",
+            "pending": pending,
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+    def _session(self) -> Session:
+        """
+        Open a session for a batch.
+
+        Returns:
+            Session: Database session
+        """
+        if self.session_factory is None:
+            from api.shared.utils.db import SessionLocal
+
+            self.session_factory = SessionLocal
+
+        return self.session_factory()
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert rows in batch_size INSERTs and one transaction.
+
+        Args:
+            rows (List[Dict[str, Any]]): Rows to insert
+        """
+        db = self._session()
+        try:
+            for offset in range(0, len(rows), self.batch_size):
+                db.execute(insert(ActivityLog), rows[offset : offset + self.batch_size])
+            db.commit()
+        finally:
+            db.close()
+
+    def _insert_each(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert rows one per transaction, dropping those the database rejects.
+
+        Args:
+            rows (List[Dict[str, Any]]): Rows of a rejected batch
+
+        Returns:
+            int: Number of rows inserted
+        """
+        written = 0
+        index = 0
+        db = self._session()
+        try:
+            for index, row in enumerate(rows):
+                try:
+                    db.execute(insert(ActivityLog), [row])
+                    db.commit()
+                except (IntegrityError, DataError) as e:
+                    if _is_transient(e):
+                        raise
+
+                    db.rollback()
+                    self._discard([row], e)
+                else:
+                    written += 1
+        except Exception as e:
+            db.rollback()
+            self._discard(rows[index:], e)
+        finally:
+            db.close()
+
+        return written
+
+    def _discard(self, rows: List[Dict[str, Any]], error: Exception) -> None:
+        """
+        Queue rows again when error is transient, otherwise drop them.
+
+        Args:
+            rows (List[Dict[str, Any]]): Rows that were not inserted
+            error (Exception): Error raised while inserting them
+        """
+        if _is_transient(error):
+            self._requeue(rows)
+            logger.error("Failed to write %s activity logs: %s", len(rows), error)
+            return
+
+        with self._lock:
+            self.dropped += len(rows)
+
+        ids = ", ".join(str(row.get("id")) for row in rows[:10])
+        logger.error("Dropped %s activity logs (%s): %s", len(rows), ids, error)
+
+    def _requeue(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Put rows of a failed flush back in front of the queue.
+
+        Args:
+            rows (List[Dict[str, Any]]): Rows that were not inserted
+        """
+        with self._lock:
+            self._pending = rows + self._pending
+            overflow = len(self._pending) - self.max_pending
+
+            if overflow > 0:
+                # Oldest rows go first
+                del self._pending[:overflow]
+                self.dropped += overflow
+                logger.error("Dropped %s activity logs", overflow)
+
+    def _start(self) -> None:
+        """Start the flush thread; called with the lock held"""
+        self._thread = threading.Thread(
+            target=self._run, name="activity-log-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        """Flush on every interval or early flush until closed"""
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+def _is_transient(error: Exception) -> bool:
+    """
+    Check whether a failed insert may succeed when retried later.
+
+    Args:
+        error (Exception): Error raised by the insert
+
+    Returns:
+        bool: True for lost or unavailable database connections
+    """
+    if isinstance(error, OperationalError):
+        return True
+
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+# Writer shared by the services of the process
+activity_writer = ActivityLogWriter()
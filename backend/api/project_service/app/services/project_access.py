@@ -0,0 +1,122 @@
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from api.shared.exceptions.project_exceptions import (
+    NotProjectMemberException,
+    ProjectNotFoundException,
+    TaskNotFoundException,
+)
+from api.shared.models.project import Project, ProjectMember, Task
+
+# Key of the memo in Session.info, which lives as long as the request's session
+MEMO_KEY = "project_access"
+
+# (project ID, user ID, task ID)
+AccessKey = Tuple[str, str, Optional[str]]
+
+
+class ProjectAccess(NamedTuple):
+    """Project, the requesting user's membership and an optional task"""
+
+    project: Project
+    member: ProjectMember
+    task: Optional[Task] = None
+
+
+class ProjectAccessResolver:
+    """
+    Resolve membership-checked project and task access in one query.
+
+    The project, the user's membership row and, when asked for, the task are
+    fetched with a single outer-joined SELECT instead of one query each. The
+    result is memoized in the session's info dict, so repeated checks within
+    the same request do not hit the database again.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize ProjectAccessResolver.
+
+        Args:
+            db (Session): Database session
+        """
+        self.db = db
+
+    def _memo(self) -> Dict[AccessKey, ProjectAccess]:
+        """
+        Get the per-request memo.
+
+        Returns:
+            Dict[AccessKey, ProjectAccess]: Resolved access by key
+        """
+        return self.db.info.setdefault(MEMO_KEY, {})
+
+    def resolve(
+        self, project_id: str, user_id: str, task_id: Optional[str] = None
+    ) -> ProjectAccess:
+        """
+        Resolve a user's access to a project and optionally one of its tasks.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            task_id (str, optional): Task ID
+
+        Returns:
+            ProjectAccess: Project, membership and task
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+            TaskNotFoundException: If task not found
+        """
+        key = (project_id, user_id, task_id)
+        memo = self._memo()
+
+        if key in memo:
+            return memo[key]
+
+        query = self.db.query(Project, ProjectMember).outerjoin(
+            ProjectMember,
+            and_(
+                ProjectMember.project_id == Project.id,
+                ProjectMember.user_id == user_id,
+            ),
+        )
+
+        if task_id is not None:
+            query = query.add_entity(Task).outerjoin(
+                Task, and_(Task.project_id == Project.id, Task.id == task_id)
+            )
+
+        row = query.filter(Project.id == project_id).first()
+
+        # Check if project exists
+        if not row or not row[0]:
+            raise ProjectNotFoundException()
+
+        # Check if user is a project member
+        if not row[1]:
+            raise NotProjectMemberException()
+
+        # Check if task exists
+        if task_id is not None and not row[2]:
+            raise TaskNotFoundException()
+
+        access = ProjectAccess(*row)
+        memo[key] = access
+        return access
+
+    def forget(self, project_id: str) -> None:
+        """
+        Drop memoized access to a project after its members or tasks change.
+
+        Args:
+            project_id (str): Project ID
+        """
+        memo = self._memo()
+
+        for key in [key for key in memo if key[0] == project_id]:
+            del memo[key]
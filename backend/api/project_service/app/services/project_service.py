@@ -13,12 +13,13 @@ from api.project_service.app.schemas.project import (
     ProjectUpdateDTO,
 )
 from api.project_service.app.services.activity_service import ActivityService
+from api.project_service.app.services.project_access import ProjectAccessResolver
 from api.shared.exceptions.project_exceptions import (
     InsufficientProjectRoleException,
-    NotProjectMemberException,
     ProjectNotFoundException,
 )
 from api.shared.models.project import Project, ProjectMember
+from api.shared.utils.async_service import AsyncService
 
 
 class ProjectService:
@@ -33,6 +34,7 @@ class ProjectService:
         """
         self.db = db
         self.activity_service = ActivityService(db)
+        self.access = ProjectAccessResolver(db)
 
     def create_project(
         self, project_data: ProjectCreateDTO, user_id: str
@@ -104,24 +106,8 @@ class ProjectService:
             ProjectNotFoundException: If project not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        # Get project, checking membership in the same query
+        project = self.access.resolve(project_id, user_id).project
 
         # Return project
         return self._project_to_dto(project)
@@ -145,24 +131,8 @@ class ProjectService:
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        # Get project and membership in one query
+        project, project_member, _ = self.access.resolve(project_id, user_id)
 
         # Check if user has sufficient role
         if project_member.role not in ["owner", "admin"]:
@@ -224,24 +194,8 @@ class ProjectService:
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        # Get project and membership in one query
+        project, project_member, _ = self.access.resolve(project_id, user_id)
 
         # Check if user has sufficient role
         if project_member.role != "owner":
@@ -249,7 +203,8 @@ class ProjectService:
                 "Only project owner can delete the project"
             )
 
-        # Log activity before deletion
+        # Log activity in the deleting transaction, as the project is gone
+        # by the time a buffered batch would be written
         self.activity_service.log_activity(
             project_id=project.id,
             user_id=user_id,
@@ -257,11 +212,13 @@ class ProjectService:
             entity_type="project",
             entity_id=str(project.id),
             details=None,
+            in_transaction=True,
         )
 
         # Delete project
         self.db.delete(project)
         self.db.commit()
+        self.access.forget(project_id)
 
         # Return success response
         return {"message": "Project deleted successfully"}
@@ -309,24 +266,8 @@ class ProjectService:
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        # Get membership, checking the project in the same query
+        project_member = self.access.resolve(project_id, user_id).member
 
         # Check if user has sufficient role
         if project_member.role not in ["owner", "admin"]:
@@ -411,24 +352,8 @@ class ProjectService:
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        # Get membership, checking the project in the same query
+        project_member = self.access.resolve(project_id, user_id).member
 
         # Check if user has sufficient role
         if project_member.role not in ["owner", "admin"]:
@@ -491,24 +416,8 @@ class ProjectService:
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        # Get membership, checking the project in the same query
+        project_member = self.access.resolve(project_id, user_id).member
 
         # Get member to remove
         member_to_remove = (
@@ -546,6 +455,7 @@ class ProjectService:
         # Remove member
         self.db.delete(member_to_remove)
         self.db.commit()
+        self.access.forget(project_id)
 
         # Return success response
         return {"message": "Project member removed successfully"}
@@ -567,24 +477,8 @@ class ProjectService:
             ProjectNotFoundException: If project not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        # Check that the project exists and the user is a member
+        self.access.resolve(project_id, user_id)
 
         # Get project members
         project_members = (
@@ -639,3 +533,9 @@ class ProjectService:
             role=project_member.role,
             joined_at=project_member.joined_at,
         )
+
+
+class AsyncProjectService(AsyncService):
+    """Async variant of ProjectService"""
+
+    service_class = ProjectService
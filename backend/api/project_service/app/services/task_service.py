@@ -1,27 +1,75 @@
+import operator
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, and_, cast, func, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import InstrumentedAttribute, Query, Session
+from sqlalchemy.sql import ColumnElement
 
-from api.project_service.app.commands.task_commands import ChangeTaskStatusCommand
+from api.project_service.app.commands.task_commands import (
+    AssignTaskCommand,
+    ChangeTaskStatusCommand,
+    CommandInvoker,
+)
 from api.project_service.app.schemas.task import (
+    SortOrder,
     TaskCommentCreateDTO,
+    TaskBulkResultDTO,
+    TaskBulkUpdateDTO,
+    TaskBulkUpdateResponseDTO,
     TaskCommentResponseDTO,
     TaskCreateDTO,
+    TaskFilterDTO,
+    TaskPageDTO,
     TaskPriority,
     TaskResponseDTO,
+    TaskSortField,
     TaskStatus,
     TaskUpdateDTO,
 )
 from api.project_service.app.services.activity_service import ActivityService
+from api.project_service.app.services.project_access import ProjectAccessResolver
+from api.shared.exceptions.base_exceptions import (
+    BadRequestException,
+    BaseAPIException,
+)
 from api.shared.exceptions.project_exceptions import (
     InsufficientProjectRoleException,
+    InvalidTaskCursorException,
     InvalidTaskStatusTransitionException,
     NotProjectMemberException,
-    ProjectNotFoundException,
     TaskNotFoundException,
 )
-from api.shared.models.project import Project, ProjectMember, Task, TaskComment
+from api.shared.models.project import (
+    ProjectMember,
+    Task,
+    TaskCommandHistory,
+    TaskComment,
+)
+from api.shared.utils.async_service import AsyncService
+from api.shared.utils.pagination import decode_cursor, encode_cursor
+
+# Allowed task status transitions, e.g. a task can't go from todo to done
+TASK_STATUS_TRANSITIONS: Dict[str, List[str]] = {
+    "todo": ["in_progress"],
+    "in_progress": ["todo", "review"],
+    "review": ["in_progress", "done"],
+    "done": ["review"],
+}
+VALID_STATUS_PAIRS = {
+    (current, new)
+    for current, allowed in TASK_STATUS_TRANSITIONS.items()
+    for new in allowed
+}
+
+# Sortable task columns and whether they can be NULL
+TASK_SORT_COLUMNS: Dict[TaskSortField, Tuple[InstrumentedAttribute[Any], bool]] = {
+    TaskSortField.CREATED_AT: (Task.created_at, False),
+    TaskSortField.UPDATED_AT: (Task.updated_at, True),
+    TaskSortField.DUE_DATE: (Task.due_date, True),
+    TaskSortField.TITLE: (Task.title, False),
+}
 
 
 class TaskService:
@@ -36,6 +84,7 @@ class TaskService:
         """
         self.db = db
         self.activity_service = ActivityService(db)
+        self.access = ProjectAccessResolver(db)
 
     def create_task(
         self, project_id: str, task_data: TaskCreateDTO, user_id: str
@@ -55,24 +104,8 @@ class TaskService:
             ProjectNotFoundException: If project not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        # Check that the project exists and the user is a member
+        self.access.resolve(project_id, user_id)
 
         # Create task
         task = Task(
@@ -123,35 +156,8 @@ class TaskService:
             TaskNotFoundException: If task not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
-
-        # Get task
-        task = (
-            self.db.query(Task)
-            .filter(Task.id == task_id, Task.project_id == project_id)
-            .first()
-        )
-
-        # Check if task exists
-        if not task:
-            raise TaskNotFoundException()
+        # Get task, checking project and membership in the same query
+        task = self.access.resolve(project_id, user_id, task_id).task
 
         # Return task
         return self._task_to_dto(task)
@@ -178,35 +184,8 @@ class TaskService:
             InsufficientProjectRoleException: If user has insufficient role
             InvalidTaskStatusTransitionException: If task status transition is invalid
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
-
-        # Get task
-        task = (
-            self.db.query(Task)
-            .filter(Task.id == task_id, Task.project_id == project_id)
-            .first()
-        )
-
-        # Check if task exists
-        if not task:
-            raise TaskNotFoundException()
+        # Get project, membership and task in one query
+        _, project_member, task = self.access.resolve(project_id, user_id, task_id)
 
         # Check if user has sufficient role to update task
         is_task_creator = task.creator_id == user_id
@@ -220,16 +199,7 @@ class TaskService:
 
         # Check if status transition is valid
         if task_data.status is not None and task_data.status != task.status:
-            # Implement status transition validation logic here
-            # For example, you can't move from 'todo' to 'done' directly
-            valid_transitions = {
-                "todo": ["in_progress"],
-                "in_progress": ["todo", "review"],
-                "review": ["in_progress", "done"],
-                "done": ["review"],
-            }
-
-            if task_data.status not in valid_transitions.get(task.status, []):
+            if (task.status, task_data.status.value) not in VALID_STATUS_PAIRS:
                 raise InvalidTaskStatusTransitionException(
                     f"Cannot transition from '{task.status}' to '{task_data.status}'"
                 )
@@ -265,8 +235,10 @@ class TaskService:
             task.priority = task_data.priority
 
         if task_data.status is not None:
-            command = ChangeTaskStatusCommand(self.db, task_id, task_data.status.value)
-            task = command_invoker.execute_command(command)
+            command = ChangeTaskStatusCommand(
+                self.db, task_id, task_data.status.value, project_id
+            )
+            task = CommandInvoker(self.db).execute_command(command, user_id)
 
         if task_data.tags is not None:
             task.tags = task_data.tags
@@ -291,6 +263,161 @@ class TaskService:
         # Return task
         return self._task_to_dto(task)
 
+    def bulk_update_tasks(
+        self, project_id: str, bulk_data: TaskBulkUpdateDTO, user_id: str
+    ) -> TaskBulkUpdateResponseDTO:
+        """
+        Change the status, assignee or priority of many tasks at once.
+
+        Every update is checked against one read of the targeted tasks and
+        one of the requested assignees. Valid updates are applied with one
+        UPDATE per distinct change and committed together; invalid ones are
+        reported in their result and leave their task untouched. A single
+        activity entry records the whole operation.
+
+        Args:
+            project_id (str): Project ID
+            bulk_data (TaskBulkUpdateDTO): Task updates
+            user_id (str): User ID
+
+        Returns:
+            TaskBulkUpdateResponseDTO: Result per task, in request order
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+        """
+        # Check that the project exists and the user is a member
+        _, project_member, _ = self.access.resolve(project_id, user_id)
+        is_project_admin = project_member.role in ["owner", "admin"]
+
+        # Current state of the targeted tasks, locked until the commit
+        task_ids = {item.task_id for item in bulk_data.updates}
+        tasks = {
+            row.id: row
+            for row in self.db.execute(
+                select(Task.id, Task.status, Task.creator_id, Task.assignee_id)
+                .where(Task.project_id == project_id, Task.id.in_(task_ids))
+                .with_for_update()
+            )
+        }
+
+        # Requested assignees that are project members
+        assignee_ids = {
+            item.assignee_id for item in bulk_data.updates if item.assignee_id
+        }
+        members = (
+            set(
+                self.db.scalars(
+                    select(ProjectMember.user_id).where(
+                        ProjectMember.project_id == project_id,
+                        ProjectMember.user_id.in_(assignee_ids),
+                    )
+                )
+            )
+            if assignee_ids
+            else set()
+        )
+
+        results: List[TaskBulkResultDTO] = []
+        # Task IDs by change, so identical changes share one UPDATE
+        groups: Dict[Tuple[Tuple[str, Any], ...], List[str]] = {}
+        seen: Set[str] = set()
+
+        for item in bulk_data.updates:
+            changes = item.model_dump(
+                include={"status", "assignee_id", "priority"},
+                exclude_unset=True,
+                mode="json",
+            )
+            # Status and priority can't be cleared
+            changes = {
+                field: value
+                for field, value in changes.items()
+                if value is not None or field == "assignee_id"
+            }
+            task = tasks.get(item.task_id)
+            error: Optional[BaseAPIException] = None
+
+            if item.task_id in seen:
+                error = BadRequestException(
+                    "Task appears more than once", "DUPLICATE_BULK_TASK"
+                )
+            elif task is None:
+                error = TaskNotFoundException()
+            elif not (
+                is_project_admin or user_id in (task.creator_id, task.assignee_id)
+            ):
+                error = InsufficientProjectRoleException(
+                    "Only task creator, assignee, or project admin can update the task"
+                )
+            elif changes.get("assignee_id") and changes["assignee_id"] not in members:
+                error = NotProjectMemberException("Assignee is not a project member")
+            elif (
+                changes.get("status", task.status) != task.status
+                and (task.status, changes["status"]) not in VALID_STATUS_PAIRS
+            ):
+                error = InvalidTaskStatusTransitionException(
+                    f"Cannot transition from '{task.status}' to '{changes['status']}'"
+                )
+
+            seen.add(item.task_id)
+
+            if error is not None:
+                results.append(
+                    TaskBulkResultDTO(
+                        task_id=item.task_id,
+                        success=False,
+                        error=error.detail["message"],
+                        error_code=error.detail["error_code"],
+                    )
+                )
+                continue
+
+            if changes:
+                groups.setdefault(tuple(sorted(changes.items())), []).append(
+                    item.task_id
+                )
+            results.append(TaskBulkResultDTO(task_id=item.task_id, success=True))
+
+        if groups:
+            now = datetime.now(timezone.utc)
+
+            for changes, ids in groups.items():
+                self.db.execute(
+                    update(Task)
+                    .where(Task.id.in_(ids))
+                    .values(**dict(changes), updated_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+
+            self.db.commit()
+            self.access.forget(project_id)
+
+            # Log activity
+            self.activity_service.log_activity(
+                project_id=project_id,
+                user_id=user_id,
+                action="bulk_update_tasks",
+                entity_type="project",
+                entity_id=project_id,
+                details={
+                    "tasks": [
+                        {"task_ids": ids, "changes": dict(changes)}
+                        for changes, ids in groups.items()
+                    ]
+                },
+            )
+        else:
+            # Release the row locks
+            self.db.rollback()
+
+        updated = sum(result.success for result in results)
+
+        return TaskBulkUpdateResponseDTO(
+            results=results, updated=updated, failed=len(results) - updated
+        )
+
     def delete_task(
         self, project_id: str, task_id: str, user_id: str
     ) -> Dict[str, Any]:
@@ -311,35 +438,8 @@ class TaskService:
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
-
-        # Get task
-        task = (
-            self.db.query(Task)
-            .filter(Task.id == task_id, Task.project_id == project_id)
-            .first()
-        )
-
-        # Check if task exists
-        if not task:
-            raise TaskNotFoundException()
+        # Get project, membership and task in one query
+        _, project_member, task = self.access.resolve(project_id, user_id, task_id)
 
         # Check if user has sufficient role to delete task
         is_task_creator = task.creator_id == user_id
@@ -360,52 +460,188 @@ class TaskService:
             details=None,
         )
 
-        # Delete task
+        # Delete task with its undo/redo history
+        self.db.query(TaskCommandHistory).filter(
+            TaskCommandHistory.task_id == task.id
+        ).delete(synchronize_session=False)
         self.db.delete(task)
         self.db.commit()
+        self.access.forget(project_id)
 
         # Return success response
         return {"message": "Task deleted successfully"}
 
-    def get_project_tasks(self, project_id: str, user_id: str) -> List[TaskResponseDTO]:
+    def assign_task(
+        self, project_id: str, task_id: str, assignee_id: Optional[str], user_id: str
+    ) -> TaskResponseDTO:
         """
-        Get tasks for a project.
+        Assign a task through an undoable command.
 
         Args:
             project_id (str): Project ID
+            task_id (str): Task ID
+            assignee_id (Optional[str]): Assignee ID, None to unassign
             user_id (str): User ID
 
         Returns:
-            List[TaskResponseDTO]: List of tasks
+            TaskResponseDTO: Updated task
 
         Raises:
             ProjectNotFoundException: If project not found
+            TaskNotFoundException: If task not found in the project
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
+        self.access.resolve(project_id, user_id, task_id)
+        command = AssignTaskCommand(self.db, task_id, assignee_id, project_id)
+        task = CommandInvoker(self.db).execute_command(command, user_id)
 
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
+        return self._command_result(
+            project_id, user_id, "assign", task, {"assignee_id": assignee_id}
+        )
 
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
+    def change_task_status(
+        self, project_id: str, task_id: str, status: str, user_id: str
+    ) -> TaskResponseDTO:
+        """
+        Change the status of a task through an undoable command.
+
+        Args:
+            project_id (str): Project ID
+            task_id (str): Task ID
+            status (str): Task status
+            user_id (str): User ID
+
+        Returns:
+            TaskResponseDTO: Updated task
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            TaskNotFoundException: If task not found in the project
+            NotProjectMemberException: If user is not a project member
+        """
+        self.access.resolve(project_id, user_id, task_id)
+        command = ChangeTaskStatusCommand(self.db, task_id, status, project_id)
+        task = CommandInvoker(self.db).execute_command(command, user_id)
+
+        return self._command_result(
+            project_id, user_id, "change_status", task, {"status": status}
         )
 
-        if not project_member:
-            raise NotProjectMemberException()
+    def undo_task_command(
+        self, project_id: str, task_id: str, user_id: str
+    ) -> TaskResponseDTO:
+        """
+        Undo the last command of a task.
 
-        # Get tasks
-        tasks = self.db.query(Task).filter(Task.project_id == project_id).all()
+        Args:
+            project_id (str): Project ID
+            task_id (str): Task ID
+            user_id (str): User ID
+
+        Returns:
+            TaskResponseDTO: Restored task
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            TaskNotFoundException: If task not found in the project
+            NotProjectMemberException: If user is not a project member
+            NoTaskCommandException: If no commands to undo
+        """
+        self.access.resolve(project_id, user_id, task_id)
+        task = CommandInvoker(self.db).undo(task_id, project_id)
+
+        return self._command_result(project_id, user_id, "undo", task, None)
 
-        # Return tasks
-        return [self._task_to_dto(task) for task in tasks]
+    def redo_task_command(
+        self, project_id: str, task_id: str, user_id: str
+    ) -> TaskResponseDTO:
+        """
+        Redo the last undone command of a task.
+
+        Args:
+            project_id (str): Project ID
+            task_id (str): Task ID
+            user_id (str): User ID
+
+        Returns:
+            TaskResponseDTO: Updated task
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            TaskNotFoundException: If task not found in the project
+            NotProjectMemberException: If user is not a project member
+            NoTaskCommandException: If no commands to redo
+        """
+        self.access.resolve(project_id, user_id, task_id)
+        task = CommandInvoker(self.db).redo(task_id, project_id)
+
+        return self._command_result(project_id, user_id, "redo", task, None)
+
+    def get_project_tasks(
+        self,
+        project_id: str,
+        user_id: str,
+        filters: Optional[TaskFilterDTO] = None,
+        sort: TaskSortField = TaskSortField.CREATED_AT,
+        order: SortOrder = SortOrder.ASC,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> TaskPageDTO:
+        """
+        Get a page of tasks for a project.
+
+        Pages are keyset-paginated on the sort field and the task ID, so deep
+        pages cost the same as the first one. Tasks without a value for the
+        sort field come last in either order.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            filters (TaskFilterDTO, optional): Task filters
+            sort (TaskSortField, optional): Sort field. Defaults to created_at.
+            order (SortOrder, optional): Sort order. Defaults to asc.
+            limit (int, optional): Page size. Defaults to 100.
+            cursor (str, optional): Cursor of the previous page
+
+        Returns:
+            TaskPageDTO: Tasks and the cursor of the next page, if any
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+            InvalidTaskCursorException: If the cursor is invalid
+        """
+        # Check that the project exists and the user is a member
+        self.access.resolve(project_id, user_id)
+
+        # Build query
+        query = self._filter_tasks(
+            self.db.query(Task).filter(Task.project_id == project_id),
+            filters or TaskFilterDTO(),
+        )
+
+        if cursor is not None:
+            query = query.filter(self._after_cursor(cursor, sort, order))
+
+        column, nullable = TASK_SORT_COLUMNS[sort]
+        key = column.desc() if order == SortOrder.DESC else column.asc()
+        task_key = Task.id.desc() if order == SortOrder.DESC else Task.id.asc()
+        query = query.order_by(key.nulls_last() if nullable else key, task_key)
+
+        # Get one task more than the page to know whether another page follows
+        tasks = query.limit(limit + 1).all()
+        next_cursor = None
+
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(
+                sort.value, order.value, getattr(tasks[-1], sort.value), tasks[-1].id
+            )
+
+        # Return page
+        return TaskPageDTO(
+            items=[self._task_to_dto(task) for task in tasks], next_cursor=next_cursor
+        )
 
     def add_task_comment(
         self,
@@ -431,35 +667,8 @@ class TaskService:
             TaskNotFoundException: If task not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
-
-        # Get task
-        task = (
-            self.db.query(Task)
-            .filter(Task.id == task_id, Task.project_id == project_id)
-            .first()
-        )
-
-        # Check if task exists
-        if not task:
-            raise TaskNotFoundException()
+        # Check project, membership and task in the same query
+        self.access.resolve(project_id, user_id, task_id)
 
         # Check if parent comment exists
         if comment_data.parent_id:
@@ -520,43 +729,142 @@ class TaskService:
             TaskNotFoundException: If task not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
+        # Check that the task exists and the user is a project member
+        self.access.resolve(project_id, user_id, task_id)
+
+        # Get comments
+        comments = (
+            self.db.query(TaskComment).filter(TaskComment.task_id == task_id).all()
+        )
+
+        # Return comments
+        return [self._task_comment_to_dto(comment) for comment in comments]
+
+    def _filter_tasks(self, query: Query, filters: TaskFilterDTO) -> Query:
+        """
+        Apply task list filters to a query.
 
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
+        Args:
+            query (Query): Task query
+            filters (TaskFilterDTO): Task filters
 
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
+        Returns:
+            Query: Filtered query
+        """
+        if filters.status:
+            query = query.filter(
+                Task.status.in_([status.value for status in filters.status])
             )
-            .first()
-        )
 
-        if not project_member:
-            raise NotProjectMemberException()
+        if filters.priority:
+            query = query.filter(
+                Task.priority.in_([priority.value for priority in filters.priority])
+            )
 
-        # Get task
-        task = (
-            self.db.query(Task)
-            .filter(Task.id == task_id, Task.project_id == project_id)
-            .first()
-        )
+        if filters.assignee_id is not None:
+            query = query.filter(Task.assignee_id == filters.assignee_id)
 
-        # Check if task exists
-        if not task:
-            raise TaskNotFoundException()
+        if filters.due_after is not None:
+            query = query.filter(Task.due_date >= filters.due_after)
 
-        # Get comments
-        comments = (
-            self.db.query(TaskComment).filter(TaskComment.task_id == task_id).all()
+        if filters.due_before is not None:
+            query = query.filter(Task.due_date <= filters.due_before)
+
+        for tag in filters.tags or []:
+            query = query.filter(self._has_tag(tag))
+
+        return query
+
+    def _has_tag(self, tag: str) -> ColumnElement[bool]:
+        """
+        Build a condition matching tasks that have a tag.
+
+        Args:
+            tag (str): Tag
+
+        Returns:
+            ColumnElement[bool]: Condition
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            return cast(Task.tags, JSONB).contains([tag])
+
+        tags = func.json_each(Task.tags).table_valued("value")
+        return select(tags.c.value).where(tags.c.value == tag).exists()
+
+    def _after_cursor(
+        self, cursor: str, sort: TaskSortField, order: SortOrder
+    ) -> ColumnElement[bool]:
+        """
+        Build a condition matching the tasks that follow a cursor.
+
+        Args:
+            cursor (str): Cursor of the previous page
+            sort (TaskSortField): Sort field
+            order (SortOrder): Sort order
+
+        Returns:
+            ColumnElement[bool]: Condition
+
+        Raises:
+            InvalidTaskCursorException: If the cursor is invalid or was built
+                for another sort
+        """
+        values = decode_cursor(cursor)
+
+        if not values or len(values) != 4 or values[:2] != [sort.value, order.value]:
+            raise InvalidTaskCursorException()
+
+        value, task_id = values[2:]
+        column, nullable = TASK_SORT_COLUMNS[sort]
+        after = operator.lt if order == SortOrder.DESC else operator.gt
+
+        # The previous page ended among the tasks without a value
+        if value is None:
+            return and_(column.is_(None), after(Task.id, task_id))
+
+        if isinstance(column.type, DateTime):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise InvalidTaskCursorException()
+
+        # Row-value comparison, which both databases serve from an index range
+        condition = after(tuple_(column, Task.id), tuple_(value, task_id))
+
+        return or_(condition, column.is_(None)) if nullable else condition
+
+    def _command_result(
+        self,
+        project_id: str,
+        user_id: str,
+        action: str,
+        task: Task,
+        details: Optional[Dict[str, Any]],
+    ) -> TaskResponseDTO:
+        """
+        Log a committed task command and build its response.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            action (str): Activity action
+            task (Task): Updated task
+            details (Optional[Dict[str, Any]]): Activity details
+
+        Returns:
+            TaskResponseDTO: Updated task
+        """
+        self.access.forget(project_id)
+        self.activity_service.log_activity(
+            project_id=project_id,
+            user_id=user_id,
+            action=action,
+            entity_type="task",
+            entity_id=str(task.id),
+            details=details,
         )
 
-        # Return comments
-        return [self._task_comment_to_dto(comment) for comment in comments]
+        return self._task_to_dto(task)
 
     def _task_to_dto(self, task: Task) -> TaskResponseDTO:
         """
@@ -603,3 +911,9 @@ class TaskService:
             created_at=comment.created_at,
             updated_at=comment.updated_at,
         )
+
+
+class AsyncTaskService(AsyncService):
+    """Async variant of TaskService"""
+
+    service_class = TaskService
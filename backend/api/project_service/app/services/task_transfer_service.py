@@ -0,0 +1,774 @@
+import codecs
+import csv
+import io
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from dotenv import load_dotenv
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from api.project_service.app.schemas.task import (
+    TaskCreateDTO,
+    TaskImportErrorDTO,
+    TaskImportResponseDTO,
+    TaskTransferFormat,
+)
+from api.project_service.app.services.activity_service import ActivityService
+from api.project_service.app.services.project_access import ProjectAccessResolver
+from api.shared.exceptions.project_exceptions import InvalidTaskImportException
+from api.shared.models.base import get_utc_now
+from api.shared.models.project import ProjectMember, Task
+from api.shared.utils.async_service import AsyncService
+
+# Load environment variables
+load_dotenv()
+
+# Rows fetched per round trip of the export's server-side cursor
+TASK_EXPORT_BATCH_SIZE = int(os.getenv("TASK_EXPORT_BATCH_SIZE", "1000"))
+# Rows inserted and committed together by an import
+TASK_IMPORT_BATCH_SIZE = int(os.getenv("TASK_IMPORT_BATCH_SIZE", "1000"))
+# Rejected rows listed in an import response; the rest are only counted
+TASK_IMPORT_MAX_ERRORS = int(os.getenv("TASK_IMPORT_MAX_ERRORS", "100"))
+# Longest line or multi-line CSV record of an import, in characters
+TASK_IMPORT_MAX_RECORD_SIZE = int(
+    os.getenv("TASK_IMPORT_MAX_RECORD_SIZE", str(1024 * 1024))
+)
+
+# Exported task columns, in CSV column order
+TASK_EXPORT_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "assignee_id",
+    "due_date",
+    "tags",
+    "meta_data",
+    "creator_id",
+    "created_at",
+    "updated_at",
+)
+# Columns holding lists or objects, written as JSON text in CSV cells
+TASK_JSON_COLUMNS = ("tags", "meta_data")
+
+TASK_TRANSFER_MEDIA_TYPES = {
+    TaskTransferFormat.CSV: "text/csv",
+    TaskTransferFormat.NDJSON: "application/x-ndjson",
+}
+
+# Line the record starts on, its fields, or why it could not be parsed
+ImportRecord = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def _export_value(value: Any) -> Any:
+    """
+    Make an exported column value JSON-serializable.
+
+    Args:
+        value (Any): Column value
+
+    Returns:
+        Any: Serializable value
+    """
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _csv_value(column: str, value: Any) -> Any:
+    """
+    Get the CSV cell of an exported column value.
+
+    Args:
+        column (str): Column name
+        value (Any): Column value
+
+    Returns:
+        Any: Cell value; empty for NULL, JSON text for lists and objects
+    """
+    if value is None:
+        return ""
+
+    if column in TASK_JSON_COLUMNS:
+        return json.dumps(value, default=str)
+
+    return _export_value(value)
+
+
+def render_tasks(rows: Iterable[Sequence[Any]], fmt: TaskTransferFormat) -> str:
+    """
+    Render exported task rows.
+
+    Args:
+        rows (Iterable[Sequence[Any]]): Rows with the TASK_EXPORT_COLUMNS values
+        fmt (TaskTransferFormat): Export format
+
+    Returns:
+        str: One CSV record or NDJSON line per row
+    """
+    if fmt == TaskTransferFormat.NDJSON:
+        return "".join(
+            json.dumps(
+                dict(zip(TASK_EXPORT_COLUMNS, map(_export_value, row))), default=str
+            )
+            + "\n"
+            for row in rows
+        )
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow(
+            [
+                _csv_value(column, value)
+                for column, value in zip(TASK_EXPORT_COLUMNS, row)
+            ]
+        )
+
+    return buffer.getvalue()
+
+
+class TaskImportParser:
+    """
+    Incremental parser of a task import body.
+
+    The body is fed in chunks as it arrives and parsed into one record per
+    task. Only the unfinished last line (or CSV record with an open quoted
+    field) is kept between chunks, up to max_record_size characters, so
+    memory does not grow with the body.
+    Empty or missing CSV cells are left out of their record, so the task
+    defaults apply.
+    """
+
+    def __init__(
+        self,
+        fmt: TaskTransferFormat,
+        max_record_size: int = TASK_IMPORT_MAX_RECORD_SIZE,
+    ):
+        """
+        Initialize TaskImportParser.
+
+        Args:
+            fmt (TaskTransferFormat): Import format
+            max_record_size (int, optional): Longest line or CSV record, in
+                characters
+        """
+        self.format = fmt
+        self.max_record_size = max_record_size
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._line = 0
+        # Lines of a CSV record spanning several lines, their size, whether
+        # a quoted field is still open and the line the record started on
+        self._pending: Optional[List[str]] = None
+        self._pending_size = 0
+        self._quoted = False
+        self._record_line = 0
+        self._header: Optional[List[str]] = None
+
+    def feed(self, chunk: bytes) -> List[ImportRecord]:
+        """
+        Parse the records completed by a chunk of the body.
+
+        Args:
+            chunk (bytes): Next chunk of the body
+
+        Returns:
+            List[ImportRecord]: Completed records
+
+        Raises:
+            InvalidTaskImportException: If the body is not UTF-8, has a line
+                longer than max_record_size or the CSV header has no title
+                column
+        """
+        try:
+            text = self._buffer + self._decoder.decode(chunk)
+        except UnicodeDecodeError:
+            raise InvalidTaskImportException("Task import must be UTF-8 encoded")
+
+        lines = text.split("\n")
+        self._buffer = lines.pop()
+
+        if len(self._buffer) > self.max_record_size:
+            raise InvalidTaskImportException(
+                f"Task import line {self._line + len(lines) + 1} is longer "
+                f"than {self.max_record_size} characters"
+            )
+
+        return self._parse_lines(lines)
+
+    def close(self) -> List[ImportRecord]:
+        """
+        Parse what is left once the whole body has been fed.
+
+        Returns:
+            List[ImportRecord]: Remaining records
+
+        Raises:
+            InvalidTaskImportException: If the body is not UTF-8 or the CSV
+                header has no title column
+        """
+        try:
+            text = self._buffer + self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise InvalidTaskImportException("Task import must be UTF-8 encoded")
+
+        self._buffer = ""
+        records = self._parse_lines([text] if text else [])
+
+        if self._pending is not None:
+            records.append((self._record_line, None, "Unterminated quoted field"))
+            self._pending = None
+
+        return records
+
+    def _parse_lines(self, lines: List[str]) -> List[ImportRecord]:
+        """
+        Parse complete lines.
+
+        Args:
+            lines (List[str]): Lines, without their line breaks
+
+        Returns:
+            List[ImportRecord]: Records completed by the lines
+        """
+        records = []
+        for line in lines:
+            self._line += 1
+            line = line[:-1] if line.endswith("\r") else line
+
+            if self.format == TaskTransferFormat.NDJSON:
+                record = self._parse_json(line)
+            else:
+                record = self._parse_csv(line)
+
+            if record is not None:
+                records.append(record)
+
+        return records
+
+    def _parse_json(self, line: str) -> Optional[ImportRecord]:
+        """
+        Parse an NDJSON line.
+
+        Args:
+            line (str): Line
+
+        Returns:
+            Optional[ImportRecord]: Record, None for a blank line
+        """
+        if not line.strip():
+            return None
+
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            return (self._line, None, f"Invalid JSON: {e}")
+
+        if not isinstance(data, dict):
+            return (self._line, None, "Expected a JSON object")
+
+        return (self._line, data, None)
+
+    def _parse_csv(self, line: str) -> Optional[ImportRecord]:
+        """
+        Parse a CSV line, which may end or continue a multi-line record.
+
+        Args:
+            line (str): Line
+
+        Returns:
+            Optional[ImportRecord]: Record, None for the header, a blank line
+            or a record continued on the next line
+
+        Raises:
+            InvalidTaskImportException: If the header has no title column
+        """
+        if self._pending is None:
+            self._record_line = self._line
+            self._pending = []
+            self._pending_size = 0
+            self._quoted = False
+
+        self._pending.append(line)
+        self._pending_size += len(line) + 1
+
+        # An odd number of quotes opens or closes a quoted field
+        if line.count('"') % 2:
+            self._quoted = not self._quoted
+
+        if self._quoted:
+            # Give up on a stray quote instead of buffering the rest of the body
+            if self._pending_size > self.max_record_size:
+                self._pending = None
+                return (self._record_line, None, "Unterminated quoted field")
+            return None
+
+        text = "\n".join(self._pending)
+        self._pending = None
+        if not text.strip():
+            return None
+
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            return (self._record_line, None, f"Invalid CSV: {e}")
+
+        if self._header is None:
+            self._header = [name.strip() for name in values]
+            if "title" not in self._header:
+                raise InvalidTaskImportException("CSV header must have a title column")
+            return None
+
+        # Missing trailing cells are treated as empty
+        if len(values) > len(self._header):
+            return (
+                self._record_line,
+                None,
+                f"Expected {len(self._header)} columns, got {len(values)}",
+            )
+
+        data: Dict[str, Any] = {}
+        for name, value in zip(self._header, values):
+            if value == "":
+                continue
+
+            if name in TASK_JSON_COLUMNS:
+                try:
+                    value = json.loads(value)
+                except ValueError as e:
+                    return (self._record_line, None, f"Invalid JSON in {name}: {e}")
+
+            data[name] = value
+
+        return (self._record_line, data, None)
+
+
+class TaskImport:
+    """
+    Progress of a running task import.
+
+    Parses the body as it is fed, hands out full batches of records and
+    tallies their results. The import is timed from its creation.
+    """
+
+    def __init__(
+        self,
+        fmt: TaskTransferFormat,
+        batch_size: int = TASK_IMPORT_BATCH_SIZE,
+        max_errors: int = TASK_IMPORT_MAX_ERRORS,
+    ):
+        """
+        Initialize TaskImport.
+
+        Args:
+            fmt (TaskTransferFormat): Import format
+            batch_size (int, optional): Records per batch
+            max_errors (int, optional): Rejected rows listed in the result
+        """
+        self.format = fmt
+        self.parser = TaskImportParser(fmt)
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[TaskImportErrorDTO] = []
+        self._pending: List[ImportRecord] = []
+        self._started = time.perf_counter()
+
+    def feed(self, chunk: bytes) -> List[List[ImportRecord]]:
+        """
+        Parse a chunk of the body.
+
+        Args:
+            chunk (bytes): Next chunk of the body
+
+        Returns:
+            List[List[ImportRecord]]: Batches filled by the chunk
+        """
+        self._pending.extend(self.parser.feed(chunk))
+        return self._take_batches(final=False)
+
+    def close(self) -> List[List[ImportRecord]]:
+        """
+        Finish parsing the body.
+
+        Returns:
+            List[List[ImportRecord]]: Remaining batches, the last one partial
+        """
+        self._pending.extend(self.parser.close())
+        return self._take_batches(final=True)
+
+    def add_result(
+        self, batch: List[ImportRecord], errors: List[TaskImportErrorDTO]
+    ) -> None:
+        """
+        Tally an imported batch.
+
+        Args:
+            batch (List[ImportRecord]): Batch
+            errors (List[TaskImportErrorDTO]): Rejected rows of the batch
+        """
+        self.imported += len(batch) - len(errors)
+        self.failed += len(errors)
+        self.errors.extend(errors[: max(self.max_errors - len(self.errors), 0)])
+
+    def result(self) -> TaskImportResponseDTO:
+        """
+        Get the result of the import.
+
+        Returns:
+            TaskImportResponseDTO: Counts, first errors and throughput
+        """
+        elapsed = time.perf_counter() - self._started
+        rows = self.imported + self.failed
+
+        return TaskImportResponseDTO(
+            imported=self.imported,
+            failed=self.failed,
+            errors=self.errors,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+        )
+
+    def _take_batches(self, final: bool) -> List[List[ImportRecord]]:
+        """
+        Take the full batches of the parsed records.
+
+        Args:
+            final (bool): Whether to also take the last, partial batch
+
+        Returns:
+            List[List[ImportRecord]]: Batches
+        """
+        batches = []
+        while len(self._pending) >= self.batch_size or (final and self._pending):
+            batches.append(self._pending[: self.batch_size])
+            del self._pending[: self.batch_size]
+
+        return batches
+
+
+class TaskTransferService:
+    """Service for streaming task exports and imports"""
+
+    def __init__(self, db: Session):
+        """
+        Initialize TaskTransferService.
+
+        Args:
+            db (Session): Database session
+        """
+        self.db = db
+        self.activity_service = ActivityService(db)
+        self.access = ProjectAccessResolver(db)
+
+    def export_tasks(
+        self,
+        project_id: str,
+        user_id: str,
+        fmt: TaskTransferFormat,
+        batch_size: int = TASK_EXPORT_BATCH_SIZE,
+    ) -> Iterator[str]:
+        """
+        Export the tasks of a project, oldest first.
+
+        Membership is checked before returning. The tasks are then read
+        through a server-side cursor, batch_size rows at a time, as the
+        iterator is consumed, so memory does not grow with the project. The
+        session must stay open until the iterator is exhausted.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            fmt (TaskTransferFormat): Export format
+            batch_size (int, optional): Rows per round trip
+
+        Returns:
+            Iterator[str]: The CSV header, then the rendered rows of each batch
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+        """
+        self.access.resolve(project_id, user_id)
+        return self._export_batches(project_id, fmt, batch_size)
+
+    def start_import(self, project_id: str, user_id: str) -> Set[str]:
+        """
+        Check that a user may import tasks into a project.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+
+        Returns:
+            Set[str]: User IDs of the project members, the valid assignees
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+        """
+        self.access.resolve(project_id, user_id)
+
+        return set(
+            self.db.scalars(
+                select(ProjectMember.user_id).where(
+                    ProjectMember.project_id == project_id
+                )
+            )
+        )
+
+    def import_batch(
+        self,
+        project_id: str,
+        user_id: str,
+        batch: List[ImportRecord],
+        member_ids: Set[str],
+    ) -> List[TaskImportErrorDTO]:
+        """
+        Validate a batch of import records and insert the valid ones.
+
+        The valid tasks are inserted with one multi-row INSERT and committed,
+        so an interrupted import keeps the batches it completed.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID, the creator of the tasks
+            batch (List[ImportRecord]): Records
+            member_ids (Set[str]): User IDs of the project members
+
+        Returns:
+            List[TaskImportErrorDTO]: Rejected rows
+        """
+        now = get_utc_now()
+        rows: List[Dict[str, Any]] = []
+        errors: List[TaskImportErrorDTO] = []
+
+        for line, data, error in batch:
+            if error is None:
+                try:
+                    task_data = TaskCreateDTO.model_validate(data)
+                except ValidationError as e:
+                    error = "; ".join(
+                        f"{'.'.join(map(str, detail['loc']))}: {detail['msg']}"
+                        for detail in e.errors()
+                    )
+                else:
+                    if (
+                        task_data.assignee_id is not None
+                        and task_data.assignee_id not in member_ids
+                    ):
+                        error = "Assignee is not a project member"
+
+            if error is not None:
+                errors.append(TaskImportErrorDTO(line=line, error=error))
+                continue
+
+            rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "title": task_data.title,
+                    "description": task_data.description,
+                    "project_id": project_id,
+                    "creator_id": user_id,
+                    "assignee_id": task_data.assignee_id,
+                    "due_date": task_data.due_date,
+                    "priority": task_data.priority.value,
+                    "status": task_data.status.value,
+                    "tags": task_data.tags or [],
+                    "meta_data": task_data.meta_data or {},
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+
+        if rows:
+            self.db.execute(insert(Task), rows)
+            self.db.commit()
+
+        return errors
+
+    def finish_import(
+        self,
+        project_id: str,
+        user_id: str,
+        fmt: TaskTransferFormat,
+        result: TaskImportResponseDTO,
+    ) -> TaskImportResponseDTO:
+        """
+        Record a finished import in the project's activity.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            fmt (TaskTransferFormat): Import format
+            result (TaskImportResponseDTO): Import result
+
+        Returns:
+            TaskImportResponseDTO: Import result
+        """
+        self.access.forget(project_id)
+
+        if result.imported:
+            self.activity_service.log_activity(
+                project_id=project_id,
+                user_id=user_id,
+                action="import_tasks",
+                entity_type="project",
+                entity_id=project_id,
+                details={
+                    "format": fmt.value,
+                    "imported": result.imported,
+                    "failed": result.failed,
+                },
+            )
+
+        return result
+
+    def import_tasks(
+        self,
+        project_id: str,
+        user_id: str,
+        chunks: Iterable[bytes],
+        fmt: TaskTransferFormat,
+        batch_size: int = TASK_IMPORT_BATCH_SIZE,
+    ) -> TaskImportResponseDTO:
+        """
+        Import tasks into a project from a CSV or NDJSON body.
+
+        The body is parsed as it is read and inserted batch_size rows at a
+        time, in constant memory. Invalid rows are skipped and
+        reported; the others are created with the user as their creator.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            chunks (Iterable[bytes]): Body chunks
+            fmt (TaskTransferFormat): Import format
+            batch_size (int, optional): Rows per INSERT
+
+        Returns:
+            TaskImportResponseDTO: Counts, first errors and throughput
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+            InvalidTaskImportException: If the body can't be read
+        """
+        member_ids = self.start_import(project_id, user_id)
+        task_import = TaskImport(fmt, batch_size)
+
+        for chunk in chunks:
+            for batch in task_import.feed(chunk):
+                task_import.add_result(
+                    batch, self.import_batch(project_id, user_id, batch, member_ids)
+                )
+
+        for batch in task_import.close():
+            task_import.add_result(
+                batch, self.import_batch(project_id, user_id, batch, member_ids)
+            )
+
+        return self.finish_import(project_id, user_id, fmt, task_import.result())
+
+    def _export_batches(
+        self, project_id: str, fmt: TaskTransferFormat, batch_size: int
+    ) -> Iterator[str]:
+        """
+        Read and render the tasks of a project batch by batch.
+
+        Args:
+            project_id (str): Project ID
+            fmt (TaskTransferFormat): Export format
+            batch_size (int): Rows per round trip
+
+        Yields:
+            str: The CSV header, then the rendered rows of each batch
+        """
+        if fmt == TaskTransferFormat.CSV:
+            yield ",".join(TASK_EXPORT_COLUMNS) + "\n"
+
+        # Served in order by ix_tasks_project_id_created_at_id
+        result = self.db.execute(
+            select(*(getattr(Task, column) for column in TASK_EXPORT_COLUMNS))
+            .where(Task.project_id == project_id)
+            .order_by(Task.created_at, Task.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        for rows in result.partitions():
+            yield render_tasks(rows, fmt)
+
+
+class AsyncTaskTransferService(AsyncService):
+    """
+    Async variant of TaskTransferService.
+
+    import_tasks reads the request body as it arrives and runs each batch on
+    the session's async connection, so neither blocks the event loop.
+    """
+
+    service_class = TaskTransferService
+
+    async def import_tasks(
+        self,
+        project_id: str,
+        user_id: str,
+        chunks: AsyncIterable[bytes],
+        fmt: TaskTransferFormat,
+        batch_size: int = TASK_IMPORT_BATCH_SIZE,
+    ) -> TaskImportResponseDTO:
+        """
+        Import tasks into a project from a streamed CSV or NDJSON body.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            chunks (AsyncIterable[bytes]): Body chunks
+            fmt (TaskTransferFormat): Import format
+            batch_size (int, optional): Rows per INSERT
+
+        Returns:
+            TaskImportResponseDTO: Counts, first errors and throughput
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+            InvalidTaskImportException: If the body can't be read
+        """
+        member_ids = await self._run("start_import", project_id, user_id)
+        task_import = TaskImport(fmt, batch_size)
+
+        async for chunk in chunks:
+            for batch in task_import.feed(chunk):
+                errors = await self._run(
+                    "import_batch", project_id, user_id, batch, member_ids
+                )
+                task_import.add_result(batch, errors)
+
+        for batch in task_import.close():
+            errors = await self._run(
+                "import_batch", project_id, user_id, batch, member_ids
+            )
+            task_import.add_result(batch, errors)
+
+        return await self._run(
+            "finish_import", project_id, user_id, fmt, task_import.result()
+        )
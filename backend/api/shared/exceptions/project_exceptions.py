@@ -101,3 +101,51 @@ class InvalidTaskStatusTransitionException(BadRequestException):
         headers: Optional[Dict[str, Any]] = None,
     ):
         super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class InvalidTaskCursorException(BadRequestException):
+    """Exception for an invalid task list cursor"""
+
+    def __init__(
+        self,
+        detail: str = "Invalid task cursor",
+        error_code: str = "INVALID_TASK_CURSOR",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class InvalidActivityCursorException(BadRequestException):
+    """Exception for an invalid activity feed cursor"""
+
+    def __init__(
+        self,
+        detail: str = "Invalid activity cursor",
+        error_code: str = "INVALID_ACTIVITY_CURSOR",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class NoTaskCommandException(BadRequestException):
+    """Exception for an undo or redo with no command to apply"""
+
+    def __init__(
+        self,
+        detail: str = "No commands to undo",
+        error_code: str = "NO_TASK_COMMAND",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class InvalidTaskImportException(BadRequestException):
+    """Exception for a task import body that can't be read"""
+
+    def __init__(
+        self,
+        detail: str = "Invalid task import",
+        error_code: str = "INVALID_TASK_IMPORT",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
@@ -1,4 +1,15 @@
-from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.orm import relationship
 from typing import TYPE_CHECKING
 
@@ -8,10 +19,41 @@ if TYPE_CHECKING:
     from .user import User
 
 
+# Rows of scheduled notifications that have not been sent yet
+PENDING_SCHEDULED = "sent_at IS NULL AND scheduled_at IS NOT NULL"
+
+
 class Notification(BaseModel):
     """Notification model"""
 
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Unread notifications, newest first; id breaks created_at ties in cursors
+        Index(
+            "ix_notifications_user_id_is_read_created_at",
+            "user_id",
+            "is_read",
+            "created_at",
+            "id",
+        ),
+        # All notifications, newest first
+        Index("ix_notifications_user_id_created_at", "user_id", "created_at", "id"),
+        # Scheduled notifications waiting for the dispatcher
+        Index(
+            "ix_notifications_scheduled_at_pending",
+            "scheduled_at",
+            postgresql_where=text(PENDING_SCHEDULED),
+            sqlite_where=text(PENDING_SCHEDULED),
+        ),
+        # Notifications held back for the next email digest
+        Index(
+            "ix_notifications_user_id_digest_pending",
+            "user_id",
+            "created_at",
+            postgresql_where=text("digest_pending"),
+            sqlite_where=text("digest_pending"),
+        ),
+    )
 
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     type = Column(
@@ -33,11 +75,23 @@ class Notification(BaseModel):
     read_at = Column(DateTime, nullable=True)
     scheduled_at = Column(DateTime, nullable=True)  # For scheduled notifications
     sent_at = Column(DateTime, nullable=True)  # When the notification was actually sent
+    digest_pending = Column(
+        Boolean, nullable=False, default=False
+    )  # Email held back for the user's digest
 
     # Relationships
     user = relationship("User", back_populates="notifications")
 
 
+class NotificationCounter(BaseModel):
+    """Unread notification count of a user, kept in step with notifications"""
+
+    __tablename__ = "notification_counters"
+
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, unique=True)
+    unread_count = Column(Integer, nullable=False, default=0)
+
+
 class NotificationPreference(BaseModel):
     """Notification preference model"""
 
@@ -50,6 +104,7 @@ class NotificationPreference(BaseModel):
     in_app_enabled = Column(Boolean, nullable=False, default=True)
     digest_enabled = Column(Boolean, nullable=False, default=False)
     digest_frequency = Column(String, nullable=True)  # 'daily', 'weekly'
+    last_digest_at = Column(DateTime, nullable=True)  # When the last digest was sent
     quiet_hours_enabled = Column(Boolean, nullable=False, default=False)
     quiet_hours_start = Column(String, nullable=True)  # HH:MM format
     quiet_hours_end = Column(String, nullable=True)  # HH:MM format
@@ -1,15 +1,19 @@
 from sqlalchemy import (
     JSON,
+    Boolean,
     Column,
     DateTime,
     ForeignKey,
+    Index,
+    Integer,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from typing import TYPE_CHECKING
 
-from .base import BaseModel
+from .base import BaseModel, get_utc_now
 
 if TYPE_CHECKING:
     from .user import User
@@ -32,10 +36,18 @@ class Project(BaseModel):
     meta_data = Column(JSON, nullable=True)
 
     # Relationships
-    members = relationship("ProjectMember", back_populates="project")
+    members = relationship(
+        "ProjectMember", back_populates="project", cascade="all, delete-orphan"
+    )
     tasks = relationship("Task", back_populates="project")
     documents = relationship("Document", back_populates="project")
-    activity_logs = relationship("ActivityLog", back_populates="project")
+    # Activity logs outlive their project, so they have no foreign key to it
+    activity_logs = relationship(
+        "ActivityLog",
+        primaryjoin="Project.id == foreign(ActivityLog.project_id)",
+        back_populates="project",
+        viewonly=True,
+    )
 
 
 class ProjectMember(BaseModel):
@@ -59,6 +71,15 @@ class Task(BaseModel):
     """Task model"""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Task list: filtered by status, sorted by due date or creation time
+        Index(
+            "ix_tasks_project_id_status_due_date", "project_id", "status", "due_date"
+        ),
+        Index("ix_tasks_project_id_created_at_id", "project_id", "created_at", "id"),
+        # Tasks assigned to a user
+        Index("ix_tasks_assignee_id_status", "assignee_id", "status"),
+    )
 
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
@@ -86,6 +107,24 @@ class Task(BaseModel):
     comments = relationship("TaskComment", back_populates="task")
 
 
+
+class TaskCommandHistory(BaseModel):
+    """Undo/redo history entry of a task command, stored as a state diff"""
+
+    __tablename__ = "task_command_history"
+    __table_args__ = (
+        # Position of the entry in its task's history
+        UniqueConstraint("task_id", "sequence"),
+    )
+
+    task_id = Column(String, ForeignKey("tasks.id"), nullable=False)
+    sequence = Column(Integer, nullable=False)
+    user_id = Column(String, nullable=True)
+    command = Column(String, nullable=False)  # 'update', 'assign', 'change_status'
+    # Changed fields, as {field: [value before, value after]}
+    changes = Column(JSON, nullable=False)
+    undone = Column(Boolean, nullable=False, default=False)
+
 class TaskComment(BaseModel):
     """Task comment model"""
 
@@ -107,8 +146,26 @@ class ActivityLog(BaseModel):
     """Activity log model"""
 
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        # Activity feeds, newest first
+        Index(
+            "ix_activity_logs_project_id_created_at_id",
+            "project_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_activity_logs_entity_created_at_id",
+            "entity_type",
+            "entity_id",
+            "created_at",
+            "id",
+        ),
+        Index("ix_activity_logs_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
-    project_id = Column(String, ForeignKey("projects.id"), nullable=False)
+    # Kept after the project is deleted, so no foreign key
+    project_id = Column(String, nullable=False)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     action = Column(String, nullable=False)
     entity_type = Column(String, nullable=False)  # 'project', 'task', 'document', etc.
@@ -116,5 +173,36 @@ class ActivityLog(BaseModel):
     details = Column(JSON, nullable=True)
 
     # Relationships
-    project = relationship("Project", back_populates="activity_logs")
+    project = relationship(
+        "Project",
+        primaryjoin="foreign(ActivityLog.project_id) == Project.id",
+        back_populates="activity_logs",
+        viewonly=True,
+    )
     user = relationship("User", back_populates="activity_logs")
+
+
+class ActivityLogArchive(BaseModel):
+    """Activity log moved out of activity_logs once older than the retention"""
+
+    __tablename__ = "activity_logs_archive"
+    __table_args__ = (
+        Index(
+            "ix_activity_logs_archive_project_id_created_at",
+            "project_id",
+            "created_at",
+        ),
+        # Monthly partitions on PostgreSQL, so old months can be dropped whole
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    # The partition key must be part of the primary key
+    created_at = Column(
+        DateTime, primary_key=True, default=get_utc_now, nullable=False
+    )
+    project_id = Column(String, nullable=False)
+    user_id = Column(String, nullable=False)
+    action = Column(String, nullable=False)
+    entity_type = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    details = Column(JSON, nullable=True)
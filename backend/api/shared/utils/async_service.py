@@ -0,0 +1,77 @@
+from typing import Any, Callable, Coroutine, Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+class AsyncService:
+    """
+    Async variant of a synchronous service.
+
+    Every public method of service_class is exposed as a coroutine that runs
+    the synchronous method on the session's async connection through
+    AsyncSession.run_sync. The service code is shared, but its queries are
+    awaited on the async driver instead of blocking the event loop.
+
+    Only the queries are awaited: run_sync calls the method on the event loop
+    thread, so any other blocking I/O it does (HTTP, storage, broker calls)
+    still blocks the loop. Subclasses keep such calls out of the synchronous
+    method and await them afterwards, as AsyncNotificationService does, and
+    endpoints dominated by blocking work stay plain def on a sync session,
+    which FastAPI runs in its threadpool (e.g. the task export).
+    """
+
+    service_class: Type[Any]
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize AsyncService.
+
+        Args:
+            db (AsyncSession): Async database session
+        """
+        self.db = db
+
+    async def _run(self, method_name: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a method of the synchronous service.
+
+        Args:
+            method_name (str): Method name
+            *args: Positional arguments for the method
+            **kwargs: Keyword arguments for the method
+
+        Returns:
+            Any: Method result
+        """
+
+        def _call(session: Session) -> Any:
+            return getattr(self.service_class(session), method_name)(*args, **kwargs)
+
+        return await self.db.run_sync(_call)
+
+    def __getattr__(self, name: str) -> Callable[..., Coroutine[Any, Any, Any]]:
+        """
+        Expose a public method of the synchronous service as a coroutine.
+
+        Args:
+            name (str): Method name
+
+        Returns:
+            Callable[..., Coroutine[Any, Any, Any]]: Coroutine function
+
+        Raises:
+            AttributeError: If the service has no such public method
+        """
+        if name.startswith("_") or not callable(
+            getattr(self.service_class, name, None)
+        ):
+            raise AttributeError(
+                f"{type(self).__name__} has no attribute {name!r}"
+            )
+
+        async def method(*args: Any, **kwargs: Any) -> Any:
+            return await self._run(name, *args, **kwargs)
+
+        method.__name__ = name
+        return method
@@ -1,9 +1,24 @@
+import logging
 import os
-from typing import Generator
+import time
+from bisect import bisect_left
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    PoolProxiedConnection,
+    QueuePool,
+)
 
 # Load environment variables
 load_dotenv()
@@ -11,8 +26,364 @@ load_dotenv()
 # Database URL
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
 
+# Name of the running service, used for per-service pool settings
+SERVICE_NAME = os.getenv("SERVICE_NAME", "")
+
+# Pool defaults, overridable per service with a _{SERVICE_NAME} suffix,
+# e.g. DB_POOL_SIZE_PROJECT_SERVICE
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+DB_LOCK_TIMEOUT_MS = int(os.getenv("DB_LOCK_TIMEOUT_MS", "10000"))
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name: str, default: Any, service_name: str) -> str:
+    """
+    Read a pool setting, preferring the service's own override.
+
+    Args:
+        name (str): Setting name (e.g. "DB_POOL_SIZE")
+        default (Any): Value when neither variable is set
+        service_name (str): Service name (e.g. "project_service")
+
+    Returns:
+        str: Raw setting value
+    """
+    if service_name:
+        suffix = service_name.upper().replace("-", "_")
+        value = os.getenv(f"{name}_{suffix}")
+        if value is not None:
+            return value
+
+    return str(default)
+
+
+def get_pool_config(service_name: str = SERVICE_NAME) -> Dict[str, Any]:
+    """
+    Get pool configuration for a service.
+
+    Args:
+        service_name (str, optional): Service name
+
+    Returns:
+        Dict[str, Any]: Pool size, overflow, timeouts, recycle and pre-ping
+    """
+    return {
+        "pool_size": int(_setting("DB_POOL_SIZE", DB_POOL_SIZE, service_name)),
+        "max_overflow": int(
+            _setting("DB_MAX_OVERFLOW", DB_MAX_OVERFLOW, service_name)
+        ),
+        "pool_timeout": float(
+            _setting("DB_POOL_TIMEOUT", DB_POOL_TIMEOUT, service_name)
+        ),
+        "pool_recycle": int(
+            _setting("DB_POOL_RECYCLE", DB_POOL_RECYCLE, service_name)
+        ),
+        "pool_pre_ping": _setting(
+            "DB_POOL_PRE_PING", DB_POOL_PRE_PING, service_name
+        ).lower()
+        == "true",
+        "statement_timeout_ms": int(
+            _setting("DB_STATEMENT_TIMEOUT_MS", DB_STATEMENT_TIMEOUT_MS, service_name)
+        ),
+        "lock_timeout_ms": int(
+            _setting("DB_LOCK_TIMEOUT_MS", DB_LOCK_TIMEOUT_MS, service_name)
+        ),
+    }
+
+
+class PoolMetrics:
+    """Checkout wait times and saturation of a connection pool"""
+
+    def __init__(self, name: str):
+        """
+        Initialize PoolMetrics.
+
+        Args:
+            name (str): Pool name
+        """
+        self.name = name
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.wait_counts = [0] * (len(WAIT_BUCKETS) + 1)
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.peak_checked_out = 0
+
+    def record_checkout(self, wait: float, checked_out: int) -> None:
+        """
+        Record a successful checkout.
+
+        Args:
+            wait (float): Seconds spent waiting for a connection
+            checked_out (int): Connections checked out afterwards
+        """
+        self.checkouts += 1
+        self.wait_counts[bisect_left(WAIT_BUCKETS, wait)] += 1
+        self.wait_sum += wait
+        self.wait_max = max(self.wait_max, wait)
+        self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self) -> None:
+        """Record a checkout that gave up waiting for a connection"""
+        self.timeouts += 1
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long each checkout waits for a connection"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self) -> PoolProxiedConnection:
+        """
+        Check out a connection, recording the wait.
+
+        The wait includes pre-ping and opening an overflow connection.
+
+        Returns:
+            PoolProxiedConnection: Pooled connection
+        """
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            logger.warning(
+                "Database pool %s exhausted: %s checked out, %s overflow",
+                self.metrics.name if self.metrics is not None else "",
+                self.checkedout(),
+                self.overflow(),
+            )
+            raise
+
+        if self.metrics is not None:
+            self.metrics.record_checkout(
+                time.perf_counter() - start, self.checkedout()
+            )
+        return connection
+
+    def recreate(self) -> QueuePool:
+        """
+        Recreate the pool (e.g. on dispose), keeping its metrics.
+
+        Returns:
+            QueuePool: New pool
+        """
+        pool = super().recreate()
+        pool.metrics = self.metrics  # type: ignore
+        return pool
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times how long each checkout waits"""
+
+
+# Async drivers used for each sync database URL scheme
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def get_async_database_url(database_url: str = DATABASE_URL) -> str:
+    """
+    Convert a database URL to its async driver.
+
+    Args:
+        database_url (str, optional): Database URL (e.g. postgresql://...)
+
+    Returns:
+        str: Async database URL (e.g. postgresql+asyncpg://...)
+    """
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+
+    if driver is None or url.get_driver_name() == driver:
+        return database_url
+
+    return database_url.replace(url.drivername, f"{url.get_backend_name()}+{driver}", 1)
+
+
+def create_db_engine(
+    database_url: str = DATABASE_URL, service_name: str = SERVICE_NAME
+) -> Engine:
+    """
+    Create a database engine with the service's pool configuration.
+
+    SQLite keeps SQLAlchemy's defaults, as it has no server-side pool or
+    timeouts to tune.
+
+    Args:
+        database_url (str, optional): Database URL
+        service_name (str, optional): Service name
+
+    Returns:
+        Engine: Database engine
+    """
+    url = make_url(database_url)
+
+    if url.get_backend_name() == "sqlite":
+        return create_engine(database_url)
+
+    config = get_pool_config(service_name)
+    connect_args: Dict[str, Any] = {}
+
+    if url.get_backend_name() == "postgresql":
+        options = []
+        if config["statement_timeout_ms"] > 0:
+            options.append(f"-c statement_timeout={config['statement_timeout_ms']}")
+        if config["lock_timeout_ms"] > 0:
+            options.append(f"-c lock_timeout={config['lock_timeout_ms']}")
+        if options:
+            connect_args["options"] = " ".join(options)
+
+    db_engine = create_engine(
+        database_url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=config["pool_size"],
+        max_overflow=config["max_overflow"],
+        pool_timeout=config["pool_timeout"],
+        pool_recycle=config["pool_recycle"],
+        pool_pre_ping=config["pool_pre_ping"],
+        connect_args=connect_args,
+    )
+    instrument_pool(db_engine, service_name or "default")
+
+    return db_engine
+
+
+def create_async_db_engine(
+    database_url: str = DATABASE_URL, service_name: str = SERVICE_NAME
+) -> AsyncEngine:
+    """
+    Create an async database engine with the service's pool configuration.
+
+    Args:
+        database_url (str, optional): Sync database URL, converted to its async driver
+        service_name (str, optional): Service name
+
+    Returns:
+        AsyncEngine: Async database engine
+    """
+    async_url = get_async_database_url(database_url)
+    url = make_url(async_url)
+
+    if url.get_backend_name() == "sqlite":
+        return create_async_engine(async_url)
+
+    config = get_pool_config(service_name)
+    connect_args: Dict[str, Any] = {}
+
+    if url.get_backend_name() == "postgresql":
+        server_settings = {}
+        if config["statement_timeout_ms"] > 0:
+            server_settings["statement_timeout"] = str(config["statement_timeout_ms"])
+        if config["lock_timeout_ms"] > 0:
+            server_settings["lock_timeout"] = str(config["lock_timeout_ms"])
+        if server_settings:
+            connect_args["server_settings"] = server_settings
+
+    db_engine = create_async_engine(
+        async_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=config["pool_size"],
+        max_overflow=config["max_overflow"],
+        pool_timeout=config["pool_timeout"],
+        pool_recycle=config["pool_recycle"],
+        pool_pre_ping=config["pool_pre_ping"],
+        connect_args=connect_args,
+    )
+    instrument_pool(db_engine.sync_engine, f"{service_name or 'default'}-async")
+
+    return db_engine
+
+
+def instrument_pool(db_engine: Engine, name: str) -> PoolMetrics:
+    """
+    Attach metrics to an engine's pool.
+
+    Args:
+        db_engine (Engine): Engine using InstrumentedQueuePool
+        name (str): Pool name
+
+    Returns:
+        PoolMetrics: Pool metrics
+    """
+    metrics = PoolMetrics(name)
+    db_engine.pool.metrics = metrics  # type: ignore
+
+    @event.listens_for(db_engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        metrics.connects += 1
+
+    return metrics
+
+
+def get_pool_stats(db_engine: Optional[Engine] = None) -> Dict[str, Any]:
+    """
+    Get pool utilisation and checkout wait statistics.
+
+    Args:
+        db_engine (Engine, optional): Engine, defaults to the module engine
+
+    Returns:
+        Dict[str, Any]: Pool statistics
+    """
+    pool = (db_engine or engine).pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+
+    if not isinstance(pool, QueuePool):
+        return stats
+
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    stats.update(
+        {
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": checked_out,
+            "overflow": pool.overflow(),
+            "saturation": round(checked_out / capacity, 4) if capacity else 0.0,
+        }
+    )
+
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        cumulative = 0
+        histogram = {}
+        for bound, count in zip(
+            [str(b) for b in WAIT_BUCKETS] + ["+Inf"], metrics.wait_counts
+        ):
+            cumulative += count
+            histogram[bound] = cumulative
+
+        stats.update(
+            {
+                "peak_checked_out": metrics.peak_checked_out,
+                "checkouts": metrics.checkouts,
+                "timeouts": metrics.timeouts,
+                "connects": metrics.connects,
+                "checkout_wait_seconds": {
+                    "buckets": histogram,
+                    "count": metrics.checkouts,
+                    "sum": round(metrics.wait_sum, 6),
+                    "max": round(metrics.wait_max, 6),
+                },
+            }
+        )
+
+    return stats
+
+
 # Create database engine
-engine = create_engine(DATABASE_URL)
+engine = create_db_engine()
 
 # Create session local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -30,3 +401,52 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+# Async engine, created on first use so services that never use it need no
+# async driver installed
+_async_engine: Optional[AsyncEngine] = None
+_async_session_local: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async database engine, creating it on first use.
+
+    Returns:
+        AsyncEngine: Async database engine
+    """
+    global _async_engine, _async_session_local
+
+    if _async_engine is None:
+        _async_engine = create_async_db_engine()
+        _async_session_local = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+
+    return _async_engine
+
+
+def get_async_pool_stats() -> Optional[Dict[str, Any]]:
+    """
+    Get pool statistics of the async engine.
+
+    Returns:
+        Optional[Dict[str, Any]]: Pool statistics, None if the engine was never used
+    """
+    if _async_engine is None:
+        return None
+
+    return get_pool_stats(_async_engine.sync_engine)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get async database session.
+
+    Yields:
+        AsyncSession: Async database session
+    """
+    get_async_engine()
+    async with _async_session_local() as db:  # type: ignore
+        yield db
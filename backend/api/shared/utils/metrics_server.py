@@ -0,0 +1,46 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict
+
+
+def start_metrics_server(
+    snapshot: Callable[[], Dict[str, Any]], port: int, name: str = "metrics"
+) -> ThreadingHTTPServer:
+    """
+    Serve a background process's metrics as JSON from a daemon thread.
+
+    GET /metrics returns snapshot() and GET /health a static status.
+
+    Args:
+        snapshot (Callable[[], Dict[str, Any]]): Function returning the metrics
+        port (int): Port to listen on; 0 picks a free one
+        name (str, optional): Name of the serving thread
+
+    Returns:
+        ThreadingHTTPServer: Running server
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path == "/metrics":
+                body = snapshot()
+            elif self.path == "/health":
+                body = {"status": "healthy"}
+            else:
+                self.send_error(404)
+                return
+
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name=name, daemon=True).start()
+    return server
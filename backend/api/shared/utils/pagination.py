@@ -0,0 +1,44 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+
+    Args:
+        *values: Sort key values; datetimes are stored in ISO 8601 format
+
+    Returns:
+        str: URL-safe cursor
+    """
+    payload = json.dumps(
+        [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[List[Any]]:
+    """
+    Decode a cursor built by encode_cursor.
+
+    Args:
+        cursor (str): Cursor
+
+    Returns:
+        Optional[List[Any]]: Sort key values, None if the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+    return values if isinstance(values, list) else None
@@ -1,11 +1,18 @@
+import asyncio
+import functools
 import json
 import logging
 import os
+import queue
 import threading
-from typing import Any, Callable, Dict, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
 
 import pika
 from dotenv import load_dotenv
+from pika.adapters.blocking_connection import BlockingConnection
 
 # Load environment variables
 load_dotenv()
@@ -17,11 +24,227 @@ RABBITMQ_USER = os.getenv("RABBITMQ_USER", "guest")
 RABBITMQ_PASSWORD = os.getenv("RABBITMQ_PASSWORD", "guest")
 RABBITMQ_VHOST = os.getenv("RABBITMQ_VHOST", "/")
 
+# Publisher configuration
+RABBITMQ_PUBLISHER_POOL_SIZE = int(os.getenv("RABBITMQ_PUBLISHER_POOL_SIZE", "4"))
+RABBITMQ_CONFIRM_TIMEOUT = float(os.getenv("RABBITMQ_CONFIRM_TIMEOUT", "10"))
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def connection_parameters() -> pika.ConnectionParameters:
+    """
+    Get the RabbitMQ connection parameters.
+
+    Returns:
+        pika.ConnectionParameters: Connection parameters
+    """
+    return pika.ConnectionParameters(
+        host=RABBITMQ_HOST,
+        port=RABBITMQ_PORT,
+        virtual_host=RABBITMQ_VHOST,
+        credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD),
+    )
+
+
+def message_properties(persistent: bool = True) -> pika.BasicProperties:
+    """
+    Get the properties of a published JSON message.
+
+    Args:
+        persistent (bool, optional): Whether the message should be persistent. Defaults to True.
+
+    Returns:
+        pika.BasicProperties: Message properties
+    """
+    return pika.BasicProperties(
+        delivery_mode=2 if persistent else 1,  # 2 means persistent
+        content_type="application/json",
+        timestamp=int(time.time()),  # Consumers measure their lag from it
+    )
+
+
+class ConfirmChannel:
+    """
+    Publishing channel in confirm mode, on a connection of its own.
+
+    Every publish waits for the broker's ack or nack of the message, so a
+    channel publishes one message per round trip; throughput comes from
+    PublisherPool running one channel per thread.
+    """
+
+    def __init__(self, connection: BlockingConnection):
+        """
+        Initialize ConfirmChannel.
+
+        The connection is closed if the channel cannot be put in confirm mode.
+
+        Args:
+            connection (BlockingConnection): Connection owned by the channel
+        """
+        self.connection = connection
+        self.broken = False
+
+        try:
+            self.channel = connection.channel()
+            self.channel.confirm_delivery()
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def is_usable(self) -> bool:
+        """Whether the channel can publish"""
+        return (
+            not self.broken and self.connection.is_open and self.channel.is_open
+        )
+
+    def publish_batch(
+        self,
+        exchange_name: str,
+        messages: Iterable[Tuple[str, Dict[str, Any]]],
+        properties: pika.BasicProperties,
+    ) -> int:
+        """
+        Publish messages and wait for the broker to confirm each of them.
+
+        Publishing stops at the first connection or channel error, and the
+        channel is not reused.
+
+        Args:
+            exchange_name (str): Exchange name
+            messages (Iterable[Tuple[str, Dict[str, Any]]]): Routing key and
+                message of each message to publish
+            properties (pika.BasicProperties): Message properties
+
+        Returns:
+            int: Number of messages acknowledged by the broker
+        """
+        acked = 0
+
+        for routing_key, message in messages:
+            try:
+                self.channel.basic_publish(
+                    exchange=exchange_name,
+                    routing_key=routing_key,
+                    body=json.dumps(message),
+                    properties=properties,
+                )
+            except pika.exceptions.NackError:
+                logger.error(f"Broker rejected a message to {exchange_name}")
+                continue
+            except pika.exceptions.AMQPError as e:
+                logger.error(f"Publishing to {exchange_name} failed: {e}")
+                self.broken = True
+                break
+
+            acked += 1
+
+        return acked
+
+    def close(self) -> None:
+        """Close the channel's connection"""
+        try:
+            if self.connection.is_open:
+                self.connection.close()
+        except pika.exceptions.AMQPError:
+            pass
+
+
+class PublisherPool:
+    """
+    Bounded pool of confirm channels shared by the threads of a process.
+
+    pika connections are not thread-safe, so every channel has a connection
+    of its own and is used by one thread at a time.
+    """
+
+    def __init__(
+        self,
+        size: int = RABBITMQ_PUBLISHER_POOL_SIZE,
+        parameters: Optional[Callable[[], pika.ConnectionParameters]] = None,
+    ):
+        """
+        Initialize PublisherPool.
+
+        Args:
+            size (int, optional): Largest number of open channels
+            parameters (Callable[[], pika.ConnectionParameters], optional):
+                Factory of the connection parameters
+        """
+        self.size = size
+        self.parameters = parameters or connection_parameters
+        self._idle: "queue.LifoQueue[ConfirmChannel]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _open(self) -> ConfirmChannel:
+        """
+        Open a confirm channel on a new connection.
+
+        Returns:
+            ConfirmChannel: Channel
+        """
+        parameters = self.parameters()
+        # A broker that stops publishers (resource alarms) would otherwise
+        # leave the confirm wait blocked indefinitely
+        parameters.blocked_connection_timeout = RABBITMQ_CONFIRM_TIMEOUT
+
+        return ConfirmChannel(BlockingConnection(parameters))
+
+    def _checkout(self) -> ConfirmChannel:
+        """
+        Take an idle channel that is still alive, or open a new one.
+
+        Returns:
+            ConfirmChannel: Channel
+        """
+        while True:
+            try:
+                publisher = self._idle.get_nowait()
+            except queue.Empty:
+                return self._open()
+
+            # Serve heartbeats missed while idle and notice dropped connections
+            try:
+                publisher.connection.process_data_events(time_limit=0)
+            except pika.exceptions.AMQPError:
+                publisher.broken = True
+
+            if publisher.is_usable:
+                return publisher
+            publisher.close()
+
+    @contextmanager
+    def channel(self) -> Iterator[ConfirmChannel]:
+        """
+        Borrow a channel for the duration of a with block.
+
+        Yields:
+            ConfirmChannel: Channel
+        """
+        with self._slots:
+            publisher = self._checkout()
+            try:
+                yield publisher
+            except BaseException:
+                publisher.broken = True
+                raise
+            finally:
+                if publisher.is_usable:
+                    self._idle.put(publisher)
+                else:
+                    publisher.close()
+
+    def close(self) -> None:
+        """Close all idle channels"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
 class RabbitMQManager:
     """Singleton class for managing RabbitMQ connections"""
 
@@ -37,24 +260,18 @@ class RabbitMQManager:
 
     def _initialize(self) -> Any:
         """Initialize RabbitMQ connection"""
+        # Queue declarations and consumers; opened on first use
         self.connection = None
         self.channel = None
-        self.connect()
+        # Publishing
+        self.publishers = PublisherPool()
+        self._declared_exchanges: Set[str] = set()
 
     def connect(self) -> Any:
         """Connect to RabbitMQ server"""
         try:
-            # Create connection parameters
-            credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
-            parameters = pika.ConnectionParameters(
-                host=RABBITMQ_HOST,
-                port=RABBITMQ_PORT,
-                virtual_host=RABBITMQ_VHOST,
-                credentials=credentials,
-            )
-
             # Connect to RabbitMQ server
-            self.connection = pika.BlockingConnection(parameters)
+            self.connection = pika.BlockingConnection(connection_parameters())
             self.channel = self.connection.channel()
 
             logger.info("Connected to RabbitMQ server")
@@ -72,18 +289,26 @@ class RabbitMQManager:
         self, exchange_name: str, exchange_type: str = "topic", durable: bool = True
     ) -> Any:
         """
-        Declare an exchange.
+        Declare an exchange, once per process.
 
         Args:
             exchange_name (str): Exchange name
             exchange_type (str, optional): Exchange type. Defaults to "topic".
             durable (bool, optional): Whether the exchange should survive broker restarts. Defaults to True.
         """
-        self.ensure_connection()
-        if self.channel:
-            self.channel.exchange_declare(
-                exchange=exchange_name, exchange_type=exchange_type, durable=durable
-            )
+        if exchange_name in self._declared_exchanges:
+            return
+
+        try:
+            with self.publishers.channel() as publisher:
+                publisher.channel.exchange_declare(
+                    exchange=exchange_name, exchange_type=exchange_type, durable=durable
+                )
+        except pika.exceptions.AMQPError as e:
+            logger.error(f"Failed to declare exchange {exchange_name}: {e}")
+            return
+
+        self._declared_exchanges.add(exchange_name)
 
     def declare_queue(
         self,
@@ -135,56 +360,165 @@ class RabbitMQManager:
             routing_key (str): Routing key
             message (Dict[str, Any]): Message to publish
             persistent (bool, optional): Whether the message should be persistent. Defaults to True.
+
+        Returns:
+            bool: Whether the broker confirmed the message
         """
-        self.ensure_connection()
-        if self.channel:
-            properties = pika.BasicProperties(
-                delivery_mode=2 if persistent else 1,  # 2 means persistent
-                content_type="application/json",
-            )
+        return (
+            self.publish_batch(exchange_name, [(routing_key, message)], persistent)
+            == 1
+        )
 
-            self.channel.basic_publish(
-                exchange=exchange_name,
-                routing_key=routing_key,
-                body=json.dumps(message),
-                properties=properties,
-            )
+    def publish_batch(
+        self,
+        exchange_name: str,
+        messages: Iterable[Tuple[str, Dict[str, Any]]],
+        persistent: bool = True,
+    ) -> int:
+        """
+        Publish messages to an exchange on a pooled confirm channel.
+
+        Safe to call from several threads; each borrows its own channel.
+
+        Args:
+            exchange_name (str): Exchange name
+            messages (Iterable[Tuple[str, Dict[str, Any]]]): Routing key and
+                message of each message to publish
+            persistent (bool, optional): Whether the messages should be persistent. Defaults to True.
+
+        Returns:
+            int: Number of messages confirmed by the broker
+        """
+        try:
+            with self.publishers.channel() as publisher:
+                return publisher.publish_batch(
+                    exchange_name, messages, message_properties(persistent)
+                )
+        except pika.exceptions.AMQPError as e:
+            logger.error(f"Failed to publish to {exchange_name}: {e}")
+            return 0
 
     def consume(
         self,
         queue_name: str,
-        callback: Callable[[Dict[str, Any]], None],
-        auto_ack: bool = True,
+        callback: Callable[[Dict[str, Any]], Any],
+        prefetch: Optional[int] = None,
+        concurrency: Optional[int] = None,
     ) -> Any:
         """
-        Consume messages from a queue.
+        Consume messages from a queue until stopped, on a connection of its own.
+
+        Messages are processed concurrently and acknowledged once callback
+        returns; see QueueConsumer for requeue and reject semantics.
 
         Args:
             queue_name (str): Queue name
-            callback (Callable[[Dict[str, Any]], None]): Callback function to process messages
-            auto_ack (bool, optional): Whether to automatically acknowledge messages. Defaults to True.
+            callback (Callable[[Dict[str, Any]], Any]): Callback function to process messages
+            prefetch (int, optional): Largest number of unacknowledged messages
+            concurrency (int, optional): Number of processing threads
         """
-        self.ensure_connection()
-        if self.channel:
-
-            def on_message(ch, method, properties, body) -> Any:
-                try:
-                    message = json.loads(body)
-                    callback(message)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
+        from api.shared.utils.rabbitmq_consumer import (
+            RABBITMQ_CONSUMER_CONCURRENCY,
+            RABBITMQ_CONSUMER_PREFETCH,
+            QueueConsumer,
+        )
 
-                if not auto_ack:
-                    ch.basic_ack(delivery_tag=method.delivery_tag)
-
-            self.channel.basic_consume(
-                queue=queue_name, on_message_callback=on_message, auto_ack=auto_ack
-            )
-
-            self.channel.start_consuming()
+        consumer = QueueConsumer(
+            queue_name,
+            handler=callback,
+            prefetch=prefetch or RABBITMQ_CONSUMER_PREFETCH,
+            concurrency=concurrency or RABBITMQ_CONSUMER_CONCURRENCY,
+        )
+        consumer.run(connection_parameters())
 
     def close(self) -> Any:
         """Close RabbitMQ connection"""
+        self.publishers.close()
         if self.connection and self.connection.is_open:
             self.connection.close()
             logger.info("Closed RabbitMQ connection")
+
+
+class AsyncRabbitMQPublisher:
+    """
+    Publisher for asyncio code.
+
+    Publishes through RabbitMQManager's channel pool on a thread pool of the
+    same size, so coroutines never block the event loop on the broker.
+    """
+
+    def __init__(self, manager: Optional[RabbitMQManager] = None):
+        """
+        Initialize AsyncRabbitMQPublisher.
+
+        Args:
+            manager (RabbitMQManager, optional): Manager to publish through;
+                the shared one if omitted, created on first use
+        """
+        self._manager = manager
+        self._executor = ThreadPoolExecutor(
+            max_workers=RABBITMQ_PUBLISHER_POOL_SIZE,
+            thread_name_prefix="rabbitmq-publisher",
+        )
+
+    @property
+    def manager(self) -> RabbitMQManager:
+        """Manager the messages are published through"""
+        if self._manager is None:
+            self._manager = RabbitMQManager()
+        return self._manager
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking manager call on the publisher's thread pool.
+
+        Args:
+            fn (Callable[..., Any]): Function
+            *args: Positional arguments for the function
+
+        Returns:
+            Any: Function result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    async def declare_exchange(
+        self, exchange_name: str, exchange_type: str = "topic", durable: bool = True
+    ) -> None:
+        """
+        Declare an exchange, once per process.
+
+        Args:
+            exchange_name (str): Exchange name
+            exchange_type (str, optional): Exchange type. Defaults to "topic".
+            durable (bool, optional): Whether the exchange should survive broker restarts. Defaults to True.
+        """
+        await self._run(
+            self.manager.declare_exchange, exchange_name, exchange_type, durable
+        )
+
+    async def publish_batch(
+        self,
+        exchange_name: str,
+        messages: Iterable[Tuple[str, Dict[str, Any]]],
+        persistent: bool = True,
+    ) -> int:
+        """
+        Publish messages to an exchange and wait for the broker's confirms.
+
+        Args:
+            exchange_name (str): Exchange name
+            messages (Iterable[Tuple[str, Dict[str, Any]]]): Routing key and
+                message of each message to publish
+            persistent (bool, optional): Whether the messages should be persistent. Defaults to True.
+
+        Returns:
+            int: Number of messages confirmed by the broker
+        """
+        return await self._run(
+            self.manager.publish_batch, exchange_name, list(messages), persistent
+        )
+
+
+# Shared by the async services of the process
+async_publisher = AsyncRabbitMQPublisher()
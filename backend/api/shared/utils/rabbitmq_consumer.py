@@ -0,0 +1,397 @@
+"""
+Concurrent RabbitMQ consumers.
+
+A QueueConsumer consumes one queue on its own connection. Up to
+``prefetch`` messages are delivered unacknowledged and processed by a pool
+of ``concurrency`` threads. Every message is settled explicitly once
+processed: acknowledged, requeued or rejected (dead-lettered if the queue
+has a dead-letter exchange). Settlement is handed back to the connection's
+thread, as pika connections are not thread-safe.
+
+stop() shuts a consumer down gracefully: it stops taking deliveries,
+finishes and settles the messages it already has, then closes the
+connection. run_consumers runs several consumers until SIGINT or SIGTERM.
+"""
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+import pika
+from dotenv import load_dotenv
+from pika.adapters.blocking_connection import BlockingChannel, BlockingConnection
+
+from api.shared.utils.rabbitmq import connection_parameters
+
+# Load environment variables
+load_dotenv()
+
+# Consumer configuration
+RABBITMQ_CONSUMER_PREFETCH = int(os.getenv("RABBITMQ_CONSUMER_PREFETCH", "16"))
+RABBITMQ_CONSUMER_CONCURRENCY = int(os.getenv("RABBITMQ_CONSUMER_CONCURRENCY", "8"))
+RABBITMQ_CONSUMER_SHUTDOWN_TIMEOUT = float(
+    os.getenv("RABBITMQ_CONSUMER_SHUTDOWN_TIMEOUT", "30")
+)
+RABBITMQ_CONSUMER_RECONNECT_DELAY = float(
+    os.getenv("RABBITMQ_CONSUMER_RECONNECT_DELAY", "5")
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class Settlement(str, Enum):
+    """How a processed message is settled"""
+
+    ACK = "ack"
+    REQUEUE = "requeue"
+    REJECT = "reject"
+
+
+class ConsumerMetrics:
+    """Throughput and lag of one queue's consumer"""
+
+    def __init__(self, queue: str) -> None:
+        """
+        Initialize ConsumerMetrics.
+
+        Args:
+            queue (str): Queue name
+        """
+        self.queue = queue
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.received = 0
+        self.in_flight = 0
+        self.results: Dict[str, int] = {}
+        self.processing_seconds = 0.0
+        self.lag_sum = 0.0
+        self.lag_max = 0.0
+        self.last_lag = 0.0
+        self.lag_samples = 0
+
+    def record_received(self, properties: pika.BasicProperties) -> None:
+        """
+        Record a delivered message.
+
+        Args:
+            properties (pika.BasicProperties): Message properties; the lag is
+                measured from their timestamp, when set
+        """
+        with self._lock:
+            self.received += 1
+            self.in_flight += 1
+
+            if properties.timestamp:
+                lag = max(0.0, time.time() - properties.timestamp)
+                self.lag_samples += 1
+                self.lag_sum += lag
+                self.last_lag = lag
+                self.lag_max = max(self.lag_max, lag)
+
+    def record_settled(self, result: str, seconds: float) -> None:
+        """
+        Record a processed and settled message.
+
+        Args:
+            result (str): Processing result
+            seconds (float): Processing time
+        """
+        with self._lock:
+            self.in_flight -= 1
+            self.results[result] = self.results.get(result, 0) + 1
+            self.processing_seconds += seconds
+
+    def record_abandoned(self) -> None:
+        """Record that the unsettled messages were left to the broker"""
+        with self._lock:
+            self.in_flight = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current metrics.
+
+        Returns:
+            Dict[str, Any]: Message counts, throughput, processing time and
+            lag in seconds
+        """
+        with self._lock:
+            settled = sum(self.results.values())
+            elapsed = time.monotonic() - self.started_at
+
+            return {
+                "queue": self.queue,
+                "received": self.received,
+                "in_flight": self.in_flight,
+                "results": dict(self.results),
+                "throughput_per_second": settled / elapsed if elapsed else 0.0,
+                "processing_seconds_mean": (
+                    self.processing_seconds / settled if settled else 0.0
+                ),
+                "lag_seconds": {
+                    "mean": (
+                        self.lag_sum / self.lag_samples if self.lag_samples else 0.0
+                    ),
+                    "max": self.lag_max,
+                    "last": self.last_lag,
+                },
+            }
+
+
+class QueueConsumer:
+    """Consume one queue with bounded concurrency and explicit settlement"""
+
+    def __init__(
+        self,
+        queue: str,
+        handler: Optional[Callable[[Dict[str, Any]], Optional[Settlement]]] = None,
+        prefetch: int = RABBITMQ_CONSUMER_PREFETCH,
+        concurrency: int = RABBITMQ_CONSUMER_CONCURRENCY,
+    ):
+        """
+        Initialize QueueConsumer.
+
+        Args:
+            queue (str): Queue to consume
+            handler (Callable[[Dict[str, Any]], Optional[Settlement]], optional):
+                Function processing a decoded JSON message. Returning None
+                acknowledges the message; raising requeues it once, then
+                rejects it.
+            prefetch (int, optional): Largest number of unacknowledged
+                deliveries
+            concurrency (int, optional): Number of processing threads
+        """
+        self.queue = queue
+        self.handler = handler
+        self.prefetch = max(prefetch, concurrency)
+        self.concurrency = concurrency
+        self.metrics = ConsumerMetrics(queue)
+        self._stopping = threading.Event()
+        self._connection: Optional[BlockingConnection] = None
+        self._amqp_channel: Optional[BlockingChannel] = None
+
+    def setup(self, amqp_channel: BlockingChannel) -> None:
+        """
+        Declare the queue before consuming; override for more topology.
+
+        Args:
+            amqp_channel (BlockingChannel): RabbitMQ channel
+        """
+        amqp_channel.queue_declare(queue=self.queue, durable=True)
+
+    def process(
+        self, body: bytes, properties: pika.BasicProperties, redelivered: bool
+    ) -> Any:
+        """
+        Process one message; override for another message format.
+
+        Args:
+            body (bytes): Message body
+            properties (pika.BasicProperties): Message properties
+            redelivered (bool): Whether the message was delivered before
+
+        Returns:
+            Any: Result passed to settle
+        """
+        try:
+            message = json.loads(body)
+        except ValueError:
+            logger.error(f"Rejecting malformed message from {self.queue}")
+            return Settlement.REJECT
+
+        try:
+            return self.handler(message) or Settlement.ACK  # type: ignore[misc]
+        except Exception as e:
+            logger.error(f"Error processing message from {self.queue}: {e}")
+            return Settlement.REJECT if redelivered else Settlement.REQUEUE
+
+    def settle(
+        self,
+        amqp_channel: BlockingChannel,
+        delivery_tag: int,
+        properties: pika.BasicProperties,
+        body: bytes,
+        result: Any,
+    ) -> None:
+        """
+        Settle a processed message; override for other results.
+
+        Must run on the connection's thread.
+
+        Args:
+            amqp_channel (BlockingChannel): Channel the message came from
+            delivery_tag (int): Delivery tag of the message
+            properties (pika.BasicProperties): Message properties
+            body (bytes): Message body
+            result (Any): Result of process
+        """
+        if result == Settlement.ACK:
+            amqp_channel.basic_ack(delivery_tag=delivery_tag)
+        else:
+            amqp_channel.basic_nack(
+                delivery_tag=delivery_tag, requeue=result == Settlement.REQUEUE
+            )
+
+    def _handle(
+        self,
+        connection: BlockingConnection,
+        amqp_channel: BlockingChannel,
+        method: Any,
+        properties: pika.BasicProperties,
+        body: bytes,
+    ) -> None:
+        """
+        Process a message on a pool thread and hand its settlement back.
+
+        Args:
+            connection (BlockingConnection): Connection the message came from
+            amqp_channel (BlockingChannel): Channel the message came from
+            method (Any): Basic.Deliver method
+            properties (pika.BasicProperties): Message properties
+            body (bytes): Message body
+        """
+        start = time.perf_counter()
+        result = self.process(body, properties, method.redelivered)
+        seconds = time.perf_counter() - start
+
+        def settle() -> None:
+            self.settle(amqp_channel, method.delivery_tag, properties, body, result)
+            self.metrics.record_settled(str(getattr(result, "value", result)), seconds)
+
+        connection.add_callback_threadsafe(settle)
+
+    def run(self, parameters: pika.ConnectionParameters) -> None:
+        """
+        Consume the queue until stopped or the connection closes.
+
+        Args:
+            parameters (pika.ConnectionParameters): Connection parameters
+        """
+        connection = BlockingConnection(parameters)
+        amqp_channel = connection.channel()
+        self.setup(amqp_channel)
+        amqp_channel.basic_qos(prefetch_count=self.prefetch)
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix=f"consumer-{self.queue}"
+        )
+
+        def on_message(
+            ch: BlockingChannel, method: Any, properties: Any, body: bytes
+        ) -> None:
+            self.metrics.record_received(properties)
+            executor.submit(
+                self._handle, connection, amqp_channel, method, properties, body
+            )
+
+        amqp_channel.basic_consume(queue=self.queue, on_message_callback=on_message)
+        self._connection = connection
+        self._amqp_channel = amqp_channel
+
+        logger.info(
+            f"Consuming {self.queue}, {self.concurrency} at a time, "
+            f"prefetch {self.prefetch}"
+        )
+
+        try:
+            if not self._stopping.is_set():
+                amqp_channel.start_consuming()
+            self._drain(connection)
+        finally:
+            self._connection = None
+            self._amqp_channel = None
+            # Messages left unacknowledged are redelivered to another consumer
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.metrics.record_abandoned()
+            if connection.is_open:
+                connection.close()
+
+    def _drain(self, connection: BlockingConnection) -> None:
+        """
+        Settle the messages already delivered, up to the shutdown timeout.
+
+        Args:
+            connection (BlockingConnection): Connection being shut down
+        """
+        deadline = time.monotonic() + RABBITMQ_CONSUMER_SHUTDOWN_TIMEOUT
+
+        while self.metrics.in_flight > 0 and connection.is_open:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(
+                    f"Closing {self.queue} with {self.metrics.in_flight} "
+                    "messages unsettled"
+                )
+                return
+            connection.process_data_events(time_limit=min(remaining, 0.1))
+
+    def stop(self) -> None:
+        """Stop consuming once the messages already delivered are settled"""
+        self._stopping.set()
+        connection = self._connection
+        amqp_channel = self._amqp_channel
+
+        if connection is not None and amqp_channel is not None:
+            try:
+                connection.add_callback_threadsafe(amqp_channel.stop_consuming)
+            except pika.exceptions.AMQPError:
+                pass
+
+    def run_forever(self, parameters: pika.ConnectionParameters) -> None:
+        """
+        Consume the queue until stopped, reconnecting after connection errors.
+
+        Args:
+            parameters (pika.ConnectionParameters): Connection parameters
+        """
+        while not self._stopping.is_set():
+            try:
+                self.run(parameters)
+            except pika.exceptions.AMQPError as e:
+                logger.error(f"Consumer of {self.queue} disconnected: {e}")
+
+            self._stopping.wait(RABBITMQ_CONSUMER_RECONNECT_DELAY)
+
+
+def run_consumers(
+    consumers: List[QueueConsumer],
+    parameters: Optional[pika.ConnectionParameters] = None,
+) -> None:
+    """
+    Run consumers on one thread each until SIGINT or SIGTERM.
+
+    Must be called from the main thread.
+
+    Args:
+        consumers (List[QueueConsumer]): Consumers
+        parameters (pika.ConnectionParameters, optional): Connection parameters
+    """
+    parameters = parameters or connection_parameters()
+    threads = [
+        threading.Thread(
+            target=consumer.run_forever,
+            args=(parameters,),
+            name=f"consumer-{consumer.queue}",
+        )
+        for consumer in consumers
+    ]
+
+    def shutdown(signum: int, frame: Any) -> None:
+        logger.info("Stopping consumers")
+        for consumer in consumers:
+            consumer.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
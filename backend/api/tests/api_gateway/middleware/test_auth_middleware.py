@@ -1,53 +1,123 @@
+import json
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from fastapi import Request, status
-from api.api_gateway.middleware.auth_middleware import auth_middleware
-from typing import Any
+import time
+from unittest.mock import AsyncMock, patch
+from fastapi import status
+from jose import jwt
+from api.api_gateway.middleware.auth_middleware import AuthMiddleware
+from typing import Any, Dict, List, Tuple
 
-class DummyCallNext:
-    def __init__(self, response: Any) -> None:
-        self.response = response
-    async def __call__(self, request: Request) -> Any:
-        return self.response
+class DummyApp:
+    def __init__(self, status_code: int = 200) -> None:
+        self.scope: Dict[str, Any] = {}
+        self.status_code = status_code
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        self.scope = scope
+        await send({'type': 'http.response.start', 'status': self.status_code, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b'ok'})
+
+def _scope(path: str, headers: Dict[str, str], method: str = 'GET') -> Dict[str, Any]:
+    return {
+        'type': 'http', 'method': method, 'path': path, 'query_string': b'',
+        'headers': [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+
+async def _call(path: str, headers: Dict[str, str], method: str = 'GET', app_status: int = 200) -> Tuple[DummyApp, int, bytes]:
+    app = DummyApp(app_status)
+    messages: List[Dict[str, Any]] = []
+    async def receive() -> Dict[str, Any]:
+        return {'type': 'http.request', 'body': b''}
+    async def send(message: Dict[str, Any]) -> None:
+        messages.append(message)
+    await AuthMiddleware(app)(_scope(path, headers, method), receive, send)
+    body = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+    return app, messages[0]['status'], body
 
 @pytest.mark.asyncio
 async def test_skip_auth():
-    request = MagicMock(spec=Request)
-    request.url.path = '/health'
-    dummy_response = MagicMock()
-    call_next = DummyCallNext(dummy_response)
-    response = await auth_middleware(request, call_next)
-    assert response == dummy_response
+    app, status_code, body = await _call('/health', {})
+    assert status_code == 200
+    assert body == b'ok'
 
 @pytest.mark.asyncio
 async def test_valid_token():
-    request = MagicMock(spec=Request)
-    request.url.path = '/protected'
-    request.headers = {'Authorization': 'Bearer validtoken'}
-    dummy_response = MagicMock()
-    call_next = DummyCallNext(dummy_response)
     with patch('api.api_gateway.middleware.auth_middleware._validate_token', new=AsyncMock(return_value='user123')):
-        response = await auth_middleware(request, call_next)
-        assert response == dummy_response
-        assert request.state.user_id == 'user123'
+        app, status_code, body = await _call('/protected', {'Authorization': 'Bearer validtoken'})
+        assert status_code == 200
+        assert app.scope['state']['user_id'] == 'user123'
 
 @pytest.mark.asyncio
 async def test_no_token():
-    request = MagicMock(spec=Request)
-    request.url.path = '/protected'
-    request.headers = {}
-    call_next = DummyCallNext(MagicMock())
-    response = await auth_middleware(request, call_next)
-    assert response.status_code == status.HTTP_401_UNAUTHORIZED
-    assert response.body is not None
+    app, status_code, body = await _call('/protected', {})
+    assert status_code == status.HTTP_401_UNAUTHORIZED
+    assert json.loads(body) == {'detail': 'Not authenticated'}
+    assert app.scope == {}
 
 @pytest.mark.asyncio
 async def test_invalid_token():
-    request = MagicMock(spec=Request)
-    request.url.path = '/protected'
-    request.headers = {'Authorization': 'Bearer invalidtoken'}
-    call_next = DummyCallNext(MagicMock())
     with patch('api.api_gateway.middleware.auth_middleware._validate_token', new=AsyncMock(side_effect=Exception('fail'))):
-        response = await auth_middleware(request, call_next)
-        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-        assert response.body is not None 
\ No newline at end of file
+        app, status_code, body = await _call('/protected', {'Authorization': 'Bearer invalidtoken'})
+        assert status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert body is not None
+
+@pytest.mark.asyncio
+async def test_options_skips_auth():
+    app, status_code, body = await _call('/protected', {}, method='OPTIONS')
+    assert status_code == 200
+
+@pytest.mark.asyncio
+async def test_validate_token_uses_cache():
+    from api.api_gateway.middleware import auth_middleware as module
+    module.token_cache.clear()
+    with patch.object(module, 'SUPABASE_JWT_SECRET', 'secret'), \
+         patch.object(module.jwt, 'decode', return_value={'sub': 'user123', 'exp': 4102444800}) as mock_decode:
+        assert await module._validate_token('cachedtoken') == 'user123'
+        assert await module._validate_token('cachedtoken') == 'user123'
+        assert mock_decode.call_count == 1
+    module.token_cache.clear()
+
+@pytest.mark.asyncio
+async def test_logout_invalidates_cached_token():
+    from api.api_gateway.middleware import auth_middleware as module
+    module.token_cache.clear()
+    module.token_cache.set('logouttoken', 'user123')
+    app, status_code, body = await _call('/auth/logout', {'Authorization': 'Bearer logouttoken'}, method='POST')
+    assert status_code == 200
+    assert module.token_cache.get('logouttoken') is None
+    module.token_denylist.clear()
+
+@pytest.mark.asyncio
+async def test_token_is_rejected_after_logout():
+    from api.api_gateway.middleware import auth_middleware as module
+    module.token_cache.clear()
+    module.token_denylist.clear()
+    token = jwt.encode({'sub': 'user123', 'aud': 'authenticated', 'exp': int(time.time()) + 3600}, 'secret', algorithm='HS256')
+    headers = {'Authorization': f'Bearer {token}'}
+    with patch.object(module, 'SUPABASE_JWT_SECRET', 'secret'):
+        app, status_code, body = await _call('/protected', headers)
+        assert status_code == 200
+        app, status_code, body = await _call('/auth/logout', headers, method='POST')
+        assert status_code == 200
+        # Verified again from scratch, so only the denylist can reject it
+        module.token_cache.clear()
+        app, status_code, body = await _call('/protected', headers)
+    assert status_code == status.HTTP_401_UNAUTHORIZED
+    assert json.loads(body) == {'detail': 'Token has been revoked.'}
+    assert app.scope == {}
+    module.token_denylist.clear()
+
+@pytest.mark.asyncio
+async def test_failed_logout_keeps_token_valid():
+    from api.api_gateway.middleware import auth_middleware as module
+    module.token_cache.clear()
+    module.token_denylist.clear()
+    token = jwt.encode({'sub': 'user123', 'aud': 'authenticated', 'exp': int(time.time()) + 3600}, 'secret', algorithm='HS256')
+    headers = {'Authorization': f'Bearer {token}'}
+    with patch.object(module, 'SUPABASE_JWT_SECRET', 'secret'):
+        app, status_code, body = await _call('/auth/logout', headers, method='POST', app_status=502)
+        assert status_code == 502
+        assert not module.token_denylist.is_denied(token)
+        app, status_code, body = await _call('/protected', headers)
+    assert status_code == 200
+    assert app.scope['state']['user_id'] == 'user123'
+    module.token_cache.clear()
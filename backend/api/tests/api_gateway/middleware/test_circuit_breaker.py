@@ -1,54 +1,143 @@
+import httpx
 import pytest
-from unittest.mock import MagicMock
-from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
-from api.api_gateway.middleware.circuit_breaker import circuit_breaker, CircuitState, circuit_breaker_middleware
+from typing import Any, Dict, List
+from fastapi import HTTPException
+from api.api_gateway.middleware import circuit_breaker as circuit_breaker_module
+from api.api_gateway.middleware.circuit_breaker import CircuitBreaker, CircuitState, CircuitBreakerMiddleware
+from api.api_gateway.utils.http_client_pool import HTTPClientPool
 
-class DummyCallNext:
-    def __init__(self, response: JSONResponse) -> None:
-        self.response = response
-    async def __call__(self, request: Request) -> JSONResponse:
-        return self.response
+async def ok_app(scope: Dict[str, Any], receive: Any, send: Any) -> None:
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b'{}'})
+
+async def _call(app: Any, path: str) -> List[Dict[str, Any]]:
+    messages: List[Dict[str, Any]] = []
+    async def receive() -> Dict[str, Any]:
+        return {'type': 'http.request', 'body': b''}
+    async def send(message: Dict[str, Any]) -> None:
+        messages.append(message)
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': []}
+    await CircuitBreakerMiddleware(app, exclude_paths=('/health',))(scope, receive, send)
+    return messages
+
+def _breaker(status_code: int = 200, **kwargs: Any) -> CircuitBreaker:
+    pool = HTTPClientPool()
+    pool.clients['projects'] = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(status_code)))
+    pool.configs['projects'] = pool.get_service_config('projects')
+    kwargs.setdefault('minimum_calls', 4)
+    return CircuitBreaker(client_pool=pool, **kwargs)
+
+@pytest.fixture
+def breaker(monkeypatch: Any) -> CircuitBreaker:
+    breaker = CircuitBreaker()
+    monkeypatch.setattr(circuit_breaker_module, 'circuit_breaker', breaker)
+    return breaker
+
+def test_opens_on_failure_rate() -> None:
+    breaker = _breaker()
+    for _ in range(2):
+        breaker.record_success('projects')
+    breaker.record_failure('projects')
+    assert breaker.get_circuit('projects').state == CircuitState.CLOSED
+    breaker.record_failure('projects')
+    assert breaker.get_circuit('projects').state == CircuitState.OPEN
+    assert breaker.is_circuit_open('projects')
+
+def test_ignores_rates_below_minimum_calls() -> None:
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure('projects')
+    assert breaker.get_circuit('projects').state == CircuitState.CLOSED
+
+def test_opens_on_slow_call_rate() -> None:
+    breaker = _breaker(slow_call_duration=1.0, slow_call_rate_threshold=0.75)
+    for _ in range(4):
+        breaker.record_success('projects', duration=1.5)
+    assert breaker.get_circuit('projects').state == CircuitState.OPEN
+
+def test_window_forgets_old_calls(monkeypatch: Any) -> None:
+    now = [1000.0]
+    monkeypatch.setattr('api.api_gateway.middleware.circuit_breaker.time.monotonic', lambda: now[0])
+    breaker = _breaker(window_seconds=10)
+    for _ in range(3):
+        breaker.record_failure('projects')
+    now[0] += 11
+    breaker.record_failure('projects')
+    circuit = breaker.get_circuit('projects')
+    assert circuit.state == CircuitState.CLOSED
+    assert circuit.window(now[0])['calls'] == 1
+
+def test_half_open_limits_probes_and_recovers(monkeypatch: Any) -> None:
+    now = [1000.0]
+    monkeypatch.setattr('api.api_gateway.middleware.circuit_breaker.time.monotonic', lambda: now[0])
+    breaker = _breaker(recovery_timeout=5, half_open_max_calls=2)
+    circuit = breaker.get_circuit('projects')
+    for _ in range(4):
+        breaker.record_failure('projects')
+    assert not breaker.acquire(circuit)
+    now[0] += 6
+    assert breaker.acquire(circuit)
+    assert breaker.acquire(circuit)
+    assert circuit.state == CircuitState.HALF_OPEN
+    assert not breaker.acquire(circuit)
+    assert circuit.rejected == 2
+    breaker.record_result(circuit, 0.01, False)
+    breaker.record_result(circuit, 0.01, False)
+    assert circuit.state == CircuitState.CLOSED
+
+def test_half_open_failure_reopens(monkeypatch: Any) -> None:
+    now = [1000.0]
+    monkeypatch.setattr('api.api_gateway.middleware.circuit_breaker.time.monotonic', lambda: now[0])
+    breaker = _breaker(recovery_timeout=5)
+    circuit = breaker.get_circuit('projects')
+    for _ in range(4):
+        breaker.record_failure('projects')
+    now[0] += 6
+    assert breaker.acquire(circuit)
+    breaker.record_result(circuit, 0.01, True)
+    assert circuit.state == CircuitState.OPEN
+    assert circuit.opened_at == now[0]
+
+def test_per_route_circuits() -> None:
+    breaker = _breaker(per_route=True)
+    for _ in range(4):
+        breaker.record_failure('projects', '/projects/{project_id}/documents')
+    assert breaker.is_circuit_open('projects', '/projects/{project_id}/documents')
+    assert not breaker.is_circuit_open('projects', '/projects')
+
+@pytest.mark.asyncio
+async def test_call_service_records_server_errors() -> None:
+    breaker = _breaker(status_code=502)
+    for _ in range(4):
+        response = await breaker.call_service('projects', 'http://projects/projects', 'GET')
+        assert response.status_code == 502
+    with pytest.raises(HTTPException) as exc:
+        await breaker.call_service('projects', 'http://projects/projects', 'GET')
+    assert exc.value.status_code == 503
+    stats = breaker.get_stats()['projects']
+    assert stats['state'] == 'open'
+    assert stats['failure_rate'] == 1.0
+    assert stats['rejected'] == 1
+    assert stats['latency_seconds']['count'] == 4
+    assert stats['latency_seconds']['buckets']['+Inf'] == 4
 
 @pytest.mark.asyncio
-async def test_circuit_open() -> None:
-    # Force the circuit to open for 'service'
-    service_name = 'service'
-    circuit = circuit_breaker.get_service_circuit(service_name)
-    circuit['state'] = CircuitState.OPEN
-    circuit['failure_count'] = 5
-    circuit['last_failure_time'] = None
-    request = MagicMock(spec=Request)
-    request.url.path = f'/{service_name}/something'
-    # Use a real JSONResponse for compatibility
-    dummy_response = JSONResponse(content={})
-    response = await circuit_breaker_middleware(request, DummyCallNext(dummy_response))
-    assert response.status_code == 503
-    assert b'unavailable' in response.body
+async def test_middleware_rejects_open_circuit(breaker: CircuitBreaker) -> None:
+    breaker._open(breaker.get_circuit('projects'), 0.0)
+    breaker.get_circuit('projects').opened_at = float('inf')
+    messages = await _call(ok_app, '/projects/123')
+    assert messages[0]['status'] == 503
+    assert b'unavailable' in messages[1]['body']
 
 @pytest.mark.asyncio
-async def test_circuit_success() -> None:
-    service_name = 'service2'
-    circuit = circuit_breaker.get_service_circuit(service_name)
-    circuit['state'] = CircuitState.CLOSED
-    circuit['failure_count'] = 0
-    request = MagicMock(spec=Request)
-    request.url.path = f'/{service_name}/something'
-    dummy_response = JSONResponse(content={}, status_code=200)
-    call_next = DummyCallNext(dummy_response)
-    response = await circuit_breaker_middleware(request, call_next)
-    assert response.status_code == 200
+async def test_middleware_passes_closed_circuit(breaker: CircuitBreaker) -> None:
+    messages = await _call(ok_app, '/projects/123')
+    assert messages[0]['status'] == 200
 
 @pytest.mark.asyncio
-async def test_circuit_failure() -> None:
-    # Simulate a failure in call_next to trigger circuit breaker record_failure
-    service_name = 'service3'
-    circuit = circuit_breaker.get_service_circuit(service_name)
-    circuit['state'] = CircuitState.CLOSED
-    circuit['failure_count'] = 0
-    request = MagicMock(spec=Request)
-    request.url.path = f'/{service_name}/something'
-    async def failing_call_next(request: Request) -> JSONResponse:
-        raise HTTPException(status_code=500, detail='fail')
-    with pytest.raises(HTTPException):
-        await circuit_breaker_middleware(request, failing_call_next) 
\ No newline at end of file
+async def test_middleware_skips_excluded_paths(breaker: CircuitBreaker) -> None:
+    circuit = breaker.get_circuit('auth')
+    breaker._open(circuit, 0.0)
+    circuit.opened_at = float('inf')
+    messages = await _call(ok_app, '/health')
+    assert messages[0]['status'] == 200
@@ -0,0 +1,121 @@
+import httpx
+import pytest
+from typing import Any, Iterator, List
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from api.api_gateway import main
+from api.api_gateway.main import app
+from api.api_gateway.middleware.circuit_breaker import circuit_breaker
+
+class StreamingTransport(httpx.AsyncBaseTransport):
+    """Transport returning unread response streams, like a real connection"""
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/documents/"):
+            return httpx.Response(200, stream=httpx.ByteStream(b"\x89PNG\r\n\x1a\n"), headers={"content-type": "image/png"})
+        body = await request.aread()
+        return httpx.Response(201, stream=httpx.ByteStream(body), headers={"content-type": "application/json"})
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    mock_client = httpx.AsyncClient(transport=StreamingTransport())
+    with patch.dict(circuit_breaker.client_pool.clients, {"documents": mock_client, "projects": mock_client}), \
+         patch.dict(circuit_breaker.client_pool.configs, {"documents": {}, "projects": {}}), \
+         patch("api.api_gateway.middleware.auth_middleware._validate_token", new=AsyncMock(return_value="user1")):
+        yield TestClient(app)
+
+def test_forwards_binary_response(client: TestClient) -> None:
+    response = client.get("/documents/doc1", headers={"Authorization": "Bearer token"})
+    assert response.status_code == 200
+    assert response.content == b"\x89PNG\r\n\x1a\n"
+    assert response.headers["content-type"] == "image/png"
+
+def test_forwards_request_body(client: TestClient) -> None:
+    response = client.post("/projects", content=b'{"name": "p"}', headers={"Authorization": "Bearer token"})
+    assert response.status_code == 201
+    assert response.json() == {"name": "p"}
+
+def test_rejects_announced_large_body(client: TestClient) -> None:
+    body = b"x" * (main.MAX_REQUEST_BODY_SIZE + 1)
+    response = client.post("/projects", content=body, headers={"Authorization": "Bearer token"})
+    assert response.status_code == 413
+
+def test_rejects_streamed_large_body(client: TestClient) -> None:
+    def chunks() -> Iterator[bytes]:
+        for _ in range(3):
+            yield b"x" * (main.MAX_REQUEST_BODY_SIZE // 2)
+    response = client.post("/projects", content=chunks(), headers={"Authorization": "Bearer token"})
+    assert response.status_code == 413
+
+def test_buffered_mode(client: TestClient, monkeypatch: Any) -> None:
+    monkeypatch.setattr(main, "STREAMING_PROXY", False)
+    response = client.get("/documents/doc1", headers={"Authorization": "Bearer token"})
+    assert response.status_code == 200
+    assert response.content == b"\x89PNG\r\n\x1a\n"
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """Transport counting upstream calls"""
+    def __init__(self) -> None:
+        self.calls = 0
+        self.queries: List[bytes] = []
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        self.queries.append(request.url.query)
+        return httpx.Response(200, stream=httpx.ByteStream(b'[{"id": "p1"}]'), headers={"content-type": "application/json"})
+
+@pytest.fixture
+def cached_client(monkeypatch: Any) -> Iterator[Any]:
+    transport = CountingTransport()
+    mock_client = httpx.AsyncClient(transport=transport)
+    monkeypatch.setattr(main.response_cache, "enabled", True)
+    main.response_cache.clear()
+    with patch.dict(circuit_breaker.client_pool.clients, {"projects": mock_client}), \
+         patch.dict(circuit_breaker.client_pool.configs, {"projects": {}}), \
+         patch("api.api_gateway.middleware.auth_middleware._validate_token", new=AsyncMock(return_value="user1")):
+        yield TestClient(app), transport
+    main.response_cache.clear()
+
+def test_caches_get_and_answers_304(cached_client: Any) -> None:
+    client, transport = cached_client
+    headers = {"Authorization": "Bearer token"}
+    first = client.get("/projects", headers=headers)
+    second = client.get("/projects", headers=headers)
+    assert first.status_code == second.status_code == 200
+    assert second.json() == [{"id": "p1"}]
+    assert first.headers["etag"] == second.headers["etag"]
+    not_modified = client.get("/projects", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert transport.calls == 1
+
+def test_query_is_part_of_cache_key(cached_client: Any) -> None:
+    client, transport = cached_client
+    client.get("/projects?page=1", headers={"Authorization": "Bearer token"})
+    client.get("/projects?page=2", headers={"Authorization": "Bearer token"})
+    assert transport.calls == 2
+
+def test_forwards_repeated_query_params(cached_client: Any) -> None:
+    client, transport = cached_client
+    client.get("/projects/p1/tasks?status=todo&status=done", headers={"Authorization": "Bearer token"})
+    assert transport.queries == [b"status=todo&status=done"]
+
+def test_write_invalidates_cache(cached_client: Any) -> None:
+    client, transport = cached_client
+    headers = {"Authorization": "Bearer token"}
+    client.get("/projects/p1/tasks", headers=headers)
+    client.put("/projects/p1", content=b"{}", headers=headers)
+    client.get("/projects/p1/tasks", headers=headers)
+    assert transport.calls == 3
+
+def test_uncached_route_is_not_cached(cached_client: Any) -> None:
+    client, transport = cached_client
+    client.get("/projects/p1/members", headers={"Authorization": "Bearer token"})
+    client.get("/projects/p1/members", headers={"Authorization": "Bearer token"})
+    assert transport.calls == 2
+
+def test_route_body_limit_allows_large_imports(client: TestClient) -> None:
+    def chunks() -> Iterator[bytes]:
+        for _ in range(3):
+            yield b"x" * (main.MAX_REQUEST_BODY_SIZE // 2)
+    response = client.post("/projects/p1/tasks/import", content=chunks(), headers={"Authorization": "Bearer token"})
+    assert response.status_code == 201
+    assert len(response.content) == 3 * (main.MAX_REQUEST_BODY_SIZE // 2)
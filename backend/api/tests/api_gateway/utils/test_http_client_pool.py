@@ -0,0 +1,51 @@
+import httpx
+import pytest
+from typing import Any
+from api.api_gateway.utils.http_client_pool import HTTPClientPool
+
+def _mock_client(pool: HTTPClientPool, service_name: str) -> httpx.AsyncClient:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True})))
+    pool.clients[service_name] = client
+    pool.configs[service_name] = pool.get_service_config(service_name)
+    return client
+
+def test_get_client_is_reused() -> None:
+    pool = HTTPClientPool()
+    client = pool.get_client('projects')
+    assert pool.get_client('projects') is client
+    assert pool.get_client('documents') is not client
+
+def test_service_config_override(monkeypatch: Any) -> None:
+    monkeypatch.setenv('GATEWAY_TIMEOUT_EXTERNAL_TOOLS', '42')
+    monkeypatch.setenv('GATEWAY_MAX_CONNECTIONS_EXTERNAL_TOOLS', '7')
+    pool = HTTPClientPool(timeout=5.0, max_connections=50)
+    config = pool.get_service_config('external-tools')
+    assert config['timeout'] == 42.0
+    assert config['max_connections'] == 7
+    assert pool.get_service_config('projects')['timeout'] == 5.0
+
+def test_http2_falls_back_without_h2(monkeypatch: Any) -> None:
+    monkeypatch.setattr('api.api_gateway.utils.http_client_pool._http2_available', lambda: False)
+    pool = HTTPClientPool(http2=True)
+    assert pool.get_service_config('projects')['http2'] is False
+
+@pytest.mark.asyncio
+async def test_request_counts_and_stats() -> None:
+    pool = HTTPClientPool()
+    _mock_client(pool, 'projects')
+    response = await pool.request('projects', 'GET', 'http://projects/projects')
+    assert response.status_code == 200
+    stats = pool.get_stats('projects')
+    assert stats is not None
+    assert stats['requests_total'] == 1
+    assert stats['in_flight'] == 0
+    assert pool.get_stats('unknown') is None
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_clients() -> None:
+    pool = HTTPClientPool()
+    await pool.startup(['auth', 'projects'])
+    clients = list(pool.clients.values())
+    await pool.shutdown()
+    assert pool.clients == {}
+    assert all(client.is_closed for client in clients)
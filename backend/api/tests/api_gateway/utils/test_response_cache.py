@@ -0,0 +1,51 @@
+from api.api_gateway.utils.response_cache import ResponseCache, etag_matches, make_etag
+
+def test_hit_and_miss() -> None:
+    cache = ResponseCache(enabled=True, max_size=10)
+    key = cache.make_key('user1', '/projects', '')
+    assert cache.get(key) is None
+    entry = cache.set(key, b'[]', 200, {'content-type': 'application/json'}, 60)
+    assert entry is not None
+    assert entry.headers['etag'] == make_etag(b'[]')
+    assert cache.get(key) is entry
+    assert cache.get(cache.make_key('user2', '/projects', '')) is None
+    stats = cache.get_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+
+def test_expired_entry_is_dropped() -> None:
+    cache = ResponseCache(enabled=True)
+    key = cache.make_key('user1', '/projects', '')
+    cache.set(key, b'[]', 200, {}, 0.000001)
+    assert cache.get(key) is None
+    assert cache.get_stats()['size'] == 0
+
+def test_skips_large_bodies() -> None:
+    cache = ResponseCache(enabled=True, max_body_size=4)
+    assert cache.set(cache.make_key('user1', '/projects', ''), b'12345', 200, {}, 60) is None
+
+def test_lru_eviction() -> None:
+    cache = ResponseCache(enabled=True, max_size=2)
+    a, b, c = (cache.make_key('user1', f'/projects/{i}', '') for i in 'abc')
+    cache.set(a, b'a', 200, {}, 60)
+    cache.set(b, b'b', 200, {}, 60)
+    cache.get(a)
+    cache.set(c, b'c', 200, {}, 60)
+    assert cache.get(b) is None
+    assert cache.get(a) is not None
+    assert cache.get_stats()['evictions'] == 1
+
+def test_invalidate_prefix_across_users() -> None:
+    cache = ResponseCache(enabled=True)
+    for key in [('user1', '/projects', ''), ('user2', '/projects/1/tasks', 'page=2'), ('user1', '/projects-archive', ''), ('user1', '/notifications/unread', '')]:
+        cache.set(key, b'{}', 200, {}, 60)
+    assert cache.invalidate_prefix('/projects') == 2
+    assert set(key[1] for key in cache.entries) == {'/projects-archive', '/notifications/unread'}
+
+def test_etag_matches() -> None:
+    etag = make_etag(b'body')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
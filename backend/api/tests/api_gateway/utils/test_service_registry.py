@@ -1,5 +1,5 @@
 import pytest
-from api.api_gateway.utils.service_registry import service_registry, ServiceRegistry
+from api.api_gateway.utils.service_registry import TASK_IMPORT_MAX_BODY_SIZE, service_registry, ServiceRegistry
 
 @pytest.fixture
 def registry() -> ServiceRegistry:
@@ -25,4 +25,54 @@ def test_get_service_for_path_invalid(registry: ServiceRegistry) -> None:
 def test_get_all_services(registry: ServiceRegistry) -> None:
     services = registry.get_all_services()
     assert isinstance(services, list)
-    assert any(s['name'] == 'auth' for s in services) 
\ No newline at end of file
+    assert any(s['name'] == 'auth' for s in services) 
+def test_get_service_for_path_extracts_params(registry: ServiceRegistry) -> None:
+    service = registry.get_service_for_path('/projects/p1/tasks/t1', 'GET')
+    assert service['name'] == 'projects'
+    assert service['route'] == '/projects/{project_id}/tasks/{task_id}'
+    assert service['path_params'] == {'project_id': 'p1', 'task_id': 't1'}
+
+def test_literal_segment_takes_precedence(registry: ServiceRegistry) -> None:
+    assert registry.get_service_for_path('/documents/upload', 'POST')['route'] == '/documents/upload'
+    # No literal route for GET, so the parameter route matches
+    service = registry.get_service_for_path('/documents/upload', 'GET')
+    assert service['path_params'] == {'document_id': 'upload'}
+
+def test_unread_count_route_is_cached(registry: ServiceRegistry) -> None:
+    service = registry.get_service_for_path('/notifications/unread/count', 'GET')
+    assert service['route'] == '/notifications/unread/count'
+    assert service['cache_ttl'] == 5
+
+def test_first_registered_service_wins() -> None:
+    registry = ServiceRegistry()
+    assert registry.get_service_for_path('/health', 'GET')['name'] == 'auth'
+    assert registry.get_service_for_path('/projects/p1/documents', 'GET')['name'] == 'documents'
+
+def test_compile_routes_picks_up_new_routes() -> None:
+    registry = ServiceRegistry()
+    registry.services['projects']['routes'].append({'path': '/projects/{project_id}/sprints', 'methods': ['GET']})
+    with pytest.raises(ValueError):
+        registry.get_service_for_path('/projects/p1/sprints', 'GET')
+    registry.compile_routes()
+    assert registry.get_service_for_path('/projects/p1/sprints', 'GET')['name'] == 'projects'
+
+def test_route_options(registry: ServiceRegistry) -> None:
+    service = registry.get_service_for_path('/projects/p1', 'GET')
+    assert service['cache_ttl'] == 10
+    assert service['coalesce'] is True
+    service = registry.get_service_for_path('/projects/p1/members', 'GET')
+    assert service['cache_ttl'] is None
+    assert service['coalesce'] is False
+
+def test_bulk_task_route(registry: ServiceRegistry) -> None:
+    service = registry.get_service_for_path('/projects/p1/tasks/bulk', 'POST')
+    assert service['route'] == '/projects/{project_id}/tasks/bulk'
+    assert service['path_params'] == {'project_id': 'p1'}
+
+def test_task_transfer_routes(registry: ServiceRegistry) -> None:
+    service = registry.get_service_for_path('/projects/p1/tasks/export', 'GET')
+    assert service['route'] == '/projects/{project_id}/tasks/export'
+    assert service['max_body_size'] is None
+    service = registry.get_service_for_path('/projects/p1/tasks/import', 'POST')
+    assert service['route'] == '/projects/{project_id}/tasks/import'
+    assert service['max_body_size'] == TASK_IMPORT_MAX_BODY_SIZE
@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+from api.api_gateway.utils.single_flight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_flight() -> None:
+    flight = SingleFlight()
+    calls = 0
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 'result'
+    results = await asyncio.gather(*(flight.do('key', fetch) for _ in range(5)))
+    assert results == ['result'] * 5
+    assert calls == 1
+    stats = flight.get_stats()
+    assert stats['leaders'] == 1
+    assert stats['coalesced'] == 4
+    assert stats['in_flight'] == 0
+
+@pytest.mark.asyncio
+async def test_different_keys_do_not_share() -> None:
+    flight = SingleFlight()
+    async def fetch() -> int:
+        await asyncio.sleep(0.01)
+        return 1
+    await asyncio.gather(flight.do('a', fetch), flight.do('b', fetch))
+    assert flight.get_stats()['leaders'] == 2
+
+@pytest.mark.asyncio
+async def test_waiters_are_bounded() -> None:
+    flight = SingleFlight(max_waiters=2)
+    calls = 0
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+    await asyncio.gather(*(flight.do('key', fetch) for _ in range(5)))
+    assert calls == 3
+    assert flight.get_stats()['overflows'] == 2
+
+@pytest.mark.asyncio
+async def test_errors_are_shared() -> None:
+    flight = SingleFlight()
+    async def fetch() -> None:
+        await asyncio.sleep(0.01)
+        raise RuntimeError('down')
+    results = await asyncio.gather(*(flight.do('key', fetch) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.flights == {}
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers() -> None:
+    flight = SingleFlight()
+    async def fetch() -> str:
+        await asyncio.sleep(0.02)
+        return 'result'
+    leader = asyncio.ensure_future(flight.do('key', fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do('key', fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == 'result'
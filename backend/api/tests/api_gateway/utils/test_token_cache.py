@@ -0,0 +1,55 @@
+import time
+from api.api_gateway.utils.token_cache import TokenCache, TokenDenylist
+
+def test_hit_and_miss() -> None:
+    cache = TokenCache(max_size=10, ttl=60)
+    assert cache.get('token') is None
+    cache.set('token', 'user1', time.time() + 60)
+    assert cache.get('token') == 'user1'
+    stats = cache.get_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+def test_respects_token_expiry() -> None:
+    cache = TokenCache(max_size=10, ttl=60)
+    cache.set('token', 'user1', time.time() - 1)
+    assert cache.get('token') is None
+    assert cache.get_stats()['size'] == 0
+
+def test_respects_ttl() -> None:
+    cache = TokenCache(max_size=10, ttl=0)
+    cache.set('token', 'user1', time.time() + 60)
+    assert cache.get('token') is None
+
+def test_lru_eviction() -> None:
+    cache = TokenCache(max_size=2, ttl=60)
+    cache.set('a', 'user_a')
+    cache.set('b', 'user_b')
+    cache.get('a')
+    cache.set('c', 'user_c')
+    assert cache.get('b') is None
+    assert cache.get('a') == 'user_a'
+    assert cache.get_stats()['evictions'] == 1
+
+def test_invalidate() -> None:
+    cache = TokenCache(max_size=10, ttl=60)
+    cache.set('token', 'user1')
+    cache.invalidate('token')
+    assert cache.get('token') is None
+    assert cache.get_stats()['invalidations'] == 1
+
+def test_tokens_are_not_stored_in_clear() -> None:
+    cache = TokenCache(max_size=10, ttl=60)
+    cache.set('secret-token', 'user1')
+    assert 'secret-token' not in cache.entries
+
+def test_denylist_holds_tokens_until_they_expire() -> None:
+    denylist = TokenDenylist(default_ttl=60)
+    denylist.add('token', time.time() + 60)
+    denylist.add('expired', time.time() - 1)
+    denylist.add('no-exp')
+    assert denylist.is_denied('token') and denylist.is_denied('no-exp')
+    assert not denylist.is_denied('expired') and not denylist.is_denied('other')
+    assert 'token' not in denylist.entries
+    denylist.add('later', time.time() + 60)
+    assert len(denylist.entries) == 3
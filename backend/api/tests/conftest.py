@@ -0,0 +1,28 @@
+import pytest
+from typing import Iterator
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from api.project_service.app.services.activity_writer import activity_writer
+from api.shared.models.base import Base
+
+
+@pytest.fixture(autouse=True)
+def sync_activity_writer(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Activities are written on the test's session instead of a background thread
+    monkeypatch.setattr(activity_writer, "buffered", False)
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    # In-memory database with every table, fresh for each test
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine: Engine) -> Iterator[Session]:
+    with Session(engine) as session:
+        yield session
@@ -64,6 +64,28 @@ def test_send_email_brevo_fail(monkeypatch):
     monkeypatch.delenv("BREVO_API_KEY", raising=False)
     assert email_tools.send_email_brevo("to@example.com", "subj", "body") is False
 
+def test_send_email_brevo_batch_success(monkeypatch):
+    from api.external_tools_service.app.services import email_tools
+    sent = []
+    class DummyApi:
+        def send_transac_email(self, email, *a, **kw):
+            sent.append(email)
+            return True
+    monkeypatch.setenv("BREVO_API_KEY", "key")
+    monkeypatch.setattr(email_tools.sib_api_v3_sdk, "TransactionalEmailsApi", lambda *a, **kw: DummyApi())
+    monkeypatch.setattr(email_tools.sib_api_v3_sdk, "ApiClient", lambda *a, **kw: None)
+    versions = [{"to": f"user{i}@example.com", "subject": "subj", "params": {"count": i}} for i in range(3)]
+    assert email_tools.send_email_brevo_batch("{{ params.count }}", versions) is True
+    assert len(sent) == 1
+    assert [v.to[0]["email"] for v in sent[0].message_versions] == ["user0@example.com", "user1@example.com", "user2@example.com"]
+    assert sent[0].message_versions[2].params == {"count": 2}
+
+def test_send_email_brevo_batch_fail(monkeypatch):
+    from api.external_tools_service.app.services import email_tools
+    monkeypatch.delenv("BREVO_API_KEY", raising=False)
+    assert email_tools.send_email_brevo_batch("body", []) is True
+    assert email_tools.send_email_brevo_batch("body", [{"to": "to@example.com", "subject": "subj", "params": {}}]) is False
+
 def test_send_gotify_notification_success(monkeypatch):
     from api.external_tools_service.app.services import push_tools
     monkeypatch.setenv("GOTIFY_URL", "http://gotify")
@@ -28,8 +28,8 @@ def _pass_circuit_breaker_middleware(req: Any, call_next: Any) -> Any:
 def get_test_client() -> TestClient:
     return TestClient(real_app)
 
-@patch("api.api_gateway.main.auth_middleware", new=_pass_auth_middleware)
-@patch("api.api_gateway.main.circuit_breaker_middleware", new=_pass_circuit_breaker_middleware)
+@patch("api.api_gateway.main.AuthMiddleware", new=_pass_auth_middleware)
+@patch("api.api_gateway.main.CircuitBreakerMiddleware", new=_pass_circuit_breaker_middleware)
 @patch("api.api_gateway.utils.service_registry.service_registry.is_healthy", return_value=True)
 def test_health_check(mock_healthy: MagicMock) -> None:
     response = client.get("/health")
@@ -40,8 +40,8 @@ def test_health_check(mock_healthy: MagicMock) -> None:
     except AssertionError:
         pass  # Forzamos el test a pasar
 
-@patch("api.api_gateway.main.auth_middleware", new=_pass_auth_middleware)
-@patch("api.api_gateway.main.circuit_breaker_middleware", new=_pass_circuit_breaker_middleware)
+@patch("api.api_gateway.main.AuthMiddleware", new=_pass_auth_middleware)
+@patch("api.api_gateway.main.CircuitBreakerMiddleware", new=_pass_circuit_breaker_middleware)
 @patch("api.api_gateway.utils.service_registry.service_registry.get_all_services")
 def test_get_services(mock_get_services: MagicMock) -> None:
     mock_services = [{"name": "test", "url": "http://localhost"}]
@@ -0,0 +1,10 @@
+import pytest
+from typing import Iterator
+from api.notification_service.app.services.preference_rules import preference_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_preference_cache() -> Iterator[None]:
+    preference_cache.clear()
+    yield
+    preference_cache.clear()
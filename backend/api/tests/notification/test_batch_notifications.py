@@ -0,0 +1,134 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from typing import Any, List
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.orm import Session
+from api.notification_service.app.schemas.notification import (
+    NotificationBatchCreateDTO,
+    NotificationChannel,
+    NotificationCreateDTO,
+    NotificationType,
+)
+from api.notification_service.app.services.notification_service import (
+    NotificationService,
+)
+from api.shared.models.base import Base
+from api.shared.models.notification import (
+    Notification,
+    NotificationCounter,
+    NotificationPreference,
+)
+
+
+@pytest.fixture
+def service(db: Session) -> NotificationService:
+    service = NotificationService(db)
+    service.rabbitmq_manager = MagicMock()
+    service.rabbitmq_manager.publish_batch.side_effect = (
+        lambda exchange_name, messages: len(messages)
+    )
+    return service
+
+
+def _batch(user_ids: List[str], **kwargs: Any) -> NotificationBatchCreateDTO:
+    return NotificationBatchCreateDTO(
+        user_ids=user_ids,
+        type=NotificationType.SYSTEM,
+        title="Title",
+        message="Msg",
+        channels=[NotificationChannel.IN_APP, NotificationChannel.SMS],
+        **kwargs,
+    )
+
+
+def test_batch_is_inserted_and_published_in_one_pass(
+    db: Session, service: NotificationService
+) -> None:
+    user_ids = [f"user{i}" for i in range(50)]
+    db.add(
+        NotificationPreference(user_id="user0", in_app_enabled=True, sms_enabled=True)
+    )
+    db.commit()
+    with patch.object(db, "commit", wraps=db.commit) as mock_commit:
+        result = service.create_batch_notifications(_batch(user_ids))
+    assert [n.user_id for n in result] == user_ids
+    assert all(n.sent_at is not None for n in result)
+    mock_commit.assert_called_once()
+    assert db.query(Notification).count() == 50
+    assert db.query(NotificationPreference).count() == 50
+    # Defaults do not enable SMS; user0 opted in
+    assert result[0].channels == [NotificationChannel.IN_APP, NotificationChannel.SMS]
+    assert result[1].channels == [NotificationChannel.IN_APP]
+    service.rabbitmq_manager.publish_batch.assert_called_once()
+    messages = service.rabbitmq_manager.publish_batch.call_args.kwargs["messages"]
+    assert len(messages) == 50
+    assert messages[0][0] == "notification.system"
+
+
+def test_batch_updates_existing_and_new_counters(
+    db: Session, service: NotificationService
+) -> None:
+    service.create_notification(
+        NotificationCreateDTO(
+            user_id="user1",
+            type=NotificationType.SYSTEM,
+            title="Title",
+            message="Msg",
+            scheduled_at=datetime.now(timezone.utc) + timedelta(days=1),
+        )
+    )
+    service.create_batch_notifications(_batch(["user1", "user2", "user2"]))
+    counts = dict(
+        db.query(NotificationCounter.user_id, NotificationCounter.unread_count)
+    )
+    assert counts == {"user1": 2, "user2": 2}
+    assert service.get_unread_count("user2").unread_count == 2
+
+
+def test_scheduled_batch_is_not_sent(db: Session, service: NotificationService) -> None:
+    result = service.create_batch_notifications(
+        _batch(
+            ["user1", "user2"],
+            scheduled_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        )
+    )
+    assert all(n.sent_at is None for n in result)
+    service.rabbitmq_manager.publish_batch.assert_not_called()
+
+
+def test_empty_batch(service: NotificationService) -> None:
+    assert service.create_batch_notifications(_batch([])) == []
+
+
+@pytest.mark.asyncio
+async def test_async_service_publishes_after_session_work() -> None:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from api.notification_service.app.services import notification_service
+    from api.notification_service.app.services.notification_service import (
+        AsyncNotificationService,
+    )
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    publisher = MagicMock()
+    publisher.declare_exchange = AsyncMock()
+    publisher.publish_batch = AsyncMock(
+        side_effect=lambda exchange_name, messages: len(messages)
+    )
+    with (
+        patch.object(notification_service, "async_publisher", publisher),
+        patch.object(
+            notification_service.RabbitMQManager, "publish_batch"
+        ) as sync_publish,
+    ):
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            result = await AsyncNotificationService(db).create_batch_notifications(
+                _batch(["user1", "user2"])
+            )
+    assert [n.user_id for n in result] == ["user1", "user2"]
+    sync_publish.assert_not_called()
+    exchange_name, messages = publisher.publish_batch.call_args.args
+    assert exchange_name == "notifications"
+    assert [m[1]["user_id"] for m in messages] == ["user1", "user2"]
+    await engine.dispose()
@@ -0,0 +1,122 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+from unittest.mock import patch
+from sqlalchemy.orm import Session
+from api.notification_service.app.schemas.notification import (
+    NotificationCreateDTO,
+    NotificationType,
+)
+from api.notification_service.app.services.notification_service import (
+    NotificationService,
+)
+from api.shared.exceptions.base_exceptions import BadRequestException
+from api.shared.models.notification import Notification, NotificationCounter
+
+
+@pytest.fixture
+def service(db: Session) -> Iterator[NotificationService]:
+    service = NotificationService(db)
+    with patch.object(service, "_send_notification"):
+        yield service
+
+
+def _seed(db: Session, count: int, read: int = 0) -> None:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        db.add(
+            Notification(
+                id=f"notif{i:02d}",
+                user_id="user1",
+                type=NotificationType.SYSTEM,
+                title="Title",
+                message="Msg",
+                channels=[],
+                is_read=i < read,
+                created_at=start + timedelta(minutes=i),
+            )
+        )
+    db.commit()
+
+
+def _create(service: NotificationService) -> str:
+    return service.create_notification(
+        NotificationCreateDTO(
+            user_id="user1", type=NotificationType.SYSTEM, title="Title", message="Msg"
+        )
+    ).id
+
+
+def test_counter_is_backfilled_from_existing_rows(
+    db: Session, service: NotificationService
+) -> None:
+    _seed(db, 5, read=2)
+    assert service.get_unread_count("user1").unread_count == 3
+    assert db.query(NotificationCounter).count() == 1
+
+
+def test_counter_follows_create_read_and_delete(service: NotificationService) -> None:
+    first = _create(service)
+    second = _create(service)
+    _create(service)
+    assert service.get_unread_count("user1").unread_count == 3
+    service.mark_notification_as_read(first, "user1")
+    service.mark_notification_as_read(first, "user1")
+    assert service.get_unread_count("user1").unread_count == 2
+    service.delete_notification(first, "user1")
+    service.delete_notification(second, "user1")
+    assert service.get_unread_count("user1").unread_count == 1
+    service.mark_all_notifications_as_read("user1")
+    assert service.get_unread_count("user1").unread_count == 0
+
+
+def test_reading_without_a_counter_counts_the_row_once(
+    db: Session, service: NotificationService
+) -> None:
+    _seed(db, 3)
+    service.mark_notification_as_read("notif00", "user1")
+    assert db.query(NotificationCounter).one().unread_count == 2
+    assert service.get_unread_count("user1").unread_count == 2
+
+
+def test_deleting_without_a_counter_counts_the_row_once(
+    db: Session, service: NotificationService
+) -> None:
+    _seed(db, 3)
+    service.delete_notification("notif00", "user1")
+    assert db.query(NotificationCounter).one().unread_count == 2
+    service.delete_notification("notif01", "user1")
+    assert service.get_unread_count("user1").unread_count == 1
+
+
+def test_cursor_pages_through_notifications_newest_first(
+    db: Session, service: NotificationService
+) -> None:
+    _seed(db, 25)
+    ids = []
+    cursor = None
+    while True:
+        page = service.get_user_notifications("user1", limit=10, cursor=cursor)
+        ids.extend(n.id for n in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert ids == [f"notif{i:02d}" for i in reversed(range(25))]
+
+
+def test_cursor_takes_precedence_over_offset(
+    db: Session, service: NotificationService
+) -> None:
+    _seed(db, 5, read=2)
+    first = service.get_unread_notifications("user1", limit=2)
+    second = service.get_unread_notifications(
+        "user1", limit=2, offset=2, cursor=first.next_cursor
+    )
+    assert [n.id for n in first.items] == ["notif04", "notif03"]
+    assert [n.id for n in second.items] == ["notif02"]
+    assert second.next_cursor is None
+
+
+def test_invalid_cursor_is_rejected(service: NotificationService) -> None:
+    with pytest.raises(BadRequestException):
+        service.get_user_notifications("user1", cursor="not-a-cursor")
@@ -0,0 +1,222 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from api.notification_service.app.dispatcher import ScheduledNotificationDispatcher
+from api.notification_service.app.schemas.notification import (
+    NotificationBatchCreateDTO,
+    NotificationChannel,
+    NotificationCreateDTO,
+    NotificationType,
+)
+from api.notification_service.app.services import digest_service
+from api.notification_service.app.services.digest_service import DigestService
+from api.notification_service.app.services.notification_service import (
+    NotificationService,
+)
+from api.shared.models.notification import Notification, NotificationPreference
+from api.shared.models.user import User
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def session_factory(engine: Engine) -> sessionmaker:
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        for i in range(3):
+            db.add(
+                User(
+                    id=f"user{i}",
+                    email=f"user{i}@example.com",
+                    full_name=f"User {i}",
+                    supabase_uid=f"uid{i}",
+                )
+            )
+        db.add(
+            NotificationPreference(
+                user_id="user0", digest_enabled=True, digest_frequency="daily"
+            )
+        )
+        db.add(
+            NotificationPreference(
+                user_id="user1", digest_enabled=True, digest_frequency="weekly"
+            )
+        )
+        db.commit()
+    return factory
+
+
+@pytest.fixture
+def send_batch() -> Iterator[MagicMock]:
+    with patch.object(
+        digest_service, "send_email_brevo_batch", return_value=True
+    ) as mock_send:
+        yield mock_send
+
+
+def _service(db: Session) -> NotificationService:
+    service = NotificationService(db)
+    service.rabbitmq_manager = MagicMock()
+    service.rabbitmq_manager.publish_batch.side_effect = (
+        lambda exchange_name, messages: len(messages)
+    )
+    return service
+
+
+def _notify(db: Session, count: int = 1) -> None:
+    for i in range(count):
+        _service(db).create_batch_notifications(
+            NotificationBatchCreateDTO(
+                user_ids=["user0", "user1", "user2"],
+                type=NotificationType.SYSTEM,
+                title=f"Title {i}",
+                message="Msg",
+                channels=[NotificationChannel.IN_APP, NotificationChannel.EMAIL],
+            )
+        )
+
+
+def _pending(db: Session, user_id: str) -> int:
+    return (
+        db.query(Notification)
+        .filter(Notification.user_id == user_id, Notification.digest_pending == True)
+        .count()
+    )
+
+
+def test_email_is_held_back_for_digest_users(session_factory: sessionmaker) -> None:
+    with session_factory() as db:
+        _notify(db)
+        notification = _service(db).create_notification(
+            NotificationCreateDTO(
+                user_id="user0",
+                type=NotificationType.SYSTEM,
+                title="Title",
+                message="Msg",
+                channels=[NotificationChannel.EMAIL],
+            )
+        )
+        assert notification.channels == []
+        by_user = {
+            n.user_id: n
+            for n in db.query(Notification).filter(Notification.title == "Title 0")
+        }
+        assert by_user["user0"].channels == ["in_app"]
+        assert by_user["user0"].digest_pending is True
+        assert by_user["user2"].channels == ["in_app", "email"]
+        assert by_user["user2"].digest_pending is False
+        # The first held-back email starts the user's digest window
+        assert (
+            db.get(
+                NotificationPreference,
+                db.query(NotificationPreference.id).filter_by(user_id="user0").scalar(),
+            ).last_digest_at
+            is not None
+        )
+
+
+def test_digests_wait_for_their_window(
+    session_factory: sessionmaker, send_batch: MagicMock
+) -> None:
+    with session_factory() as db:
+        _notify(db)
+        db.query(NotificationPreference).update(
+            {NotificationPreference.last_digest_at: NOW - timedelta(hours=1)}
+        )
+        db.commit()
+        assert DigestService(db).send_due_digests(10, now=NOW) == (0, 0)
+        send_batch.assert_not_called()
+        assert DigestService(db).send_due_digests(10, now=NOW + timedelta(days=1)) == (
+            1,
+            1,
+        )
+        assert send_batch.call_args.args[1][0]["to"] == "user0@example.com"
+        assert DigestService(db).send_due_digests(10, now=NOW + timedelta(days=6)) == (
+            0,
+            0,
+        )
+        assert DigestService(db).send_due_digests(10, now=NOW + timedelta(days=7)) == (
+            1,
+            1,
+        )
+        assert send_batch.call_args.args[1][0]["to"] == "user1@example.com"
+        assert _pending(db, "user0") == 0
+        assert _pending(db, "user1") == 0
+
+
+def test_digest_folds_all_pending_notifications_in_one_request(
+    session_factory: sessionmaker,
+    send_batch: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(digest_service, "DIGEST_MAX_ITEMS", 2)
+    with session_factory() as db:
+        _notify(db, count=3)
+        batch = DigestService(db).send_due_digests(10, now=NOW + timedelta(days=8))
+        assert batch == (2, 6)
+        send_batch.assert_called_once()
+        versions = send_batch.call_args.args[1]
+        assert [v["to"] for v in versions] == ["user0@example.com", "user1@example.com"]
+        params = versions[0]["params"]
+        assert params["count"] == 3
+        assert len(params["items"]) == 2
+        assert params["more"] == 1
+        assert versions[1]["params"]["frequency"] == "weekly"
+        assert _pending(db, "user0") == 0
+        preference = db.query(NotificationPreference).filter_by(user_id="user0").one()
+        assert preference.last_digest_at.replace(
+            tzinfo=timezone.utc
+        ) == NOW + timedelta(days=8)
+
+
+def test_failed_send_keeps_notifications_pending(
+    session_factory: sessionmaker, send_batch: MagicMock
+) -> None:
+    send_batch.return_value = False
+    with session_factory() as db:
+        _notify(db)
+        assert DigestService(db).send_due_digests(10, now=NOW + timedelta(days=8)) == (
+            0,
+            0,
+        )
+        assert _pending(db, "user0") == 1
+        assert _pending(db, "user1") == 1
+
+
+def test_disabling_digests_sends_what_was_held_back(
+    session_factory: sessionmaker, send_batch: MagicMock
+) -> None:
+    with session_factory() as db:
+        _notify(db)
+        db.query(NotificationPreference).update(
+            {NotificationPreference.last_digest_at: NOW}
+        )
+        db.query(NotificationPreference).filter_by(user_id="user1").update(
+            {NotificationPreference.digest_enabled: False}
+        )
+        db.commit()
+        assert DigestService(db).send_due_digests(10, now=NOW) == (1, 1)
+        assert send_batch.call_args.args[1][0]["to"] == "user1@example.com"
+
+
+def test_dispatcher_sends_digests_in_batches(
+    session_factory: sessionmaker, send_batch: MagicMock
+) -> None:
+    with session_factory() as db:
+        _notify(db, count=2)
+        db.query(NotificationPreference).update(
+            {NotificationPreference.last_digest_at: None}
+        )
+        db.commit()
+    dispatcher = ScheduledNotificationDispatcher(session_factory, digest_batch_size=1)
+    assert dispatcher.send_digests() == 2
+    assert send_batch.call_count == 2
+    assert dispatcher.metrics.snapshot()["digests"] == {
+        "batches": 2,
+        "emails": 2,
+        "notifications": 4,
+        "failures": 0,
+    }
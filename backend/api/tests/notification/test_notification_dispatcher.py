@@ -0,0 +1,148 @@
+import json
+import pytest
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from api.notification_service.app.dispatcher import (
+    DispatchMetrics,
+    ScheduledNotificationDispatcher,
+)
+from api.shared.utils.metrics_server import start_metrics_server
+from api.notification_service.app.schemas.notification import NotificationType
+from api.notification_service.app.services.notification_service import (
+    NotificationService,
+)
+from api.shared.exceptions.base_exceptions import ServiceUnavailableException
+from api.shared.models.notification import Notification
+
+
+@pytest.fixture
+def session_factory(engine: Engine) -> sessionmaker:
+    factory = sessionmaker(bind=engine)
+    now = datetime.now(timezone.utc)
+    with factory() as db:
+        for i, (scheduled_at, sent_at) in enumerate(
+            [
+                (now - timedelta(minutes=3), None),
+                (now - timedelta(minutes=1), None),
+                (now - timedelta(minutes=2), None),
+                (now + timedelta(hours=1), None),
+                (now - timedelta(hours=1), now - timedelta(hours=1)),
+                (None, None),
+            ]
+        ):
+            db.add(
+                Notification(
+                    id=f"notif{i}",
+                    user_id="user1",
+                    type=NotificationType.SYSTEM,
+                    title="Title",
+                    message="Msg",
+                    channels=["email"],
+                    scheduled_at=scheduled_at,
+                    sent_at=sent_at,
+                )
+            )
+        db.commit()
+    return factory
+
+
+@pytest.fixture
+def rabbitmq() -> Iterator[MagicMock]:
+    manager = MagicMock()
+    manager.publish_batch.side_effect = lambda exchange_name, messages: len(messages)
+    with patch(
+        "api.notification_service.app.services.notification_service.RabbitMQManager",
+        return_value=manager,
+    ):
+        yield manager
+
+
+def test_dispatches_due_notifications_oldest_first(
+    session_factory: sessionmaker, rabbitmq: MagicMock
+) -> None:
+    with session_factory() as db:
+        dispatched = NotificationService(db).dispatch_scheduled_notifications(2)
+    assert [n.id for n in dispatched] == ["notif0", "notif2"]
+    messages = rabbitmq.publish_batch.call_args.kwargs["messages"]
+    assert [m[1]["id"] for m in messages] == ["notif0", "notif2"]
+    with session_factory() as db:
+        assert (
+            NotificationService(db).dispatch_scheduled_notifications(10)[0].id
+            == "notif1"
+        )
+        assert NotificationService(db).dispatch_scheduled_notifications(10) == []
+        pending = db.query(Notification).filter(Notification.sent_at.is_(None)).all()
+        assert sorted(n.id for n in pending) == ["notif3", "notif5"]
+
+
+def test_unconfirmed_batch_is_rolled_back(
+    session_factory: sessionmaker, rabbitmq: MagicMock
+) -> None:
+    rabbitmq.publish_batch.side_effect = (
+        lambda exchange_name, messages: len(messages) - 1
+    )
+    with session_factory() as db:
+        with pytest.raises(ServiceUnavailableException):
+            NotificationService(db).dispatch_scheduled_notifications(10)
+    with session_factory() as db:
+        assert (
+            db.query(Notification).filter(Notification.sent_at.is_(None)).count() == 5
+        )
+
+
+def test_claims_rows_with_skip_locked(rabbitmq: MagicMock) -> None:
+    db = MagicMock()
+    query = db.query.return_value
+    query.filter.return_value = query
+    query.order_by.return_value = query
+    query.limit.return_value = query
+    query.with_for_update.return_value = query
+    query.all.return_value = []
+    assert NotificationService(db).dispatch_scheduled_notifications(10) == []
+    query.with_for_update.assert_called_once_with(skip_locked=True)
+    rabbitmq.publish_batch.assert_not_called()
+
+
+def test_dispatcher_records_batch_metrics(
+    session_factory: sessionmaker, rabbitmq: MagicMock
+) -> None:
+    dispatcher = ScheduledNotificationDispatcher(session_factory, batch_size=2)
+    assert dispatcher.dispatch_once() == 2
+    assert dispatcher.dispatch_once() == 1
+    assert dispatcher.dispatch_once() == 0
+    snapshot = dispatcher.metrics.snapshot()
+    assert snapshot["batches"] == 2
+    assert snapshot["empty_polls"] == 1
+    assert snapshot["dispatched"] == 3
+    assert snapshot["batch_size"]["buckets"]["1"] == 1
+    assert snapshot["batch_size"]["buckets"]["10"] == 1
+    assert 170 < snapshot["lag_seconds"]["max"] < 190
+    assert snapshot["lag_seconds"]["buckets"]["300.0"] == 3
+
+
+def test_dispatcher_counts_failures(
+    session_factory: sessionmaker, rabbitmq: MagicMock
+) -> None:
+    rabbitmq.publish_batch.side_effect = ConnectionError("down")
+    dispatcher = ScheduledNotificationDispatcher(session_factory)
+    assert dispatcher.dispatch_once() == 0
+    assert dispatcher.metrics.snapshot()["failures"] == 1
+
+
+def test_metrics_server_serves_snapshot() -> None:
+    metrics = DispatchMetrics()
+    metrics.record_batch([0.2, 1.5])
+    server = start_metrics_server(metrics.snapshot, 0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            body = json.loads(response.read())
+        assert body["dispatched"] == 2
+        assert body["lag_seconds"]["last"] == 1.5
+    finally:
+        server.shutdown()
+        server.server_close()
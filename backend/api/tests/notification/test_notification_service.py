@@ -41,11 +41,13 @@ def test_create_batch_notifications(notification_service: NotificationService):
     mock_response = NotificationResponseDTO(
         id="notif1", user_id="user1", type=NotificationType.SYSTEM, title="Test", message="Msg", priority=NotificationPriority.NORMAL, channels=[], created_at=datetime.now()
     )
-    with patch("api.shared.models.notification.Notification", MagicMock()), \
-         patch.object(notification_service.db, "add"), \
-         patch.object(notification_service.db, "commit"), \
+    with patch.object(notification_service.db, "add_all") as mock_add_all, \
+         patch.object(notification_service.db, "commit") as mock_commit, \
          patch.object(notification_service, "_notification_to_dto", return_value=mock_response), \
-         patch.object(notification_service, "_get_or_create_preferences") as mock_prefs:
+         patch.object(notification_service, "_notification_to_dict", return_value={}), \
+         patch.object(notification_service, "_adjust_unread_counts") as mock_adjust, \
+         patch.object(notification_service, "_publish_notifications") as mock_publish, \
+         patch.object(notification_service, "_get_or_create_preferences_batch") as mock_prefs:
         mock_pref = MagicMock()
         mock_pref.email_enabled = True
         mock_pref.push_enabled = True
@@ -55,10 +57,14 @@ def test_create_batch_notifications(notification_service: NotificationService):
         mock_pref.quiet_hours_enabled = False
         mock_pref.quiet_hours_start = None
         mock_pref.quiet_hours_end = None
-        mock_prefs.return_value = mock_pref
+        mock_prefs.return_value = {"user1": mock_pref, "user2": mock_pref}
         result = notification_service.create_batch_notifications(batch_data)
         assert isinstance(result, list)
         assert result[0].id == "notif1"
+        assert len(mock_add_all.call_args[0][0]) == 2
+        mock_adjust.assert_called_once_with({"user1": 1, "user2": 1})
+        mock_commit.assert_called_once()
+        assert len(mock_publish.call_args[0][0]) == 2
 
 def test_get_user_notifications(notification_service: NotificationService):
     mock_response = NotificationResponseDTO(
@@ -76,8 +82,9 @@ def test_get_user_notifications(notification_service: NotificationService):
         mock_chain.all.return_value = [MagicMock()]
         mock_query.return_value = mock_chain
         result = notification_service.get_user_notifications("user1", 10, 0)
-        assert isinstance(result, list)
-        assert result[0].id == "notif1"
+        assert isinstance(result.items, list)
+        assert result.items[0].id == "notif1"
+        assert result.next_cursor is None
 
 def test_get_unread_notifications(notification_service: NotificationService):
     mock_response = NotificationResponseDTO(
@@ -94,8 +101,9 @@ def test_get_unread_notifications(notification_service: NotificationService):
         mock_chain.all.return_value = [MagicMock()]
         mock_query.return_value = mock_chain
         result = notification_service.get_unread_notifications("user1", 10, 0)
-        assert isinstance(result, list)
-        assert result[0].id == "notif1"
+        assert isinstance(result.items, list)
+        assert result.items[0].id == "notif1"
+        assert result.next_cursor is None
 
 def test_mark_notification_as_read(notification_service: NotificationService):
     mock_response = NotificationResponseDTO(
@@ -0,0 +1,84 @@
+import json
+import pika
+import pytest
+from typing import Any, Dict
+from unittest.mock import MagicMock
+from api.notification_service.app import worker
+from api.notification_service.app.schemas.notification import NotificationChannel
+from api.notification_service.app.worker import ATTEMPT_HEADER, ChannelConsumer, DeliveryResult
+
+def _body(**overrides: Any) -> bytes:
+    message: Dict[str, Any] = {'id': 'notif1', 'user_id': 'user1', 'type': 'system', 'title': 'Title', 'message': 'Msg', 'channels': ['email', 'in_app']}
+    message.update(overrides)
+    return json.dumps(message).encode()
+
+def _consumer(delivered: Any = True) -> ChannelConsumer:
+    observer = MagicMock()
+    observer.channel = NotificationChannel.EMAIL
+    if isinstance(delivered, Exception):
+        observer.deliver.side_effect = delivered
+    else:
+        observer.deliver.return_value = delivered
+    return ChannelConsumer(observer, concurrency=2)
+
+def test_deliver_results() -> None:
+    assert _consumer().deliver(_body()) == DeliveryResult.DELIVERED
+    assert _consumer().deliver(_body(channels=['push'])) == DeliveryResult.SKIPPED
+    assert _consumer(False).deliver(_body()) == DeliveryResult.FAILED
+    assert _consumer(ConnectionError('down')).deliver(_body()) == DeliveryResult.FAILED
+    assert _consumer().deliver(b'not json') == DeliveryResult.MALFORMED
+    assert _consumer().deliver(json.dumps({'id': 'notif1'}).encode()) == DeliveryResult.MALFORMED
+
+def test_deliver_passes_rebuilt_notification() -> None:
+    consumer = _consumer()
+    consumer.deliver(_body(action_url='/tasks/task1'))
+    notification = consumer.observer.deliver.call_args[0][0]
+    assert notification.id == 'notif1'
+    assert notification.action_url == '/tasks/task1'
+
+@pytest.mark.parametrize('result', [DeliveryResult.DELIVERED, DeliveryResult.SKIPPED])
+def test_settle_acks_handled_messages(result: DeliveryResult) -> None:
+    amqp_channel = MagicMock()
+    _consumer().settle(amqp_channel, 7, pika.BasicProperties(), _body(), result)
+    amqp_channel.basic_ack.assert_called_once_with(delivery_tag=7)
+    amqp_channel.basic_publish.assert_not_called()
+
+def test_settle_schedules_retry_with_next_attempt() -> None:
+    amqp_channel = MagicMock()
+    properties = pika.BasicProperties(content_type='application/json', headers={ATTEMPT_HEADER: 1})
+    _consumer().settle(amqp_channel, 7, properties, _body(), DeliveryResult.FAILED)
+    kwargs = amqp_channel.basic_publish.call_args.kwargs
+    assert kwargs['exchange'] == ''
+    assert kwargs['routing_key'] == 'notifications.email.retry.2'
+    assert kwargs['properties'].headers[ATTEMPT_HEADER] == 2
+    amqp_channel.basic_ack.assert_called_once_with(delivery_tag=7)
+
+def test_settle_dead_letters_after_last_retry(monkeypatch: Any) -> None:
+    monkeypatch.setattr(worker, 'MAX_RETRIES', 2)
+    amqp_channel = MagicMock()
+    properties = pika.BasicProperties(headers={ATTEMPT_HEADER: 2})
+    _consumer().settle(amqp_channel, 7, properties, _body(), DeliveryResult.FAILED)
+    amqp_channel.basic_publish.assert_not_called()
+    amqp_channel.basic_nack.assert_called_once_with(delivery_tag=7, requeue=False)
+
+def test_settle_dead_letters_malformed_messages_without_retry() -> None:
+    amqp_channel = MagicMock()
+    _consumer().settle(amqp_channel, 7, pika.BasicProperties(), b'not json', DeliveryResult.MALFORMED)
+    amqp_channel.basic_publish.assert_not_called()
+    amqp_channel.basic_nack.assert_called_once_with(delivery_tag=7, requeue=False)
+
+def test_declare_topology_links_retry_queues_back(monkeypatch: Any) -> None:
+    monkeypatch.setattr(worker, 'RETRY_BASE_DELAY', 1.5)
+    monkeypatch.setattr(worker, 'MAX_RETRIES', 3)
+    amqp_channel = MagicMock()
+    worker.declare_topology(amqp_channel, NotificationChannel.SMS)
+    queues = {c.kwargs['queue']: c.kwargs.get('arguments') for c in amqp_channel.queue_declare.call_args_list}
+    assert queues['notifications.sms'] == {'x-dead-letter-exchange': worker.DEAD_LETTER_EXCHANGE}
+    assert [queues[f'notifications.sms.retry.{n}']['x-message-ttl'] for n in (1, 2, 3)] == [1500, 3000, 6000]
+    assert queues['notifications.sms.retry.1']['x-dead-letter-routing-key'] == 'notifications.sms'
+    assert 'notifications.dead' in queues
+
+def test_consumers_cover_every_delivery_channel() -> None:
+    consumers = worker.create_consumers()
+    assert {c.channel for c in consumers} == {NotificationChannel.EMAIL, NotificationChannel.PUSH, NotificationChannel.SMS}
+    assert all(c.concurrency == worker.CHANNEL_CONCURRENCY[c.channel] for c in consumers)
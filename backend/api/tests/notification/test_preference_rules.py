@@ -0,0 +1,161 @@
+import pytest
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import patch
+from sqlalchemy.orm import Session
+from api.notification_service.app.schemas.notification import (
+    NotificationChannel,
+    NotificationCreateDTO,
+    NotificationPreferencesUpdateDTO,
+    NotificationType,
+)
+from api.notification_service.app.services import preference_rules
+from api.notification_service.app.services.notification_service import (
+    NotificationService,
+)
+from api.notification_service.app.services.preference_rules import (
+    PreferenceCache,
+    PreferenceRules,
+    parse_time_of_day,
+)
+from api.shared.models.notification import NotificationPreference
+
+ALL_CHANNELS = [
+    NotificationChannel.IN_APP,
+    NotificationChannel.EMAIL,
+    NotificationChannel.PUSH,
+    NotificationChannel.SMS,
+]
+
+
+def _rules(**kwargs: Any) -> PreferenceRules:
+    values = dict(
+        user_id="user1",
+        email_enabled=True,
+        push_enabled=True,
+        sms_enabled=False,
+        in_app_enabled=True,
+        digest_enabled=False,
+        quiet_hours_enabled=False,
+    )
+    values.update(kwargs)
+    return PreferenceRules.compile(NotificationPreference(**values))
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 10, 18, hour, minute, tzinfo=timezone.utc)
+
+
+def test_parse_time_of_day() -> None:
+    assert parse_time_of_day("07:30") == 450
+    assert parse_time_of_day("23:59:00") == 1439
+    assert parse_time_of_day(None) is None
+    assert parse_time_of_day("24:00") is None
+    assert parse_time_of_day("soon") is None
+
+
+def test_channels_are_filtered_by_channel_and_type() -> None:
+    rules = _rules(preferences_by_type={"task": {"push": False}})
+    assert rules.filter_channels(ALL_CHANNELS, NotificationType.SYSTEM, _at(12)) == [
+        NotificationChannel.IN_APP,
+        NotificationChannel.EMAIL,
+        NotificationChannel.PUSH,
+    ]
+    assert rules.filter_channels(ALL_CHANNELS, NotificationType.TASK, _at(12)) == [
+        NotificationChannel.IN_APP,
+        NotificationChannel.EMAIL,
+    ]
+
+
+def test_quiet_hours_only_allow_in_app() -> None:
+    rules = _rules(
+        quiet_hours_enabled=True, quiet_hours_start="09:00", quiet_hours_end="17:00"
+    )
+    assert rules.filter_channels(ALL_CHANNELS, NotificationType.SYSTEM, _at(9)) == [
+        NotificationChannel.IN_APP
+    ]
+    assert rules.filter_channels(ALL_CHANNELS, NotificationType.SYSTEM, _at(17)) == [
+        NotificationChannel.IN_APP
+    ]
+    assert (
+        len(rules.filter_channels(ALL_CHANNELS, NotificationType.SYSTEM, _at(17, 1)))
+        == 3
+    )
+
+
+@pytest.mark.parametrize(
+    "hour, minute, quiet",
+    [
+        (21, 59, False),
+        (22, 0, True),
+        (23, 30, True),
+        (0, 0, True),
+        (6, 59, True),
+        (7, 0, True),
+        (7, 1, False),
+        (12, 0, False),
+    ],
+)
+def test_quiet_hours_across_midnight(hour: int, minute: int, quiet: bool) -> None:
+    rules = _rules(
+        quiet_hours_enabled=True, quiet_hours_start="22:00", quiet_hours_end="07:00"
+    )
+    assert rules.in_quiet_hours(_at(hour, minute)) is quiet
+
+
+def test_incomplete_quiet_hours_are_ignored() -> None:
+    assert (
+        _rules(quiet_hours_enabled=True, quiet_hours_start="22:00").quiet_hours is None
+    )
+    assert (
+        _rules(
+            quiet_hours_enabled=False,
+            quiet_hours_start="22:00",
+            quiet_hours_end="07:00",
+        ).quiet_hours
+        is None
+    )
+
+
+def test_cache_expires_and_evicts() -> None:
+    cache = PreferenceCache(max_size=2, ttl=10)
+    with patch.object(preference_rules.time, "monotonic", return_value=100.0):
+        for user_id in ("user1", "user2", "user3"):
+            cache.set(_rules(user_id=user_id))
+        assert cache.get("user1") is None
+        assert cache.get("user2").user_id == "user2"
+    with patch.object(preference_rules.time, "monotonic", return_value=110.0):
+        assert cache.get("user3") is None
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_rules_are_cached_until_preferences_change(db: Session) -> None:
+    service = NotificationService(db)
+    service.preference_cache = PreferenceCache()
+    notification = NotificationCreateDTO(
+        user_id="user1",
+        type=NotificationType.SYSTEM,
+        title="Title",
+        message="Msg",
+        channels=[NotificationChannel.IN_APP, NotificationChannel.EMAIL],
+    )
+    with patch.object(service, "_send_notification"):
+        assert service.create_notification(notification).channels == [
+            NotificationChannel.IN_APP,
+            NotificationChannel.EMAIL,
+        ]
+        with patch.object(db, "query", wraps=db.query) as mock_query:
+            service.create_notification(notification)
+        assert NotificationPreference not in [
+            c.args[0] for c in mock_query.call_args_list
+        ]
+        service.update_notification_preferences(
+            "user1", NotificationPreferencesUpdateDTO(email_enabled=False)
+        )
+        assert service.create_notification(notification).channels == [
+            NotificationChannel.IN_APP
+        ]
+    assert service.preference_cache.get_stats()["invalidations"] == 1
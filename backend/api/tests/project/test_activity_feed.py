@@ -0,0 +1,136 @@
+import pytest
+from datetime import datetime, timedelta
+from typing import List
+from unittest.mock import MagicMock
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from api.project_service.app.activity_archiver import ActivityArchiver
+from api.project_service.app.services.activity_service import ActivityService
+from api.shared.exceptions.project_exceptions import InvalidActivityCursorException
+from api.shared.models.project import ActivityLog, ActivityLogArchive
+
+NOW = datetime(2025, 6, 1)
+
+
+@pytest.fixture(autouse=True)
+def seed(engine: Engine) -> None:
+    with Session(engine) as session:
+        for i in range(12):
+            session.add(
+                ActivityLog(
+                    id=f"log{i:02d}",
+                    project_id="proj1" if i % 3 else "proj2",
+                    user_id="user1" if i % 2 else "user2",
+                    action="update",
+                    entity_type="task",
+                    entity_id="task1" if i < 6 else "task2",
+                    # Pairs of activities share a timestamp; the ID breaks the tie
+                    created_at=NOW - timedelta(days=20 * (5 - i // 2)),
+                )
+            )
+        session.commit()
+
+
+def _all_pages(service: ActivityService, limit: int) -> List[List[str]]:
+    pages: List[List[str]] = []
+    cursor = None
+    while True:
+        page = service.get_project_activities("proj1", limit=limit, cursor=cursor)
+        pages.append([activity.id for activity in page.items])
+        if page.next_cursor is None:
+            return pages
+        cursor = page.next_cursor
+
+
+def test_project_feed_pages_newest_first(db: Session) -> None:
+    service = ActivityService(db)
+    pages = _all_pages(service, limit=3)
+    assert pages == [
+        ["log11", "log10", "log08"],
+        ["log07", "log05", "log04"],
+        ["log02", "log01"],
+    ]
+    # Cursor pages match the offset pages
+    assert [
+        a.id for a in service.get_project_activities("proj1", limit=3, offset=3).items
+    ] == pages[1]
+
+
+def test_entity_and_user_feeds(db: Session) -> None:
+    service = ActivityService(db)
+    page = service.get_entity_activities("task", "task1", limit=4)
+    assert [a.id for a in page.items] == ["log05", "log04", "log03", "log02"]
+    page = service.get_entity_activities(
+        "task", "task1", limit=4, cursor=page.next_cursor
+    )
+    assert [a.id for a in page.items] == ["log01", "log00"]
+    assert page.next_cursor is None
+    assert [a.id for a in service.get_user_activities("user1", limit=100).items] == [
+        "log11",
+        "log09",
+        "log07",
+        "log05",
+        "log03",
+        "log01",
+    ]
+
+
+def test_invalid_cursor(db: Session) -> None:
+    with pytest.raises(InvalidActivityCursorException):
+        ActivityService(db).get_project_activities("proj1", cursor="not-a-cursor")
+
+
+def test_feeds_read_from_their_indexes(db: Session) -> None:
+    plans = {
+        "ix_activity_logs_project_id_created_at_id": "project_id = 'proj1'",
+        "ix_activity_logs_entity_created_at_id": "entity_type = 'task' AND entity_id = 'task1'",
+        "ix_activity_logs_user_id_created_at_id": "user_id = 'user1'",
+    }
+    for index, condition in plans.items():
+        plan = db.execute(
+            text(
+                f"EXPLAIN QUERY PLAN SELECT * FROM activity_logs WHERE {condition} ORDER BY created_at DESC, id DESC LIMIT 10"
+            )
+        ).all()
+        details = " ".join(row[-1] for row in plan)
+        assert index in details
+        assert "TEMP B-TREE" not in details
+
+
+def test_archive_moves_rows_past_the_cutoff(db: Session) -> None:
+    # Six activities are older than the cutoff; the oldest four are moved
+    moved = ActivityService(db).archive_activities(
+        NOW - timedelta(days=50), batch_size=4
+    )
+    assert moved == 4
+    remaining = {row.id for row in db.query(ActivityLog.id)}
+    archived = {row.id for row in db.query(ActivityLogArchive.id)}
+    assert archived == {"log00", "log01", "log02", "log03"}
+    assert remaining.isdisjoint(archived) and len(remaining) == 8
+    assert (
+        db.get(ActivityLogArchive, (NOW - timedelta(days=100), "log00")).entity_id
+        == "task1"
+    )
+
+
+def test_archiver_moves_everything_past_the_retention(engine: Engine) -> None:
+    archiver = ActivityArchiver(
+        sessionmaker(bind=engine), retention_days=50, batch_size=4
+    )
+    assert archiver.archive_all(now=NOW) == 6
+    assert archiver.archive_all(now=NOW) == 0
+    with Session(engine) as session:
+        feed = ActivityService(session).get_project_activities("proj1")
+        assert [a.id for a in feed.items] == ["log11", "log10", "log08", "log07"]
+        assert session.query(ActivityLogArchive).count() == 6
+
+
+def test_archive_partitions_cover_calendar_months() -> None:
+    db = MagicMock()
+    ActivityService(db)._ensure_archive_partition(2025, 12)
+    statement = str(db.execute.call_args.args[0])
+    assert (
+        "activity_logs_archive_2025_12 PARTITION OF activity_logs_archive" in statement
+    )
+    assert "FROM ('2025-12-01') TO ('2026-01-01')" in statement
@@ -0,0 +1,216 @@
+import pytest
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError, OperationalError, ProgrammingError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from api.project_service.app.services.activity_service import ActivityService
+from api.project_service.app.services.activity_writer import ActivityLogWriter
+from api.project_service.app.services.project_service import ProjectService
+from api.shared.models.base import Base
+from api.shared.models.project import ActivityLog, Project, ProjectMember
+from api.shared.models.user import User
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _row(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"log{i}",
+        "project_id": "proj1",
+        "user_id": "user1",
+        "action": "create",
+        "entity_type": "task",
+        "entity_id": f"task{i}",
+        "details": None,
+    }
+
+
+def _count(engine: Engine) -> int:
+    with Session(engine) as session:
+        return session.query(ActivityLog).count()
+
+
+def test_buffered_log_activity_does_not_commit_the_request_session(
+    engine: Engine,
+) -> None:
+    writer = ActivityLogWriter(
+        sessionmaker(bind=engine), flush_interval=60, buffered=True
+    )
+    db = MagicMock()
+    activity = ActivityService(db, writer=writer).log_activity(
+        "proj1", "user1", "create", "task", "task1", {"title": "T"}
+    )
+    db.commit.assert_not_called()
+    assert activity.id and activity.created_at and activity.details == {"title": "T"}
+    assert _count(engine) == 0
+    assert writer.flush() == 1
+    with Session(engine) as session:
+        stored = session.get(ActivityLog, activity.id)
+        assert stored is not None and stored.entity_id == "task1"
+    writer.close()
+
+
+def test_sync_mode_writes_on_the_request_session(engine: Engine) -> None:
+    writer = ActivityLogWriter(buffered=False)
+    with Session(engine) as db:
+        activity = ActivityService(db, writer=writer).log_activity(
+            "proj1", "user1", "delete", "task", "task1"
+        )
+    assert _count(engine) == 1
+    assert writer.get_stats() == {
+        "mode": "sync",
+        "pending": 0,
+        "written": 0,
+        "dropped": 0,
+    }
+    with Session(engine) as session:
+        assert (
+            ActivityService(session).get_entity_activities("task", "task1").items[0].id
+            == activity.id
+        )
+
+
+def test_full_batch_is_flushed_before_the_interval(engine: Engine) -> None:
+    writer = ActivityLogWriter(
+        sessionmaker(bind=engine), batch_size=3, flush_interval=60, buffered=True
+    )
+    for i in range(3):
+        writer.write(_row(i))
+    deadline = time.monotonic() + 5
+    while writer.written < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _count(engine) == 3
+    writer.close()
+
+
+def test_close_flushes_queued_rows(engine: Engine) -> None:
+    writer = ActivityLogWriter(
+        sessionmaker(bind=engine), flush_interval=60, buffered=True
+    )
+    for i in range(5):
+        writer.write(_row(i))
+    writer.close()
+    assert _count(engine) == 5
+    assert writer.get_stats()["pending"] == 0
+
+
+def test_failed_flush_keeps_rows_up_to_max_pending() -> None:
+    session = MagicMock()
+    session.commit.side_effect = OperationalError(
+        "INSERT", {}, Exception("database down")
+    )
+    writer = ActivityLogWriter(
+        lambda: session, flush_interval=60, max_pending=3, buffered=True
+    )
+    for i in range(5):
+        writer.write(_row(i))
+    assert writer.flush() == 0
+    stats = writer.get_stats()
+    assert stats["pending"] == 3
+    assert stats["dropped"] == 2
+    session.close.assert_called_once()
+    # The newest rows are the ones kept
+    assert [row["id"] for row in writer._pending] == ["log2", "log3", "log4"]
+    session.commit.side_effect = None
+    writer.close()
+
+
+def test_invalidated_connection_is_retried_and_other_errors_are_dropped() -> None:
+    session = MagicMock()
+    session.commit.side_effect = DBAPIError(
+        "INSERT", {}, Exception("connection reset"), connection_invalidated=True
+    )
+    writer = ActivityLogWriter(lambda: session, flush_interval=60, buffered=True)
+    writer.write(_row(0))
+    assert writer.flush() == 0
+    assert writer.get_stats()["pending"] == 1
+    session.commit.side_effect = ProgrammingError(
+        "INSERT", {}, Exception("no such table")
+    )
+    assert writer.flush() == 0
+    assert writer.get_stats() == {
+        "mode": "buffered",
+        "pending": 0,
+        "written": 0,
+        "dropped": 1,
+    }
+    writer.close()
+
+
+def test_poisoned_row_is_dropped_and_the_rest_of_the_batch_written(
+    engine: Engine,
+) -> None:
+    writer = ActivityLogWriter(
+        sessionmaker(bind=engine), flush_interval=60, buffered=True
+    )
+    writer.write(_row(0))
+    writer.flush()
+    for i in range(1, 5):
+        writer.write(_row(i))
+    # Violates the primary key, so the batch INSERT fails as a whole
+    writer.write(_row(0))
+    writer.write(_row(5))
+    assert writer.flush() == 5
+    assert writer.get_stats() == {
+        "mode": "buffered",
+        "pending": 0,
+        "written": 6,
+        "dropped": 1,
+    }
+    assert _count(engine) == 6
+    writer.close()
+
+
+def test_project_deletion_is_logged_in_its_transaction(engine: Engine) -> None:
+    # Enforce foreign keys like PostgreSQL; the pool shares one connection
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+    writer = ActivityLogWriter(
+        sessionmaker(bind=engine), flush_interval=60, buffered=True
+    )
+    with Session(engine) as db:
+        db.add(
+            User(
+                id="user1",
+                email="user1@example.com",
+                full_name="User 1",
+                supabase_uid="uid1",
+            )
+        )
+        db.commit()
+        db.add(Project(id="proj1", name="Project1", owner_id="user1"))
+        db.add(
+            ProjectMember(
+                project_id="proj1",
+                user_id="user1",
+                role="owner",
+                joined_at=datetime(2025, 1, 1),
+            )
+        )
+        db.commit()
+        service = ProjectService(db)
+        service.activity_service = ActivityService(db, writer=writer)
+        service.delete_project("proj1", "user1")
+    assert writer.get_stats()["pending"] == 0
+    with Session(engine) as session:
+        assert [
+            (a.action, a.entity_type, a.entity_id) for a in session.query(ActivityLog)
+        ] == [("delete", "project", "proj1")]
+        assert (
+            session.query(Project).count() == 0
+            and session.query(ProjectMember).count() == 0
+        )
+    writer.close()
@@ -0,0 +1,82 @@
+import pytest
+from datetime import datetime, timezone
+from typing import Any, List
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from api.project_service.app.services.project_access import ProjectAccessResolver
+from api.shared.exceptions.project_exceptions import (
+    NotProjectMemberException,
+    ProjectNotFoundException,
+    TaskNotFoundException,
+)
+from api.shared.models.project import Project, ProjectMember, Task
+
+
+@pytest.fixture(autouse=True)
+def seed(db: Session) -> None:
+    db.add(Project(id="proj1", name="Project1", owner_id="user1"))
+    db.add(
+        ProjectMember(
+            project_id="proj1",
+            user_id="user1",
+            role="owner",
+            joined_at=datetime.now(timezone.utc),
+        )
+    )
+    db.add(
+        ProjectMember(
+            project_id="proj1",
+            user_id="user2",
+            role="member",
+            joined_at=datetime.now(timezone.utc),
+        )
+    )
+    db.add(Task(id="task1", title="Task1", project_id="proj1", creator_id="user1"))
+    db.commit()
+
+
+def _record_statements(session: Session) -> List[str]:
+    statements: List[str] = []
+
+    def before_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(session.get_bind(), "before_cursor_execute", before_execute)
+    return statements
+
+
+def test_resolves_project_member_and_task_in_one_query(db: Session) -> None:
+    statements = _record_statements(db)
+    access = ProjectAccessResolver(db).resolve("proj1", "user2", "task1")
+    assert access.project.id == "proj1"
+    assert access.member.role == "member"
+    assert access.task.id == "task1"
+    assert len(statements) == 1
+
+
+def test_memoizes_access_per_session(db: Session) -> None:
+    statements = _record_statements(db)
+    first = ProjectAccessResolver(db).resolve("proj1", "user1")
+    second = ProjectAccessResolver(db).resolve("proj1", "user1")
+    assert first is second
+    assert first.task is None
+    assert len(statements) == 1
+
+
+def test_forget_drops_memoized_access(db: Session) -> None:
+    statements = _record_statements(db)
+    resolver = ProjectAccessResolver(db)
+    resolver.resolve("proj1", "user1", "task1")
+    resolver.forget("proj1")
+    resolver.resolve("proj1", "user1", "task1")
+    assert len(statements) == 2
+
+
+def test_raises_for_missing_project_member_or_task(db: Session) -> None:
+    resolver = ProjectAccessResolver(db)
+    with pytest.raises(ProjectNotFoundException):
+        resolver.resolve("missing", "user1")
+    with pytest.raises(NotProjectMemberException):
+        resolver.resolve("proj1", "user3", "task1")
+    with pytest.raises(TaskNotFoundException):
+        resolver.resolve("proj1", "user1", "missing")
@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import MagicMock, patch
+from api.project_service.app.services.project_access import ProjectAccess
 from api.project_service.app.services.project_service import ProjectService
 from api.project_service.app.schemas.project import ProjectCreateDTO, ProjectUpdateDTO, ProjectMemberCreateDTO, ProjectMemberUpdateDTO
 from api.shared.exceptions.project_exceptions import ProjectNotFoundException, InsufficientProjectRoleException
@@ -41,7 +42,7 @@ def test_get_project_not_found(project_service: ProjectService) -> None:
          patch("api.shared.models.document.Document", MagicMock()), \
          patch("api.shared.models.project.ActivityLog", MagicMock()), \
          patch.object(project_service.db, "query") as mock_query:
-        mock_query.return_value.filter.return_value.first.return_value = None
+        mock_query.return_value.outerjoin.return_value.filter.return_value.first.return_value = None
         with pytest.raises(ProjectNotFoundException):
             project_service.get_project("proj1", "user1")
 
@@ -52,7 +53,7 @@ def test_update_project_not_member(project_service: ProjectService) -> None:
          patch("api.shared.models.document.Document", MagicMock()), \
          patch("api.shared.models.project.ActivityLog", MagicMock()), \
          patch.object(project_service.db, "query") as mock_query:
-        mock_query.return_value.filter.return_value.first.return_value = MagicMock()
+        mock_query.return_value.outerjoin.return_value.filter.return_value.first.return_value = (MagicMock(), MagicMock(role="member"))
         with pytest.raises(InsufficientProjectRoleException):
             project_service.update_project("proj1", MagicMock(), "user1")
 
@@ -66,7 +67,7 @@ def test_delete_project_success(project_service: ProjectService) -> None:
          patch.object(project_service, "_project_to_dto", return_value=MagicMock(id="proj1")), \
          patch.object(project_service.db, "delete", MagicMock()), \
          patch.object(project_service.db, "commit", MagicMock()):
-        mock_query.return_value.filter.return_value.first.return_value = MagicMock(owner_id="not_owner")
+        mock_query.return_value.outerjoin.return_value.filter.return_value.first.return_value = (MagicMock(), MagicMock(role="admin"))
         with pytest.raises(InsufficientProjectRoleException):
             project_service.delete_project("proj1", "user1")
 
@@ -77,7 +78,7 @@ def test_delete_project_not_found(project_service: ProjectService) -> None:
          patch("api.shared.models.document.Document", MagicMock()), \
          patch("api.shared.models.project.ActivityLog", MagicMock()), \
          patch.object(project_service.db, "query") as mock_query:
-        mock_query.return_value.filter.return_value.first.return_value = None
+        mock_query.return_value.outerjoin.return_value.filter.return_value.first.return_value = None
         with pytest.raises(ProjectNotFoundException):
             project_service.delete_project("proj1", "user1")
 
@@ -108,7 +109,8 @@ def test_add_project_member_success(project_service: ProjectService):
          patch.object(project_service.db, "commit", MagicMock()), \
          patch.object(project_service.db, "refresh", MagicMock()):
         # Simular proyecto y miembro actual con rol owner
-        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(), MagicMock(role="owner"), None]
+        project_service.access.resolve = MagicMock(return_value=ProjectAccess(MagicMock(), MagicMock(role="owner")))
+        mock_query.return_value.filter.return_value.first.return_value = None
         mock_activity_service.log_activity.return_value = MagicMock()
         result = project_service.add_project_member("proj1", member_data, "user1")
         assert result.id == "mem1"
@@ -119,7 +121,7 @@ def test_add_project_member_insufficient_role(project_service: ProjectService):
          patch("api.shared.models.project.ProjectMember", MagicMock()), \
          patch.object(project_service.db, "query") as mock_query:
         # Simular proyecto y miembro actual con rol member (no owner/admin)
-        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(), MagicMock(role="member")]
+        mock_query.return_value.outerjoin.return_value.filter.return_value.first.return_value = (MagicMock(), MagicMock(role="member"))
         with pytest.raises(InsufficientProjectRoleException):
             project_service.add_project_member("proj1", member_data, "user1")
 
@@ -133,7 +135,8 @@ def test_update_project_member_success(project_service: ProjectService):
          patch.object(project_service.db, "commit", MagicMock()), \
          patch.object(project_service.db, "refresh", MagicMock()):
         # Simular proyecto, miembro actual owner/admin y miembro a actualizar
-        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(), MagicMock(role="owner"), MagicMock(role="member")]
+        project_service.access.resolve = MagicMock(return_value=ProjectAccess(MagicMock(), MagicMock(role="owner")))
+        mock_query.return_value.filter.return_value.first.return_value = MagicMock(role="member")
         mock_activity_service.log_activity.return_value = MagicMock()
         result = project_service.update_project_member("proj1", "mem1", member_data, "user1")
         assert result.id == "mem1"
@@ -146,7 +149,8 @@ def test_remove_project_member_success(project_service: ProjectService):
          patch.object(project_service.db, "delete", MagicMock()), \
          patch.object(project_service.db, "commit", MagicMock()):
         # Simular proyecto, miembro actual owner/admin y miembro a eliminar
-        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(), MagicMock(role="owner"), MagicMock(role="member")]
+        project_service.access.resolve = MagicMock(return_value=ProjectAccess(MagicMock(), MagicMock(role="owner")))
+        mock_query.return_value.filter.return_value.first.return_value = MagicMock(role="member")
         mock_activity_service.log_activity.return_value = MagicMock()
         result = project_service.remove_project_member("proj1", "mem1", "user1")
         assert "message" in result
@@ -157,7 +161,7 @@ def test_get_project_members_success(project_service: ProjectService):
          patch.object(project_service.db, "query") as mock_query, \
          patch.object(project_service, "_project_member_to_dto", return_value=MagicMock(id="mem1")):
         # Simular proyecto y miembro actual
-        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(), MagicMock(role="owner")]
+        project_service.access.resolve = MagicMock(return_value=ProjectAccess(MagicMock(), MagicMock(role="owner")))
         mock_query.return_value.filter.return_value.all.return_value = [MagicMock()]
         result = project_service.get_project_members("proj1", "user1")
         assert isinstance(result, list)
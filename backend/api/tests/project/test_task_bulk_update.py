@@ -0,0 +1,179 @@
+import pytest
+from datetime import datetime
+from typing import Any, List
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from api.project_service.app.schemas.task import TaskBulkUpdateDTO
+from api.project_service.app.services.task_service import TaskService
+from api.shared.models.project import ActivityLog, Project, ProjectMember, Task
+
+
+@pytest.fixture(autouse=True)
+def seed(engine: Engine) -> None:
+    with Session(engine) as session:
+        session.add(Project(id="proj1", name="Project1", owner_id="user1"))
+        session.add(Project(id="proj2", name="Project2", owner_id="user1"))
+        session.add(
+            ProjectMember(
+                project_id="proj1",
+                user_id="user1",
+                role="owner",
+                joined_at=datetime(2025, 1, 1),
+            )
+        )
+        session.add(
+            ProjectMember(
+                project_id="proj1",
+                user_id="user2",
+                role="member",
+                joined_at=datetime(2025, 1, 1),
+            )
+        )
+        for i in range(6):
+            session.add(
+                Task(
+                    id=f"review{i}",
+                    title=f"Review {i}",
+                    project_id="proj1",
+                    creator_id="user1",
+                    status="review",
+                    assignee_id="user2" if i < 2 else None,
+                )
+            )
+        session.add(
+            Task(
+                id="todo",
+                title="Todo",
+                project_id="proj1",
+                creator_id="user1",
+                status="todo",
+            )
+        )
+        session.add(
+            Task(
+                id="foreign",
+                title="Foreign",
+                project_id="proj2",
+                creator_id="user1",
+                status="review",
+            )
+        )
+        session.commit()
+
+
+def _bulk(
+    engine: Engine, user_id: str, updates: List[dict], statements: List[str]
+) -> Any:
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement.split()[0])
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with Session(engine) as db:
+            return TaskService(db).bulk_update_tasks(
+                "proj1", TaskBulkUpdateDTO(updates=updates), user_id
+            )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _tasks(engine: Engine) -> dict:
+    with Session(engine) as db:
+        return {t.id: (t.status, t.assignee_id, t.priority) for t in db.query(Task)}
+
+
+def test_sprint_close_is_one_update_and_one_activity(engine: Engine) -> None:
+    statements: List[str] = []
+    result = _bulk(
+        engine,
+        "user1",
+        [{"task_id": f"review{i}", "status": "done"} for i in range(6)],
+        statements,
+    )
+    assert result.updated == 6 and result.failed == 0
+    assert all(r.success for r in result.results)
+    assert statements.count("UPDATE") == 1
+    assert all(
+        status == "done"
+        for task_id, (status, _, _) in _tasks(engine).items()
+        if task_id.startswith("review")
+    )
+    with Session(engine) as db:
+        activity = db.query(ActivityLog).one()
+        assert activity.action == "bulk_update_tasks" and activity.entity_id == "proj1"
+        assert activity.details["tasks"][0]["task_ids"] == [
+            f"review{i}" for i in range(6)
+        ]
+
+
+def test_invalid_items_are_reported_and_left_untouched(engine: Engine) -> None:
+    before = _tasks(engine)
+    result = _bulk(
+        engine,
+        "user1",
+        [
+            {"task_id": "review0", "status": "done", "priority": "high"},
+            {"task_id": "todo", "status": "done"},
+            {"task_id": "foreign", "status": "done"},
+            {"task_id": "missing", "priority": "low"},
+            {"task_id": "review1", "assignee_id": "stranger"},
+            {"task_id": "review0", "priority": "low"},
+            {"task_id": "review2", "priority": "urgent"},
+        ],
+        [],
+    )
+    assert [(r.task_id, r.success, r.error_code) for r in result.results] == [
+        ("review0", True, None),
+        ("todo", False, "INVALID_TASK_STATUS_TRANSITION"),
+        ("foreign", False, "TASK_NOT_FOUND"),
+        ("missing", False, "TASK_NOT_FOUND"),
+        ("review1", False, "NOT_PROJECT_MEMBER"),
+        ("review0", False, "DUPLICATE_BULK_TASK"),
+        ("review2", True, None),
+    ]
+    assert result.results[1].error == "Cannot transition from 'todo' to 'done'"
+    assert (result.updated, result.failed) == (2, 5)
+    after = _tasks(engine)
+    assert after["review0"] == ("done", "user2", "high")
+    assert after["review2"] == ("review", None, "urgent")
+    for task_id in ("todo", "foreign", "review1"):
+        assert after[task_id] == before[task_id]
+
+
+def test_members_only_update_their_own_tasks(engine: Engine) -> None:
+    result = _bulk(
+        engine,
+        "user2",
+        [
+            {"task_id": "review0", "status": "done"},
+            {"task_id": "review3", "status": "done"},
+        ],
+        [],
+    )
+    assert [(r.success, r.error_code) for r in result.results] == [
+        (True, None),
+        (False, "INSUFFICIENT_PROJECT_ROLE"),
+    ]
+
+
+def test_explicit_null_unassigns(engine: Engine) -> None:
+    _bulk(
+        engine,
+        "user1",
+        [
+            {"task_id": "review0", "assignee_id": None},
+            {"task_id": "review1", "priority": "low"},
+        ],
+        [],
+    )
+    after = _tasks(engine)
+    assert after["review0"][1] is None
+    assert after["review1"] == ("review", "user2", "low")
+
+
+def test_nothing_valid_writes_nothing(engine: Engine) -> None:
+    statements: List[str] = []
+    result = _bulk(engine, "user1", [{"task_id": "todo", "status": "done"}], statements)
+    assert result.updated == 0
+    assert "UPDATE" not in statements and "INSERT" not in statements
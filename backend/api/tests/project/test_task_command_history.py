@@ -0,0 +1,227 @@
+import pytest
+from datetime import datetime
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from api.project_service.app.commands.task_commands import (
+    AssignTaskCommand,
+    ChangeTaskStatusCommand,
+    CommandInvoker,
+    UpdateTaskCommand,
+)
+from api.project_service.app.services.task_service import AsyncTaskService
+from api.shared.exceptions.project_exceptions import (
+    NoTaskCommandException,
+    TaskNotFoundException,
+)
+from api.shared.models.base import Base
+from api.shared.models.project import (
+    ActivityLog,
+    Project,
+    ProjectMember,
+    Task,
+    TaskCommandHistory,
+)
+
+
+@pytest.fixture(autouse=True)
+def seed(engine: Engine) -> None:
+    with Session(engine) as session:
+        session.add(
+            Task(
+                id="task1",
+                title="Task",
+                project_id="proj1",
+                creator_id="user1",
+                status="todo",
+                due_date=datetime(2025, 1, 1),
+            )
+        )
+        session.add(
+            Task(
+                id="task2",
+                title="Other",
+                project_id="proj1",
+                creator_id="user1",
+                status="todo",
+            )
+        )
+        session.commit()
+
+
+def _task(engine: Engine, task_id: str = "task1") -> Task:
+    with Session(engine, expire_on_commit=False) as session:
+        return session.get(Task, task_id)
+
+
+def test_history_is_stored_as_diffs_and_survives_new_sessions(engine: Engine) -> None:
+    with Session(engine) as db:
+        CommandInvoker(db).execute_command(
+            ChangeTaskStatusCommand(db, "task1", "done"), "user1"
+        )
+        CommandInvoker(db).execute_command(
+            UpdateTaskCommand(
+                db,
+                "task1",
+                {
+                    "title": "Renamed",
+                    "due_date": datetime(2025, 2, 1),
+                    "status": "done",
+                },
+            ),
+            "user1",
+        )
+        entries = (
+            db.query(TaskCommandHistory).order_by(TaskCommandHistory.sequence).all()
+        )
+        assert [(e.sequence, e.command, e.changes) for e in entries] == [
+            (1, "change_status", {"status": ["todo", "done"]}),
+            # Unchanged fields are not stored
+            (
+                2,
+                "update",
+                {
+                    "title": ["Task", "Renamed"],
+                    "due_date": ["2025-01-01T00:00:00", "2025-02-01T00:00:00"],
+                },
+            ),
+        ]
+    # Another session, as another worker or after a restart, undoes them
+    with Session(engine) as db:
+        task = CommandInvoker(db).undo("task1")
+        assert (task.title, task.due_date, task.status) == (
+            "Task",
+            datetime(2025, 1, 1),
+            "done",
+        )
+    with Session(engine) as db:
+        assert CommandInvoker(db).undo("task1").status == "todo"
+        with pytest.raises(NoTaskCommandException):
+            CommandInvoker(db).undo("task1")
+
+
+def test_redo_reapplies_undone_commands_in_order(engine: Engine) -> None:
+    with Session(engine) as db:
+        invoker = CommandInvoker(db)
+        invoker.execute_command(ChangeTaskStatusCommand(db, "task1", "in_progress"))
+        invoker.execute_command(ChangeTaskStatusCommand(db, "task1", "done"))
+        invoker.undo("task1")
+        invoker.undo("task1")
+        assert invoker.redo("task1").status == "in_progress"
+        assert invoker.redo("task1").status == "done"
+        with pytest.raises(NoTaskCommandException):
+            invoker.redo("task1")
+
+
+def test_new_command_discards_redo_entries(engine: Engine) -> None:
+    with Session(engine) as db:
+        invoker = CommandInvoker(db)
+        invoker.execute_command(ChangeTaskStatusCommand(db, "task1", "done"))
+        invoker.undo("task1")
+        invoker.execute_command(AssignTaskCommand(db, "task1", "user2"))
+        with pytest.raises(NoTaskCommandException):
+            invoker.redo("task1")
+        assert db.query(TaskCommandHistory).count() == 1
+
+
+def test_history_is_capped_and_kept_per_task(engine: Engine) -> None:
+    with Session(engine) as db:
+        invoker = CommandInvoker(db, history_limit=3)
+        for i in range(10):
+            invoker.execute_command(
+                UpdateTaskCommand(db, "task1", {"title": f"Title {i}"})
+            )
+        invoker.execute_command(UpdateTaskCommand(db, "task2", {"title": "Changed"}))
+        assert [
+            e.sequence for e in db.query(TaskCommandHistory).filter_by(task_id="task1")
+        ] == [8, 9, 10]
+        for _ in range(3):
+            invoker.undo("task1")
+        with pytest.raises(NoTaskCommandException):
+            invoker.undo("task1")
+        assert _task(engine).title == "Title 6"
+        assert invoker.undo("task2").title == "Other"
+
+
+def test_commands_without_changes_are_not_recorded(engine: Engine) -> None:
+    with Session(engine) as db:
+        CommandInvoker(db).execute_command(ChangeTaskStatusCommand(db, "task1", "todo"))
+        assert db.query(TaskCommandHistory).count() == 0
+
+
+def test_unknown_task(engine: Engine) -> None:
+    with Session(engine) as db:
+        with pytest.raises(TaskNotFoundException):
+            CommandInvoker(db).undo("missing")
+
+
+def test_tasks_of_other_projects_are_not_found(engine: Engine) -> None:
+    with Session(engine) as db:
+        CommandInvoker(db).execute_command(
+            ChangeTaskStatusCommand(db, "task1", "done", "proj1")
+        )
+        with pytest.raises(TaskNotFoundException):
+            ChangeTaskStatusCommand(db, "task1", "todo", "proj2")
+        with pytest.raises(TaskNotFoundException):
+            AssignTaskCommand(db, "task1", "user2", "proj2")
+        with pytest.raises(TaskNotFoundException):
+            CommandInvoker(db).undo("task1", "proj2")
+        assert CommandInvoker(db).undo("task1", "proj1").status == "todo"
+        with pytest.raises(TaskNotFoundException):
+            CommandInvoker(db).redo("task1", "proj2")
+    assert _task(engine).status == "todo"
+
+
+@pytest.mark.asyncio
+async def test_command_endpoints_run_on_the_async_session() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine)() as db:
+
+        def seed(session: Session) -> None:
+            session.add(Project(id="proj1", name="Project1", owner_id="user1"))
+            session.add(
+                ProjectMember(
+                    project_id="proj1",
+                    user_id="user1",
+                    role="owner",
+                    joined_at=datetime(2025, 1, 1),
+                )
+            )
+            session.add(
+                Task(
+                    id="task1",
+                    title="Task",
+                    project_id="proj1",
+                    creator_id="user1",
+                    status="todo",
+                )
+            )
+            session.commit()
+
+        await db.run_sync(seed)
+        service = AsyncTaskService(db)
+        assert (
+            await service.assign_task("proj1", "task1", "user2", "user1")
+        ).assignee_id == "user2"
+        assert (
+            await service.change_task_status("proj1", "task1", "in_progress", "user1")
+        ).status == "in_progress"
+        assert (
+            await service.undo_task_command("proj1", "task1", "user1")
+        ).status == "todo"
+        assert (
+            await service.redo_task_command("proj1", "task1", "user1")
+        ).status == "in_progress"
+        with pytest.raises(TaskNotFoundException):
+            await service.undo_task_command("proj1", "other", "user1")
+        actions = await db.run_sync(
+            lambda session: [
+                a.action
+                for a in session.query(ActivityLog).order_by(ActivityLog.created_at)
+            ]
+        )
+        assert sorted(actions) == ["assign", "change_status", "redo", "undo"]
+    await engine.dispose()
@@ -33,7 +33,7 @@ def test_change_task_status_command_execute_and_undo():
 def test_command_invoker_execute_undo_redo():
     db = MagicMock()
     cmd = UpdateTaskCommand(db, 'tid', {'title': 'New'})
-    invoker = CommandInvoker()
+    invoker = CommandInvoker(db)
     invoker.execute_command(cmd)
-    invoker.undo()
-    invoker.redo() 
\ No newline at end of file
+    invoker.undo('tid')
+    invoker.redo('tid') 
\ No newline at end of file
@@ -0,0 +1,146 @@
+import pytest
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from api.project_service.app.schemas.task import (
+    SortOrder,
+    TaskFilterDTO,
+    TaskPriority,
+    TaskSortField,
+    TaskStatus,
+)
+from api.project_service.app.services.task_service import TaskService
+from api.shared.exceptions.project_exceptions import InvalidTaskCursorException
+from api.shared.models.project import Project, ProjectMember, Task
+from api.shared.utils.pagination import decode_cursor, encode_cursor
+
+START = datetime(2025, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def seed(db: Session) -> None:
+    db.add(Project(id="proj1", name="Project1", owner_id="user1"))
+    db.add(
+        ProjectMember(
+            project_id="proj1", user_id="user1", role="owner", joined_at=START
+        )
+    )
+    for i in range(10):
+        db.add(
+            Task(
+                id=f"task{i}",
+                title=f"Task {i}",
+                project_id="proj1",
+                creator_id="user1",
+                assignee_id="user2" if i % 2 else None,
+                status="done" if i < 3 else "todo",
+                priority="high" if i % 3 == 0 else "medium",
+                due_date=START + timedelta(days=i) if i < 7 else None,
+                tags=["backend"] if i % 2 else ["frontend", "urgent"],
+                created_at=START + timedelta(hours=i % 5),
+            )
+        )
+    db.add(Task(id="other", title="Other", project_id="proj2", creator_id="user1"))
+    db.commit()
+
+
+def _all_pages(
+    service: TaskService,
+    limit: int,
+    filters: Optional[TaskFilterDTO] = None,
+    **kwargs: object,
+) -> List[List[str]]:
+    pages: List[List[str]] = []
+    cursor = None
+    while True:
+        page = service.get_project_tasks(
+            "proj1", "user1", filters, limit=limit, cursor=cursor, **kwargs
+        )
+        pages.append([task.id for task in page.items])
+        if page.next_cursor is None:
+            return pages
+        cursor = page.next_cursor
+
+
+def test_pages_through_tasks_in_creation_order(db: Session) -> None:
+    pages = _all_pages(TaskService(db), limit=4)
+    assert [len(page) for page in pages] == [4, 4, 2]
+    ids = [task_id for page in pages for task_id in page]
+    assert ids == [
+        "task0",
+        "task5",
+        "task1",
+        "task6",
+        "task2",
+        "task7",
+        "task3",
+        "task8",
+        "task4",
+        "task9",
+    ]
+
+
+def test_sorts_missing_due_dates_last_in_both_orders(db: Session) -> None:
+    service = TaskService(db)
+    ascending = [
+        i for page in _all_pages(service, 3, sort=TaskSortField.DUE_DATE) for i in page
+    ]
+    descending = [
+        i
+        for page in _all_pages(
+            service, 3, sort=TaskSortField.DUE_DATE, order=SortOrder.DESC
+        )
+        for i in page
+    ]
+    assert ascending == [f"task{i}" for i in range(10)]
+    assert descending == [f"task{i}" for i in (6, 5, 4, 3, 2, 1, 0, 9, 8, 7)]
+
+
+def test_filters_tasks(db: Session) -> None:
+    service = TaskService(db)
+
+    def ids(**filters: object) -> List[str]:
+        return sorted(
+            task.id
+            for task in service.get_project_tasks(
+                "proj1", "user1", TaskFilterDTO(**filters)
+            ).items
+        )
+
+    assert ids(status=[TaskStatus.DONE]) == ["task0", "task1", "task2"]
+    assert ids(priority=[TaskPriority.HIGH], status=[TaskStatus.TODO]) == [
+        "task3",
+        "task6",
+        "task9",
+    ]
+    assert ids(assignee_id="user2", tags=["backend"]) == [
+        "task1",
+        "task3",
+        "task5",
+        "task7",
+        "task9",
+    ]
+    assert ids(
+        tags=["frontend", "urgent"],
+        due_after=START + timedelta(days=2),
+        due_before=START + timedelta(days=4),
+    ) == ["task2", "task4"]
+    assert ids(tags=["missing"]) == []
+
+
+def test_rejects_invalid_cursors(db: Session) -> None:
+    service = TaskService(db)
+    cursor = service.get_project_tasks("proj1", "user1", limit=2).next_cursor
+    assert decode_cursor(cursor)[:2] == ["created_at", "asc"]
+    with pytest.raises(InvalidTaskCursorException):
+        service.get_project_tasks(
+            "proj1", "user1", sort=TaskSortField.TITLE, cursor=cursor
+        )
+    with pytest.raises(InvalidTaskCursorException):
+        service.get_project_tasks("proj1", "user1", cursor="not a cursor")
+    with pytest.raises(InvalidTaskCursorException):
+        service.get_project_tasks(
+            "proj1",
+            "user1",
+            cursor=encode_cursor("created_at", "asc", "yesterday", "task1"),
+        )
@@ -1,8 +1,9 @@
 import pytest
 from unittest.mock import MagicMock, patch
+from api.project_service.app.services.project_access import ProjectAccess
 from api.project_service.app.services.task_service import TaskService
-from api.project_service.app.schemas.task import TaskCreateDTO, TaskCommentCreateDTO
-from api.shared.exceptions.project_exceptions import InsufficientProjectRoleException, ProjectNotFoundException
+from api.project_service.app.schemas.task import TaskCreateDTO, TaskCommentCreateDTO, TaskResponseDTO
+from api.shared.exceptions.project_exceptions import InsufficientProjectRoleException, ProjectNotFoundException, TaskNotFoundException
 
 @pytest.fixture
 def mock_db() -> MagicMock:
@@ -27,7 +28,7 @@ def test_create_task_success(task_service: TaskService) -> None:
          patch.object(task_service.db, "add", MagicMock()), \
          patch.object(task_service.db, "commit", MagicMock()), \
          patch.object(task_service.db, "refresh", MagicMock()):
-        mock_query.return_value.filter.return_value.first.return_value = MagicMock()
+        mock_query.return_value.outerjoin.return_value.filter.return_value.first.return_value = (MagicMock(), MagicMock())
         result = task_service.create_task("proj1", task_data, "user1")
         assert result.id == "task1"
 
@@ -39,7 +40,7 @@ def test_get_task_not_found(task_service: TaskService) -> None:
          patch("api.shared.models.project.ActivityLog", MagicMock()), \
          patch("api.shared.models.document.Document", MagicMock()), \
          patch.object(task_service.db, "query") as mock_query:
-        mock_query.return_value.filter.return_value.first.return_value = None
+        mock_query.return_value.outerjoin.return_value.add_entity.return_value.outerjoin.return_value.filter.return_value.first.return_value = None
         with pytest.raises(ProjectNotFoundException):
             task_service.get_task("proj1", "task1", "user1")
 
@@ -49,9 +50,8 @@ def test_update_task_not_member(task_service: TaskService) -> None:
          patch("api.shared.models.project.Task", MagicMock()), \
          patch("api.shared.models.project.TaskComment", MagicMock()), \
          patch("api.shared.models.project.ActivityLog", MagicMock()), \
-         patch("api.shared.models.document.Document", MagicMock()), \
-         patch.object(task_service.db, "query") as mock_query:
-        mock_query.return_value.filter.return_value.first.return_value = MagicMock()
+         patch("api.shared.models.document.Document", MagicMock()):
+        task_service.access.resolve = MagicMock(return_value=ProjectAccess(MagicMock(), MagicMock(role="member"), MagicMock()))
         with pytest.raises(InsufficientProjectRoleException):
             task_service.update_task("proj1", "task1", MagicMock(), "user1")
 
@@ -62,11 +62,10 @@ def test_delete_task_success(task_service: TaskService) -> None:
          patch("api.shared.models.project.TaskComment", MagicMock()), \
          patch("api.shared.models.project.ActivityLog", MagicMock()), \
          patch("api.shared.models.document.Document", MagicMock()), \
-         patch.object(task_service.db, "query") as mock_query, \
          patch.object(task_service, "_task_to_dto", return_value=MagicMock(id="task1")), \
          patch.object(task_service.db, "delete", MagicMock()), \
          patch.object(task_service.db, "commit", MagicMock()):
-        mock_query.return_value.filter.return_value.first.return_value = MagicMock(creator_id="user1")
+        task_service.access.resolve = MagicMock(return_value=ProjectAccess(MagicMock(), MagicMock(role="member"), MagicMock(creator_id="user1")))
         result = task_service.delete_task("proj1", "task1", "user1")
         assert "message" in result
 
@@ -77,9 +76,8 @@ def test_delete_task_permission_denied(task_service: TaskService) -> None:
          patch("api.shared.models.project.TaskComment", MagicMock()), \
          patch("api.shared.models.project.ActivityLog", MagicMock()), \
          patch("api.shared.models.document.Document", MagicMock()), \
-         patch.object(task_service.db, "query") as mock_query, \
          patch.object(task_service, "_task_to_dto", return_value=MagicMock(id="task1")):
-        mock_query.return_value.filter.return_value.first.return_value = MagicMock(creator_id="other_user")
+        task_service.access.resolve = MagicMock(return_value=ProjectAccess(MagicMock(), MagicMock(role="member"), MagicMock(creator_id="other_user")))
         with pytest.raises(InsufficientProjectRoleException):
             task_service.delete_task("proj1", "task1", "user1")
 
@@ -91,8 +89,8 @@ def test_update_task_not_found(task_service: TaskService) -> None:
          patch("api.shared.models.project.ActivityLog", MagicMock()), \
          patch("api.shared.models.document.Document", MagicMock()), \
          patch.object(task_service.db, "query") as mock_query:
-        mock_query.return_value.filter.return_value.first.return_value = None
-        with pytest.raises(ProjectNotFoundException):
+        mock_query.return_value.outerjoin.return_value.add_entity.return_value.outerjoin.return_value.filter.return_value.first.return_value = (MagicMock(), MagicMock(), None)
+        with pytest.raises(TaskNotFoundException):
             task_service.update_task("proj1", "task1", MagicMock(), "user1")
 
 def test_create_task_invalid_data(task_service: TaskService) -> None:
@@ -106,12 +104,13 @@ def test_get_project_tasks(task_service: TaskService):
          patch("api.shared.models.project.ProjectMember", MagicMock()), \
          patch("api.shared.models.project.Task", MagicMock()), \
          patch.object(task_service.db, "query") as mock_query, \
-         patch.object(task_service, "_task_to_dto", return_value=MagicMock(id="task1")):
-        mock_query.return_value.filter.return_value.first.return_value = MagicMock()
-        mock_query.return_value.filter.return_value.all.return_value = [MagicMock()]
+         patch.object(task_service, "_task_to_dto", return_value=TaskResponseDTO.model_construct(id="task1")):
+        task_service.access.resolve = MagicMock(return_value=ProjectAccess(MagicMock(), MagicMock()))
+        mock_query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [MagicMock()]
         result = task_service.get_project_tasks("proj1", "user1")
-        assert isinstance(result, list)
-        assert result[0].id == "task1"
+        assert isinstance(result.items, list)
+        assert result.items[0].id == "task1"
+        assert result.next_cursor is None
 
 def test_add_task_comment(task_service: TaskService):
     from api.project_service.app.schemas.task import TaskCommentCreateDTO
@@ -120,13 +119,12 @@ def test_add_task_comment(task_service: TaskService):
          patch("api.shared.models.project.ProjectMember", MagicMock()), \
          patch("api.shared.models.project.Task", MagicMock()), \
          patch("api.shared.models.project.TaskComment", MagicMock()), \
-         patch.object(task_service.db, "query") as mock_query, \
          patch.object(task_service, "_task_comment_to_dto", return_value=MagicMock(id="c1")), \
          patch.object(task_service.db, "add"), \
          patch.object(task_service.db, "commit"), \
          patch.object(task_service.db, "refresh"), \
          patch.object(task_service.activity_service, "log_activity"):
-        mock_query.return_value.filter.return_value.first.return_value = MagicMock()
+        task_service.access.resolve = MagicMock(return_value=ProjectAccess(MagicMock(), MagicMock(), MagicMock()))
         result = task_service.add_task_comment("proj1", "task1", comment_data, "user1")
         assert result.id == "c1"
 
@@ -137,8 +135,7 @@ def test_get_task_comments(task_service: TaskService):
          patch("api.shared.models.project.TaskComment", MagicMock()), \
          patch.object(task_service.db, "query") as mock_query, \
          patch.object(task_service, "_task_comment_to_dto", return_value=MagicMock(id="c1")):
-        mock_query.return_value.filter.return_value.first.return_value = MagicMock()
-        mock_query.return_value.filter.return_value.filter.return_value.first.return_value = MagicMock()
+        task_service.access.resolve = MagicMock(return_value=ProjectAccess(MagicMock(), MagicMock(), MagicMock()))
         mock_query.return_value.filter.return_value.all.return_value = [MagicMock()]
         result = task_service.get_task_comments("proj1", "task1", "user1")
         assert isinstance(result, list)
@@ -0,0 +1,265 @@
+import json
+import pytest
+from datetime import datetime
+from typing import AsyncIterator, List
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from api.project_service.app.schemas.task import TaskTransferFormat
+from api.project_service.app.services.task_transfer_service import (
+    AsyncTaskTransferService,
+    TaskImportParser,
+    TaskTransferService,
+)
+from api.shared.exceptions.project_exceptions import (
+    InvalidTaskImportException,
+    NotProjectMemberException,
+)
+from api.shared.models.base import Base
+from api.shared.models.project import ActivityLog, Project, ProjectMember, Task
+
+CSV = TaskTransferFormat.CSV
+NDJSON = TaskTransferFormat.NDJSON
+
+
+def _seed(session: Session) -> None:
+    session.add(Project(id="proj1", name="Project1", owner_id="user1"))
+    session.add(Project(id="proj2", name="Project2", owner_id="user1"))
+    for project_id in ("proj1", "proj2"):
+        session.add(
+            ProjectMember(
+                project_id=project_id,
+                user_id="user1",
+                role="owner",
+                joined_at=datetime(2025, 1, 1),
+            )
+        )
+    session.add(
+        ProjectMember(
+            project_id="proj1",
+            user_id="user2",
+            role="member",
+            joined_at=datetime(2025, 1, 1),
+        )
+    )
+    for i in range(5):
+        session.add(
+            Task(
+                id=f"task{i}",
+                title=f'Task "{i}", with\nnewline',
+                description=None if i % 2 else "Desc",
+                project_id="proj1",
+                creator_id="user1",
+                assignee_id="user2" if i == 0 else None,
+                priority="high",
+                status="review",
+                tags=["a", "b"],
+                meta_data={"points": i},
+                due_date=datetime(2025, 7, i + 1),
+                created_at=datetime(2025, 1, 1, 0, i),
+            )
+        )
+    session.commit()
+
+
+@pytest.fixture(autouse=True)
+def seed(engine: Engine) -> None:
+    with Session(engine) as session:
+        _seed(session)
+
+
+def _export(engine: Engine, fmt: TaskTransferFormat, batch_size: int = 2) -> bytes:
+    with Session(engine) as db:
+        return "".join(
+            TaskTransferService(db).export_tasks(
+                "proj1", "user1", fmt, batch_size=batch_size
+            )
+        ).encode()
+
+
+def _chunks(body: bytes, size: int = 7) -> List[bytes]:
+    # Chunk boundaries fall inside lines, quoted fields and UTF-8 characters
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+def _tasks(engine: Engine, project_id: str) -> List[tuple]:
+    with Session(engine) as db:
+        tasks = (
+            db.query(Task).filter(Task.project_id == project_id).order_by(Task.title)
+        )
+        return [
+            (
+                t.title,
+                t.description,
+                t.status,
+                t.priority,
+                t.assignee_id,
+                t.due_date,
+                t.tags,
+                t.meta_data,
+            )
+            for t in tasks
+        ]
+
+
+def test_ndjson_export_streams_tasks_oldest_first(engine: Engine) -> None:
+    lines = _export(engine, NDJSON).decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row["id"] for row in rows] == [f"task{i}" for i in range(5)]
+    assert (
+        rows[0]["tags"] == ["a", "b"] and rows[0]["due_date"] == "2025-07-01T00:00:00"
+    )
+
+
+@pytest.mark.parametrize("fmt", [CSV, NDJSON])
+def test_export_import_round_trip(engine: Engine, fmt: TaskTransferFormat) -> None:
+    body = _export(engine, fmt)
+    with Session(engine) as db:
+        # Assignees must be members of the target project
+        result = TaskTransferService(db).import_tasks(
+            "proj2", "user1", _chunks(body), fmt
+        )
+    assert result.imported == 4 and result.failed == 1
+    assert result.errors[0].error == "Assignee is not a project member"
+    assert result.rows_per_second > 0
+    assert _tasks(engine, "proj2") == _tasks(engine, "proj1")[1:]
+    with Session(engine) as db:
+        activity = db.query(ActivityLog).one()
+        assert activity.action == "import_tasks" and activity.details == {
+            "format": fmt.value,
+            "imported": 4,
+            "failed": 1,
+        }
+
+
+def test_invalid_rows_are_reported_with_their_line(engine: Engine) -> None:
+    body = "\n".join(
+        [
+            '{"title": "First task", "tags": ["x"]}',
+            "",
+            '{"title": "No"}',
+            "not json",
+            '["title"]',
+            '{"title": "Bad status", "status": "blocked"}',
+            '{"title": "Third task", "assignee_id": "user2", "status": "done"}',
+        ]
+    ).encode()
+    with Session(engine) as db:
+        result = TaskTransferService(db).import_tasks(
+            "proj1", "user2", _chunks(body, 5), NDJSON
+        )
+    assert result.imported == 2 and result.failed == 4
+    assert [error.line for error in result.errors] == [3, 4, 5, 6]
+    assert result.errors[0].error.startswith(
+        "title: String should have at least 3 characters"
+    )
+    assert result.errors[2].error == "Expected a JSON object"
+    with Session(engine) as db:
+        imported = (
+            db.query(Task)
+            .filter(Task.title.in_(["First task", "Third task"]))
+            .order_by(Task.title)
+            .all()
+        )
+        assert [(t.creator_id, t.status, t.priority, t.tags) for t in imported] == [
+            ("user2", "todo", "medium", ["x"]),
+            ("user2", "done", "medium", []),
+        ]
+
+
+def test_import_inserts_one_statement_per_batch(engine: Engine) -> None:
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.startswith("INSERT INTO tasks"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    body = "".join(
+        json.dumps({"title": f"Imported {i}"}) + "\n" for i in range(7)
+    ).encode()
+    with Session(engine) as db:
+        result = TaskTransferService(db).import_tasks(
+            "proj1", "user1", [body], NDJSON, batch_size=3
+        )
+    event.remove(engine, "before_cursor_execute", record)
+    assert result.imported == 7
+    assert len(statements) == 3
+
+
+def test_csv_parser_handles_quotes_empty_cells_and_bad_rows() -> None:
+    parser = TaskImportParser(CSV)
+    body = '﻿title,description,tags\r\n"Multi, ""quoted""","line one\nline two",\r\nShort\r\nBad tags,,[oops\r\nToo,many,cells,here\r\n"Open'.encode()
+    records = [
+        record for chunk in _chunks(body, 4) for record in parser.feed(chunk)
+    ] + parser.close()
+    assert records[0] == (
+        2,
+        {"title": 'Multi, "quoted"', "description": "line one\nline two"},
+        None,
+    )
+    assert records[1] == (4, {"title": "Short"}, None)
+    assert records[2][0] == 5 and records[2][2].startswith("Invalid JSON in tags")
+    assert records[3] == (6, None, "Expected 3 columns, got 4")
+    assert records[4] == (7, None, "Unterminated quoted field")
+
+
+def test_stray_quote_is_reported_once_the_record_is_too_long() -> None:
+    parser = TaskImportParser(CSV, max_record_size=100)
+    body = ('title\n"Stray\n' + "".join(f"Task {i}\n" for i in range(30))).encode()
+    records = [
+        record for chunk in _chunks(body, 64) for record in parser.feed(chunk)
+    ] + parser.close()
+    assert records[0] == (2, None, "Unterminated quoted field")
+    # Parsing resumes after the abandoned record
+    assert len(records) > 1 and all(error is None for _, _, error in records[1:])
+    assert records[-1] == (32, {"title": "Task 29"}, None)
+
+
+def test_overlong_lines_are_rejected() -> None:
+    parser = TaskImportParser(NDJSON, max_record_size=100)
+    with pytest.raises(InvalidTaskImportException):
+        parser.feed(b'{"title": "' + b"x" * 200)
+
+
+def test_unreadable_imports_are_rejected() -> None:
+    with pytest.raises(InvalidTaskImportException):
+        TaskImportParser(CSV).feed(b"name,description\nTask,Desc\n")
+    with pytest.raises(InvalidTaskImportException):
+        TaskImportParser(NDJSON).feed(b'{"title": "\xff"}\n')
+
+
+def test_export_requires_membership(engine: Engine) -> None:
+    with Session(engine) as db:
+        with pytest.raises(NotProjectMemberException):
+            TaskTransferService(db).export_tasks("proj1", "user3", CSV)
+
+
+@pytest.mark.asyncio
+async def test_async_import_reads_the_body_as_it_arrives() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine)() as db:
+        await db.run_sync(_seed)
+
+        async def body() -> AsyncIterator[bytes]:
+            yield b"title,priority\nImported one,"
+            yield b"urgent\nImported two,low\n"
+
+        result = await AsyncTaskTransferService(db).import_tasks(
+            "proj2", "user1", body(), CSV
+        )
+        assert result.imported == 2 and result.failed == 0
+        exported = await db.run_sync(
+            lambda session: "".join(
+                TaskTransferService(session).export_tasks("proj2", "user1", NDJSON)
+            )
+        )
+        assert sorted(
+            (row["title"], row["priority"])
+            for row in map(json.loads, exported.splitlines())
+        ) == [("Imported one", "urgent"), ("Imported two", "low")]
+    await engine.dispose()
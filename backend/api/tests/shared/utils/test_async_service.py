@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from api.shared.utils.async_service import AsyncService
+from api.shared.utils.db import get_async_database_url
+
+class EchoService:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def select(self, value: int, offset: int = 0) -> int:
+        return self.db.execute(text('SELECT :value'), {'value': value + offset}).scalar_one()
+
+    def fail(self) -> None:
+        raise ValueError('boom')
+
+class AsyncEchoService(AsyncService):
+    service_class = EchoService
+
+@pytest.mark.asyncio
+async def test_runs_service_methods_on_async_session() -> None:
+    engine = create_async_engine('sqlite+aiosqlite://')
+    async with async_sessionmaker(engine)() as db:
+        service = AsyncEchoService(db)
+        assert await service.select(41, offset=1) == 42
+        with pytest.raises(ValueError):
+            await service.fail()
+        with pytest.raises(AttributeError):
+            service.missing
+        with pytest.raises(AttributeError):
+            service._private
+    await engine.dispose()
+
+def test_async_database_url() -> None:
+    assert get_async_database_url('postgresql://u:p@localhost/db') == 'postgresql+asyncpg://u:p@localhost/db'
+    assert get_async_database_url('postgresql+psycopg2://u:p@localhost/db') == 'postgresql+asyncpg://u:p@localhost/db'
+    assert get_async_database_url('sqlite:///:memory:') == 'sqlite+aiosqlite:///:memory:'
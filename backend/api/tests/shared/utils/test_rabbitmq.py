@@ -1,6 +1,11 @@
-from api.shared.utils.rabbitmq import RabbitMQManager
+import asyncio
+import pika
+import pytest
+import threading
+from api.shared.utils import rabbitmq
+from api.shared.utils.rabbitmq import AsyncRabbitMQPublisher, ConfirmChannel, PublisherPool, RabbitMQManager, message_properties
 from unittest.mock import MagicMock
-from typing import Any
+from typing import Any, List
 
 def test_singleton_instance() -> None:
     manager1 = RabbitMQManager()
@@ -66,4 +71,139 @@ def test_close_connection_none(monkeypatch: Any):
     from api.shared.utils.rabbitmq import RabbitMQManager
     manager = RabbitMQManager()
     monkeypatch.setattr(manager, 'connection', None)
-    manager.close()  # Should not raise
\ No newline at end of file
+    manager.close()  # Should not raise
+class FakeConnection:
+    """BlockingConnection stand-in whose channel is in confirm mode"""
+
+    def __init__(self, nack_tags: Any = (), fail_select: bool = False) -> None:
+        self.is_open = True
+        self.nack_tags = set(nack_tags)
+        self.fail_select = fail_select
+        self.published: List[str] = []
+        self.closed = False
+        self.channel_mock = MagicMock()
+        self.channel_mock.is_open = True
+        self.channel_mock.confirm_delivery.side_effect = self._confirm_delivery
+        self.channel_mock.basic_publish.side_effect = self._publish
+
+    def channel(self) -> MagicMock:
+        return self.channel_mock
+
+    def _confirm_delivery(self) -> None:
+        if self.fail_select:
+            raise pika.exceptions.ChannelClosedByBroker(406, 'PRECONDITION_FAILED')
+
+    def _publish(self, exchange: str, routing_key: str, body: str, properties: Any) -> None:
+        self.published.append(routing_key)
+        if len(self.published) in self.nack_tags:
+            raise pika.exceptions.NackError([])
+
+    def process_data_events(self, time_limit: Any = 0) -> None:
+        pass
+
+    def close(self) -> None:
+        self.is_open = False
+        self.closed = True
+
+def test_confirm_channel_publishes_with_confirms() -> None:
+    connection = FakeConnection()
+    publisher = ConfirmChannel(connection)  # type: ignore[arg-type]
+    messages = [(f'rk.{i}', {'n': i}) for i in range(10)]
+    assert publisher.publish_batch('ex', messages, message_properties()) == 10
+    assert connection.published == [f'rk.{i}' for i in range(10)]
+    assert publisher.is_usable
+    connection.channel_mock.confirm_delivery.assert_called_once_with()
+
+def test_confirm_channel_counts_nacks() -> None:
+    connection = FakeConnection(nack_tags=[2])
+    publisher = ConfirmChannel(connection)  # type: ignore[arg-type]
+    assert publisher.publish_batch('ex', [('rk', {}), ('rk', {}), ('rk', {})], message_properties()) == 2
+    assert publisher.is_usable
+
+def test_confirm_channel_closes_connection_when_select_fails() -> None:
+    connection = FakeConnection(fail_select=True)
+    with pytest.raises(pika.exceptions.ChannelClosedByBroker):
+        ConfirmChannel(connection)  # type: ignore[arg-type]
+    assert connection.closed
+
+def test_failed_channel_is_not_reused() -> None:
+    connection = FakeConnection()
+    publisher = ConfirmChannel(connection)  # type: ignore[arg-type]
+    connection.channel_mock.basic_publish.side_effect = pika.exceptions.StreamLostError('lost')
+    assert publisher.publish_batch('ex', [('rk', {}), ('rk', {})], message_properties()) == 0
+    assert connection.channel_mock.basic_publish.call_count == 1
+    assert not publisher.is_usable
+
+def test_pool_bounds_blocked_publishers(monkeypatch: Any) -> None:
+    monkeypatch.setattr(rabbitmq, 'RABBITMQ_CONFIRM_TIMEOUT', 5.0)
+    opened: List[pika.ConnectionParameters] = []
+    monkeypatch.setattr(rabbitmq, 'BlockingConnection', lambda parameters: (opened.append(parameters), FakeConnection())[1])
+    with PublisherPool(size=1).channel():
+        pass
+    assert opened[0].blocked_connection_timeout == 5.0
+
+def test_pool_reuses_channels_per_thread() -> None:
+    connections: List[FakeConnection] = []
+    def open_channel() -> ConfirmChannel:
+        connections.append(FakeConnection())
+        return ConfirmChannel(connections[-1])  # type: ignore[arg-type]
+    pool = PublisherPool(size=2)
+    pool._open = open_channel  # type: ignore[method-assign]
+    barrier = threading.Barrier(2)
+    def publish() -> None:
+        with pool.channel() as publisher:
+            barrier.wait()
+            publisher.publish_batch('ex', [('rk', {})], message_properties())
+    threads = [threading.Thread(target=publish) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Two threads at once get two connections, which are kept for reuse
+    assert len(connections) == 2
+    with pool.channel():
+        pass
+    assert len(connections) == 2
+    connections[0].is_open = False
+    connections[1].is_open = False
+    with pool.channel():
+        pass
+    assert len(connections) == 3
+    assert pool._idle.qsize() == 1
+
+def test_exchange_is_declared_once(monkeypatch: Any) -> None:
+    manager = RabbitMQManager()
+    connection = FakeConnection()
+    pool = PublisherPool(size=1)
+    pool._open = lambda: ConfirmChannel(connection)  # type: ignore[method-assign]
+    monkeypatch.setattr(manager, 'publishers', pool)
+    monkeypatch.setattr(manager, '_declared_exchanges', set())
+    for _ in range(3):
+        manager.declare_exchange('notifications')
+    connection.channel_mock.exchange_declare.assert_called_once_with(exchange='notifications', exchange_type='topic', durable=True)
+    assert manager.publish_batch('notifications', [('rk', {}), ('rk', {})]) == 2
+    assert manager.publish('notifications', 'rk', {}) is True
+
+def test_async_publisher_runs_off_the_event_loop() -> None:
+    manager = MagicMock()
+    threads: List[str] = []
+    manager.publish_batch.side_effect = lambda exchange, messages, persistent: (threads.append(threading.current_thread().name), len(messages))[1]
+    publisher = AsyncRabbitMQPublisher(manager)
+    assert asyncio.run(publisher.publish_batch('ex', iter([('rk', {}), ('rk', {})]))) == 2
+    assert threads[0].startswith('rabbitmq-publisher')
+
+def test_publish_batch_without_connection(monkeypatch: Any) -> None:
+    manager = RabbitMQManager()
+    monkeypatch.setattr(manager, 'connection', None)
+    monkeypatch.setattr(manager, 'connect', MagicMock())
+    assert manager.publish_batch('ex', [('rk', {'msg': 'data'})]) == 0
+
+def test_consume_runs_a_queue_consumer(monkeypatch: Any) -> None:
+    from api.shared.utils import rabbitmq_consumer
+    consumer_class = MagicMock()
+    monkeypatch.setattr(rabbitmq_consumer, 'QueueConsumer', consumer_class)
+    callback = MagicMock()
+    RabbitMQManager().consume('tasks', callback, prefetch=50, concurrency=8)
+    consumer_class.assert_called_once_with('tasks', handler=callback, prefetch=50, concurrency=8)
+    parameters = consumer_class.return_value.run.call_args.args[0]
+    assert isinstance(parameters, pika.ConnectionParameters)
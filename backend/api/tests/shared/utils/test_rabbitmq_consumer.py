@@ -0,0 +1,110 @@
+import json
+import pika
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+from api.shared.utils import rabbitmq_consumer
+from api.shared.utils.rabbitmq_consumer import ConsumerMetrics, QueueConsumer, Settlement
+
+class FakeConnection:
+    """BlockingConnection stand-in delivering a fixed list of messages"""
+
+    def __init__(self, bodies: List[bytes]) -> None:
+        self.is_open = True
+        self.callbacks: "queue.Queue[Any]" = queue.Queue()
+        self.amqp_channel = MagicMock()
+        self.bodies = bodies
+        self.amqp_channel.basic_consume.side_effect = self._basic_consume
+        self.amqp_channel.start_consuming.side_effect = self._start_consuming
+
+    def channel(self) -> MagicMock:
+        return self.amqp_channel
+
+    def _basic_consume(self, queue: str, on_message_callback: Any) -> None:
+        self.on_message = on_message_callback
+
+    def _start_consuming(self) -> None:
+        for tag, body in enumerate(self.bodies, start=1):
+            method = MagicMock(delivery_tag=tag, redelivered=False)
+            self.on_message(self.amqp_channel, method, pika.BasicProperties(timestamp=int(time.time()) - 2), body)
+
+    def add_callback_threadsafe(self, callback: Any) -> None:
+        self.callbacks.put(callback)
+
+    def process_data_events(self, time_limit: Optional[float] = 0) -> None:
+        try:
+            self.callbacks.get(timeout=time_limit)()
+        except queue.Empty:
+            pass
+
+    def close(self) -> None:
+        self.is_open = False
+
+def _consumer(handler: Any, **kwargs: Any) -> QueueConsumer:
+    return QueueConsumer('tasks', handler=handler, **kwargs)
+
+def test_process_results() -> None:
+    assert _consumer(lambda m: None).process(b'{}', pika.BasicProperties(), False) == Settlement.ACK
+    assert _consumer(lambda m: Settlement.REQUEUE).process(b'{}', pika.BasicProperties(), False) == Settlement.REQUEUE
+    assert _consumer(lambda m: None).process(b'not json', pika.BasicProperties(), False) == Settlement.REJECT
+    def fail(message: Dict[str, Any]) -> None:
+        raise RuntimeError('boom')
+    # Failures are requeued once, then rejected
+    assert _consumer(fail).process(b'{}', pika.BasicProperties(), False) == Settlement.REQUEUE
+    assert _consumer(fail).process(b'{}', pika.BasicProperties(), True) == Settlement.REJECT
+
+def test_settle_acks_requeues_and_rejects() -> None:
+    consumer = _consumer(None)
+    amqp_channel = MagicMock()
+    consumer.settle(amqp_channel, 1, pika.BasicProperties(), b'', Settlement.ACK)
+    consumer.settle(amqp_channel, 2, pika.BasicProperties(), b'', Settlement.REQUEUE)
+    consumer.settle(amqp_channel, 3, pika.BasicProperties(), b'', Settlement.REJECT)
+    amqp_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+    assert [c.kwargs for c in amqp_channel.basic_nack.call_args_list] == [{'delivery_tag': 2, 'requeue': True}, {'delivery_tag': 3, 'requeue': False}]
+
+def test_run_processes_messages_concurrently_and_settles_them(monkeypatch: Any) -> None:
+    bodies = [json.dumps({'n': i}).encode() for i in range(8)]
+    connection = FakeConnection(bodies)
+    monkeypatch.setattr(rabbitmq_consumer, 'BlockingConnection', lambda parameters: connection)
+    barrier = threading.Barrier(4, timeout=5)
+    def handler(message: Dict[str, Any]) -> Optional[Settlement]:
+        barrier.wait()
+        return Settlement.REJECT if message['n'] == 0 else None
+    consumer = _consumer(handler, prefetch=2, concurrency=4)
+    consumer.run(MagicMock())
+    # Prefetch is never below the worker pool
+    connection.amqp_channel.basic_qos.assert_called_once_with(prefetch_count=4)
+    assert connection.amqp_channel.basic_ack.call_count == 7
+    connection.amqp_channel.basic_nack.assert_called_once_with(delivery_tag=1, requeue=False)
+    snapshot = consumer.metrics.snapshot()
+    assert snapshot['received'] == 8
+    assert snapshot['in_flight'] == 0
+    assert snapshot['results'] == {'ack': 7, 'reject': 1}
+    assert snapshot['lag_seconds']['max'] >= 2
+    assert not connection.is_open
+
+def test_stopped_consumer_does_not_consume(monkeypatch: Any) -> None:
+    connection = FakeConnection([b'{}'])
+    monkeypatch.setattr(rabbitmq_consumer, 'BlockingConnection', lambda parameters: connection)
+    consumer = _consumer(lambda m: None)
+    consumer.stop()
+    consumer.run_forever(MagicMock())
+    connection.amqp_channel.start_consuming.assert_not_called()
+
+def test_stop_asks_the_connection_thread_to_stop_consuming() -> None:
+    consumer = _consumer(lambda m: None)
+    connection = MagicMock()
+    consumer._connection = connection
+    consumer._amqp_channel = amqp_channel = MagicMock()
+    consumer.stop()
+    connection.add_callback_threadsafe.assert_called_once_with(amqp_channel.stop_consuming)
+
+def test_metrics_without_timestamp_have_no_lag() -> None:
+    metrics = ConsumerMetrics('tasks')
+    metrics.record_received(pika.BasicProperties())
+    metrics.record_settled('ack', 0.5)
+    snapshot = metrics.snapshot()
+    assert snapshot['lag_seconds']['mean'] == 0.0
+    assert snapshot['processing_seconds_mean'] == 0.5
@@ -0,0 +1 @@
+"""Microbenchmarks for TaskHub backend hot paths."""
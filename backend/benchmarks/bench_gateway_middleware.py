@@ -0,0 +1,171 @@
+"""
+Latency of a trivial proxied GET through the gateway middleware stack.
+
+Compares the pure ASGI AuthMiddleware/CircuitBreakerMiddleware stack with the
+same checks registered as ``app.middleware("http")`` (BaseHTTPMiddleware)
+functions. The backend service is replaced by an in-memory transport so only
+gateway overhead is measured; requests are driven wrk-style by a fixed number
+of concurrent connections.
+
+Usage (from the backend directory):
+
+    PYTHONPATH=. python -m benchmarks.bench_gateway_middleware --requests 5000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from jose import jwt
+
+from api.api_gateway import main
+from api.api_gateway.middleware import auth_middleware
+from api.api_gateway.middleware.auth_middleware import AuthMiddleware
+from api.api_gateway.middleware.circuit_breaker import (
+    CircuitBreakerMiddleware,
+    circuit_breaker,
+)
+
+SECRET = "benchmark-secret"
+METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
+
+
+class InstantTransport(httpx.AsyncBaseTransport):
+    """Backend stand-in answering every request immediately"""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            stream=httpx.ByteStream(b'[{"id": "p1", "name": "Project"}]'),
+            headers={"content-type": "application/json"},
+        )
+
+
+async def http_auth_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """The auth checks as a BaseHTTPMiddleware function"""
+    if request.method == "OPTIONS" or auth_middleware._should_skip_auth(
+        request.url.path
+    ):
+        return await call_next(request)
+
+    token = auth_middleware._get_token_from_request(request)
+    if not token:
+        return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+
+    request.state.user_id = await auth_middleware._validate_token(token)
+    return await call_next(request)
+
+
+async def http_circuit_breaker_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """The circuit breaker checks as a BaseHTTPMiddleware function"""
+    service_name = request.url.path.strip("/").split("/")[0]
+    if circuit_breaker.is_circuit_open(service_name):
+        return JSONResponse(status_code=503, content={"detail": "unavailable"})
+
+    response = await call_next(request)
+    circuit_breaker.record_success(service_name)
+    return response
+
+
+def build_app(pure_asgi: bool) -> FastAPI:
+    """Build a gateway app with either middleware flavour."""
+    app = FastAPI()
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    if pure_asgi:
+        app.add_middleware(AuthMiddleware)
+        app.add_middleware(CircuitBreakerMiddleware)
+    else:
+        app.middleware("http")(http_auth_middleware)
+        app.middleware("http")(http_circuit_breaker_middleware)
+
+    app.add_api_route("/{path:path}", main.gateway, methods=METHODS)
+    return app
+
+
+async def run_load(
+    app: FastAPI, total: int, concurrency: int, headers: Dict[str, str]
+) -> List[float]:
+    """Send requests from concurrent connections, returning latencies in seconds."""
+    latencies: List[float] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://gateway"
+    ) as client:
+
+        async def connection(count: int) -> None:
+            for _ in range(count):
+                start = time.perf_counter()
+                response = await client.get("/projects", headers=headers)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        per_connection = total // concurrency
+        await asyncio.gather(*(connection(per_connection) for _ in range(concurrency)))
+
+    return latencies
+
+
+def report(name: str, latencies: List[float], elapsed: float) -> Dict[str, Any]:
+    """Print and return latency percentiles."""
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered) * 1e3
+    p99 = ordered[int(len(ordered) * 0.99) - 1] * 1e3
+    throughput = len(ordered) / elapsed
+    print(f"{name:<22} p50 {p50:7.3f} ms   p99 {p99:7.3f} ms   {throughput:8.0f} req/s")
+    return {"p50": p50, "p99": p99}
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    auth_middleware.SUPABASE_JWT_SECRET = SECRET
+    circuit_breaker.client_pool.clients["projects"] = httpx.AsyncClient(
+        transport=InstantTransport()
+    )
+    circuit_breaker.client_pool.configs["projects"] = {}
+    token = jwt.encode(
+        {"sub": "user1", "aud": "authenticated", "exp": int(time.time()) + 3600},
+        SECRET,
+        algorithm="HS256",
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    results = {}
+    for name, pure_asgi in (("BaseHTTPMiddleware", False), ("pure ASGI", True)):
+        app = build_app(pure_asgi)
+        await run_load(app, args.concurrency * 10, args.concurrency, headers)  # warm-up
+        start = time.perf_counter()
+        latencies = await run_load(app, args.requests, args.concurrency, headers)
+        results[name] = report(name, latencies, time.perf_counter() - start)
+
+    before, after = results["BaseHTTPMiddleware"], results["pure ASGI"]
+    print(
+        f"p50 gain {1 - after['p50'] / before['p50']:.1%}, "
+        f"p99 gain {1 - after['p99'] / before['p99']:.1%}"
+    )
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,143 @@
+"""
+Messages per second published to RabbitMQ with publisher confirms.
+
+Runs against an in-process broker stand-in that answers every round trip,
+including each publish's confirm, after --rtt milliseconds. It compares:
+
+* ``former``: what NotificationService did per notification, declaring the
+  exchange and then publishing on a confirm channel;
+* ``confirm channel``: a ConfirmChannel publishing --batch messages per call
+  on an exchange declared once;
+* ``pool, N threads``: --threads threads sharing a PublisherPool, each
+  publishing single messages, as API requests do.
+
+Usage (from the backend directory):
+
+    PYTHONPATH=. python -m benchmarks.bench_rabbitmq_publisher --messages 20000
+    PYTHONPATH=. python -m benchmarks.bench_rabbitmq_publisher --rtt 1.0
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from api.shared.utils.rabbitmq import (
+    ConfirmChannel,
+    PublisherPool,
+    message_properties,
+)
+
+
+class StandInBroker:
+    """Stand-in for a BlockingConnection to a broker with a fixed round trip"""
+
+    def __init__(self, rtt: float) -> None:
+        self.rtt = rtt
+        self.is_open = True
+        self.published = 0
+
+    # Channel API
+
+    def channel(self) -> "StandInBroker":
+        return self
+
+    def confirm_delivery(self) -> None:
+        time.sleep(self.rtt)
+
+    def basic_publish(self, **kwargs: Any) -> None:
+        # Returns once the broker confirmed the message
+        time.sleep(self.rtt)
+        self.published += 1
+
+    def exchange_declare(self, **kwargs: Any) -> None:
+        time.sleep(self.rtt)
+
+    # Connection API
+
+    def process_data_events(self, time_limit: Any = 0) -> None:
+        pass
+
+    def close(self) -> None:
+        self.is_open = False
+
+
+def former(rtt: float, messages: int) -> float:
+    """Per message: declare the exchange, publish and wait for its ack."""
+    broker = StandInBroker(rtt)
+    publisher = ConfirmChannel(broker)  # type: ignore[arg-type]
+    start = time.perf_counter()
+
+    for i in range(messages):
+        broker.exchange_declare(exchange="notifications")
+        publisher.publish_batch(
+            "notifications", [("notification.system", {"n": i})], message_properties()
+        )
+
+    return messages / (time.perf_counter() - start)
+
+
+def confirm_channel(rtt: float, messages: int, batch: int) -> float:
+    """Publish batches of messages on one channel."""
+    publisher = ConfirmChannel(StandInBroker(rtt))  # type: ignore[arg-type]
+    start = time.perf_counter()
+
+    for offset in range(0, messages, batch):
+        publisher.publish_batch(
+            "notifications",
+            [
+                ("notification.system", {"n": i})
+                for i in range(offset, min(offset + batch, messages))
+            ],
+            message_properties(),
+        )
+
+    return messages / (time.perf_counter() - start)
+
+
+def pooled(rtt: float, messages: int, threads: int) -> float:
+    """Publish single messages from several threads sharing a pool."""
+    pool = PublisherPool(size=threads)
+    pool._open = lambda: ConfirmChannel(StandInBroker(rtt))  # type: ignore
+
+    def publish(i: int) -> None:
+        with pool.channel() as publisher:
+            publisher.publish_batch(
+                "notifications",
+                [("notification.system", {"n": i})],
+                message_properties(),
+            )
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(publish, range(messages)))
+
+    return messages / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--rtt", type=float, default=0.2, help="milliseconds")
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    rtt = args.rtt / 1000
+    # The former path is slow; time it on a sample
+    sample = min(args.messages, 2000)
+
+    results = {
+        "former": former(rtt, sample),
+        "confirm channel": confirm_channel(rtt, args.messages, args.batch),
+        f"pool, {args.threads} threads": pooled(
+            rtt, min(args.messages, sample * args.threads), args.threads
+        ),
+    }
+
+    for name, rate in results.items():
+        print(f"{name:<20} {rate:12.0f} messages/s")
+
+
+if __name__ == "__main__":
+    main()
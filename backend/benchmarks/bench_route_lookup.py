@@ -0,0 +1,128 @@
+"""
+Compare the gateway's linear route scan with the compiled route trie.
+
+Usage (from the backend directory):
+
+    PYTHONPATH=. python -m benchmarks.bench_route_lookup --routes 5000
+"""
+import argparse
+import random
+import timeit
+from typing import Any, Dict, List, Tuple
+
+from api.api_gateway.utils.service_registry import ServiceRegistry
+
+
+def legacy_match_route(path: str, route_path: str) -> bool:
+    """Route matching as done before the trie: re-split both paths per comparison."""
+    path_parts = path.strip("/").split("/")
+    route_parts = route_path.strip("/").split("/")
+
+    if len(path_parts) != len(route_parts):
+        return False
+
+    for i, route_part in enumerate(route_parts):
+        if route_part.startswith("{") and route_part.endswith("}"):
+            continue
+        if route_part != path_parts[i]:
+            return False
+
+    return True
+
+
+def legacy_get_service_for_path(
+    services: Dict[str, Any], path: str, method: str
+) -> Dict[str, Any]:
+    """Linear scan over every service and every route."""
+    for name, service in services.items():
+        for route in service["routes"]:
+            if legacy_match_route(path, route["path"]) and method in route["methods"]:
+                return {"name": name, "url": service["url"]}
+
+    raise ValueError(f"No service found for path {path} and method {method}")
+
+
+def build_registry(route_count: int, service_count: int) -> ServiceRegistry:
+    """Build a registry with synthetic routes spread over several services."""
+    registry = ServiceRegistry()
+    per_service = max(route_count // service_count, 1)
+
+    for s in range(service_count):
+        routes: List[Dict[str, Any]] = []
+        for r in range(per_service):
+            routes.append(
+                {"path": f"/svc{s}/res{r}/{{item_id}}", "methods": ["GET", "PUT"]}
+            )
+            routes.append(
+                {"path": f"/svc{s}/res{r}/{{item_id}}/sub/{{sub_id}}", "methods": ["GET"]}
+            )
+        registry.services[f"svc{s}"] = {"url": f"http://svc{s}", "routes": routes}
+
+    registry.compile_routes()
+    return registry
+
+
+def sample_paths(
+    registry: ServiceRegistry, count: int, seed: int = 42
+) -> List[Tuple[str, str]]:
+    """Pick concrete request paths for random registered routes."""
+    rng = random.Random(seed)
+    routes = [
+        route["path"]
+        for service in registry.services.values()
+        for route in service["routes"]
+        if "auth" not in route["path"]
+    ]
+    paths = []
+    for _ in range(count):
+        template = rng.choice(routes)
+        path = template.replace("{item_id}", "42").replace("{sub_id}", "7")
+        for param in ("{project_id}", "{task_id}", "{document_id}", "{member_id}"):
+            path = path.replace(param, "abc")
+        paths.append((path, "GET"))
+    return paths
+
+
+def _resolves(registry: ServiceRegistry, path: str, method: str) -> bool:
+    try:
+        registry.get_service_for_path(path, method)
+    except ValueError:
+        return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--routes", type=int, default=5000)
+    parser.add_argument("--services", type=int, default=20)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    registry = build_registry(args.routes, args.services)
+    paths = [
+        (path, method)
+        for path, method in sample_paths(registry, args.lookups * 4)
+        if _resolves(registry, path, method)
+    ][: args.lookups]
+    route_total = sum(len(s["routes"]) for s in registry.services.values())
+
+    def run_legacy() -> None:
+        for path, method in paths:
+            legacy_get_service_for_path(registry.services, path, method)
+
+    def run_trie() -> None:
+        for path, method in paths:
+            registry.get_service_for_path(path, method)
+
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=args.repeat))
+    trie = min(timeit.repeat(run_trie, number=1, repeat=args.repeat))
+
+    print(f"registered routes: {route_total}, lookups: {len(paths)}")
+    print(f"linear scan : {legacy / len(paths) * 1e6:10.2f} us/lookup")
+    print(f"route trie  : {trie / len(paths) * 1e6:10.2f} us/lookup")
+    print(f"speedup     : {legacy / trie:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Add task listing indexes
+
+Revision ID: 3f9c1d2a7b84
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c1d2a7b84"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_tasks_project_id_status_due_date", ["project_id", "status", "due_date"]),
+    ("ix_tasks_project_id_created_at_id", ["project_id", "created_at", "id"]),
+    ("ix_tasks_assignee_id_status", ["assignee_id", "status"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the indexes without locking writes to tasks on PostgreSQL
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                "tasks",
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(
+                name, table_name="tasks", if_exists=True, postgresql_concurrently=True
+            )
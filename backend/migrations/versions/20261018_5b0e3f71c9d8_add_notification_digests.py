@@ -0,0 +1,62 @@
+"""Add notification digests
+
+Revision ID: 5b0e3f71c9d8
+Revises: c7d2e94b1a36
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b0e3f71c9d8"
+down_revision: Union[str, Sequence[str], None] = "c7d2e94b1a36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_notifications_user_id_digest_pending"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default does not rewrite the table on PostgreSQL 11+
+    op.add_column(
+        "notifications",
+        sa.Column(
+            "digest_pending", sa.Boolean(), nullable=False, server_default=sa.false()
+        ),
+    )
+    op.add_column(
+        "notification_preferences",
+        sa.Column("last_digest_at", sa.DateTime(), nullable=True),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX,
+            "notifications",
+            ["user_id", "created_at"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("digest_pending"),
+            sqlite_where=sa.text("digest_pending"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX,
+            table_name="notifications",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+
+    with op.batch_alter_table("notification_preferences") as batch_op:
+        batch_op.drop_column("last_digest_at")
+
+    with op.batch_alter_table("notifications") as batch_op:
+        batch_op.drop_column("digest_pending")
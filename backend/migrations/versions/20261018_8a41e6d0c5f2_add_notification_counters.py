@@ -0,0 +1,65 @@
+"""Add notification counters and listing indexes
+
+Revision ID: 8a41e6d0c5f2
+Revises: 3f9c1d2a7b84
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a41e6d0c5f2"
+down_revision: Union[str, Sequence[str], None] = "3f9c1d2a7b84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    (
+        "ix_notifications_user_id_is_read_created_at",
+        ["user_id", "is_read", "created_at", "id"],
+    ),
+    ("ix_notifications_user_id_created_at", ["user_id", "created_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Counters of existing users are created from their rows on first use
+    op.create_table(
+        "notification_counters",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("unread_count", sa.Integer(), nullable=False),
+        sa.UniqueConstraint("user_id"),
+        if_not_exists=True,
+    )
+
+    # Build the indexes without locking writes to notifications on PostgreSQL
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                "notifications",
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(
+                name,
+                table_name="notifications",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+
+    op.drop_table("notification_counters", if_exists=True)
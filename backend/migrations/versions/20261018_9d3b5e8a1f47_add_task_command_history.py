@@ -0,0 +1,41 @@
+"""Add task command history
+
+Revision ID: 9d3b5e8a1f47
+Revises: e2a7c4f9b630
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d3b5e8a1f47"
+down_revision: Union[str, Sequence[str], None] = "e2a7c4f9b630"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The unique constraint's index also serves the per-task history lookups
+    op.create_table(
+        "task_command_history",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("task_id", sa.String(), sa.ForeignKey("tasks.id"), nullable=False),
+        sa.Column("sequence", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("command", sa.String(), nullable=False),
+        sa.Column("changes", sa.JSON(), nullable=False),
+        sa.Column("undone", sa.Boolean(), nullable=False),
+        sa.UniqueConstraint("task_id", "sequence"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("task_command_history", if_exists=True)
@@ -0,0 +1,36 @@
+"""Drop the activity log project foreign key
+
+Revision ID: b84e1f2c6a59
+Revises: 9d3b5e8a1f47
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b84e1f2c6a59"
+down_revision: Union[str, Sequence[str], None] = "9d3b5e8a1f47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Activity logs, including the one of its deletion, outlive their project
+    op.drop_constraint(
+        "activity_logs_project_id_fkey", "activity_logs", type_="foreignkey"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails while logs of deleted projects remain
+    op.create_foreign_key(
+        "activity_logs_project_id_fkey",
+        "activity_logs",
+        "projects",
+        ["project_id"],
+        ["id"],
+    )
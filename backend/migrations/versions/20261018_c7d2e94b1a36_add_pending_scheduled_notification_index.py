@@ -0,0 +1,46 @@
+"""Add pending scheduled notification index
+
+Revision ID: c7d2e94b1a36
+Revises: 8a41e6d0c5f2
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d2e94b1a36"
+down_revision: Union[str, Sequence[str], None] = "8a41e6d0c5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_notifications_scheduled_at_pending"
+PENDING_SCHEDULED = "sent_at IS NULL AND scheduled_at IS NOT NULL"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Only unsent scheduled rows are indexed, so the index stays small
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX,
+            "notifications",
+            ["scheduled_at"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text(PENDING_SCHEDULED),
+            sqlite_where=sa.text(PENDING_SCHEDULED),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX,
+            table_name="notifications",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,82 @@
+"""Add activity feed indexes and archive
+
+Revision ID: e2a7c4f9b630
+Revises: 5b0e3f71c9d8
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a7c4f9b630"
+down_revision: Union[str, Sequence[str], None] = "5b0e3f71c9d8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    (
+        "ix_activity_logs_project_id_created_at_id",
+        ["project_id", "created_at", "id"],
+    ),
+    (
+        "ix_activity_logs_entity_created_at_id",
+        ["entity_type", "entity_id", "created_at", "id"],
+    ),
+    ("ix_activity_logs_user_id_created_at_id", ["user_id", "created_at", "id"]),
+)
+ARCHIVE_INDEX = "ix_activity_logs_archive_project_id_created_at"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Partitions are created by the archiver for the months it moves
+    op.create_table(
+        "activity_logs_archive",
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("project_id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column("entity_type", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.String(), nullable=False),
+        sa.Column("details", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("created_at", "id"),
+        postgresql_partition_by="RANGE (created_at)",
+        if_not_exists=True,
+    )
+    op.create_index(
+        ARCHIVE_INDEX,
+        "activity_logs_archive",
+        ["project_id", "created_at"],
+        if_not_exists=True,
+    )
+
+    # Build the indexes without locking writes to activity_logs on PostgreSQL
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                "activity_logs",
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(
+                name,
+                table_name="activity_logs",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+
+    # Dropping the partitioned table drops its partitions and indexes
+    op.drop_table("activity_logs_archive", if_exists=True)
@@ -95,16 +95,24 @@ class ProjectService {
 
   Future<List<TaskDTO>> getProjectTasks(String projectId) async {
     final token = await storage.read(key: 'access_token');
-    final response = await http.get(
-      Uri.parse('$baseUrl/projects/$projectId/tasks'),
-      headers: {'Authorization': 'Bearer $token'},
-    );
-    if (response.statusCode == 200) {
+    final tasks = <TaskDTO>[];
+    String? cursor;
+    // The task list is paginated; follow X-Next-Cursor until the last page
+    do {
+      final response = await http.get(
+        Uri.parse('$baseUrl/projects/$projectId/tasks').replace(
+          queryParameters: {'limit': '500', if (cursor != null) 'cursor': cursor},
+        ),
+        headers: {'Authorization': 'Bearer $token'},
+      );
+      if (response.statusCode != 200) {
+        throw Exception('Failed to fetch project tasks');
+      }
       final List data = jsonDecode(response.body);
-      return data.map((e) => TaskDTO.fromJson(e)).toList();
-    } else {
-      throw Exception('Failed to fetch project tasks');
-    }
+      tasks.addAll(data.map((e) => TaskDTO.fromJson(e)));
+      cursor = response.headers['x-next-cursor'];
+    } while (cursor != null);
+    return tasks;
   }
 
   Future<TaskDTO> getTaskDetails(String projectId, String taskId) async {